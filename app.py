@@ -1,11 +1,30 @@
+import time
 import streamlit as st
 import pandas as pd
-import main
-from logistica_sim.sistema import catalogos
+from logistica_sim.sistema import catalogos, consultas, indicadores, instrumentacion, servicio
 import altair as alt
 
 st.set_page_config(page_title="Simulación Logística ERP", layout="wide")
 
+INTERVALO_CONSULTA_SEG = 0.5  # Frecuencia de refresco del avance de una simulación en curso
+
+
+def tabla_paginada(tabla, posiciones, key, columnas_ocultar=(), formato=None):
+    """Muestra una página de las filas filtradas de una TablaIndexada (solo esa página se serializa)."""
+    col_a, col_b, col_c = st.columns([1, 1, 2])
+    tamano = col_a.selectbox("Filas por página", [25, 50, 100, 250], index=1, key=f"{key}_tamano")
+    paginas = consultas.n_paginas(len(posiciones), tamano)
+    if st.session_state.get(f"{key}_numero", 1) > paginas:
+        st.session_state[f"{key}_numero"] = paginas  # El filtro redujo el número de páginas
+    numero = col_b.number_input(f"Página (de {paginas:,})", min_value=1, max_value=paginas, value=1, step=1,
+                                key=f"{key}_numero")
+    
+    df_pagina = tabla.pagina(posiciones, numero, tamano)
+    df_pagina = df_pagina.drop(columns=[c for c in columnas_ocultar if c in df_pagina.columns])
+    inicio = (numero - 1) * tamano
+    col_c.caption(f"Filas {min(inicio + 1, len(posiciones)):,}–{inicio + len(df_pagina):,} de {len(posiciones):,}")
+    st.dataframe(df_pagina.style.format(formato) if formato else df_pagina, use_container_width=True)
+
 st.title("🚛 Sistema de Simulación Logística ERP")
 st.markdown("Simulación avanzada de Supply Chain con estructura de datos profesional.")
 
@@ -23,13 +42,48 @@ escenario = st.sidebar.selectbox(
     }[x]
 )
 
-n_dias = st.sidebar.number_input("Días a simular", min_value=7, max_value=60, value=15)
+n_dias = st.sidebar.number_input("Días a simular", min_value=7, max_value=730, value=15)
 capacidad_picking = st.sidebar.number_input("Capacidad Picking (u/día)", value=1500)
+semilla = st.sidebar.number_input("Semilla aleatoria", min_value=0, value=42, step=1,
+                                  help="Con la misma configuración y semilla el resultado se sirve desde caché.")
+instrumentar = st.sidebar.checkbox("⏱️ Medir tiempos por fase", value=False,
+                                   help="Registra el tiempo de cómputo de cada fase por día (pestaña Análisis Gráfico).")
 
 if st.sidebar.button("▶️ Ejecutar Simulación"):
-    with st.spinner("Procesando simulación..."):
-        resultados = main.run_simulation(n_dias, capacidad_picking, escenario)
-        st.session_state['resultados'] = resultados
+    # Servicio con caché compartida entre sesiones (escenario, días, picking, catálogos, semilla);
+    # la simulación corre en un hilo de trabajo y la página consulta su avance
+    st.session_state['ejecucion'] = servicio.simular_async(n_dias, capacidad_picking, escenario, semilla=int(semilla),
+                                                             instrumentar=instrumentar)
+
+if 'ejecucion' in st.session_state:
+    ejecucion = st.session_state['ejecucion']
+    
+    if not ejecucion.terminada():
+        st.header("⏳ Simulación en curso")
+        st.progress(ejecucion.fraccion, text=f"Día {ejecucion.dias_completados} de {ejecucion.n_dias}")
+        
+        df_parcial = ejecucion.kpis_parciales()
+        if not df_parcial.empty:
+            col_p1, col_p2, col_p3 = st.columns(3)
+            col_p1.metric("Fill Rate (promedio)", f"{df_parcial['fill_rate'].mean():.1f}%")
+            col_p2.metric("OTIF (promedio)", f"{df_parcial['otif'].mean():.1f}%")
+            col_p3.metric("Pedidos", int(df_parcial['total_pedidos'].sum()))
+            st.line_chart(df_parcial[['fill_rate', 'otif']])
+        
+        if st.button("⏹️ Cancelar Simulación") and not ejecucion.cancelar():
+            # Otra sesión espera la misma corrida: sigue para ella, esta sesión deja de seguirla
+            del st.session_state['ejecucion']
+            st.info("Simulación cancelada para esta sesión; otras sesiones que la pidieron la siguen esperando.")
+            st.stop()
+        time.sleep(INTERVALO_CONSULTA_SEG)
+        st.rerun()
+    
+    del st.session_state['ejecucion']
+    if ejecucion.cancelada():
+        st.warning(f"Simulación cancelada tras {ejecucion.dias_completados} de {ejecucion.n_dias} días.")
+    else:
+        st.session_state['resultados'] = ejecucion.resultado()
+        st.session_state.pop('huella_resultados', None)  # Se calcula una vez por resultado al exportar
         st.success("¡Simulación completada con éxito!")
 
 if 'resultados' in st.session_state:
@@ -44,18 +98,11 @@ if 'resultados' in st.session_state:
     # --- KPIs Globales ---
     st.header("📊 Tablero de Control")
     
-    # Calcular KPIs desde df_pedidos
-    total_pedidos = len(df_pedidos['ID_Pedido'].unique())
-    total_unidades = df_pedidos['Cant_Solicitada'].sum()
-    fill_rate = (df_pedidos['Cant_Entregada'].sum() / total_unidades) * 100 if total_unidades > 0 else 0
-    
-    # OTIF (Aproximado: Entregado completo el mismo día)
-    pedidos_agrupados = df_pedidos.groupby('ID_Pedido').agg({
-        'Cant_Solicitada': 'sum',
-        'Cant_Entregada': 'sum'
-    })
-    pedidos_perfectos = pedidos_agrupados[pedidos_agrupados['Cant_Solicitada'] == pedidos_agrupados['Cant_Entregada']]
-    otif = (len(pedidos_perfectos) / total_pedidos) * 100 if total_pedidos > 0 else 0
+    # KPIs globales desde el motor de indicadores (mismo cálculo que main y el reporte PDF)
+    _, kpis_globales = indicadores.calcular_kpis_resultados(res)
+    total_pedidos = kpis_globales['total_pedidos']
+    fill_rate = kpis_globales['fill_rate_global']
+    otif = kpis_globales['otif_global']  # Pedidos completos entregados el mismo día
     
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Pedidos", total_pedidos)
@@ -65,7 +112,7 @@ if 'resultados' in st.session_state:
 
     # --- Pestañas de Datos ---
     st.markdown("---")
-    tab1, tab_clientes, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+    tab1, tab_clientes, tab2, tab3, tab4, tab5, tab6, tab_cubo, tab7 = st.tabs([
         "📦 Productos (Maestro)", 
         "👥 Maestro de Clientes",
         "🛒 Pedidos (Ventas)", 
@@ -73,6 +120,7 @@ if 'resultados' in st.session_state:
         "🚛 Transporte (Flota)",
         "📜 Kardex (Movimientos)",
         "📈 Análisis Gráfico",
+        "🧊 Cubo de KPIs",
         "📊 Reporte Diario"
     ])
     
@@ -86,19 +134,8 @@ if 'resultados' in st.session_state:
         
     with tab_clientes:
         st.subheader("Maestro de Clientes")
-        # Convertir diccionario a DataFrame
-        data_cli = []
-        for k, v in catalogos.dic_clientes.items():
-            r = v.copy()
-            r['ID_Cliente'] = k
-            data_cli.append(r)
-        
-        df_clientes = pd.DataFrame(data_cli)
-        # Ordenar columnas
-        cols_order = ['ID_Cliente', 'nombre', 'tipo', 'frecuencia_compra', 'credito_limite', 'probabilidad_espera']
-        # Asegurar que existan (por si acaso)
-        cols_final = [c for c in cols_order if c in df_clientes.columns]
-        df_clientes = df_clientes[cols_final]
+        # Maestro de clientes memorizado por versión de catálogos
+        df_clientes = servicio.tabla_clientes()
         
         st.dataframe(df_clientes.style.format({
             'credito_limite': 'S/ {:,.2f}',
@@ -107,106 +144,110 @@ if 'resultados' in st.session_state:
         
     with tab2:
         st.subheader("Registro de Pedidos (Ventas)")
+        tabla_pedidos = servicio.tabla_indexada(res, 'df_pedidos')
+        tabla_lineas = servicio.tabla_indexada(res, 'df_lineas_pedido')
         
         col_f1, col_f2 = st.columns([1, 3])
         with col_f1:
             filtrar_ventas = st.checkbox("Filtrar por Día", key="chk_ventas")
-        
-        df_pedidos_show = df_pedidos.copy()
+        dia_ventas = None
         if filtrar_ventas:
             with col_f2:
                 dia_ventas = st.slider("Seleccionar Día", 1, n_dias, 1, key="sld_ventas")
-            df_pedidos_show = df_pedidos[df_pedidos['Fecha'] == dia_ventas]
+        col_f3, col_f4 = st.columns(2)
+        clientes_ventas = col_f3.multiselect("Cliente", tabla_pedidos.valores('Cliente'), key="ms_clientes_ventas")
+        skus_ventas = col_f4.multiselect("SKU", tabla_lineas.valores('SKU'), key="ms_skus_ventas")
         
-        # Ocultar columnas internas (Zona_ID, Items_Detalle) para la vista principal
-        columnas_ocultar = ['Zona_ID', 'Items_Detalle', 'Fecha_Entrega']
-        if 'Zona_ID' in df_pedidos_show.columns:
-            df_pedidos_display = df_pedidos_show.drop(columns=[c for c in columnas_ocultar if c in df_pedidos_show.columns])
-        else:
-            df_pedidos_display = df_pedidos_show.copy()
-            
-        st.dataframe(df_pedidos_display, use_container_width=True)
+        # Filtros resueltos sobre los índices; solo la página visible se envía al navegador
+        filas_pedidos = tabla_pedidos.filtrar(
+            Fecha=dia_ventas,
+            Cliente=clientes_ventas or None,
+            ID_Pedido=consultas.pedidos_con_sku(tabla_lineas, skus_ventas) if skus_ventas else None
+        )
+        # Ocultar columnas internas (Zona_ID, Fecha_Entrega) para la vista principal
+        tabla_paginada(tabla_pedidos, filas_pedidos, "pag_pedidos", columnas_ocultar=('Zona_ID', 'Fecha_Entrega'))
         
-        # Selector para ver detalle de un pedido específico
-        if 'Items_Detalle' in df_pedidos_show.columns and len(df_pedidos_show) > 0:
-            st.markdown("---")
-            st.markdown("#### 🔍 Ver Detalle de Productos de un Pedido")
-            
-            # Crear opciones de pedidos
-            opciones_pedidos = df_pedidos_show['ID_Pedido'].tolist()
-            
+        # Detalle de un pedido (tabla hija df_lineas_pedido) con búsqueda por prefijo del ID
+        st.markdown("---")
+        st.markdown("#### 🔍 Ver Detalle de Productos de un Pedido")
+        texto_pedido = st.text_input("Buscar ID Pedido (ej. P03-0):", key="txt_buscar_pedido")
+        sugerencias = tabla_pedidos.buscar_ids('ID_Pedido', texto_pedido) if texto_pedido.strip() else []
+        
+        if texto_pedido.strip() and not sugerencias:
+            st.info("Ningún pedido coincide con la búsqueda.")
+        
+        if sugerencias:
             pedido_seleccionado = st.selectbox(
                 "Seleccionar ID Pedido:",
-                options=opciones_pedidos,
+                options=sugerencias,
                 key="select_pedido_detalle"
             )
             
-            if pedido_seleccionado:
-                # Obtener datos del pedido seleccionado
-                pedido_data = df_pedidos_show[df_pedidos_show['ID_Pedido'] == pedido_seleccionado].iloc[0]
-                
-                # Mostrar información del pedido
-                col_det1, col_det2, col_det3, col_det4 = st.columns(4)
-                col_det1.metric("Cliente", pedido_data['Cliente'])
-                col_det2.metric("Zona", pedido_data['Zona'])
-                col_det3.metric("Estado", pedido_data['Estado'])
-                col_det4.metric("Día", pedido_data['Fecha'])
-                
-                # Mostrar detalle de items
-                items = pedido_data['Items_Detalle']
-                if items and isinstance(items, list):
-                    st.markdown("**Productos del Pedido:**")
-                    df_items = pd.DataFrame(items)
-                    st.dataframe(df_items, use_container_width=True)
-                else:
-                    st.info("No hay detalle de items disponible para este pedido.")
-        else:
-            st.info("Detalle de productos no disponible en los datos actuales.")
+            # Obtener datos del pedido seleccionado
+            pedido_data = tabla_pedidos.df.iloc[tabla_pedidos.filtrar(ID_Pedido=pedido_seleccionado)[0]]
+            
+            # Mostrar información del pedido
+            col_det1, col_det2, col_det3, col_det4 = st.columns(4)
+            col_det1.metric("Cliente", pedido_data['Cliente'])
+            col_det2.metric("Zona", pedido_data['Zona'])
+            col_det3.metric("Estado", pedido_data['Estado'])
+            col_det4.metric("Día", pedido_data['Fecha'])
+            
+            # Mostrar detalle de items
+            df_items = tabla_lineas.df.iloc[tabla_lineas.filtrar(ID_Pedido=pedido_seleccionado)].drop(columns='ID_Pedido')
+            if not df_items.empty:
+                st.markdown("**Productos del Pedido:**")
+                st.dataframe(df_items.reset_index(drop=True), use_container_width=True)
+            else:
+                st.info("No hay detalle de items disponible para este pedido.")
         
         if 'ventas_perdidas' in res and not res['ventas_perdidas'].empty:
             st.error("⚠️ Registro de Ventas Perdidas (No Atendidas)")
-            df_vp_show = res['ventas_perdidas'].copy()
-            if filtrar_ventas:
-                df_vp_show = df_vp_show[df_vp_show['Fecha'] == dia_ventas]
-            st.dataframe(df_vp_show, use_container_width=True)
+            tabla_vp = servicio.tabla_indexada(res, 'ventas_perdidas')
+            filas_vp = tabla_vp.filtrar(Fecha=dia_ventas, Producto=skus_ventas or None)
+            tabla_paginada(tabla_vp, filas_vp, "pag_ventas_perdidas")
             
         if 'historial_backlog' in res and not res['historial_backlog'].empty:
             st.warning("⏳ Historial de Backlog (Clientes que SÍ esperaron)")
-            df_bl_show = res['historial_backlog'].copy()
-            if filtrar_ventas:
-                df_bl_show = df_bl_show[df_bl_show['Fecha_Ingreso'] == dia_ventas]
-            st.dataframe(df_bl_show, use_container_width=True)
+            tabla_bl = servicio.tabla_indexada(res, 'historial_backlog')
+            filas_bl = tabla_bl.filtrar(Fecha_Ingreso=dia_ventas, Producto=skus_ventas or None,
+                                        Cliente=clientes_ventas or None)
+            tabla_paginada(tabla_bl, filas_bl, "pag_backlog")
         
     with tab3:
         st.subheader("Gestión de Compras (Reposición)")
+        tabla_compras = servicio.tabla_indexada(res, 'df_compras')
         
         col_c1, col_c2 = st.columns([1, 3])
         with col_c1:
             filtrar_compras = st.checkbox("Filtrar por Día", key="chk_compras")
-            
-        df_compras_show = df_compras.copy()
+        dia_compras = None
         if filtrar_compras and not df_compras.empty:
             with col_c2:
                 dia_compras = st.slider("Seleccionar Día", 1, n_dias, 1, key="sld_compras")
-            df_compras_show = df_compras[df_compras['Fecha_Creacion'] == dia_compras]
 
-        if not df_compras_show.empty:
-            st.dataframe(df_compras_show, use_container_width=True)
+        filas_compras = []
+        if not df_compras.empty:
+            skus_compras = st.multiselect("SKU", tabla_compras.valores('Producto'), key="ms_skus_compras")
+            filas_compras = tabla_compras.filtrar(Fecha_Creacion=dia_compras, Producto=skus_compras or None)
+
+        if len(filas_compras):
+            tabla_paginada(tabla_compras, filas_compras, "pag_compras")
         else:
             st.info("No se generaron órdenes de compra en este periodo.")
             
     with tab4:
         st.subheader("Gestión de Transporte")
+        tabla_despachos = servicio.tabla_indexada(res, 'df_despachos')
         
         col_t_filter1, col_t_filter2 = st.columns([1, 3])
         with col_t_filter1:
             filtrar_transporte = st.checkbox("Filtrar por Día", key="chk_transporte")
-            
-        df_despachos_show = res['df_despachos'].copy()
+        dia_transporte = None
         if filtrar_transporte and not res['df_despachos'].empty:
             with col_t_filter2:
                 dia_transporte = st.slider("Seleccionar Día", 1, n_dias, 1, key="sld_transporte")
-            df_despachos_show = df_despachos_show[df_despachos_show['Fecha_Salida'] == dia_transporte]
+        filas_despachos = tabla_despachos.filtrar(Fecha_Salida=dia_transporte)
 
         col_t1, col_t2 = st.columns(2)
         
@@ -216,60 +257,58 @@ if 'resultados' in st.session_state:
             
         with col_t2:
             st.markdown("### 📦 Despachos Realizados")
-            if not df_despachos_show.empty:
-                st.dataframe(df_despachos_show.style.format({
+            if len(filas_despachos):
+                tabla_paginada(tabla_despachos, filas_despachos, "pag_despachos", formato={
                     'Peso_Total_Carga_kg': '{:.2f} kg',
                     'Porcentaje_Ocupacion': '{:.1f}%',
+                    'Distancia_km': '{:.1f} km',
                     'Costo_Viaje': 'S/ {:.2f}'
-                }), use_container_width=True)
+                })
             else:
                 st.info("No se han generado despachos.")
+
+        # Búsqueda por pedido (join líneas de despacho - cabecera)
+        if 'df_lineas_despacho' in res and not res['df_lineas_despacho'].empty:
+            st.markdown("### 🔍 ¿En qué vehículo viajó un pedido?")
+            id_pedido_buscar = st.text_input("ID Pedido (ej. P01-001):", key="txt_pedido_transporte").strip().upper()
+            if id_pedido_buscar:
+                tabla_lineas_desp = servicio.tabla_indexada(res, 'df_lineas_despacho')
+                df_lineas = tabla_lineas_desp.df.iloc[tabla_lineas_desp.filtrar(ID_Pedido=id_pedido_buscar)]
+                df_viajes_pedido = df_lineas.astype({'ID_Despacho': str}).merge(
+                    res['df_despachos'][['ID_Despacho', 'Fecha_Salida', 'Hora_Salida', 'Hora_Retorno', 'ID_Vehiculo', 'Destino']],
+                    on='ID_Despacho'
+                )
+                if not df_viajes_pedido.empty:
+                    st.dataframe(df_viajes_pedido, use_container_width=True)
+                else:
+                    st.info("El pedido no figura en ningún despacho.")
         
     with tab5:
         st.subheader("Kardex de Inventario")
+        tabla_kardex = servicio.tabla_indexada(res, 'df_kardex')
         
         col_k1, col_k2 = st.columns([1, 3])
         with col_k1:
             filtrar_kardex = st.checkbox("Filtrar por Día", key="chk_kardex")
-            
-        df_kardex_show = df_kardex.copy()
+        dia_kardex = None
         if filtrar_kardex and not df_kardex.empty:
             with col_k2:
                 dia_kardex = st.slider("Seleccionar Día", 1, n_dias, 1, key="sld_kardex")
-            df_kardex_show = df_kardex[df_kardex['Fecha'] == dia_kardex]
-
-        st.dataframe(df_kardex_show, use_container_width=True)
+        col_k3, col_k4 = st.columns(2)
+        skus_kardex = col_k3.multiselect("SKU", tabla_kardex.valores('Producto'), key="ms_skus_kardex")
+        tipos_kardex = col_k4.multiselect("Tipo de Movimiento", tabla_kardex.valores('Tipo_Movimiento'),
+                                          key="ms_tipos_kardex")
+        
+        filas_kardex = tabla_kardex.filtrar(Fecha=dia_kardex, Producto=skus_kardex or None,
+                                            Tipo_Movimiento=tipos_kardex or None)
+        tabla_paginada(tabla_kardex, filas_kardex, "pag_kardex")
         
     with tab6:
         st.subheader("Evolución de Inventario")
         
         if not df_kardex.empty:
-            # Crear un rango de días completo
-            dias = range(1, n_dias + 1)
-            skus = df_productos.index.unique()
-            
-            data_evolucion = []
-            
-            for sku in skus:
-                movs = df_kardex[df_kardex['Producto'] == sku].sort_values('Fecha')
-                
-                # Obtener saldo final de cada día
-                for d in dias:
-                    movs_dia = movs[movs['Fecha'] <= d]
-                    if not movs_dia.empty:
-                        saldo = movs_dia.iloc[-1]['Saldo_Final']
-                    else:
-                        # Si no hay movimientos previos, asumimos el stock inicial (Q_Lote * 2 según inicialización)
-                        # O mejor, buscamos el valor inicial en df_productos si pudiéramos, pero aquí usaremos una lógica segura
-                        saldo = df_productos.loc[sku, 'Q_Lote_Optimo'] * 2
-                    
-                    data_evolucion.append({
-                        'Dia': d,
-                        'Producto': sku,
-                        'Stock': saldo
-                    })
-            
-            df_grafico = pd.DataFrame(data_evolucion)
+            # Saldo diario por SKU (memorizado junto con el resultado de la simulación)
+            df_grafico = servicio.evolucion_stock(res)
             
             # Gráfico de Stock (Restaurado)
             chart_stock = alt.Chart(df_grafico).mark_line(point=True).encode(
@@ -313,6 +352,26 @@ if 'resultados' in st.session_state:
             
             st.altair_chart(chart_fill, use_container_width=True)
 
+        # Tendencia suavizada (ventanas móviles y EWMA calculadas en línea durante la simulación)
+        if 'df_tendencias' in res and not res['df_tendencias'].empty:
+            kpi_tendencia = st.selectbox(
+                "KPI para tendencia:",
+                ['fill_rate', 'otif', 'backlog_rate', 'unidades_perdidas', 'utilizacion_flota'],
+                key="kpi_tendencia"
+            )
+            columnas_tendencia = [f"{kpi_tendencia}_media_7d", f"{kpi_tendencia}_media_30d", f"{kpi_tendencia}_ewma"]
+            df_tend_long = res['df_tendencias'][['Dia'] + columnas_tendencia].melt(
+                id_vars='Dia', var_name='Serie', value_name='Valor'
+            )
+            chart_tendencia = alt.Chart(df_tend_long).mark_line().encode(
+                x=alt.X('Dia:O', title='Día'),
+                y=alt.Y('Valor:Q', title=kpi_tendencia),
+                color='Serie:N',
+                tooltip=['Dia', 'Serie', alt.Tooltip('Valor:Q', format='.2f')]
+            ).properties(title=f"Tendencia de {kpi_tendencia} (media 7d / 30d / EWMA)").interactive()
+            
+            st.altair_chart(chart_tendencia, use_container_width=True)
+
         # Gráfico de Ventas Perdidas / No Atendidas
         st.markdown("### 📉 Unidades No Atendidas (Quiebres de Stock)")
         
@@ -332,6 +391,64 @@ if 'resultados' in st.session_state:
         else:
             st.success("✅ ¡Excelente! No hubo ventas perdidas en este periodo.")
 
+        # Tiempo de cómputo por fase de la simulación (solo si se midió)
+        df_timings = res.get('df_timings')
+        if df_timings is not None and not df_timings.empty:
+            st.markdown("### ⏱️ Tiempo de Cómputo por Fase")
+            chart_fases = alt.Chart(df_timings).mark_bar().encode(
+                x=alt.X('Dia:O', title='Día'),
+                y=alt.Y('sum(Tiempo_ms):Q', title='Tiempo (ms)', stack='zero'),
+                color=alt.Color('Fase:N', sort=list(instrumentacion.FASES)),
+                tooltip=['Dia', 'Fase', alt.Tooltip('Tiempo_ms:Q', format='.2f'), 'Llamadas']
+            ).properties(title="Tiempo de pared por fase y día").interactive()
+            st.altair_chart(chart_fases, use_container_width=True)
+            st.dataframe(instrumentacion.resumen_fases(df_timings), use_container_width=True)
+
+    with tab_cubo:
+        st.subheader("🧊 Cubo de KPIs (Día × SKU × Cliente × Zona)")
+        
+        if 'cubo_kpis' in res and res['cubo_kpis'].n_celdas > 0:
+            cubo = res['cubo_kpis']
+            etiquetas_dim = {'dia': 'Día', 'sku': 'SKU', 'cliente': 'Cliente', 'zona': 'Zona'}
+            
+            dims_agrupar = st.multiselect(
+                "Agrupar por:", list(etiquetas_dim), default=['zona'],
+                format_func=etiquetas_dim.get, key="cubo_agrupar"
+            )
+            
+            col_cf1, col_cf2, col_cf3, col_cf4 = st.columns(4)
+            n_dias_cubo = res['config']['n_dias']
+            rango_dias = col_cf1.slider("Días", 1, n_dias_cubo, (1, n_dias_cubo), key="cubo_dias")
+            filtro_sku = col_cf2.multiselect("SKU", cubo.categorias['sku'].tolist(), key="cubo_sku")
+            filtro_cliente = col_cf3.multiselect("Cliente", cubo.categorias['cliente'].tolist(), key="cubo_cliente")
+            filtro_zona = col_cf4.multiselect("Zona", cubo.categorias['zona'].tolist(),
+                                              format_func=lambda z: catalogos.dic_zonas.get(z, z), key="cubo_zona")
+            
+            # Corte + consolidación sobre los agregados precalculados
+            df_cubo = cubo.consolidar(
+                por=dims_agrupar,
+                dia=range(rango_dias[0], rango_dias[1] + 1),
+                sku=filtro_sku or None,
+                cliente=filtro_cliente or None,
+                zona=filtro_zona or None
+            )
+            st.dataframe(df_cubo, use_container_width=True)
+            
+            if len(dims_agrupar) == 1 and not df_cubo.empty:
+                df_cubo_chart = df_cubo.reset_index().rename(columns={dims_agrupar[0]: 'Grupo'})
+                df_cubo_chart['Grupo'] = df_cubo_chart['Grupo'].astype(str)
+                chart_cubo = alt.Chart(df_cubo_chart).transform_fold(
+                    ['unidades_entregadas', 'unidades_perdidas', 'unidades_backlog'], as_=['Medida', 'Unidades']
+                ).mark_bar().encode(
+                    x=alt.X('Grupo:N', title=etiquetas_dim[dims_agrupar[0]]),
+                    y=alt.Y('Unidades:Q', stack=True),
+                    color='Medida:N',
+                    tooltip=['Grupo:N', 'Medida:N', 'Unidades:Q']
+                ).properties(title="Unidades entregadas, perdidas y en backlog")
+                st.altair_chart(chart_cubo, use_container_width=True)
+        else:
+            st.info("No hay datos agregados para este resultado.")
+
     with tab7:
         st.subheader("📊 Reporte Diario Detallado")
         
@@ -374,17 +491,24 @@ if 'resultados' in st.session_state:
             'Costo_Unitario': 'S/ {:.2f}',
             'Stock_Fisico': '{:.0f}',
             'Stock_Comprometido': '{:.0f}'
-        }).applymap(lambda x: 'background-color: #ffcdd2' if x < 0 else '', subset=['Stock_Fisico']), use_container_width=True)
+        }).map(lambda x: 'background-color: #ffcdd2' if x < 0 else '', subset=['Stock_Fisico']), use_container_width=True)
         
         # Alertas del día
         if datos_dia['alertas']:
             for a in datos_dia['alertas']:
-                if isinstance(a, dict):
+                if isinstance(a, dict) and a.get('Evento') == 'Cierre':
+                    st.info(f"✔️ {a['Mensaje']}")
+                elif isinstance(a, dict):
                     st.error(f"⚠️ {a['Mensaje']}")
                 else:
                     st.error(f"⚠️ {a}")
         else:
-            st.success("✅ Sin alertas este día.")
+            st.success("✅ Sin alertas nuevas este día.")
+        
+        # Alertas que siguen abiertas al final de la simulación
+        if 'alertas_activas' in res and not res['alertas_activas'].empty:
+            with st.expander(f"🔔 Alertas abiertas al cierre ({len(res['alertas_activas'])})"):
+                st.dataframe(res['alertas_activas'], use_container_width=True)
 
     # --- Descarga de Reporte PDF ---
     st.markdown("---")
@@ -393,16 +517,56 @@ if 'resultados' in st.session_state:
     try:
         from logistica_sim.sistema import reporte
         
-        if st.button("Generar Reporte PDF"):
-            with st.spinner("Generando PDF..."):
-                pdf_bytes = reporte.generar_pdf(res)
-                
+        # Huella calculada una sola vez por resultado y guardada junto a él
+        huella = st.session_state.get('huella_resultados')
+        if huella is None:
+            huella = st.session_state['huella_resultados'] = reporte.huella_resultados(res)
+        
+        # Generación en segundo plano solo a pedido; resultados ya generados se sirven desde la caché
+        if st.button("📄 Generar Reporte PDF"):
+            st.session_state['pdf_solicitado'] = huella
+        if st.session_state.get('pdf_solicitado') == huella:
+            futuro_pdf = reporte.generar_pdf_async(res, huella)
+            if futuro_pdf.done():
                 st.download_button(
                     label="⬇️ Descargar Reporte PDF",
-                    data=pdf_bytes,
+                    data=futuro_pdf.result(),
                     file_name="reporte_logistica_erp.pdf",
                     mime="application/pdf"
                 )
+            else:
+                st.info("⏳ El reporte PDF se está generando en segundo plano.")
+                st.button("🔄 Actualizar estado del reporte")
+        
+        # Reporte comparativo: cada escenario se simula y resume en un proceso aparte
+        with st.expander("📊 Reporte Comparativo de Escenarios"):
+            from logistica_sim.sistema import comparativo
+            
+            escenarios_comp = st.multiselect(
+                "Escenarios a comparar (el primero es la base):",
+                list(comparativo.ESCENARIOS), default=list(comparativo.ESCENARIOS), key="escenarios_comparar"
+            )
+            if st.button("Generar Comparativo", disabled=len(escenarios_comp) < 2):
+                with st.spinner("Simulando escenarios en paralelo..."):
+                    # Misma configuración que la corrida mostrada (días, picking, empaque y semilla)
+                    resumenes = comparativo.simular_escenarios(
+                        escenarios_comp, res['config']['n_dias'], res['config']['capacidad_picking'],
+                        res['config'].get('estrategia_empaque', 'ffd'), semilla=res['config']['semilla']
+                    )
+                    st.session_state['comparativo'] = (
+                        comparativo.tabla_comparativa(resumenes),
+                        comparativo.generar_pdf_comparativo(resumenes)
+                    )
+            
+            if 'comparativo' in st.session_state:
+                df_comp, pdf_comp = st.session_state['comparativo']
+                st.dataframe(df_comp, use_container_width=True)
+                st.download_button(
+                    label="⬇️ Descargar Comparativo PDF",
+                    data=pdf_comp,
+                    file_name="reporte_comparativo_escenarios.pdf",
+                    mime="application/pdf"
+                )
     except ImportError:
         st.error("La librería 'fpdf' no está instalada. Por favor instálela para generar reportes (pip install fpdf).")
     except Exception as e:
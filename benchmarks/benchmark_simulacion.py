@@ -0,0 +1,295 @@
+"""
+Benchmark de la Simulación
+Mide run_simulation y sus etapas (demanda, compromiso/despacho de pedidos,
+backlog, reposición, planificación de despachos, KPIs, alertas y PDF) barriendo
+días, pedidos por día y tamaño de catálogo con catálogos sintéticos. Guarda los
+resultados en JSON y los compara contra una línea base con tolerancia.
+
+Uso:
+    python benchmarks/benchmark_simulacion.py                  # corre y compara contra baseline.json
+    python benchmarks/benchmark_simulacion.py --guardar-base   # corre y reemplaza la línea base
+    python benchmarks/benchmark_simulacion.py --rapido --tolerancia 0.5
+    python benchmarks/benchmark_simulacion.py --rapido --carga 10k --dias-carga 1   # + prueba de capacidad
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import main
+from logistica_sim.sistema import alertas, carga, catalogos, demanda, indicadores, reporte
+from logistica_sim.sistema.inventario import GestionInventario
+from logistica_sim.sistema.transporte import GestionTransporte
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RUTA_BASE = os.path.join(DIRECTORIO, "baseline.json")
+RUTA_RESULTADOS = os.path.join(DIRECTORIO, "ultimo.json")
+
+TOLERANCIA = 0.25          # Regresión si el tiempo supera la base en más de 25 %...
+MIN_DIFERENCIA_S = 0.010   # ...y en más de 10 ms (ruido de medición en etapas cortas)
+REPETICIONES = 3
+SEMILLA = 1234
+
+# Punto base del barrido: se varía un eje a la vez
+CASO_BASE = {'dias': 30, 'pedidos_por_dia': 12, 'n_skus': 5}
+BARRIDO = {
+    'dias': (15, 30, 60),
+    'pedidos_por_dia': (12, 25, 50),
+    'n_skus': (5, 25, 100),
+}
+BARRIDO_RAPIDO = {
+    'dias': (10, 20),
+    'pedidos_por_dia': (12, 25),
+    'n_skus': (5, 20),
+}
+
+# Etapa -> funciones (objeto, atributo) cronometradas dentro de run_simulation
+ETAPAS = {
+    'demanda': [(main, 'generar_demanda_diaria')],
+    'comprometer_despachar': [(GestionInventario, 'comprometer_stock'), (GestionInventario, 'despachar_pedido')],
+    'atender_backlog': [(GestionInventario, 'atender_backlog')],
+    'verificar_reposicion': [(GestionInventario, 'verificar_reposicion')],
+    'planificar_despachos': [(GestionTransporte, 'planificar_despachos')],
+    'indicadores': [(indicadores, 'calcular_kpis_diarios')],
+    'alertas': [(alertas.MotorAlertas, 'evaluar')],
+}
+
+
+def nombre_caso(caso):
+    return f"d{caso['dias']}_p{caso['pedidos_por_dia']}_s{caso['n_skus']}"
+
+
+def casos_barrido(barrido=BARRIDO, base=CASO_BASE):
+    """Casos únicos variando un eje a la vez alrededor del caso base."""
+    casos = {}
+    for eje, valores in barrido.items():
+        for valor in valores:
+            caso = dict(base, **{eje: valor})
+            casos[nombre_caso(caso)] = caso
+    return list(casos.values())
+
+
+def catalogo_sintetico(n_skus, semilla=SEMILLA):
+    """
+    Catálogos de la corrida (catalogos.catalogos_simulacion) con n_skus SKUs
+    sintéticos derivados de los reales; se pasan a run_simulation(catalogos=...)
+    sin modificar los catálogos globales.
+    """
+    rng = random.Random(semilla)
+    plantillas = list(catalogos.dic_sku.values())
+
+    sinteticos = {}
+    for i in range(n_skus):
+        info = dict(plantillas[i % len(plantillas)])
+        escala = rng.uniform(0.5, 1.5)
+        info['nombre'] = f"{info['nombre']} #{i + 1}"
+        info['stock_objetivo'] = int(info['stock_objetivo'] * escala)
+        info['stock_minimo'] = int(info['stock_minimo'] * escala)
+        info['lead_time_dias'] = rng.randint(2, 6)
+        sinteticos[f"P{i + 1:03d}"] = info
+    return catalogos.catalogos_simulacion(dic_sku=sinteticos)
+
+
+@contextlib.contextmanager
+def pedidos_diarios(pedidos_por_dia):
+    """
+    Ajusta el rango de pedidos por día de demanda.py y lo restaura al salir. Como
+    cronometrar_etapas, modifica estado del módulo: el benchmark corre en un solo hilo.
+    """
+    original = demanda.PEDIDOS_POR_DIA
+    demanda.PEDIDOS_POR_DIA = (max(int(pedidos_por_dia * 0.8), 1), max(int(pedidos_por_dia * 1.2), 1))
+    try:
+        yield
+    finally:
+        demanda.PEDIDOS_POR_DIA = original
+
+
+@contextlib.contextmanager
+def cronometrar_etapas(acumulado, etapas=ETAPAS):
+    """Envuelve las funciones de `etapas` para sumar su tiempo en `acumulado[etapa]`."""
+    originales = []
+
+    def envolver(etapa, funcion):
+        @functools.wraps(funcion)
+        def cronometrada(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                acumulado[etapa] += time.perf_counter() - inicio
+        return cronometrada
+
+    for etapa, objetivos in etapas.items():
+        acumulado.setdefault(etapa, 0.0)
+        for objeto, atributo in objetivos:
+            original = getattr(objeto, atributo)
+            originales.append((objeto, atributo, original))
+            setattr(objeto, atributo, envolver(etapa, original))
+    try:
+        yield acumulado
+    finally:
+        for objeto, atributo, original in reversed(originales):
+            setattr(objeto, atributo, original)
+
+
+def medir_caso(caso, repeticiones=REPETICIONES, semilla=SEMILLA):
+    """Mediana (s) del total, de cada etapa y del PDF en `repeticiones` corridas con la misma semilla."""
+    totales, pdfs, etapas = [], [], {etapa: [] for etapa in ETAPAS}
+    n_pedidos = 0
+    catalogos_caso = catalogo_sintetico(caso['n_skus'], semilla)
+    with pedidos_diarios(caso['pedidos_por_dia']):
+        for _ in range(repeticiones):
+            acumulado = {}
+            with cronometrar_etapas(acumulado):
+                inicio = time.perf_counter()
+                resultados = main.run_simulation(caso['dias'], 1500, "normal", semilla=semilla,
+                                                 catalogos=catalogos_caso)
+                totales.append(time.perf_counter() - inicio)
+            for etapa, segundos in acumulado.items():
+                etapas[etapa].append(segundos)
+
+            inicio = time.perf_counter()
+            reporte.generar_pdf(resultados)
+            pdfs.append(time.perf_counter() - inicio)
+            n_pedidos = len(resultados['df_pedidos'])
+
+    tiempos = {'total': statistics.median(totales)}
+    tiempos.update({etapa: statistics.median(valores) for etapa, valores in etapas.items()})
+    tiempos['generar_pdf'] = statistics.median(pdfs)
+    return {
+        'parametros': dict(caso),
+        'pedidos_generados': n_pedidos,
+        'tiempos_s': {k: round(v, 6) for k, v in tiempos.items()},
+    }
+
+
+def medir_carga(escala, dias, semilla=SEMILLA):
+    """
+    Prueba de capacidad: una corrida (sin repeticiones ni PDF) con la carga sintética
+    `escala` de carga.ESCALAS; la demanda se cronometra en el generador de la carga.
+    """
+    carga_sintetica = carga.CargaSintetica.escala(escala, semilla=semilla)
+    etapas = dict(ETAPAS, demanda=[(carga_sintetica, 'generar_demanda_diaria')])
+    acumulado = {}
+    with cronometrar_etapas(acumulado, etapas):
+        inicio = time.perf_counter()
+        resultados = main.run_simulation(dias, carga_sintetica.lineas_por_dia, "normal", semilla=semilla,
+                                         carga=carga_sintetica)
+        total = time.perf_counter() - inicio
+    return {
+        'parametros': {'escala': escala, 'dias': dias, **carga_sintetica.descripcion()},
+        'pedidos_generados': len(resultados['df_pedidos']),
+        'tiempos_s': {k: round(v, 6) for k, v in {'total': total, **acumulado}.items()},
+    }
+
+
+def ejecutar(casos, repeticiones=REPETICIONES, semilla=SEMILLA, verbose=True, cargas=(), dias_carga=1):
+    """Mide todos los casos (y las escalas de `cargas`) y retorna el documento de resultados (serializable a JSON)."""
+    resultados = {}
+    mediciones = [(nombre_caso(caso), lambda caso=caso: medir_caso(caso, repeticiones, semilla)) for caso in casos]
+    mediciones += [(f"carga_{escala}_d{dias_carga}", lambda escala=escala: medir_carga(escala, dias_carga, semilla))
+                   for escala in cargas]
+    for nombre, medir in mediciones:
+        resultados[nombre] = medir()
+        if verbose:
+            tiempos = resultados[nombre]['tiempos_s']
+            print(f"{nombre:<18} total={tiempos['total']:.3f}s  "
+                  + "  ".join(f"{k}={v * 1000:.1f}ms" for k, v in tiempos.items() if k != 'total'))
+    return {
+        'entorno': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'fecha': time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        'repeticiones': repeticiones,
+        'semilla': semilla,
+        'casos': resultados,
+    }
+
+
+def comparar(actual, base, tolerancia=TOLERANCIA, min_diferencia=MIN_DIFERENCIA_S):
+    """
+    Regresiones de `actual` contra `base`: lista de dicts (caso, métrica, base, actual,
+    ratio) para los tiempos que superan la base en más de `tolerancia` (fracción)
+    y en más de `min_diferencia` segundos. Los casos o métricas ausentes en la base se ignoran.
+    """
+    regresiones = []
+    for nombre, caso in actual['casos'].items():
+        caso_base = base.get('casos', {}).get(nombre)
+        if caso_base is None:
+            continue
+        for metrica, segundos in caso['tiempos_s'].items():
+            referencia = caso_base['tiempos_s'].get(metrica)
+            if referencia is None:
+                continue
+            if segundos > referencia * (1 + tolerancia) and segundos - referencia > min_diferencia:
+                regresiones.append({
+                    'caso': nombre, 'metrica': metrica, 'base': referencia, 'actual': segundos,
+                    'ratio': round(segundos / referencia, 2) if referencia else float('inf'),
+                })
+    return regresiones
+
+
+def guardar(documento, ruta):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(documento, f, indent=2, ensure_ascii=False)
+
+
+def cargar(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de run_simulation y sus etapas")
+    parser.add_argument('--rapido', action='store_true', help="Barrido reducido")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES)
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help="Fracción de aumento tolerada antes de marcar regresión (0.25 = 25 %%)")
+    parser.add_argument('--base', default=RUTA_BASE, help="JSON de línea base")
+    parser.add_argument('--salida', default=RUTA_RESULTADOS, help="JSON donde se guardan los resultados")
+    parser.add_argument('--guardar-base', action='store_true', help="Guarda los resultados como nueva línea base")
+    parser.add_argument('--carga', action='append', default=[], choices=list(carga.ESCALAS),
+                        help="Agrega una prueba de capacidad con la carga sintética de esa escala (repetible)")
+    parser.add_argument('--dias-carga', type=int, default=1, help="Días simulados en las pruebas de capacidad")
+    args = parser.parse_args(argv)
+
+    casos = casos_barrido(BARRIDO_RAPIDO if args.rapido else BARRIDO)
+    documento = ejecutar(casos, args.repeticiones, cargas=args.carga, dias_carga=args.dias_carga)
+    guardar(documento, args.salida)
+    print(f"\nResultados guardados en {args.salida}")
+
+    if args.guardar_base:
+        guardar(documento, args.base)
+        print(f"Línea base actualizada: {args.base}")
+        return 0
+
+    if not os.path.exists(args.base):
+        print(f"Sin línea base en {args.base} (use --guardar-base para crearla).")
+        return 0
+
+    regresiones = comparar(documento, cargar(args.base), args.tolerancia)
+    if not regresiones:
+        print(f"Sin regresiones contra {args.base} (tolerancia {args.tolerancia:.0%}).")
+        return 0
+    print(f"\n[REGRESION] {len(regresiones)} métricas superan la tolerancia de {args.tolerancia:.0%}:")
+    for r in regresiones:
+        print(f"  {r['caso']:<18} {r['metrica']:<22} {r['base'] * 1000:9.1f}ms -> {r['actual'] * 1000:9.1f}ms (x{r['ratio']})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
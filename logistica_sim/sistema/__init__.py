@@ -5,7 +5,7 @@ Sistema de simulación logística con módulos de inventario, transporte, y repo
 
 # Exponer clases principales para facilitar los imports
 from .inventario import GestionInventario, EstadoInventario, reservar_y_actualizar, reponer_por_demanda
-from .transporte import GestionTransporte, planificar_rutas
+from .transporte import GestionTransporte, ModeloCarga, planificar_rutas
 from .reporte import generar_pdf, reporte_logistica, PDFReport
 
 # Exponer módulos completos para acceso directo
@@ -14,6 +14,23 @@ from . import demanda
 from . import picking
 from . import indicadores
 from . import alertas
+from . import empaque
+from . import ruteo
+from . import flota
+from . import tendencias
+from . import cubo
+from . import comparativo
+from . import esquemas
+from . import servicio
+from . import consultas
+from . import instrumentacion
+from . import memoria
+from . import perfilado
+from . import carga
+from . import red
+from . import politicas
+from . import pronostico
+from . import stock_seguridad
 
 __all__ = [
     # Clases de Inventario
@@ -24,6 +41,7 @@ __all__ = [
     
     # Clases de Transporte
     'GestionTransporte',
+    'ModeloCarga',
     'planificar_rutas',
     
     # Funciones de Reporte
@@ -37,4 +55,21 @@ __all__ = [
     'picking',
     'indicadores',
     'alertas',
+    'empaque',
+    'ruteo',
+    'flota',
+    'tendencias',
+    'cubo',
+    'comparativo',
+    'esquemas',
+    'servicio',
+    'consultas',
+    'instrumentacion',
+    'memoria',
+    'perfilado',
+    'carga',
+    'red',
+    'politicas',
+    'pronostico',
+    'stock_seguridad',
 ]
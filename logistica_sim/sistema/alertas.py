@@ -1,44 +1,189 @@
 """
 Módulo de Alertas
 Genera alertas basadas en los indicadores y umbrales definidos.
+Las reglas son declarativas (métrica, comparación, umbral, severidad, alcance) y se
+evalúan como máscaras vectorizadas sobre todos los SKUs. El motor guarda el estado de
+cada alerta, de modo que una condición persistente emite un evento de apertura y uno
+de cierre (con histéresis) en lugar de repetirse cada día.
 """
+import numpy as np
+import pandas as pd
+
+COMPARADORES = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+}
+
+ALCANCES = ('sku', 'kpi')
+
+EVENTO_APERTURA = 'Apertura'
+EVENTO_CIERRE = 'Cierre'
+
+
+class ReglaAlerta:
+    """
+    Regla declarativa de alerta.
+    - metrica: columna de df_inventario/df_productos (alcance 'sku') o clave de los KPIs del día (alcance 'kpi')
+    - umbral: número o nombre de columna (p. ej. 'Stock_Seguridad') evaluado por SKU
+    - histeresis: margen que la métrica debe superar (en sentido de recuperación) para cerrar la alerta
+    - mensaje: plantilla con {entidad}, {valor} y {umbral}
+    """
+
+    def __init__(self, nombre, tipo, metrica, comparacion, umbral, nivel, alcance='sku',
+                 mensaje="{entidad}: {valor} fuera de umbral ({umbral})", histeresis=0.0):
+        if comparacion not in COMPARADORES:
+            raise ValueError(f"Comparación '{comparacion}' no soportada. Use: {', '.join(COMPARADORES)}")
+        if alcance not in ALCANCES:
+            raise ValueError(f"Alcance '{alcance}' no soportado. Use: {', '.join(ALCANCES)}")
+        self.nombre = nombre
+        self.tipo = tipo
+        self.metrica = metrica
+        self.comparacion = comparacion
+        self.umbral = umbral
+        self.nivel = nivel
+        self.alcance = alcance
+        self.mensaje = mensaje
+        self.histeresis = float(histeresis)
+
+        self.comparar = COMPARADORES[comparacion]
+        # La alerta sigue abierta mientras la métrica no se recupere más allá del margen
+        self.desplazamiento_cierre = self.histeresis if comparacion in ('<', '<=') else -self.histeresis
+
+
+REGLAS_PREDETERMINADAS = (
+    ReglaAlerta('inventario_critico', 'Inventario Crítico', 'Stock_Fisico', '<=', 'Stock_Seguridad', 'Alto',
+                mensaje="Producto {entidad} con stock bajo ({valor:.0f} < {umbral:.0f})."),
+    ReglaAlerta('otif_bajo', 'KPI Bajo', 'otif', '<', 90, 'Medio', alcance='kpi',
+                mensaje="OTIF del día bajo: {valor}% (Meta: {umbral:.0f}%)", histeresis=2.0),
+    ReglaAlerta('fill_rate_bajo', 'KPI Bajo', 'fill_rate', '<', 95, 'Medio', alcance='kpi',
+                mensaje="Fill Rate bajo: {valor}% (Meta: {umbral:.0f}%)", histeresis=1.0),
+)
+
+
+class MotorAlertas:
+    """
+    Evalúa un conjunto de reglas día a día manteniendo, por regla, un vector booleano
+    de alertas abiertas (una posición por SKU, o una sola para KPIs) y el día de apertura.
+    """
+
+    def __init__(self, reglas=REGLAS_PREDETERMINADAS):
+        self.reglas = tuple(reglas)
+        self.entidades = {}   # regla -> pd.Index de entidades evaluadas
+        self.activas = {}     # regla -> np.ndarray[bool]
+        self.desde = {}       # regla -> np.ndarray[int] (día de apertura)
+
+    def evaluar(self, dia, df_inventario, df_productos, kpis_dia):
+        """
+        Evalúa todas las reglas y retorna solo los eventos del día (aperturas y cierres).
+        """
+        eventos = []
+        productos = None
+        for regla in self.reglas:
+            if regla.alcance == 'sku':
+                if productos is None:
+                    productos = self._alinear_productos(df_inventario, df_productos)
+                entidades = df_inventario.index
+                valores = self._columna(regla.metrica, df_inventario, productos)
+                umbrales = (self._columna(regla.umbral, df_inventario, productos)
+                            if isinstance(regla.umbral, str) else np.full(len(entidades), float(regla.umbral)))
+            else:
+                entidades = pd.Index(['KPI'])
+                valores = np.array([kpis_dia.get(regla.metrica, np.nan)], dtype=float)
+                umbrales = np.array([float(regla.umbral)])
+
+            activas, desde = self._estado(regla, entidades)
+            condicion = regla.comparar(valores, umbrales)
+            sigue = regla.comparar(valores, umbrales + regla.desplazamiento_cierre)
+
+            abre = condicion & ~activas
+            cierra = activas & ~sigue
+
+            desde[abre] = dia
+            eventos.extend(self._eventos(regla, EVENTO_APERTURA, dia, entidades, valores, umbrales, desde, abre))
+            eventos.extend(self._eventos(regla, EVENTO_CIERRE, dia, entidades, valores, umbrales, desde, cierra))
+
+            activas |= abre
+            activas &= ~cierra
+
+        return eventos
+
+    def alertas_activas(self):
+        """Retorna las alertas abiertas al momento (regla, entidad y día de apertura)."""
+        abiertas = []
+        for regla in self.reglas:
+            if regla.nombre not in self.activas:
+                continue
+            for pos in np.flatnonzero(self.activas[regla.nombre]):
+                abiertas.append({
+                    'Regla': regla.nombre,
+                    'Tipo': regla.tipo,
+                    'Entidad': self.entidades[regla.nombre][pos],
+                    'Nivel': regla.nivel,
+                    'Dia_Apertura': int(self.desde[regla.nombre][pos])
+                })
+        return abiertas
+
+    def _estado(self, regla, entidades):
+        """Estado de la regla alineado a las entidades del día (nuevas entidades inician cerradas)."""
+        previas = self.entidades.get(regla.nombre)
+        if previas is None or not previas.equals(entidades):
+            activas = np.zeros(len(entidades), dtype=bool)
+            desde = np.zeros(len(entidades), dtype=np.int64)
+            if previas is not None:
+                posiciones = previas.get_indexer(entidades)
+                encontradas = posiciones >= 0
+                activas[encontradas] = self.activas[regla.nombre][posiciones[encontradas]]
+                desde[encontradas] = self.desde[regla.nombre][posiciones[encontradas]]
+            self.entidades[regla.nombre] = entidades
+            self.activas[regla.nombre] = activas
+            self.desde[regla.nombre] = desde
+        return self.activas[regla.nombre], self.desde[regla.nombre]
+
+    @staticmethod
+    def _alinear_productos(df_inventario, df_productos):
+        if df_productos.index.equals(df_inventario.index):
+            return df_productos
+        return df_productos.reindex(df_inventario.index)
+
+    @staticmethod
+    def _columna(nombre, df_inventario, df_productos):
+        if nombre in df_inventario.columns:
+            return df_inventario[nombre].to_numpy(dtype=float)
+        if nombre in df_productos.columns:
+            return df_productos[nombre].to_numpy(dtype=float)
+        raise KeyError(f"Columna '{nombre}' no encontrada en inventario ni productos.")
+
+    @staticmethod
+    def _eventos(regla, evento, dia, entidades, valores, umbrales, desde, mascara):
+        # Solo se recorren las posiciones que cambiaron de estado
+        posiciones = np.flatnonzero(mascara)
+        eventos = []
+        for pos in posiciones:
+            entidad = entidades[pos]
+            if evento == EVENTO_APERTURA:
+                mensaje = regla.mensaje.format(entidad=entidad, valor=float(valores[pos]), umbral=float(umbrales[pos]))
+            else:
+                mensaje = (f"{regla.tipo} normalizada ({regla.nombre}, {entidad}): "
+                           f"valor actual {float(valores[pos]):g}, abierta desde el día {desde[pos]}.")
+            eventos.append({
+                'Fecha': dia,
+                'Tipo': regla.tipo,
+                'Mensaje': mensaje,
+                'Nivel': regla.nivel,
+                'Evento': evento,
+                'Regla': regla.nombre,
+                'Entidad': entidad,
+                'Dia_Apertura': int(desde[pos])
+            })
+        return eventos
+
 
 def generar_alertas(df_inventario, df_productos, indicadores, dia):
     """
     Genera alertas basadas en el estado del inventario y los KPIs del día.
+    Evaluación sin estado: retorna todas las condiciones vigentes del día
+    (usar MotorAlertas para eventos de apertura/cierre sin repeticiones).
     """
-    alertas = []
-    
-    # 1. Alertas de Inventario (Stock Crítico)
-    # Unir con df_productos para obtener Stock_Seguridad
-    # Asumimos que ambos tienen el mismo índice (ID_Producto)
-    df_full = df_inventario.join(df_productos[['Stock_Seguridad']])
-    
-    criticos = df_full[df_full['Stock_Fisico'] <= df_full['Stock_Seguridad']]
-    
-    for sku, row in criticos.iterrows():
-        alertas.append({
-            'Fecha': dia,
-            'Tipo': 'Inventario Crítico',
-            'Mensaje': f"Producto {sku} con stock bajo ({row['Stock_Fisico']} < {row['Stock_Seguridad']}).",
-            'Nivel': 'Alto'
-        })
-        
-    # 2. Alertas de KPIs
-    if indicadores['otif'] < 90:
-        alertas.append({
-            'Fecha': dia,
-            'Tipo': 'KPI Bajo',
-            'Mensaje': f"OTIF del día bajo: {indicadores['otif']}% (Meta: 90%)",
-            'Nivel': 'Medio'
-        })
-        
-    if indicadores.get('fill_rate', 100) < 95:
-        alertas.append({
-            'Fecha': dia,
-            'Tipo': 'KPI Bajo',
-            'Mensaje': f"Fill Rate bajo: {indicadores['fill_rate']}% (Meta: 95%)",
-            'Nivel': 'Medio'
-        })
-
-    return alertas
+    return MotorAlertas().evaluar(dia, df_inventario, df_productos, indicadores)
@@ -0,0 +1,277 @@
+"""
+Módulo de Carga Sintética
+Generador de cargas de trabajo a escala para pruebas de capacidad: catálogo de
+SKUs, cartera de clientes con pesos de compra, zonas con coordenadas y flota de
+cualquier tamaño, coherentes entre sí (stock según la demanda esperada, flota
+según el peso diario), y demanda diaria con sesgo Zipf sobre SKUs y clientes y
+estacionalidad. Todo se deriva de una sola configuración sembrada y se conecta a
+run_simulation(..., carga=CargaSintetica(...)).
+"""
+import math
+
+import numpy as np
+
+from . import catalogos
+from .catalogos import dic_tipos_vehiculo
+from .demanda import DIAS_PICO_ESTACIONAL
+
+# Escalas predefinidas por líneas de pedido por día
+ESCALAS = {
+    '10k': {'lineas_por_dia': 10_000, 'n_skus': 1_000, 'n_clientes': 500, 'n_zonas': 50},
+    '100k': {'lineas_por_dia': 100_000, 'n_skus': 10_000, 'n_clientes': 5_000, 'n_zonas': 200},
+    '1M': {'lineas_por_dia': 1_000_000, 'n_skus': 50_000, 'n_clientes': 20_000, 'n_zonas': 500},
+}
+
+CATEGORIAS = ("Hidráulica", "Equipos", "Eléctrica", "Neumática", "Ferretería", "Seguridad")
+RADIO_ZONAS_KM = 40.0
+RADIO_CLIENTES_KM = 3.0   # Dispersión de los clientes alrededor del centro de su zona
+# Fracción de clientes (de mayor a menor peso de compra) por nivel de FRECUENCIA_PESOS
+CORTES_FRECUENCIA = (("Muy Alta", 0.05), ("Alta", 0.20), ("Media", 0.35), ("Baja", 0.40))
+HOLGURA_FLOTA = 1.3   # Capacidad diaria de la flota sobre el peso esperado
+
+
+def pesos_zipf(n, sesgo):
+    """Probabilidades Zipf p_k ∝ 1 / k^sesgo para los rangos k = 1..n (sesgo 0 = uniforme)."""
+    pesos = 1.0 / np.arange(1, n + 1, dtype=float) ** sesgo
+    return pesos / pesos.sum()
+
+
+class CargaSintetica:
+    """
+    Configuración sembrada de una carga sintética. Los IDs siguen el orden de
+    popularidad: P00001 es el SKU más pedido y C0001 el cliente que más compra.
+    """
+
+    def __init__(self, lineas_por_dia=1_000, n_skus=200, n_clientes=100, n_zonas=20, n_vehiculos=None,
+                 lineas_por_pedido=(1, 5), cantidad=(5, 50), sesgo_skus=1.1, sesgo_clientes=0.8,
+                 amplitud_estacional=0.2, periodo_estacional=7, semilla=0):
+        """
+        Args:
+            lineas_por_dia: Líneas de pedido por día antes de la estacionalidad.
+            lineas_por_pedido, cantidad: Rangos (mínimo, máximo) uniformes.
+            sesgo_skus, sesgo_clientes: Exponente Zipf de la popularidad.
+            amplitud_estacional, periodo_estacional: Onda 1 + A·sen(2π·día/periodo);
+                el escenario 'demanda_estacional' duplica además los DIAS_PICO_ESTACIONAL.
+            n_vehiculos: Tamaño de la flota; None la dimensiona según el peso diario esperado.
+        """
+        self.lineas_por_dia = int(lineas_por_dia)
+        self.n_skus = int(n_skus)
+        self.n_clientes = int(n_clientes)
+        self.n_zonas = int(n_zonas)
+        self.lineas_por_pedido = lineas_por_pedido
+        self.cantidad = cantidad
+        self.sesgo_skus = sesgo_skus
+        self.sesgo_clientes = sesgo_clientes
+        self.amplitud_estacional = amplitud_estacional
+        self.periodo_estacional = periodo_estacional
+        self.semilla = semilla
+
+        self.p_skus = pesos_zipf(self.n_skus, sesgo_skus)
+        self.p_clientes = pesos_zipf(self.n_clientes, sesgo_clientes)
+        self.ids_sku = [f"P{i + 1:05d}" for i in range(self.n_skus)]
+        self.ids_cliente = [f"C{i + 1:04d}" for i in range(self.n_clientes)]
+        self.ids_zona = [f"Z{i + 1:03d}" for i in range(self.n_zonas)]
+
+        self.dic_sku = self._generar_skus()
+        self.dic_clientes, self.zona_cliente = self._generar_clientes()
+        self.dic_zonas, self.dic_coordenadas_zonas = self._generar_zonas()
+        self.dic_coordenadas_clientes = self._generar_coordenadas_clientes()
+        self.dic_flota = self._generar_flota(n_vehiculos)
+        self._cdf_skus = np.cumsum(self.p_skus)
+        self._cdf_clientes = np.cumsum(self.p_clientes)
+
+    @classmethod
+    def escala(cls, nombre, **ajustes):
+        """Carga de una escala de ESCALAS ('10k', '100k', '1M') con parámetros opcionales ajustados."""
+        if nombre not in ESCALAS:
+            raise ValueError(f"Escala desconocida: {nombre}. Opciones: {list(ESCALAS)}")
+        return cls(**{**ESCALAS[nombre], **ajustes})
+
+    def descripcion(self):
+        """Parámetros de la carga (para la configuración de los resultados)."""
+        return {
+            'lineas_por_dia': self.lineas_por_dia, 'n_skus': self.n_skus, 'n_clientes': self.n_clientes,
+            'n_zonas': self.n_zonas, 'n_vehiculos': len(self.dic_flota),
+            'lineas_por_pedido': tuple(self.lineas_por_pedido), 'cantidad': tuple(self.cantidad),
+            'sesgo_skus': self.sesgo_skus, 'sesgo_clientes': self.sesgo_clientes,
+            'amplitud_estacional': self.amplitud_estacional, 'periodo_estacional': self.periodo_estacional,
+            'semilla': self.semilla,
+        }
+
+    # ------------------------------------------------------------------
+    # Datos maestros
+    # ------------------------------------------------------------------
+    def _rng(self, *flujo):
+        return np.random.default_rng([self.semilla, *flujo])
+
+    def _cantidad_media(self):
+        return (self.cantidad[0] + self.cantidad[1]) / 2
+
+    def _generar_skus(self):
+        rng = self._rng(1)
+        n = self.n_skus
+        lead_time = rng.integers(2, 7, n)
+        costo = np.round(rng.lognormal(3.5, 1.0, n), 2)
+        margen = rng.uniform(1.2, 1.6, n)
+        peso = np.round(rng.lognormal(0.0, 0.8, n).clip(0.05, 40.0), 2)
+        volumen = np.round(peso * rng.uniform(0.002, 0.006, n), 4)
+        categoria = rng.integers(0, len(CATEGORIAS), n)
+        # Stock coherente con la demanda media diaria esperada de cada SKU
+        demanda_diaria = self.lineas_por_dia * self.p_skus * self._cantidad_media()
+        stock_minimo = np.maximum(np.ceil(demanda_diaria * 1.5), 5).astype(int)
+        stock_objetivo = np.maximum(np.ceil(demanda_diaria * (lead_time + 3)), stock_minimo * 2).astype(int)
+
+        return {
+            sku: {
+                "nombre": f"{CATEGORIAS[categoria[i]]} artículo {i + 1}",
+                "stock_objetivo": int(stock_objetivo[i]),
+                "stock_minimo": int(stock_minimo[i]),
+                "lead_time_dias": int(lead_time[i]),
+                "costo_unitario": float(costo[i]),
+                "precio_venta": float(round(costo[i] * margen[i], 2)),
+                "categoria": CATEGORIAS[categoria[i]],
+                "peso_kg": float(peso[i]),
+                "volumen_m3": float(volumen[i]),
+            }
+            for i, sku in enumerate(self.ids_sku)
+        }
+
+    def _generar_clientes(self):
+        rng = self._rng(2)
+        n = self.n_clientes
+        zona = rng.integers(0, self.n_zonas, n)
+        # Nivel de frecuencia según la posición en el ranking de compra
+        limites = np.cumsum([f for _, f in CORTES_FRECUENCIA]) * n
+        nivel = np.searchsorted(limites, np.arange(n), side='right').clip(max=len(CORTES_FRECUENCIA) - 1)
+        tipos = ("Corporativo", "Empresa Grande", "Empresa Mediana", "Empresa Pequeña")
+        probabilidad_espera = rng.uniform(0.3, 0.95, n).round(2)
+
+        dic_clientes, zona_cliente = {}, []
+        for i, cliente in enumerate(self.ids_cliente):
+            frecuencia = CORTES_FRECUENCIA[nivel[i]][0]
+            dic_clientes[cliente] = {
+                "nombre": f"Cliente Sintético {i + 1}",
+                "tipo": tipos[min(nivel[i], len(tipos) - 1)],
+                "frecuencia_compra": frecuencia,
+                "credito_limite": int(round(self.p_clientes[i] * self.lineas_por_dia * 5000, -3)) + 5000,
+                "probabilidad_espera": float(probabilidad_espera[i]),
+                "peso_compra": float(self.p_clientes[i]),
+                "zona_id": self.ids_zona[zona[i]],
+            }
+            zona_cliente.append(self.ids_zona[zona[i]])
+        return dic_clientes, zona_cliente
+
+    def _generar_zonas(self):
+        rng = self._rng(3)
+        angulo = rng.uniform(0, 2 * math.pi, self.n_zonas)
+        radio = RADIO_ZONAS_KM * np.sqrt(rng.uniform(0.02, 1.0, self.n_zonas))
+        x, y = np.round(radio * np.cos(angulo), 1), np.round(radio * np.sin(angulo), 1)
+        dic_zonas = {z: f"Zona {i + 1}" for i, z in enumerate(self.ids_zona)}
+        coordenadas = {z: (float(x[i]), float(y[i])) for i, z in enumerate(self.ids_zona)}
+        return dic_zonas, coordenadas
+
+    def _generar_coordenadas_clientes(self):
+        """Cada cliente cerca del centro de su zona (desplazamiento uniforme en un disco)."""
+        rng = self._rng(5)
+        angulo = rng.uniform(0, 2 * math.pi, self.n_clientes)
+        radio = RADIO_CLIENTES_KM * np.sqrt(rng.uniform(0, 1, self.n_clientes))
+        centros = np.array([self.dic_coordenadas_zonas[z] for z in self.zona_cliente], dtype=float).reshape(-1, 2)
+        x = np.round(centros[:, 0] + radio * np.cos(angulo), 1)
+        y = np.round(centros[:, 1] + radio * np.sin(angulo), 1)
+        return {c: (float(x[i]), float(y[i])) for i, c in enumerate(self.ids_cliente)}
+
+    def _generar_flota(self, n_vehiculos):
+        capacidades = {t: v['capacidad_kg'] for t, v in dic_tipos_vehiculo.items()}
+        tipos = list(capacidades)
+        if n_vehiculos is None:
+            peso_medio = sum(self.p_skus[i] * info['peso_kg'] for i, info in enumerate(self.dic_sku.values()))
+            peso_diario = self.lineas_por_dia * self._cantidad_media() * peso_medio
+            capacidad_media = sum(capacidades[t] for t in tipos) / len(tipos)
+            n_vehiculos = max(math.ceil(peso_diario * HOLGURA_FLOTA / capacidad_media), len(tipos))
+        rng = self._rng(4)
+        asignados = rng.integers(0, len(tipos), int(n_vehiculos))
+        return {
+            f"V-{i + 1:05d}": {"tipo": tipos[t], "capacidad_kg": capacidades[tipos[t]]}
+            for i, t in enumerate(asignados)
+        }
+
+    # ------------------------------------------------------------------
+    # Demanda
+    # ------------------------------------------------------------------
+    def factor_estacional(self, dia, escenario="normal"):
+        factor = 1.0 + self.amplitud_estacional * math.sin(2 * math.pi * dia / self.periodo_estacional)
+        if escenario == "demanda_estacional" and dia in DIAS_PICO_ESTACIONAL:
+            factor *= 2.0
+        return factor
+
+    def generar_demanda_diaria(self, dia, escenario="normal", rng=None):
+        """
+        Pedidos del día con el mismo formato que demanda.generar_demanda_diaria. Las
+        líneas se muestrean vectorizadas (Zipf por inversión de la CDF) con un
+        generador propio por día: la demanda no depende de la semilla de la simulación
+        (`rng`, el generador de la corrida, se acepta por compatibilidad y no se usa).
+        """
+        rng = self._rng(10, dia)
+        n_lineas = max(int(round(self.lineas_por_dia * self.factor_estacional(dia, escenario))), 1)
+
+        # Tamaños de pedido hasta cubrir n_lineas (el último se recorta; n_lineas tamaños siempre alcanzan)
+        lo, hi = self.lineas_por_pedido
+        tamanos = rng.integers(max(lo, 1), max(hi, 1) + 1, n_lineas)
+        fin = np.cumsum(tamanos)
+        n_pedidos = int(np.searchsorted(fin, n_lineas)) + 1
+        tamanos = tamanos[:n_pedidos]
+        tamanos[-1] -= fin[n_pedidos - 1] - n_lineas
+        tamanos = np.minimum(tamanos, self.n_skus)
+        pedido_de_linea = np.repeat(np.arange(n_pedidos), tamanos)
+
+        skus = self._sin_repetir(pedido_de_linea, self._muestrear(self._cdf_skus, rng, len(pedido_de_linea)))
+        cantidades = rng.integers(self.cantidad[0], self.cantidad[1] + 1, len(pedido_de_linea))
+        if escenario == "demanda_estacional" and dia in DIAS_PICO_ESTACIONAL:
+            cantidades = cantidades * 2
+        clientes = self._muestrear(self._cdf_clientes, rng, n_pedidos)
+
+        ids_sku, ids_cliente, zona_cliente = self.ids_sku, self.ids_cliente, self.zona_cliente
+        skus, cantidades, clientes = skus.tolist(), cantidades.tolist(), clientes.tolist()
+        pedidos_dia = []
+        inicio = 0
+        for i, n in enumerate(tamanos.tolist()):
+            c = clientes[i]
+            pedidos_dia.append({
+                "id_pedido": f"P{dia:02d}-{i + 1:03d}",
+                "cliente_id": ids_cliente[c],
+                "zona_id": zona_cliente[c],
+                "items": [{"sku": ids_sku[s], "cantidad": q}
+                          for s, q in zip(skus[inicio:inicio + n], cantidades[inicio:inicio + n])],
+            })
+            inicio += n
+        return pedidos_dia
+
+    @staticmethod
+    def _muestrear(cdf, rng, n):
+        return np.searchsorted(cdf, rng.random(n) * cdf[-1], side='right').clip(max=len(cdf) - 1)
+
+    def _sin_repetir(self, pedido_de_linea, skus):
+        """Reemplaza SKUs repetidos dentro de un pedido por el siguiente SKU libre (como demanda.py)."""
+        skus = skus.copy()
+        while True:
+            clave = pedido_de_linea.astype(np.int64) * self.n_skus + skus
+            _, primera = np.unique(clave, return_index=True)
+            repetidas = np.setdiff1d(np.arange(len(skus)), primera, assume_unique=True)
+            if not len(repetidas):
+                return skus
+            skus[repetidas] = (skus[repetidas] + 1) % self.n_skus
+
+    # ------------------------------------------------------------------
+    # Conexión con la simulación
+    # ------------------------------------------------------------------
+    def catalogos(self):
+        """
+        Catálogos de la carga (SKUs, clientes, zonas, coordenadas de zonas y clientes y flota) con el
+        formato de catalogos.catalogos_simulacion, para pasarlos explícitamente a
+        run_simulation y simular_red. Los catálogos globales no se modifican.
+        """
+        return catalogos.catalogos_simulacion(
+            dic_sku=self.dic_sku, dic_clientes=self.dic_clientes, dic_zonas=self.dic_zonas,
+            dic_coordenadas_zonas=self.dic_coordenadas_zonas,
+            dic_coordenadas_clientes=self.dic_coordenadas_clientes, dic_flota=self.dic_flota)
+
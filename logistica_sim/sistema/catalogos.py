@@ -1,7 +1,8 @@
 """
 Módulo de Catálogos
-Contiene los datos maestros de productos, clientes y vehículos.
+Contiene los datos maestros de productos, clientes, zonas y vehículos.
 """
+import hashlib
 
 # Catálogo de productos (SKU) - MASTER DATA
 # Cada producto tiene configuración completa para simulación ERP
@@ -14,7 +15,8 @@ dic_sku = {
         "costo_unitario": 45.50,
         "precio_venta": 68.25,
         "categoria": "Hidráulica",
-        "peso_kg": 0.5
+        "peso_kg": 0.5,
+        "volumen_m3": 0.002
     },
     "P002": {
         "nombre": "Bomba centrífuga 1HP",
@@ -24,7 +26,8 @@ dic_sku = {
         "costo_unitario": 320.00,
         "precio_venta": 480.00,
         "categoria": "Equipos",
-        "peso_kg": 12.0
+        "peso_kg": 12.0,
+        "volumen_m3": 0.050
     },
     "P003": {
         "nombre": "Válvula de presión 2\"",
@@ -34,7 +37,8 @@ dic_sku = {
         "costo_unitario": 85.75,
         "precio_venta": 128.63,
         "categoria": "Válvulas",
-        "peso_kg": 2.5
+        "peso_kg": 2.5,
+        "volumen_m3": 0.008
     },
     "P004": {
         "nombre": "Kit de sellos",
@@ -44,7 +48,8 @@ dic_sku = {
         "costo_unitario": 25.00,
         "precio_venta": 37.50,
         "categoria": "Accesorios",
-        "peso_kg": 0.1
+        "peso_kg": 0.1,
+        "volumen_m3": 0.001
     },
     "P005": {
         "nombre": "Motor eléctrico 5HP",
@@ -54,82 +59,94 @@ dic_sku = {
         "costo_unitario": 850.00,
         "precio_venta": 1275.00,
         "categoria": "Equipos",
-        "peso_kg": 45.0
+        "peso_kg": 45.0,
+        "volumen_m3": 0.120
     }
 }
 
 # Catálogo de clientes (Empresas Fijas) - MASTER DATA
 # Cartera de 10 clientes clave para análisis de fidelidad y frecuencia
+# 'zona_id': zona de entrega del cliente (sus coordenadas están en dic_coordenadas_clientes)
 dic_clientes = {
     "C01": {
         "nombre": "Industrias Mineras del Sur S.A.",
         "tipo": "Corporativo",
         "frecuencia_compra": "Alta",  # Compra frecuentemente
         "credito_limite": 50000,
-        "probabilidad_espera": 0.95 # Muy alta fidelidad
+        "probabilidad_espera": 0.95, # Muy alta fidelidad
+        "zona_id": "Z02"
     },
     "C02": {
         "nombre": "Constructora Edificar SAC",
         "tipo": "Empresa Mediana",
         "frecuencia_compra": "Media",
         "credito_limite": 25000,
-        "probabilidad_espera": 0.60
+        "probabilidad_espera": 0.60,
+        "zona_id": "Z03"
     },
     "C03": {
         "nombre": "Agroexportadora Frutas del Norte",
         "tipo": "Empresa Grande",
         "frecuencia_compra": "Alta",
         "credito_limite": 40000,
-        "probabilidad_espera": 0.85
+        "probabilidad_espera": 0.85,
+        "zona_id": "Z01"
     },
     "C04": {
         "nombre": "Manufacturas Textiles Unidos",
         "tipo": "Empresa Mediana",
         "frecuencia_compra": "Media",
         "credito_limite": 20000,
-        "probabilidad_espera": 0.60
+        "probabilidad_espera": 0.60,
+        "zona_id": "Z03"
     },
     "C05": {
         "nombre": "Servicios Logísticos Express",
         "tipo": "Empresa Grande",
         "frecuencia_compra": "Muy Alta",
         "credito_limite": 60000,
-        "probabilidad_espera": 0.90
+        "probabilidad_espera": 0.90,
+        "zona_id": "Z05"
     },
     "C06": {
         "nombre": "Pesquera del Pacífico S.A.",
         "tipo": "Corporativo",
         "frecuencia_compra": "Alta",
         "credito_limite": 45000,
-        "probabilidad_espera": 0.95
+        "probabilidad_espera": 0.95,
+        "zona_id": "Z04"
     },
     "C07": {
         "nombre": "Plásticos Industriales SAC",
         "tipo": "Empresa Pequeña",
         "frecuencia_compra": "Baja",
         "credito_limite": 10000,
-        "probabilidad_espera": 0.30 # Baja fidelidad, compra donde haya
+        "probabilidad_espera": 0.30, # Baja fidelidad, compra donde haya
+        "zona_id": "Z05"
     },
     "C08": {
         "nombre": "Metalmecánica Precision EIRL",
         "tipo": "Empresa Pequeña",
         "frecuencia_compra": "Baja",
         "credito_limite": 8000,
-        "probabilidad_espera": 0.30
+        "probabilidad_espera": 0.30,
+        "zona_id": "Z02"
     },
     "C09": {
         "nombre": "Químicos y Solventes del Perú",
         "tipo": "Empresa Mediana",
         "frecuencia_compra": "Media",
         "credito_limite": 30000,
-        "probabilidad_espera": 0.60
+        "probabilidad_espera": 0.60,
+        "zona_id": "Z04"
     },
     "C10": {
         "nombre": "Transportes Carga Pesada SAC",
         "tipo": "Empresa Grande",
         "frecuencia_compra": "Alta",
         "credito_limite": 35000,
-        "probabilidad_espera": 0.80
+        "probabilidad_espera": 0.80,
+        "zona_id": "Z01"
     }
 }
 
@@ -150,9 +167,101 @@ dic_zonas = {
     "Z05": "Zona Oeste"
 }
 
+# Coordenadas planas (km) respecto al almacén central, para la matriz de distancias
+COORDENADAS_ALMACEN = (0.0, 0.0)
+
+dic_coordenadas_zonas = {
+    "Z01": (2.0, 24.0),    # Norte
+    "Z02": (-3.0, -27.0),  # Sur
+    "Z03": (4.0, 6.0),     # Centro
+    "Z04": (26.0, 3.0),    # Este
+    "Z05": (-21.0, 5.0)    # Oeste
+}
+
+# Coordenadas planas (km) de cada cliente, dentro de su zona de entrega
+dic_coordenadas_clientes = {
+    "C01": (-5.0, -29.5),
+    "C02": (3.0, 4.5),
+    "C03": (0.5, 22.0),
+    "C04": (6.5, 7.0),
+    "C05": (-19.0, 3.0),
+    "C06": (28.0, 5.5),
+    "C07": (-23.5, 7.0),
+    "C08": (-1.0, -25.0),
+    "C09": (24.0, 0.5),
+    "C10": (4.0, 26.5)
+}
+
+# Factor de circuito: relación entre distancia vial y distancia en línea recta
+FACTOR_CIRCUITO = 1.3
+
 # Catálogo de vehículos
 dic_vehiculos = {
     "V01": {"capacidad": 100, "costo_km": 4.5},
     "V02": {"capacidad": 120, "costo_km": 5.0},
     "V03": {"capacidad": 80, "costo_km": 3.8}
 }
+
+# Tipos de vehículo de la flota: vehículo de referencia en dic_vehiculos (costo por km) y capacidad
+dic_tipos_vehiculo = {
+    "Camión 5Ton": {"vehiculo": "V01", "capacidad_kg": 5000},
+    "Camión 10Ton": {"vehiculo": "V02", "capacidad_kg": 10000},
+    "Furgoneta 1Ton": {"vehiculo": "V03", "capacidad_kg": 1000}
+}
+
+# Flota propia (vehículos de GestionTransporte); 'tipo' debe existir en dic_tipos_vehiculo
+dic_flota = {
+    "V-001": {"tipo": "Camión 5Ton", "capacidad_kg": 5000},
+    "V-002": {"tipo": "Camión 5Ton", "capacidad_kg": 5000},
+    "V-003": {"tipo": "Camión 10Ton", "capacidad_kg": 10000},
+    "V-004": {"tipo": "Furgoneta 1Ton", "capacidad_kg": 1000},
+    "V-005": {"tipo": "Camión 5Ton", "capacidad_kg": 5000}
+}
+
+# Red de almacenes (centros de distribución) para la simulación multi-almacén (ver red.py)
+# 'flota': IDs de dic_flota asignados al almacén
+dic_almacenes = {
+    "A01": {"nombre": "CD Central", "coordenadas": (0.0, 0.0), "flota": ["V-001", "V-003", "V-004"]},
+    "A02": {"nombre": "CD Norte", "coordenadas": (3.0, 18.0), "flota": ["V-002", "V-005"]}
+}
+
+
+# Catálogos que consume una corrida de simulación (reemplazables por corrida, ver catalogos_simulacion)
+CATALOGOS_SIMULACION = ('dic_sku', 'dic_clientes', 'dic_zonas', 'dic_coordenadas_zonas',
+                        'dic_coordenadas_clientes', 'dic_flota')
+
+
+def costo_km_tipo(tipo):
+    """Costo por km de un tipo de vehículo de la flota (vía su vehículo de referencia en dic_vehiculos)."""
+    if tipo not in dic_tipos_vehiculo:
+        raise ValueError(f"Tipo de vehículo desconocido: {tipo}. Opciones: {list(dic_tipos_vehiculo)}")
+    return dic_vehiculos[dic_tipos_vehiculo[tipo]['vehiculo']]['costo_km']
+
+
+def catalogos_simulacion(**reemplazos):
+    """
+    Catálogos de una corrida como {nombre: diccionario}: los del módulo, salvo los
+    indicados en `reemplazos` (p. ej. dic_sku=...). run_simulation y los gestores
+    los reciben explícitamente, sin modificar los diccionarios globales.
+    """
+    desconocidos = set(reemplazos) - set(CATALOGOS_SIMULACION)
+    if desconocidos:
+        raise ValueError(f"Catálogos desconocidos: {sorted(desconocidos)}. Opciones: {list(CATALOGOS_SIMULACION)}")
+    actuales = {'dic_sku': dic_sku, 'dic_clientes': dic_clientes, 'dic_zonas': dic_zonas,
+                'dic_coordenadas_zonas': dic_coordenadas_zonas,
+                'dic_coordenadas_clientes': dic_coordenadas_clientes, 'dic_flota': dic_flota}
+    actuales.update(reemplazos)
+    return actuales
+
+
+def version_catalogos(catalogos=None):
+    """
+    Huella corta del contenido actual de los catálogos. Cambia si se edita cualquier
+    dato maestro, por lo que sirve como parte de la clave de resultados cacheados.
+    catalogos: catálogos de una corrida (catalogos_simulacion); por defecto los del módulo.
+    """
+    c = catalogos_simulacion() if catalogos is None else catalogos
+    contenido = repr((c['dic_sku'], c['dic_clientes'], FRECUENCIA_PESOS, c['dic_zonas'], COORDENADAS_ALMACEN,
+                      c['dic_coordenadas_zonas'], c['dic_coordenadas_clientes'], FACTOR_CIRCUITO,
+                      dic_vehiculos, dic_tipos_vehiculo, c['dic_flota'], dic_almacenes))
+    return hashlib.sha1(contenido.encode()).hexdigest()[:12]
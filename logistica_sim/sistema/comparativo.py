@@ -0,0 +1,140 @@
+"""
+Módulo de Reporte Comparativo
+Compara varios escenarios (o réplicas) a partir de resúmenes compactos: cada
+simulación se ejecuta y se resume en un proceso de trabajo, y solo el resumen
+(KPIs globales, alertas condensadas, días pico, inventario final) vuelve al
+proceso principal. Con esos resúmenes se arma la tabla de deltas contra un
+escenario base y un PDF con una sección por escenario.
+"""
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from . import reporte
+from .red import METODO_INICIO
+
+ESCENARIOS = ("normal", "proveedor_lento", "demanda_estacional", "lote_economico")
+
+# (clave en kpis_globales / resumen, etiqueta, mayor es mejor)
+KPIS_COMPARADOS = (
+    ('otif_global', 'OTIF (%)', True),
+    ('fill_rate_global', 'Fill Rate (%)', True),
+    ('backlog_rate_global', 'Backlog Rate (%)', False),
+    ('utilizacion_flota_promedio', 'Utilizacion Flota (%)', True),
+    ('unidades_perdidas', 'Unidades Perdidas', False),
+    ('valor_total_inventario', 'Valor Inventario (S/)', False),
+)
+
+
+def resumir_escenario(resultados, nombre=None):
+    """Resumen compacto de un resultado de run_simulation (entradas del reporte + nombre)."""
+    resumen = reporte.preparar_datos_reporte(resultados)
+    resumen['nombre'] = nombre or resultados['config']['escenario']
+    return resumen
+
+
+def _simular_y_resumir(tarea):
+    """Trabajo de cada proceso: simula, resume y descarta el resultado completo."""
+    from main import run_simulation  # Import diferido: main depende de este paquete
+
+    nombre, escenario, n_dias, capacidad_picking, estrategia_empaque, semilla = tarea
+    resultados = run_simulation(n_dias, capacidad_picking, escenario, estrategia_empaque, semilla)
+    return resumir_escenario(resultados, nombre)
+
+
+def simular_escenarios(escenarios=ESCENARIOS, n_dias=30, capacidad_picking=1500, estrategia_empaque="ffd",
+                       replicas=1, semilla=None, procesos=None, metodo_inicio=METODO_INICIO):
+    """
+    Ejecuta cada escenario (y réplica) en un proceso y retorna la lista de resúmenes en orden.
+    Con `replicas` > 1 cada réplica usa la semilla `semilla + i` (o una aleatoria).
+    procesos=1 ejecuta todo en el proceso actual. Los procesos se inician con
+    `metodo_inicio` ('spawn' por defecto, como red.py): hacer fork del servidor
+    multihilo de Streamlit puede copiar locks tomados por otros hilos.
+    """
+    tareas = []
+    for escenario in escenarios:
+        for r in range(replicas):
+            nombre = escenario if replicas == 1 else f"{escenario} (r{r + 1})"
+            if semilla is not None:
+                semilla_tarea = semilla + r
+            else:
+                semilla_tarea = random.randrange(2**32) if replicas > 1 else None
+            tareas.append((nombre, escenario, n_dias, capacidad_picking, estrategia_empaque, semilla_tarea))
+
+    if procesos == 1:
+        return [_simular_y_resumir(t) for t in tareas]
+
+    contexto = multiprocessing.get_context(metodo_inicio)
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as ejecutor:
+        return list(ejecutor.map(_simular_y_resumir, tareas))
+
+
+def tabla_comparativa(resumenes, base=0):
+    """
+    DataFrame con un escenario por fila, los KPIs comparados y sus deltas contra
+    el resumen `base` (índice o nombre).
+    """
+    filas = []
+    for resumen in resumenes:
+        fila = {'Escenario': resumen['nombre']}
+        for clave, etiqueta, _ in KPIS_COMPARADOS:
+            fila[etiqueta] = float(resumen['kpis_globales'].get(clave, resumen.get(clave, 0.0)))
+        filas.append(fila)
+    df = pd.DataFrame(filas).set_index('Escenario')
+
+    fila_base = df.loc[base] if isinstance(base, str) else df.iloc[base]
+    for _, etiqueta, _ in KPIS_COMPARADOS:
+        df[f"Delta {etiqueta}"] = (df[etiqueta] - fila_base[etiqueta]).round(2)
+    return df
+
+
+def generar_pdf_comparativo(resumenes, base=0):
+    """
+    PDF con la tabla comparativa (valor y delta contra la base) seguida de una
+    sección por escenario. Retorna los bytes del documento.
+    """
+    df = tabla_comparativa(resumenes, base)
+    nombre_base = df.index[base] if not isinstance(base, str) else base
+
+    pdf = reporte.PDFReport()
+    pdf.add_page()
+    pdf.chapter_title("Comparativo de Escenarios")
+    pdf.chapter_body(f"Escenarios comparados: {len(resumenes)}. Base: {nombre_base}.")
+
+    # Tabla: KPIs en filas, escenarios en columnas (bloques de 4 escenarios por ancho de página)
+    for inicio in range(0, len(df), 4):
+        bloque = df.iloc[inicio:inicio + 4]
+        ancho_col = 130 / max(len(bloque), 1)
+        pdf.set_font('Arial', 'B', 8)
+        pdf.cell(50, 7, 'Indicador', 1)
+        for nombre in bloque.index:
+            pdf.cell(ancho_col, 7, reporte._recortar(nombre, 22), 1)
+        pdf.ln()
+        pdf.set_font('Arial', '', 8)
+        for clave, etiqueta, mayor_mejor in KPIS_COMPARADOS:
+            pdf.cell(50, 7, etiqueta, 1)
+            for nombre, fila in bloque.iterrows():
+                delta = fila[f"Delta {etiqueta}"]
+                texto = f"{fila[etiqueta]:,.1f}"
+                if nombre != nombre_base:
+                    texto += f" ({delta:+,.1f})"
+                pdf.cell(ancho_col, 7, texto, 1)
+            pdf.ln()
+        pdf.ln(4)
+
+    # Mejor escenario por KPI
+    lineas = []
+    for _, etiqueta, mayor_mejor in KPIS_COMPARADOS:
+        mejor = df[etiqueta].idxmax() if mayor_mejor else df[etiqueta].idxmin()
+        lineas.append(f"- {etiqueta}: mejor en {mejor} ({df.loc[mejor, etiqueta]:,.1f})")
+    pdf.chapter_body("\n".join(lineas))
+
+    # Secciones por escenario
+    for resumen in resumenes:
+        pdf.add_page()
+        pdf.chapter_title(f"Escenario: {resumen['nombre']}")
+        reporte.agregar_secciones(pdf, resumen)
+
+    return pdf.output(dest='S').encode('latin-1')
@@ -0,0 +1,112 @@
+"""
+Módulo de Consultas sobre Tablas de Resultados
+Índices por columna (valor -> posiciones de fila) para filtrar las tablas grandes
+del tablero sin recorrerlas completas, paginar por desplazamiento y buscar IDs
+por prefijo. Cada interacción de la interfaz serializa solo una página.
+"""
+import numpy as np
+import pandas as pd
+
+TAMANO_PAGINA = 50
+MAX_SUGERENCIAS = 20
+
+# Columnas indexadas por tabla de resultados
+COLUMNAS_INDICE = {
+    'df_pedidos': ('Fecha', 'Cliente', 'Zona_ID', 'Estado', 'ID_Pedido'),
+    'df_lineas_pedido': ('ID_Pedido', 'SKU'),
+    'df_kardex': ('Fecha', 'Producto', 'Tipo_Movimiento'),
+    'df_compras': ('Fecha_Creacion', 'Producto', 'Estado'),
+    'df_despachos': ('Fecha_Salida', 'ID_Vehiculo', 'Destino', 'ID_Despacho'),
+    'df_lineas_despacho': ('ID_Pedido', 'ID_Despacho'),
+    'ventas_perdidas': ('Fecha', 'Producto', 'Pedido_ID'),
+    'historial_backlog': ('Fecha_Ingreso', 'Producto', 'Cliente', 'ID_Pedido'),
+}
+
+
+class IndiceColumna:
+    """
+    Índice invertido de una columna: los valores distintos ordenados y, para
+    cada uno, el rango de posiciones de fila (en orden original) que lo contienen.
+    """
+
+    def __init__(self, serie):
+        codigos, valores = pd.factorize(serie, sort=True)
+        self.valores = pd.Index(valores)
+        # Orden estable: dentro de cada valor las posiciones quedan crecientes
+        self.posiciones = np.argsort(codigos, kind='stable').astype(np.int64)
+        codigos_ordenados = codigos[self.posiciones]
+        self.limites = np.searchsorted(codigos_ordenados, np.arange(len(valores) + 1))
+        self._texto = None
+
+    def buscar(self, valores):
+        """Posiciones (ordenadas) de las filas cuyo valor está en `valores`."""
+        codigos = self.valores.get_indexer(pd.Index(list(valores)))
+        bloques = [self.posiciones[self.limites[c]:self.limites[c + 1]] for c in np.unique(codigos[codigos >= 0])]
+        if not bloques:
+            return np.empty(0, dtype=np.int64)
+        return bloques[0] if len(bloques) == 1 else np.sort(np.concatenate(bloques))
+
+    def con_prefijo(self, prefijo, limite=MAX_SUGERENCIAS):
+        """Valores distintos que empiezan con `prefijo` (búsqueda binaria sobre los valores ordenados)."""
+        if self._texto is None:
+            self._texto = self.valores.astype(str)
+        valores = self._texto
+        inicio = valores.searchsorted(prefijo, side='left')
+        fin = valores.searchsorted(prefijo + '\uffff', side='left')
+        return valores[inicio:min(fin, inicio + limite)].tolist()
+
+
+class TablaIndexada:
+    """DataFrame con índices por columna para filtrar, paginar y buscar."""
+
+    def __init__(self, df, columnas=()):
+        self.df = df
+        self.indices = {col: IndiceColumna(df[col]) for col in columnas if col in df.columns}
+
+    def __len__(self):
+        return len(self.df)
+
+    def filtrar(self, **filtros):
+        """
+        Posiciones de las filas que cumplen todos los filtros (columna=valor o
+        lista de valores; None se ignora). Las columnas deben estar indexadas.
+        """
+        resultado = None
+        for col, valores in filtros.items():
+            if valores is None:
+                continue
+            if col not in self.indices:
+                raise ValueError(f"Columna '{col}' no indexada. Use: {', '.join(self.indices)}")
+            if isinstance(valores, (str, int, np.integer)):
+                valores = [valores]
+            posiciones = self.indices[col].buscar(valores)
+            resultado = posiciones if resultado is None else np.intersect1d(resultado, posiciones, assume_unique=True)
+        return np.arange(len(self.df), dtype=np.int64) if resultado is None else resultado
+
+    def pagina(self, posiciones, numero=1, tamano=TAMANO_PAGINA):
+        """Filas de la página `numero` (desde 1) de las posiciones filtradas."""
+        inicio = (max(int(numero), 1) - 1) * tamano
+        return self.df.iloc[posiciones[inicio:inicio + tamano]]
+
+    def valores(self, col):
+        """Valores distintos (ordenados) de una columna indexada, para los filtros de la interfaz."""
+        return self.indices[col].valores.tolist()
+
+    def buscar_ids(self, col, prefijo, limite=MAX_SUGERENCIAS):
+        """IDs de la columna que empiezan con `prefijo` (sin distinguir mayúsculas)."""
+        return self.indices[col].con_prefijo(prefijo.strip().upper(), limite)
+
+
+def indexar(resultados, nombre):
+    """TablaIndexada de la tabla `nombre` de resultados con sus COLUMNAS_INDICE."""
+    return TablaIndexada(resultados[nombre], COLUMNAS_INDICE.get(nombre, ()))
+
+
+def n_paginas(n_filas, tamano=TAMANO_PAGINA):
+    return max(-(-n_filas // tamano), 1)
+
+
+def pedidos_con_sku(tabla_lineas, skus):
+    """IDs de los pedidos que contienen alguno de los SKUs (vía la tabla de líneas), para filtrar df_pedidos."""
+    lineas = tabla_lineas.df.iloc[tabla_lineas.filtrar(SKU=skus)]
+    return lineas['ID_Pedido'].astype(str).unique().tolist()
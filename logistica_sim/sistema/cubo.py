@@ -0,0 +1,190 @@
+"""
+Módulo de Cubo de KPIs
+Agregados precalculados por día × SKU × cliente × zona (unidades solicitadas,
+entregadas, perdidas y en backlog; líneas y pedidos). Se construye una vez al
+final de la simulación y guarda solo las celdas con datos (formato disperso de
+coordenadas), por lo que cualquier corte o consolidación del tablero es un
+filtro + bincount sobre arrays, sin volver a recorrer las tablas originales.
+"""
+import numpy as np
+import pandas as pd
+
+DIMENSIONES = ('dia', 'sku', 'cliente', 'zona')
+MEDIDAS = ('unidades_solicitadas', 'unidades_entregadas', 'unidades_perdidas',
+           'unidades_backlog', 'lineas', 'pedidos')
+
+# Consolidaciones con más celdas que este límite usan np.unique en lugar de bincount denso
+LIMITE_CELDAS_DENSO = 5_000_000
+
+
+class CuboKPIs:
+    """
+    Cubo disperso: `codigos[dim]` (int32 por celda), `categorias[dim]` (pd.Index con
+    los valores de cada código) y `medidas[medida]` (float64 por celda).
+    La medida 'pedidos' se asigna a la primera línea de cada pedido: es exacta al
+    consolidar sin la dimensión SKU; al agrupar o filtrar por SKU se reporta el
+    número de pedidos que contienen el SKU (= líneas, un SKU aparece una vez por pedido).
+    """
+
+    def __init__(self, codigos, categorias, medidas):
+        self.codigos = codigos
+        self.categorias = categorias
+        self.medidas = medidas
+
+    @property
+    def n_celdas(self):
+        return len(next(iter(self.medidas.values()))) if self.medidas else 0
+
+    @classmethod
+    def construir(cls, df_pedidos, df_lineas_pedido, df_ventas_perdidas=None, df_historial_backlog=None):
+        """
+        Construye el cubo a partir de las tablas de run_simulation (cabecera de pedidos
+        y su tabla hija de líneas). Las unidades perdidas y en backlog se ubican en el
+        día del evento y heredan cliente y zona del pedido que las originó.
+        """
+        lineas = _lineas_pedido(df_pedidos, df_lineas_pedido)
+        ids_pedido = df_pedidos['ID_Pedido'].astype(str)
+        pedido_a_cliente = dict(zip(ids_pedido, df_pedidos['Cliente'].astype(str)))
+        pedido_a_zona = dict(zip(ids_pedido, df_pedidos['Zona_ID'].astype(str)))
+
+        partes = [lineas]
+        if df_ventas_perdidas is not None and len(df_ventas_perdidas):
+            partes.append(_eventos(df_ventas_perdidas, 'Fecha', 'Pedido_ID', 'Cantidad_Perdida',
+                                   'unidades_perdidas', pedido_a_cliente, pedido_a_zona))
+        if df_historial_backlog is not None and len(df_historial_backlog):
+            ingresos = df_historial_backlog
+            if 'Estado' in ingresos.columns:
+                ingresos = ingresos[ingresos['Estado'] == 'Ingresado a Backlog']
+            partes.append(_eventos(ingresos, 'Fecha_Ingreso', 'ID_Pedido', 'Cantidad_Pendiente',
+                                   'unidades_backlog', pedido_a_cliente, pedido_a_zona))
+
+        df = pd.concat(partes, ignore_index=True)
+        for medida in MEDIDAS:
+            df[medida] = df[medida].fillna(0.0) if medida in df.columns else 0.0
+
+        # Consolidar filas con las mismas coordenadas (una celda por combinación)
+        codigos, categorias = {}, {}
+        for dim in DIMENSIONES:
+            cod, cat = pd.factorize(df[dim], sort=True)
+            codigos[dim] = cod.astype(np.int32)
+            categorias[dim] = pd.Index(cat, name=dim)
+
+        clave = _clave_lineal(codigos, categorias, DIMENSIONES, len(df))
+        unicas, inversa = np.unique(clave, return_inverse=True)
+        coords = np.unravel_index(unicas, [len(categorias[d]) for d in DIMENSIONES])
+        codigos = {dim: coords[i].astype(np.int32) for i, dim in enumerate(DIMENSIONES)}
+        medidas = {m: np.bincount(inversa, weights=df[m].to_numpy(dtype=float), minlength=len(unicas))
+                   for m in MEDIDAS}
+
+        return cls(codigos, categorias, medidas)
+
+    def cortar(self, **filtros):
+        """
+        Retorna un sub-cubo con las celdas que cumplen los filtros,
+        p. ej. cortar(dia=range(1, 8), zona='Z01').
+        """
+        mascara = self._mascara(filtros)
+        return CuboKPIs(
+            {d: c[mascara] for d, c in self.codigos.items()},
+            self.categorias,
+            {m: v[mascara] for m, v in self.medidas.items()}
+        )
+
+    def consolidar(self, por=('dia',), **filtros):
+        """
+        Suma las medidas agrupando por las dimensiones de `por` (las demás se consolidan).
+        Agrega fill_rate (%) por grupo. Con `por=()` retorna el total en una fila.
+        """
+        por = (por,) if isinstance(por, str) else tuple(por)
+        for dim in por:
+            if dim not in DIMENSIONES:
+                raise ValueError(f"Dimensión '{dim}' no válida. Use: {', '.join(DIMENSIONES)}")
+
+        mascara = self._mascara(filtros)
+        tamanos = [len(self.categorias[d]) for d in por]
+        clave = _clave_lineal({d: self.codigos[d][mascara] for d in por}, self.categorias, por, int(mascara.sum()))
+
+        if np.prod(tamanos, dtype=np.float64) <= LIMITE_CELDAS_DENSO:
+            total_celdas = int(np.prod(tamanos, dtype=np.int64))
+            conteo = np.bincount(clave, minlength=total_celdas)
+            grupos = np.flatnonzero(conteo)
+            sumas = {m: np.bincount(clave, weights=v[mascara], minlength=total_celdas)[grupos]
+                     for m, v in self.medidas.items()}
+        else:
+            grupos, inversa = np.unique(clave, return_inverse=True)
+            sumas = {m: np.bincount(inversa, weights=v[mascara], minlength=len(grupos))
+                     for m, v in self.medidas.items()}
+
+        if 'sku' in por or filtros.get('sku') is not None:
+            sumas['pedidos'] = sumas['lineas']
+
+        if por:
+            coords = np.unravel_index(grupos, tamanos)
+            niveles = [self.categorias[d][coords[i]] for i, d in enumerate(por)]
+            indice = pd.MultiIndex.from_arrays(niveles) if len(por) > 1 else niveles[0]
+        else:
+            indice = pd.RangeIndex(len(grupos))
+
+        df = pd.DataFrame(sumas, index=indice)
+        for medida in MEDIDAS:
+            df[medida] = df[medida].round().astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['fill_rate'] = np.where(
+                df['unidades_solicitadas'] > 0,
+                (df['unidades_entregadas'] / df['unidades_solicitadas'] * 100).round(2),
+                100.0
+            )
+        return df
+
+    def _mascara(self, filtros):
+        mascara = np.ones(self.n_celdas, dtype=bool)
+        for dim, valores in filtros.items():
+            if dim not in DIMENSIONES:
+                raise ValueError(f"Dimensión '{dim}' no válida. Use: {', '.join(DIMENSIONES)}")
+            if valores is None:
+                continue
+            if isinstance(valores, (str, int, np.integer)):
+                valores = [valores]
+            # Filtrar en el espacio de códigos (una comparación por celda)
+            codigos_validos = self.categorias[dim].get_indexer(pd.Index(list(valores)))
+            codigos_validos = codigos_validos[codigos_validos >= 0]
+            mascara &= np.isin(self.codigos[dim], codigos_validos)
+        return mascara
+
+
+def _clave_lineal(codigos, categorias, dims, n):
+    """Código lineal (row-major) de las dimensiones `dims` para n celdas."""
+    clave = np.zeros(n, dtype=np.int64)
+    for dim in dims:
+        clave = clave * len(categorias[dim]) + codigos[dim]
+    return clave
+
+
+def _lineas_pedido(df_pedidos, df_lineas_pedido):
+    """Una fila por línea (pedido, SKU) con día, cliente y zona de la cabecera (join por posición)."""
+    ids_lineas = df_lineas_pedido['ID_Pedido'].astype(str)
+    posiciones = pd.Index(df_pedidos['ID_Pedido'].astype(str)).get_indexer(ids_lineas)
+
+    return pd.DataFrame({
+        'dia': df_pedidos['Fecha'].to_numpy(dtype=np.int64)[posiciones],
+        'sku': df_lineas_pedido['SKU'].astype(str).to_numpy(),
+        'cliente': df_pedidos['Cliente'].astype(str).to_numpy()[posiciones],
+        'zona': df_pedidos['Zona_ID'].astype(str).to_numpy()[posiciones],
+        'unidades_solicitadas': df_lineas_pedido['Cant_Solicitada'].to_numpy(dtype=float),
+        'unidades_entregadas': df_lineas_pedido['Cant_Entregada'].to_numpy(dtype=float),
+        'lineas': 1.0,
+        # Primera línea de cada pedido (los pedidos se cuentan una sola vez)
+        'pedidos': (~ids_lineas.duplicated()).to_numpy(dtype=float)
+    })
+
+
+def _eventos(df, col_fecha, col_pedido, col_cantidad, medida, pedido_a_cliente, pedido_a_zona):
+    """Eventos por (día, pedido, SKU) con cliente y zona del pedido de origen."""
+    pedidos = df[col_pedido]
+    return pd.DataFrame({
+        'dia': df[col_fecha].to_numpy(dtype=np.int64),
+        'sku': df['Producto'].astype(str).to_numpy(),
+        'cliente': pedidos.astype(str).map(pedido_a_cliente).fillna('Sin Cliente').astype(str).to_numpy(),
+        'zona': pedidos.astype(str).map(pedido_a_zona).fillna('General').astype(str).to_numpy(),
+        medida: df[col_cantidad].to_numpy(dtype=float)
+    })
@@ -3,48 +3,58 @@ Módulo de Demanda
 Simula la llegada de pedidos diarios usando clientes fijos con frecuencias de compra.
 """
 import random
-from .catalogos import dic_clientes, FRECUENCIA_PESOS
+from .catalogos import FRECUENCIA_PESOS, catalogos_simulacion
 
-def generar_demanda_diaria(dia, escenario="normal"):
+# Rango (mínimo, máximo) de pedidos base por día
+PEDIDOS_POR_DIA = (10, 15)
+DIAS_PICO_ESTACIONAL = range(15, 21)  # Días con demanda duplicada en 'demanda_estacional'
+
+def generar_demanda_diaria(dia, escenario="normal", rng=None, catalogos=None):
     """
     Genera la lista de pedidos para un día específico.
+    rng: generador (random.Random) de la corrida; por defecto el generador global del módulo random.
+    catalogos: catálogos de la corrida (clientes, zonas y SKUs; ver catalogos.catalogos_simulacion);
+    por defecto los del módulo catalogos.
     """
-    from .catalogos import dic_sku, dic_zonas
+    rng = random if rng is None else rng
+    catalogos = catalogos_simulacion() if catalogos is None else catalogos
+    dic_sku, dic_zonas = catalogos['dic_sku'], catalogos['dic_zonas']
     
     # Preparar lista de clientes ponderada por frecuencia
     clientes_ponderados = []
-    for cliente_id, info in dic_clientes.items():
+    for cliente_id, info in catalogos['dic_clientes'].items():
         frecuencia = info["frecuencia_compra"]
         peso = FRECUENCIA_PESOS.get(frecuencia, 1)
         clientes_ponderados.extend([cliente_id] * peso)
         
     # Aplicar multiplicador según escenario
     multiplicador_demanda = 1.0
-    if escenario == "demanda_estacional" and 15 <= dia <= 20:
+    if escenario == "demanda_estacional" and dia in DIAS_PICO_ESTACIONAL:
         multiplicador_demanda = 2.0  # Black Friday effect
     
     # Base de pedidos por día (ajustado por escenario)
-    n_pedidos_base = random.randint(10, 15)
+    n_pedidos_base = rng.randint(*PEDIDOS_POR_DIA)
     n_pedidos = int(n_pedidos_base * multiplicador_demanda)
     
     pedidos_dia = []
     
     for i in range(n_pedidos):
         # Seleccionar cliente usando la lista ponderada
-        cliente_id = random.choice(clientes_ponderados)
-        zona_id = random.choice(list(dic_zonas.keys()))
+        cliente_id = rng.choice(clientes_ponderados)
+        # Zona de entrega del cliente; clientes sin zona asignada reciben una al azar
+        zona_id = catalogos['dic_clientes'][cliente_id].get('zona_id') or rng.choice(list(dic_zonas.keys()))
         
         # Generar líneas de pedido (1 a 3 productos por pedido para variedad)
-        n_lineas = random.randint(1, 3)
+        n_lineas = rng.randint(1, 3)
         items = []
         skus_disponibles = list(dic_sku.keys())
         
         # Evitar repetir SKU en el mismo pedido
-        skus_seleccionados = random.sample(skus_disponibles, min(n_lineas, len(skus_disponibles)))
+        skus_seleccionados = rng.sample(skus_disponibles, min(n_lineas, len(skus_disponibles)))
         
         for sku in skus_seleccionados:
             # Cantidad base ajustada por escenario
-            cantidad_base = random.randint(5, 50)
+            cantidad_base = rng.randint(5, 50)
             cantidad = int(cantidad_base * multiplicador_demanda)
             
             items.append({
@@ -0,0 +1,176 @@
+"""
+Módulo de Empaque (Bin-Packing)
+Asigna pedidos a vehículos por peso con estrategias seleccionables:
+- ffd: First-Fit Decreasing por zona (comportamiento histórico).
+- bfd: Best-Fit Decreasing por zona con estructura ordenada de capacidad restante.
+- consolidado: Best-Fit Decreasing multi-zona (un vehículo puede visitar varias zonas).
+"""
+import bisect
+import numpy as np
+
+ESTRATEGIAS_EMPAQUE = ("ffd", "bfd", "consolidado")
+
+
+def _first_fit_decreasing(pesos, capacidades):
+    """
+    Asigna cada pedido (de mayor a menor peso) al primer vehículo donde quepa.
+    Los vehículos deben venir ordenados por capacidad descendente.
+    Retorna (asignacion, cargas): índice de vehículo por pedido (-1 si no cabe) y carga por vehículo.
+    """
+    asignacion = np.full(len(pesos), -1, dtype=np.int64)
+    cargas = np.zeros(len(capacidades), dtype=float)
+
+    for i in np.argsort(-pesos, kind="stable"):
+        cabe = cargas + pesos[i] <= capacidades
+        j = cabe.argmax()
+        if cabe[j]:
+            asignacion[i] = j
+            cargas[j] += pesos[i]
+
+    return asignacion, cargas
+
+
+def _best_fit_decreasing(pesos, capacidades):
+    """
+    Asigna cada pedido (de mayor a menor peso) al vehículo con menor capacidad
+    restante donde quepa. La capacidad restante se mantiene en una lista ordenada
+    de tuplas (restante, vehiculo), por lo que cada búsqueda es O(log V).
+    """
+    asignacion = np.full(len(pesos), -1, dtype=np.int64)
+    cargas = np.zeros(len(capacidades), dtype=float)
+    restantes = sorted((float(c), j) for j, c in enumerate(capacidades))
+
+    for i in np.argsort(-pesos, kind="stable"):
+        peso = float(pesos[i])
+        pos = bisect.bisect_left(restantes, (peso, -1))
+        if pos == len(restantes):
+            continue
+
+        restante, j = restantes.pop(pos)
+        asignacion[i] = j
+        cargas[j] += peso
+        bisect.insort(restantes, (restante - peso, j))
+
+    return asignacion, cargas
+
+
+def empacar(pesos, capacidades, estrategia="ffd"):
+    """
+    Empaca un grupo de pedidos en un conjunto de vehículos.
+
+    Args:
+        pesos: Array con el peso (kg) de cada pedido.
+        capacidades: Array con la capacidad (kg) de cada vehículo.
+        estrategia: 'ffd' o 'bfd' ('consolidado' usa 'bfd' sobre todo el día).
+
+    Returns:
+        (asignacion, cargas) como arrays de NumPy.
+    """
+    pesos = np.asarray(pesos, dtype=float)
+    capacidades = np.asarray(capacidades, dtype=float)
+
+    if estrategia == "ffd":
+        return _first_fit_decreasing(pesos, capacidades)
+    if estrategia in ("bfd", "consolidado"):
+        return _best_fit_decreasing(pesos, capacidades)
+
+    raise ValueError(f"Estrategia de empaque desconocida: {estrategia}. Opciones: {ESTRATEGIAS_EMPAQUE}")
+
+
+def empacar_dia(pesos, zonas, capacidades, estrategia="ffd"):
+    """
+    Empaca los pedidos de un día respetando la regla de zonas del sistema:
+    cada zona usa vehículos aún no utilizados en el día y, si ya no quedan
+    libres, reutiliza toda la flota (segunda vuelta).
+    En modo 'consolidado' todas las zonas se empacan juntas.
+
+    Args:
+        pesos: Array con el peso (kg) de cada pedido.
+        zonas: Secuencia con el ID de zona de cada pedido.
+        capacidades: Array con la capacidad (kg) de cada vehículo.
+        estrategia: Una de ESTRATEGIAS_EMPAQUE.
+
+    Returns:
+        (viajes, sin_asignar):
+        - viajes: lista de dicts {'vehiculo', 'zonas', 'pedidos', 'carga'} con índices
+          de vehículo y de pedido (pedidos en orden de asignación).
+        - sin_asignar: lista de índices de pedidos que no cupieron.
+    """
+    if estrategia not in ESTRATEGIAS_EMPAQUE:
+        raise ValueError(f"Estrategia de empaque desconocida: {estrategia}. Opciones: {ESTRATEGIAS_EMPAQUE}")
+
+    pesos = np.asarray(pesos, dtype=float)
+    capacidades = np.asarray(capacidades, dtype=float)
+
+    # Vehículos grandes primero (orden estable para respetar el orden de la flota)
+    orden_vehiculos = np.argsort(-capacidades, kind="stable")
+
+    # Agrupar pedidos por zona en orden de aparición
+    if estrategia == "consolidado":
+        grupos = {None: np.arange(len(pesos))}
+    else:
+        indices_zona = {}
+        for i, z in enumerate(zonas):
+            indices_zona.setdefault(z, []).append(i)
+        grupos = {z: np.array(idx, dtype=np.int64) for z, idx in indices_zona.items()}
+
+    usados = np.zeros(len(capacidades), dtype=bool)
+    viajes = []
+    sin_asignar = []
+
+    for zona, idx_pedidos in grupos.items():
+        libres = orden_vehiculos[~usados[orden_vehiculos]]
+        if len(libres) == 0:
+            libres = orden_vehiculos  # Fallback: reusar si es absolutamente necesario
+
+        pesos_grupo = pesos[idx_pedidos]
+        asignacion, cargas = empacar(pesos_grupo, capacidades[libres], estrategia)
+
+        # Pedidos en orden de asignación (peso descendente)
+        orden_asignacion = np.argsort(-pesos_grupo, kind="stable")
+        sin_asignar.extend(idx_pedidos[orden_asignacion[asignacion[orden_asignacion] < 0]].tolist())
+
+        # Agrupar por vehículo con un solo sort estable en lugar de filtrar por cada vehículo
+        orden_asignacion = orden_asignacion[asignacion[orden_asignacion] >= 0]
+        vehiculo_de = asignacion[orden_asignacion]
+        orden_asignacion = orden_asignacion[np.argsort(vehiculo_de, kind="stable")]
+        limites = np.searchsorted(np.sort(vehiculo_de), np.arange(len(libres) + 1))
+
+        for k, vid in enumerate(libres):
+            if cargas[k] <= 0:
+                continue
+
+            pedidos_k = idx_pedidos[orden_asignacion[limites[k]:limites[k + 1]]]
+            zonas_k = [zona] if zona is not None else list(dict.fromkeys(zonas[i] for i in pedidos_k))
+
+            viajes.append({
+                'vehiculo': int(vid),
+                'zonas': zonas_k,
+                'pedidos': pedidos_k.tolist(),
+                'carga': cargas[k]
+            })
+            usados[vid] = True
+
+    return viajes, sin_asignar
+
+
+def resumen_utilizacion(viajes, capacidades):
+    """
+    Resume la utilización de los viajes de un día.
+    Retorna promedio simple (% ocupación por viaje) y ponderado (carga total / capacidad usada).
+    """
+    if not viajes:
+        return {'Viajes': 0, 'Peso_Total_kg': 0.0, 'Capacidad_Usada_kg': 0.0,
+                'Utilizacion_Promedio': 0.0, 'Utilizacion_Ponderada': 0.0}
+
+    capacidades = np.asarray(capacidades, dtype=float)
+    cargas = np.array([v['carga'] for v in viajes], dtype=float)
+    caps = capacidades[[v['vehiculo'] for v in viajes]]
+
+    return {
+        'Viajes': len(viajes),
+        'Peso_Total_kg': round(float(cargas.sum()), 2),
+        'Capacidad_Usada_kg': round(float(caps.sum()), 2),
+        'Utilizacion_Promedio': round(float((cargas / caps).mean() * 100), 1),
+        'Utilizacion_Ponderada': round(float(cargas.sum() / caps.sum() * 100), 1)
+    }
@@ -0,0 +1,140 @@
+"""
+Módulo de Esquemas de Tablas
+Define los tipos de cada tabla de resultados de la simulación y construye los
+DataFrames con tipos compactos: categóricos para SKU, cliente, zona, vehículo y
+estados; int32 para días y cantidades; float32 para pesos, volúmenes y
+porcentajes (los montos en soles se mantienen en float64).
+"""
+import pandas as pd
+
+CATEGORIA = 'category'
+TEXTO = 'str'      # IDs únicos por fila (categórico no ahorra memoria)
+ENTERO = 'int32'
+DECIMAL = 'float32'
+MONTO = 'float64'
+
+ESQUEMAS = {
+    'df_pedidos': {
+        'ID_Pedido': TEXTO,
+        'Fecha': ENTERO,
+        'Fecha_Entrega': DECIMAL,  # NaN si no hubo entrega el día del pedido
+        'Cliente': CATEGORIA,
+        'Zona_ID': CATEGORIA,
+        'Zona': CATEGORIA,
+        'N_Lineas': 'int16',
+        'Cant_Solicitada': ENTERO,
+        'Cant_Entregada': ENTERO,
+        'Estado': CATEGORIA,
+    },
+    'df_lineas_pedido': {
+        'ID_Pedido': CATEGORIA,
+        'SKU': CATEGORIA,
+        'Cant_Solicitada': ENTERO,
+        'Cant_Entregada': ENTERO,
+    },
+    'df_kardex': {
+        'Fecha': ENTERO,
+        'Producto': CATEGORIA,
+        'Tipo_Movimiento': CATEGORIA,
+        'Cantidad': ENTERO,
+        'Saldo_Final': ENTERO,
+        'ID_Referencia': CATEGORIA,
+        'Tipo_Referencia': CATEGORIA,
+    },
+    'df_compras': {
+        'ID_Compra': TEXTO,
+        'Fecha_Creacion': ENTERO,
+        'Producto': CATEGORIA,
+        'Cantidad': ENTERO,
+        'Fecha_Arribo': ENTERO,
+        'Estado': CATEGORIA,
+        'Lead_Time_Aplicado': ENTERO,
+    },
+    'df_despachos': {
+        'ID_Despacho': TEXTO,
+        'Fecha_Salida': ENTERO,
+        'Hora_Salida': CATEGORIA,
+        'Hora_Retorno': CATEGORIA,
+        'Destino': CATEGORIA,
+        'ID_Vehiculo': CATEGORIA,
+        'Tipo_Vehiculo': CATEGORIA,
+        'Peso_Total_Carga_kg': DECIMAL,
+        'Volumen_Total_m3': DECIMAL,
+        'Capacidad_Max_kg': ENTERO,
+        'Porcentaje_Ocupacion': DECIMAL,
+        'Distancia_km': DECIMAL,
+        'Costo_Viaje': MONTO,
+        'Cant_Pedidos': ENTERO,
+    },
+    'df_lineas_despacho': {
+        'ID_Despacho': CATEGORIA,
+        'ID_Pedido': CATEGORIA,
+        'Peso_kg': DECIMAL,
+    },
+    'df_utilizacion': {
+        'Fecha': ENTERO,
+        'Estrategia': CATEGORIA,
+        'Viajes': ENTERO,
+        'Peso_Total_kg': DECIMAL,
+        'Capacidad_Usada_kg': DECIMAL,
+        'Utilizacion_Promedio': DECIMAL,
+        'Utilizacion_Ponderada': DECIMAL,
+        'Pedidos_Sin_Asignar': ENTERO,
+        'Pedidos_Arrastrados': ENTERO,
+    },
+    'ventas_perdidas': {
+        'Fecha': ENTERO,
+        'Pedido_ID': TEXTO,
+        'Producto': CATEGORIA,
+        'Cantidad_Solicitada': ENTERO,
+        'Cantidad_Atendida': ENTERO,
+        'Cantidad_Perdida': ENTERO,
+        'Motivo': CATEGORIA,
+    },
+    'historial_backlog': {
+        'Fecha_Ingreso': ENTERO,
+        'Cliente': CATEGORIA,
+        'ID_Pedido': TEXTO,
+        'Producto': CATEGORIA,
+        'Cantidad_Pendiente': ENTERO,
+        'Probabilidad_Espera': DECIMAL,
+        'Estado': CATEGORIA,
+    },
+    'df_transferencias': {
+        'ID_Transferencia': TEXTO,
+        'Fecha_Creacion': ENTERO,
+        'Origen': CATEGORIA,
+        'Destino': CATEGORIA,
+        'Producto': CATEGORIA,
+        'Cantidad_Solicitada': ENTERO,
+        'Cantidad': ENTERO,
+        'Fecha_Arribo': ENTERO,
+        'Motivo': CATEGORIA,
+    },
+}
+
+
+def construir_tabla(nombre, datos):
+    """
+    Construye la tabla `nombre` desde registros (lista de dicts), columnas (dict de
+    listas/arrays) o un DataFrame, aplicando el esquema. Sin datos retorna la tabla
+    vacía con todas las columnas; las columnas extra se conservan con su tipo inferido.
+    """
+    esquema = ESQUEMAS[nombre]
+    df = datos if isinstance(datos, pd.DataFrame) else pd.DataFrame(datos)
+
+    if df.empty:
+        return pd.DataFrame({col: pd.Series(dtype=tipo) for col, tipo in esquema.items()})
+
+    tipos = {col: tipo for col, tipo in esquema.items() if col in df.columns}
+    df = df.astype(tipos)
+    orden = list(tipos) + [c for c in df.columns if c not in esquema]
+    return df[orden]
+
+
+def memoria_tablas(resultados):
+    """Bytes (deep) por tabla de resultados: {nombre: bytes}."""
+    return {
+        nombre: int(resultados[nombre].memory_usage(deep=True).sum())
+        for nombre in ESQUEMAS if nombre in resultados and isinstance(resultados[nombre], pd.DataFrame)
+    }
@@ -0,0 +1,195 @@
+"""
+Módulo de Calendario de Flota
+Registra la disponibilidad de cada vehículo como intervalos de tiempo (viajes con
+su hora de retorno y mantenimientos) y permite programar varios viajes por día
+dentro del turno. Cada vehículo mantiene una lista ordenada de intervalos, por lo
+que buscar el primer hueco libre es O(log k) con k = reservas del vehículo, y un
+heap compartido ordenado por (libre_desde, posición) permite elegir el vehículo
+libre más temprano sin recorrer toda la flota.
+"""
+import bisect
+import heapq
+
+# Turno operativo (horas del día)
+TURNO_INICIO_H = 8.0
+TURNO_FIN_H = 20.0
+
+# Parámetros de duración de viaje
+VELOCIDAD_PROMEDIO_KMH = 35.0
+TIEMPO_PARADA_H = 0.5  # Carga/descarga por zona visitada
+
+
+def duracion_viaje(distancia_km, n_paradas):
+    """Duración estimada (h) de un viaje: recorrido + tiempo de carga/descarga por parada."""
+    return distancia_km / VELOCIDAD_PROMEDIO_KMH + n_paradas * TIEMPO_PARADA_H
+
+
+def formatear_hora(hora_absoluta):
+    """Convierte una hora absoluta de simulación en 'HH:MM' del día correspondiente."""
+    minutos = int(round((hora_absoluta % 24) * 60))
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+class CalendarioFlota:
+    """
+    Calendario de disponibilidad por vehículo.
+    Las horas son absolutas: (dia - 1) * 24 + hora_del_dia.
+    Cada intervalo es una tupla (inicio, fin, motivo) y los intervalos de un
+    vehículo nunca se solapan.
+    `libre_desde[vid]` es una cota inferior de la primera hora libre del vehículo
+    (exacta tras cada reserva); el heap guarda (libre_desde, posición, vid) con
+    borrado perezoso de las entradas desactualizadas.
+    """
+
+    def __init__(self, ids_vehiculos, turno_inicio_h=TURNO_INICIO_H, turno_fin_h=TURNO_FIN_H):
+        self.turno_inicio_h = turno_inicio_h
+        self.turno_fin_h = turno_fin_h
+        self.intervalos = {vid: [] for vid in ids_vehiculos}
+        self.posicion = {vid: i for i, vid in enumerate(self.intervalos)}
+        self.libre_desde = {vid: 0.0 for vid in self.intervalos}
+        self._heap = [(0.0, i, vid) for vid, i in self.posicion.items()]
+        self._con_intervalos = set()   # Vehículos con intervalos (los únicos que depurar revisa)
+        self._mantenimientos = {}      # dia -> vehículos con un mantenimiento que toca ese día
+
+    @staticmethod
+    def hora_absoluta(dia, hora):
+        return (dia - 1) * 24 + hora
+
+    def primer_hueco(self, id_vehiculo, dia, duracion_h):
+        """
+        Retorna la primera hora absoluta del turno del día en que el vehículo
+        está libre durante `duracion_h` horas, o None si no cabe en el turno.
+        """
+        t = self._hueco(id_vehiculo, dia, duracion_h)
+        return t if t + duracion_h <= self.hora_absoluta(dia, self.turno_fin_h) else None
+
+    def _hueco(self, id_vehiculo, dia, duracion_h):
+        """Primera hora desde el inicio del turno con `duracion_h` horas libres (sin límite de fin de turno)."""
+        intervalos = self.intervalos[id_vehiculo]
+        t = self.hora_absoluta(dia, self.turno_inicio_h)
+
+        # Único intervalo que puede cubrir t: el último que empieza antes de t
+        pos = bisect.bisect_right(intervalos, (t,))
+        if pos > 0 and intervalos[pos - 1][1] > t:
+            t = intervalos[pos - 1][1]
+
+        while pos < len(intervalos) and intervalos[pos][0] < t + duracion_h:
+            t = max(t, intervalos[pos][1])
+            pos += 1
+        return t
+
+    def _actualizar_libre(self, id_vehiculo, dia, forzar=False):
+        """Recalcula libre_desde (primera hora libre del día) y lo publica en el heap si cambió."""
+        libre = self._hueco(id_vehiculo, dia, 0.0)
+        if forzar or libre != self.libre_desde[id_vehiculo]:
+            self.libre_desde[id_vehiculo] = libre
+            heapq.heappush(self._heap, (libre, self.posicion[id_vehiculo], id_vehiculo))
+            if len(self._heap) > 4 * len(self.posicion):
+                self._heap = [(t, self.posicion[vid], vid) for vid, t in self.libre_desde.items()]
+                heapq.heapify(self._heap)
+
+    def _insertar(self, id_vehiculo, intervalo, pos=None):
+        intervalos = self.intervalos[id_vehiculo]
+        if pos is None:
+            bisect.insort(intervalos, intervalo)
+        else:
+            intervalos.insert(pos, intervalo)
+        self._con_intervalos.add(id_vehiculo)
+
+    def reservar(self, id_vehiculo, dia, duracion_h, motivo="Viaje"):
+        """
+        Reserva el primer hueco del día para el vehículo.
+        Retorna (inicio, fin) en horas absolutas, o None si no hay hueco en el turno.
+        """
+        inicio = self.primer_hueco(id_vehiculo, dia, duracion_h)
+        if inicio is None:
+            return None
+
+        self._insertar(id_vehiculo, (inicio, inicio + duracion_h, motivo))
+        self._actualizar_libre(id_vehiculo, dia)
+        return inicio, inicio + duracion_h
+
+    def reservar_primero_disponible(self, ids_candidatos, dia, duracion_h, motivo="Viaje"):
+        """
+        Reserva el vehículo que quede libre más temprano entre los candidatos
+        (en empate, el primero en el orden de la flota). `ids_candidatos` es una
+        colección de IDs o una función id -> bool. Recorre el heap por libre_desde
+        y se detiene cuando ningún vehículo restante puede salir antes que el mejor
+        encontrado. Retorna (id_vehiculo, inicio, fin) o None.
+        """
+        admisible = ids_candidatos if callable(ids_candidatos) else set(ids_candidatos).__contains__
+        heap, libre_desde = self._heap, self.libre_desde
+        mejor = None      # (inicio, posición, vid)
+        revisados = set()
+        while heap and (mejor is None or heap[0][:2] < mejor[:2]):
+            libre, posicion, vid = heapq.heappop(heap)
+            if libre != libre_desde[vid] or vid in revisados:
+                continue   # Entrada desactualizada
+            revisados.add(vid)
+            if not admisible(vid):
+                continue
+            inicio = self.primer_hueco(vid, dia, duracion_h)
+            if inicio is not None and (mejor is None or (inicio, posicion) < mejor[:2]):
+                mejor = (inicio, posicion, vid)
+
+        # Los revisados vuelven al heap con su primera hora libre del día (cota más ajustada)
+        for vid in revisados:
+            self._actualizar_libre(vid, dia, forzar=True)
+        if mejor is None:
+            return None
+
+        inicio, _, vid = mejor
+        self._insertar(vid, (inicio, inicio + duracion_h, motivo))
+        self._actualizar_libre(vid, dia)
+        return vid, inicio, inicio + duracion_h
+
+    def programar_mantenimiento(self, id_vehiculo, dia, hora_inicio, duracion_h):
+        """
+        Bloquea el vehículo por mantenimiento desde `hora_inicio` del día indicado.
+        Lanza ValueError si se solapa con otra reserva.
+        """
+        inicio = self.hora_absoluta(dia, hora_inicio)
+        fin = inicio + duracion_h
+        intervalos = self.intervalos[id_vehiculo]
+
+        pos = bisect.bisect_right(intervalos, (inicio,))
+        solapa_anterior = pos > 0 and intervalos[pos - 1][1] > inicio
+        solapa_siguiente = pos < len(intervalos) and intervalos[pos][0] < fin
+        if solapa_anterior or solapa_siguiente:
+            raise ValueError(f"El mantenimiento de {id_vehiculo} se solapa con otra reserva.")
+
+        self._insertar(id_vehiculo, (inicio, fin, "Mantenimiento"), pos)
+        for d in range(dia, int(fin // 24) + 2):
+            self._mantenimientos.setdefault(d, set()).add(id_vehiculo)
+
+    def en_mantenimiento(self, id_vehiculo, dia):
+        """True si un mantenimiento cubre todo el turno del día."""
+        inicio_turno = self.hora_absoluta(dia, self.turno_inicio_h)
+        fin_turno = self.hora_absoluta(dia, self.turno_fin_h)
+        intervalos = self.intervalos[id_vehiculo]
+
+        pos = bisect.bisect_right(intervalos, (inicio_turno, float("inf")))
+        return (pos > 0 and intervalos[pos - 1][2] == "Mantenimiento"
+                and intervalos[pos - 1][1] >= fin_turno)
+
+    def en_mantenimiento_dia(self, dia):
+        """Vehículos con un mantenimiento que cubre todo el turno del día (sin recorrer la flota)."""
+        return {vid for vid in self._mantenimientos.get(dia, ()) if self.en_mantenimiento(vid, dia)}
+
+    def depurar(self, dia):
+        """
+        Descarta intervalos que terminaron antes del inicio del día (memoria acotada).
+        Solo revisa los vehículos que tienen intervalos.
+        """
+        limite = self.hora_absoluta(dia, 0)
+        for vid in list(self._con_intervalos):
+            intervalos = self.intervalos[vid]
+            pos = 0
+            while pos < len(intervalos) and intervalos[pos][1] <= limite:
+                pos += 1
+            if pos:
+                del intervalos[:pos]
+            if not intervalos:
+                self._con_intervalos.discard(vid)
+        for d in [d for d in self._mantenimientos if d < dia]:
+            del self._mantenimientos[d]
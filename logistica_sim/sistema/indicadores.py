@@ -1,34 +1,172 @@
 """
 Módulo de Indicadores
-Calcula los KPIs logísticos.
+Calcula los KPIs logísticos (motor vectorizado sobre tablas de pedidos, ventas perdidas y despachos).
 """
+import math
 import pandas as pd
+import numpy as np
 from .catalogos import dic_vehiculos
 
-def calcular_kpis_diarios(pedidos_dia, pedidos_entregados, capacidad_picking, pedidos_dia_completos=None):
+def calcular_kpis(df_pedidos, df_ventas_perdidas=None, df_despachos=None, dias=None):
     """
-    Calcula KPIs diarios.
-    Nota: pedidos_entregados puede ser una lista de pedidos o estar vacío si se calcula fuera.
-    pedidos_dia_completos: Lista de registros completos de pedidos para cálculo preciso de OTIF (opcional).
+    Motor de KPIs vectorizado: calcula KPIs diarios y globales en una sola pasada
+    groupby sobre las tablas columnares de la simulación.
+
+    Args:
+        df_pedidos: Una fila por pedido con Fecha, Fecha_Entrega, Cant_Solicitada, Cant_Entregada.
+        df_ventas_perdidas: Fecha, Cantidad_Perdida (opcional).
+        df_despachos: Fecha_Salida, Porcentaje_Ocupacion (opcional).
+        dias: Días a reportar (p. ej. range(1, n_dias + 1)); por defecto, los días con datos.
+
+    Returns:
+        (df_kpis_diarios, kpis_globales): DataFrame indexado por día y diccionario de métricas globales.
     """
-    total_pedidos = len(pedidos_dia)
-    
-    # Si no se pasa lista de entregados, asumimos 0 para cálculos internos (se actualizarán fuera)
-    total_entregados = len(pedidos_entregados)
-    
-    # OTIF se calculará en main.py con datos precisos
-    # Aquí solo retornamos estructura base
-    otif = 0.0
-    
+    df_pedidos = _como_df(df_pedidos, ['Fecha', 'Fecha_Entrega', 'Cant_Solicitada', 'Cant_Entregada'])
+    df_ventas_perdidas = _como_df(df_ventas_perdidas, ['Fecha', 'Cantidad_Perdida'])
+    df_despachos = _como_df(df_despachos, ['Fecha_Salida', 'Porcentaje_Ocupacion'])
+
+    fecha = df_pedidos['Fecha'].to_numpy(dtype=np.int64)
+    solicitado = df_pedidos['Cant_Solicitada'].to_numpy(dtype=np.int64)
+    entregado = df_pedidos['Cant_Entregada'].to_numpy(dtype=np.int64)
+    fecha_entrega = pd.to_numeric(df_pedidos['Fecha_Entrega'], errors='coerce').to_numpy(dtype=float)
+
+    # OTIF: pedido completo entregado el mismo día
+    perfecto = (solicitado == entregado) & (fecha_entrega == fecha)
+
+    df_dia = pd.DataFrame({
+        'Fecha': fecha, 'Solicitado': solicitado, 'Entregado': entregado, 'Perfecto': perfecto
+    }).groupby('Fecha').agg(
+        total_pedidos=('Solicitado', 'size'),
+        unidades_solicitadas=('Solicitado', 'sum'),
+        unidades_entregadas=('Entregado', 'sum'),
+        pedidos_perfectos=('Perfecto', 'sum')
+    )
+
+    perdidas = df_ventas_perdidas.groupby('Fecha')['Cantidad_Perdida'].sum()
+    ocupacion = df_despachos.groupby('Fecha_Salida')['Porcentaje_Ocupacion'].mean()
+
+    indice_dias = pd.Index(list(dias) if dias is not None else df_dia.index, name='dia')
+    df_dia = df_dia.reindex(indice_dias, fill_value=0)
+    df_dia['unidades_perdidas'] = perdidas.reindex(indice_dias, fill_value=0).to_numpy()
+
+    sol = df_dia['unidades_solicitadas'].to_numpy(dtype=float)
+    ent = df_dia['unidades_entregadas'].to_numpy(dtype=float)
+    perd = df_dia['unidades_perdidas'].to_numpy(dtype=float)
+    total = df_dia['total_pedidos'].to_numpy(dtype=float)
+    hay_unidades = sol > 0
+
+    # Backlog = No entregado - Ventas perdidas (unidades pendientes, NO perdidas)
+    backlog = np.clip(sol - ent - perd, 0, None)
+    df_dia['unidades_backlog'] = backlog.astype(np.int64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df_dia['otif'] = np.round(np.where(total > 0, df_dia['pedidos_perfectos'] / total * 100, 0.0), 2)
+        df_dia['fill_rate'] = np.round(np.where(hay_unidades, ent / sol * 100, 100.0), 2)
+        df_dia['backlog_rate'] = np.round(np.where(hay_unidades, backlog / sol * 100, 0.0), 2)
+
+    df_dia['utilizacion_flota'] = np.round(ocupacion.reindex(indice_dias).fillna(0.0).to_numpy(dtype=float), 2)
+    df_dia['productividad'] = 0.0
+
+    total_sol = sol.sum()
+    total_ped = total.sum()
+    total_backlog = max(total_sol - ent.sum() - perd.sum(), 0)
+
+    kpis_globales = {
+        "total_pedidos": int(total_ped),
+        "total_unidades": int(total_sol),
+        "unidades_entregadas": int(ent.sum()),
+        "unidades_perdidas": int(perd.sum()),
+        "backlog_unidades": int(total_backlog),
+        "otif_global": round(float(perfecto.sum() / total_ped * 100), 2) if total_ped > 0 else 0.0,
+        "fill_rate_global": round(float(ent.sum() / total_sol * 100), 2) if total_sol > 0 else 0.0,
+        "backlog_rate_global": round(float(total_backlog / total_sol * 100), 2) if total_sol > 0 else 0.0,
+        "otif_promedio": _promedio(df_dia['otif']),
+        "fill_rate_promedio": _promedio(df_dia['fill_rate']),
+        "backlog_rate_promedio": _promedio(df_dia['backlog_rate']),
+        "utilizacion_flota_promedio": _promedio(df_dia['utilizacion_flota'])
+    }
+
+    return df_dia, kpis_globales
+
+
+def calcular_kpis_resultados(resultados):
+    """
+    Aplica `calcular_kpis` sobre el diccionario que retorna run_simulation
+    (tablero, reporte PDF y cualquier otro consumidor de resultados).
+    """
+    n_dias = resultados.get('config', {}).get('n_dias')
+    return calcular_kpis(
+        resultados['df_pedidos'],
+        resultados.get('ventas_perdidas'),
+        resultados.get('df_despachos'),
+        dias=range(1, n_dias + 1) if n_dias else None
+    )
+
+
+def _como_df(tabla, columnas):
+    """Acepta DataFrame, lista de registros o None y asegura las columnas requeridas."""
+    if tabla is None:
+        tabla = []
+    df = tabla if isinstance(tabla, pd.DataFrame) else pd.DataFrame(tabla)
+    if df.empty:
+        return pd.DataFrame({col: pd.Series(dtype='float64') for col in columnas})
+    return df
+
+
+def _promedio(serie):
+    return round(float(serie.mean()), 2) if len(serie) > 0 else 0.0
+
+
+def calcular_kpis_diarios(pedidos_dia, pedidos_entregados, capacidad_picking, pedidos_dia_completos=None,
+                          ventas_perdidas_dia=None, despachos_dia=None):
+    """
+    Calcula los KPIs de un día con sumas simples sobre sus registros (mismas
+    fórmulas que `calcular_kpis`, sin armar DataFrames en cada día del bucle).
+    pedidos_dia_completos: Registros del día (formato df_pedidos) para OTIF, Fill Rate y Backlog Rate.
+    ventas_perdidas_dia / despachos_dia: Registros del día para backlog y utilización de flota.
+    """
+    if not pedidos_dia_completos:
+        return {
+            "otif": 0.0,
+            "fill_rate": 100.0,
+            "backlog_rate": 0.0,
+            "productividad": 0.0,
+            "utilizacion_flota": 0.0,
+            "total_pedidos": len(pedidos_dia),
+            "unidades_solicitadas": 0,
+            "unidades_entregadas": 0,
+            "unidades_perdidas": 0
+        }
+
+    solicitadas = entregadas = perfectos = 0
+    for p in pedidos_dia_completos:
+        solicitadas += p['Cant_Solicitada']
+        entregadas += p['Cant_Entregada']
+        # OTIF: pedido completo entregado el mismo día
+        perfectos += p['Cant_Solicitada'] == p['Cant_Entregada'] and p['Fecha_Entrega'] == p['Fecha']
+    perdidas = sum(vp['Cantidad_Perdida'] for vp in ventas_perdidas_dia or ())
+    ocupaciones = [d['Porcentaje_Ocupacion'] for d in despachos_dia or ()]
+
+    # Backlog = No entregado - Ventas perdidas (unidades pendientes, NO perdidas)
+    backlog = max(solicitadas - entregadas - perdidas, 0)
+
     return {
-        "otif": round(otif, 2),
-        "fill_rate": 0.0, # Se calcula fuera con precisión
-        "backlog_rate": 0.0, # Se calcula fuera
+        "otif": _redondear(perfectos / len(pedidos_dia_completos) * 100),
+        "fill_rate": _redondear(entregadas / solicitadas * 100) if solicitadas > 0 else 100.0,
+        "backlog_rate": _redondear(backlog / solicitadas * 100) if solicitadas > 0 else 0.0,
         "productividad": 0.0,
-        "utilizacion_flota": 0.0, # Se calcula en transporte
-        "total_pedidos": total_pedidos
+        "utilizacion_flota": _redondear(math.fsum(ocupaciones) / len(ocupaciones)) if ocupaciones else 0.0,
+        "total_pedidos": len(pedidos_dia),
+        "unidades_solicitadas": int(solicitadas),
+        "unidades_entregadas": int(entregadas),
+        "unidades_perdidas": int(perdidas)
     }
 
+
+def _redondear(valor):
+    """Redondeo a 2 decimales igual al de `calcular_kpis` (np.round)."""
+    return float(np.round(valor, 2))
+
 def calcular_metricas_globales(resultados_diarios):
     """
     Calcula promedios globales de los KPIs diarios.
@@ -0,0 +1,122 @@
+"""
+Módulo de Instrumentación
+Mide el tiempo de pared (perf_counter_ns) y el número de llamadas de cada fase
+de run_simulation por día simulado. Desactivada por defecto: el cronómetro nulo
+retorna siempre el mismo contexto vacío, sin leer el reloj ni registrar nada.
+"""
+from time import perf_counter_ns
+
+import pandas as pd
+
+FASES = ('demanda', 'recepciones', 'backlog', 'pedidos', 'transporte', 'reposicion', 'kpis', 'alertas')
+COLUMNAS_TIEMPOS = ('Dia', 'Fase', 'Tiempo_ms', 'Llamadas')
+
+
+class _MedicionFase:
+    __slots__ = ('cronometro', 'fase', 'inicio')
+
+    def __init__(self, cronometro, fase):
+        self.cronometro = cronometro
+        self.fase = fase
+
+    def __enter__(self):
+        self.inicio = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.cronometro._sumar(self.fase, perf_counter_ns() - self.inicio)
+        return False
+
+
+class Cronometro:
+    """
+    Acumula nanosegundos y llamadas por (día, fase):
+        crono.iniciar_dia(dia)
+        with crono.fase('demanda'):
+            ...
+    """
+
+    activo = True
+
+    def __init__(self):
+        self.dia = 0
+        self._ns = {}        # (dia, fase) -> ns
+        self._llamadas = {}  # (dia, fase) -> n
+
+    def iniciar_dia(self, dia):
+        self.dia = dia
+
+    def fase(self, nombre):
+        return _MedicionFase(self, nombre)
+
+    def _sumar(self, fase, ns):
+        clave = (self.dia, fase)
+        self._ns[clave] = self._ns.get(clave, 0) + ns
+        self._llamadas[clave] = self._llamadas.get(clave, 0) + 1
+
+    def tabla(self):
+        """df_timings: una fila por (Dia, Fase) con Tiempo_ms y Llamadas."""
+        if not self._ns:
+            return tabla_vacia()
+        claves = list(self._ns)
+        return pd.DataFrame({
+            'Dia': pd.array([d for d, _ in claves], dtype='int32'),
+            'Fase': pd.Categorical([f for _, f in claves], categories=_categorias(claves)),
+            'Tiempo_ms': [self._ns[c] / 1e6 for c in claves],
+            'Llamadas': pd.array([self._llamadas[c] for c in claves], dtype='int32'),
+        })
+
+
+class _ContextoNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_CONTEXTO_NULO = _ContextoNulo()
+
+
+class CronometroNulo:
+    """Cronómetro desactivado: misma interfaz que Cronometro, sin costo de medición."""
+
+    activo = False
+
+    def iniciar_dia(self, dia):
+        pass
+
+    def fase(self, nombre):
+        return _CONTEXTO_NULO
+
+    def tabla(self):
+        return tabla_vacia()
+
+
+def crear_cronometro(activo=False):
+    return Cronometro() if activo else CronometroNulo()
+
+
+def tabla_vacia():
+    return pd.DataFrame({
+        'Dia': pd.array([], dtype='int32'),
+        'Fase': pd.Categorical([], categories=list(FASES)),
+        'Tiempo_ms': pd.array([], dtype='float64'),
+        'Llamadas': pd.array([], dtype='int32'),
+    })
+
+
+def resumen_fases(df_timings):
+    """Tiempo total (ms), llamadas y porcentaje del tiempo por fase, de mayor a menor."""
+    resumen = df_timings.groupby('Fase', observed=True)[['Tiempo_ms', 'Llamadas']].sum()
+    total = resumen['Tiempo_ms'].sum()
+    resumen['Porcentaje'] = (resumen['Tiempo_ms'] / total * 100).round(1) if total else 0.0
+    return resumen.sort_values('Tiempo_ms', ascending=False)
+
+
+def _categorias(claves):
+    # Fases conocidas en orden del ciclo diario; las adicionales al final
+    extra = [f for f in dict.fromkeys(f for _, f in claves) if f not in FASES]
+    return list(FASES) + extra
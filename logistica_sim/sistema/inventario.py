@@ -3,9 +3,11 @@ Módulo de Inventario Consolidado
 Gestiona el stock, reposición automática y sistema completo de inventario ERP.
 Consolida: inventario.py + gestion_inventario.py + estado_inventario.py
 """
+import random
 import pandas as pd
 import numpy as np
-from .catalogos import dic_sku
+from .catalogos import dic_sku, catalogos_simulacion
+from . import esquemas, politicas
 
 
 # ============================================================================
@@ -130,8 +132,19 @@ class GestionInventario:
     Incluye Kardex, Maestro de Productos y Gestión de Órdenes.
     """
     
-    def __init__(self):
-        """Inicializa el sistema de inventario con datos maestros."""
+    def __init__(self, rng=None, catalogos=None):
+        """
+        Inicializa el sistema de inventario con datos maestros.
+        rng: generador (random.Random) para la decisión de espera de los clientes;
+        por defecto el generador global del módulo random.
+        catalogos: catálogos de la corrida (SKUs, clientes y zonas; ver
+        catalogos.catalogos_simulacion); por defecto los del módulo catalogos.
+        """
+        self.rng = random if rng is None else rng
+        catalogos = catalogos_simulacion() if catalogos is None else catalogos
+        self.dic_sku = catalogos['dic_sku']
+        self.dic_clientes = catalogos['dic_clientes']
+        self.dic_zonas = catalogos['dic_zonas']
         # Tablas Transaccionales - Inicializar antes de llamar a métodos que las usen
         self.ordenes_compra = []  # Lista de diccionarios para df_compras
         self.kardex = []          # Lista de diccionarios para df_kardex
@@ -152,7 +165,7 @@ class GestionInventario:
         """
         datos_maestros = []
         
-        for sku, info in dic_sku.items():
+        for sku, info in self.dic_sku.items():
             # Calcular EOQ (Economic Order Quantity) simplificado
             # Aumentado de 60% a 80% para asegurar mejor reposición
             q_lote = int(info['stock_objetivo'] * 0.8)
@@ -168,7 +181,8 @@ class GestionInventario:
                 'Q_Lote_Optimo': q_lote,
                 'Costo_Unitario': info['costo_unitario'],
                 'Precio_Venta': info['precio_venta'],
-                'Peso_Unitario_kg': info.get('peso_kg', 1.0)
+                'Peso_Unitario_kg': info.get('peso_kg', 1.0),
+                'Volumen_Unitario_m3': info.get('volumen_m3', 0.0)
             })
         
         self.df_productos = pd.DataFrame(datos_maestros)
@@ -290,15 +304,12 @@ class GestionInventario:
             - Evalúa si el cliente espera (Backlog) o se va (Venta Perdida) según su probabilidad.
         - NUNCA deja Stock_Fisico en negativo.
         """
-        from .catalogos import dic_clientes
-        import random
-
         items_despachados = []
         cliente_id = pedido.get('cliente_id')
         prob_espera = 0.5
         
-        if cliente_id and cliente_id in dic_clientes:
-            prob_espera = dic_clientes[cliente_id].get('probabilidad_espera', 0.5)
+        if cliente_id and cliente_id in self.dic_clientes:
+            prob_espera = self.dic_clientes[cliente_id].get('probabilidad_espera', 0.5)
 
         for item in pedido['items']:
             sku = item['sku']
@@ -336,7 +347,7 @@ class GestionInventario:
                 cantidad_faltante = cantidad_solicitada - cantidad_a_despachar
                 
                 # Decisión del Cliente: ¿Espera o se va?
-                decision_espera = random.random() < prob_espera
+                decision_espera = self.rng.random() < prob_espera
                 
                 if decision_espera:
                     # BACKLOG: El cliente espera
@@ -388,6 +399,96 @@ class GestionInventario:
         self._calcular_campos_derivados()
         return items_despachados
 
+    def procesar_pedido(self, pedido, dia_actual):
+        """
+        Compromete y despacha un pedido nuevo.
+        Retorna (registro, entregado_por_sku, pedido_transporte): la fila de df_pedidos,
+        las unidades entregadas por SKU y el pedido a transportar (None si no se despachó nada).
+        """
+        # Intentar comprometer stock
+        self.comprometer_stock(pedido)
+        
+        # Despachar (Mueve de Físico a Cliente y registra Kardex)
+        items_despachados = self.despachar_pedido(pedido, dia_actual)
+        
+        # Calcular estado del pedido
+        cant_solicitada = sum(i['cantidad'] for i in pedido['items'])
+        cant_entregada = sum(i['cantidad'] for i in items_despachados)
+        
+        if cant_entregada == cant_solicitada:
+            estado_pedido = 'Entregado Total'
+        elif cant_entregada > 0:
+            estado_pedido = 'Entregado Parcial'
+        else:
+            estado_pedido = 'Pendiente'
+        
+        entregado_por_sku = {}
+        for d in items_despachados:
+            entregado_por_sku[d['sku']] = entregado_por_sku.get(d['sku'], 0) + d['cantidad']
+        
+        registro = {
+            'ID_Pedido': pedido['id_pedido'],
+            'Fecha': dia_actual,
+            # Día de entrega efectiva (hoy si se entregó algo, sino queda pendiente)
+            'Fecha_Entrega': dia_actual if cant_entregada > 0 else None,
+            'Cliente': pedido['cliente_id'],
+            'Zona_ID': pedido['zona_id'],  # ID para lógica interna
+            'Zona': self.dic_zonas.get(pedido['zona_id'], pedido['zona_id']),  # Nombre para display
+            'N_Lineas': len(pedido['items']),
+            'Cant_Solicitada': cant_solicitada,
+            'Cant_Entregada': cant_entregada,
+            'Estado': estado_pedido
+        }
+        
+        # Preparar para transporte (solo lo que se despachó efectivamente)
+        pedido_transporte = None
+        if cant_entregada > 0:
+            pedido_transporte = {
+                'id_pedido': pedido['id_pedido'],
+                'cliente': pedido['cliente_id'],
+                'zona': pedido['zona_id'],
+                'items': items_despachados  # Solo lo que se mueve
+            }
+        return registro, entregado_por_sku, pedido_transporte
+
+    def enviar_transferencia(self, transferencia, dia_actual):
+        """
+        Despacha una transferencia a otro almacén desde el stock disponible.
+        Retorna la cantidad enviada (puede ser menor a la solicitada).
+        """
+        sku = transferencia['Producto']
+        disponible = max(int(self.df_inventario.loc[sku, 'Stock_Disponible']), 0)
+        cantidad = min(int(transferencia['Cantidad']), disponible)
+        if cantidad > 0:
+            self.df_inventario.loc[sku, 'Stock_Fisico'] -= cantidad
+            self._registrar_kardex(
+                dia_actual, sku, 'TRANSFERENCIA_SALIDA', -cantidad,
+                self.df_inventario.loc[sku, 'Stock_Fisico'],
+                id_referencia=transferencia['ID_Transferencia'],
+                tipo_referencia='transferencia'
+            )
+            self._calcular_campos_derivados()
+        return cantidad
+
+    def registrar_transferencia_entrante(self, transferencia):
+        """Suma al Stock_En_Transito una transferencia enviada por otro almacén."""
+        self.df_inventario.loc[transferencia['Producto'], 'Stock_En_Transito'] += transferencia['Cantidad']
+        self._calcular_campos_derivados()
+
+    def recibir_transferencia(self, transferencia, dia_actual):
+        """Ingresa al Stock_Fisico una transferencia en tránsito que llega hoy."""
+        sku = transferencia['Producto']
+        cantidad = transferencia['Cantidad']
+        self.df_inventario.loc[sku, 'Stock_Fisico'] += cantidad
+        self.df_inventario.loc[sku, 'Stock_En_Transito'] -= cantidad
+        self._registrar_kardex(
+            dia_actual, sku, 'TRANSFERENCIA_ENTRADA', cantidad,
+            self.df_inventario.loc[sku, 'Stock_Fisico'],
+            id_referencia=transferencia['ID_Transferencia'],
+            tipo_referencia='transferencia'
+        )
+        self._calcular_campos_derivados()
+
     def atender_backlog(self, dia_actual):
         """
         Intenta despachar pedidos pendientes en el Backlog con el stock disponible.
@@ -446,19 +547,23 @@ class GestionInventario:
         
         return items_recuperados
     
-    def verificar_reposicion(self, dia_actual, escenario="normal"):
+    def verificar_reposicion(self, dia_actual, escenario="normal", pronostico=None):
         """
         Verifica Puntos de Reorden y genera Órdenes de Compra.
+        Con un `pronostico` (ver pronostico.py) con historia suficiente, el punto de
+        reorden es dinámico (demanda pronosticada en el lead time + stock de seguridad)
+        y el stock objetivo se desplaza con él, conservando la brecha S - s del maestro.
         """
         ordenes_creadas = []
+        puntos_reorden, stocks_objetivo = self.puntos_reorden(pronostico)
         
         for sku in self.df_inventario.index:
             posicion = self.df_inventario.loc[sku, 'Posicion_Inventario']
-            punto_reorden = self.df_productos.loc[sku, 'Punto_Reorden']
+            punto_reorden = puntos_reorden[sku]
             
             if posicion < punto_reorden:
                 q_lote = self.df_productos.loc[sku, 'Q_Lote_Optimo']
-                stock_objetivo = self.df_productos.loc[sku, 'Stock_Objetivo']
+                stock_objetivo = stocks_objetivo[sku]
                 lead_time = self.df_productos.loc[sku, 'Lead_Time']
                 
                 if escenario == "lote_economico":
@@ -493,10 +598,31 @@ class GestionInventario:
         self._calcular_campos_derivados()
         return ordenes_creadas
     
+    def puntos_reorden(self, pronostico=None):
+        """
+        (Punto_Reorden, Stock_Objetivo) vigentes por SKU: los del maestro, o los
+        dinámicos del pronóstico cuando está listo (los SKUs sin pronóstico usan el maestro).
+        """
+        puntos = self.df_productos['Punto_Reorden']
+        objetivos = self.df_productos['Stock_Objetivo']
+        if pronostico is None or not pronostico.listo:
+            return puntos, objetivos
+        lead_time = self.df_productos['Lead_Time'].reindex(pronostico.skus).fillna(1).to_numpy()
+        dinamicos = pd.Series(np.ceil(pronostico.punto_reorden(lead_time)), index=pronostico.skus)
+        dinamicos = dinamicos.reindex(puntos.index).fillna(puntos).astype('int64')
+        return dinamicos, dinamicos + (objetivos - puntos)
+
+    def aplicar_politicas(self, df_politicas):
+        """
+        Reemplaza en el maestro los parámetros de reposición (Punto_Reorden,
+        Stock_Objetivo, Q_Lote_Optimo) por los de `df_politicas` (ver politicas.py).
+        """
+        politicas.aplicar_politicas(self.df_productos, df_politicas)
+
     def obtener_tablas_finales(self):
         """Retorna los DataFrames finales para reportes."""
-        df_compras = pd.DataFrame(self.ordenes_compra)
-        df_kardex = pd.DataFrame(self.kardex)
+        df_compras = esquemas.construir_tabla('df_compras', self.ordenes_compra)
+        df_kardex = esquemas.construir_tabla('df_kardex', self.kardex)
         
         # Estado actual completo
         df_estado = self.df_inventario.join(self.df_productos)
@@ -641,17 +767,22 @@ class EstadoInventario:
             "motivo": motivo
         }
     
-    def verificar_reposicion(self, dia_actual, demanda_dia_por_sku, escenario="normal"):
+    def verificar_reposicion(self, dia_actual, demanda_dia_por_sku, escenario="normal", pronostico=None):
         """
         Verifica si es necesario reponer stock y crea órdenes al proveedor.
+        Con un `pronostico` listo, el mínimo de cada SKU es su punto de reorden dinámico.
         Retorna lista de órdenes creadas.
         """
         ordenes_creadas = []
+        minimos = {}
+        if pronostico is not None and pronostico.listo:
+            lead_time = [dic_sku[sku]["lead_time_dias"] if sku in dic_sku else 1 for sku in pronostico.skus]
+            minimos = dict(zip(pronostico.skus, np.ceil(pronostico.punto_reorden(lead_time)).astype(int).tolist()))
         
         for sku, info in dic_sku.items():
             stock_actual = self.stock.get(sku, 0)
-            stock_objetivo = info["stock_objetivo"]
-            stock_minimo = info["stock_minimo"]
+            stock_minimo = minimos.get(sku, info["stock_minimo"])
+            stock_objetivo = info["stock_objetivo"] + (stock_minimo - info["stock_minimo"])
             demanda_hoy = demanda_dia_por_sku.get(sku, 0)
             
             # Aplicar lógica según escenario
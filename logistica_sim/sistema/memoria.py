@@ -0,0 +1,218 @@
+"""
+Módulo de Memoria
+Contabiliza los bytes retenidos por cada estructura de la simulación (atributos
+de GestionInventario y GestionTransporte, y acumuladores del bucle principal)
+cada N días, junto con la memoria trazada por tracemalloc (actual y pico del
+intervalo). El pico se atribuye a la estructura que más creció en ese intervalo.
+Desactivado por defecto: el monitor nulo no inicia tracemalloc ni recorre nada.
+"""
+import sys
+import tracemalloc
+from array import array
+from collections import deque
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+
+import numpy as np
+import pandas as pd
+
+MAX_MUESTRA = 200   # Elementos medidos por contenedor; el resto se extrapola
+COLUMNAS_MEMORIA = ('Dia', 'Estructura', 'Bytes')
+COLUMNAS_RESUMEN = ('Dia', 'Traced_Actual', 'Traced_Pico', 'Estructura_Mayor', 'Bytes_Mayor',
+                    'Estructura_Crecimiento', 'Crecimiento')
+
+_ATOMICOS = (int, float, complex, bool, str, bytes, type(None))
+_SIN_RECORRER = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+
+def tamano_profundo(obj, vistos=None, muestra=MAX_MUESTRA):
+    """
+    Estimación de bytes retenidos por `obj` y todo lo que referencia. DataFrames,
+    Series e índices usan memory_usage(deep=True); arreglos numpy y array.array su
+    buffer. En contenedores con más de `muestra` elementos se miden `muestra`
+    elementos equiespaciados y se extrapola. `vistos` (ids) evita contar dos veces
+    objetos compartidos; al pasarlo entre estructuras, cada objeto se atribuye a la primera.
+    """
+    vistos = set() if vistos is None else vistos
+    total = 0.0
+    pendientes = [(obj, 1.0)]
+    while pendientes:
+        actual, factor = pendientes.pop()
+        if id(actual) in vistos or isinstance(actual, _SIN_RECORRER):
+            continue
+        vistos.add(id(actual))
+
+        if isinstance(actual, pd.DataFrame):
+            total += factor * actual.memory_usage(deep=True).sum()
+            continue
+        if isinstance(actual, (pd.Series, pd.Index)):
+            total += factor * actual.memory_usage(deep=True)
+            continue
+        if isinstance(actual, np.ndarray):
+            total += factor * max(sys.getsizeof(actual), actual.nbytes)
+            continue
+
+        total += factor * sys.getsizeof(actual)
+        if isinstance(actual, (_ATOMICOS, array)):
+            continue
+
+        if isinstance(actual, dict):
+            hijos = list(actual.keys()) + list(actual.values())
+        elif isinstance(actual, (list, tuple, set, frozenset, deque)):
+            hijos = list(actual)
+        elif hasattr(actual, '__dict__'):
+            hijos = [vars(actual)]
+        elif hasattr(type(actual), '__slots__'):
+            hijos = [getattr(actual, s) for s in type(actual).__slots__ if hasattr(actual, s)]
+        else:
+            continue
+
+        if len(hijos) > muestra:
+            seleccion = np.linspace(0, len(hijos) - 1, muestra).round().astype(int)
+            factor_hijos = factor * len(hijos) / muestra
+            hijos = [hijos[i] for i in seleccion]
+        else:
+            factor_hijos = factor
+        pendientes.extend((h, factor_hijos) for h in hijos)
+    return int(total)
+
+
+def estructuras_simulacion(gestion, transporte, **principales):
+    """
+    Estructuras a medir: cada atributo no escalar de `gestion` (inventario.*) y
+    `transporte` (transporte.*), más los acumuladores del bucle principal
+    pasados por nombre (principal.*). El orden fija la atribución de objetos compartidos.
+    """
+    estructuras = {}
+    for prefijo, objeto in (('inventario', gestion), ('transporte', transporte)):
+        for atributo, valor in vars(objeto).items():
+            if not isinstance(valor, _ATOMICOS):
+                estructuras[f"{prefijo}.{atributo}"] = valor
+    for nombre, valor in principales.items():
+        estructuras[f"principal.{nombre}"] = valor
+    return estructuras
+
+
+class MonitorMemoria:
+    """
+    Mide la memoria cada `cada_n_dias` días (y siempre el último):
+        monitor.iniciar()
+        if monitor.toca(dia, n_dias):
+            monitor.medir(dia, estructuras_simulacion(...))
+        monitor.detener()
+    """
+
+    activo = True
+
+    def __init__(self, cada_n_dias=1, muestra=MAX_MUESTRA):
+        self.cada_n_dias = max(int(cada_n_dias), 1)
+        self.muestra = muestra
+        self._filas = []      # (dia, estructura, bytes)
+        self._resumen = []    # dict por medición
+        self._anterior = {}   # estructura -> bytes de la medición previa
+        self._propio = False  # tracemalloc iniciado por este monitor
+
+    def iniciar(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._propio = True
+        tracemalloc.reset_peak()
+
+    def detener(self):
+        if self._propio:
+            tracemalloc.stop()
+            self._propio = False
+
+    def toca(self, dia, n_dias):
+        return dia % self.cada_n_dias == 0 or dia == n_dias
+
+    def medir(self, dia, estructuras):
+        # Memoria trazada antes de recorrer (el recorrido también reserva memoria)
+        actual, pico = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        vistos = set()
+        medidas = {nombre: tamano_profundo(obj, vistos, self.muestra) for nombre, obj in estructuras.items()}
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        self._filas.extend((dia, nombre, b) for nombre, b in medidas.items())
+        mayor = max(medidas, key=medidas.get) if medidas else None
+        crecimientos = {n: b - self._anterior.get(n, 0) for n, b in medidas.items()}
+        crece = max(crecimientos, key=crecimientos.get) if crecimientos else None
+        self._resumen.append({
+            'Dia': dia, 'Traced_Actual': actual, 'Traced_Pico': pico,
+            'Estructura_Mayor': mayor, 'Bytes_Mayor': medidas.get(mayor, 0),
+            'Estructura_Crecimiento': crece, 'Crecimiento': crecimientos.get(crece, 0),
+        })
+        self._anterior = medidas
+
+    def tabla(self):
+        """df_memoria: una fila por (Dia, Estructura) con los bytes estimados."""
+        if not self._filas:
+            return tabla_vacia()
+        dias, nombres, bytes_ = zip(*self._filas)
+        return pd.DataFrame({
+            'Dia': pd.array(dias, dtype='int32'),
+            'Estructura': pd.Categorical(nombres, categories=list(dict.fromkeys(nombres))),
+            'Bytes': pd.array(bytes_, dtype='int64'),
+        })
+
+    def resumen(self):
+        """df_memoria_resumen: memoria trazada y estructura mayor / de mayor crecimiento por medición."""
+        return pd.DataFrame(self._resumen, columns=list(COLUMNAS_RESUMEN))
+
+    def pico(self):
+        """Medición con el mayor pico de tracemalloc, atribuido a la estructura que más creció (None si no hay)."""
+        if not self._resumen:
+            return None
+        return dict(max(self._resumen, key=lambda r: r['Traced_Pico']))
+
+
+class MonitorNulo:
+    """Monitor desactivado: misma interfaz que MonitorMemoria, sin costo."""
+
+    activo = False
+
+    def iniciar(self):
+        pass
+
+    def detener(self):
+        pass
+
+    def toca(self, dia, n_dias):
+        return False
+
+    def tabla(self):
+        return tabla_vacia()
+
+    def resumen(self):
+        return pd.DataFrame(columns=list(COLUMNAS_RESUMEN))
+
+    def pico(self):
+        return None
+
+
+def crear_monitor(medir_memoria=False):
+    """
+    medir_memoria: False/None/0 desactiva; True mide cada día; un entero N mide cada N días.
+    """
+    if not medir_memoria:
+        return MonitorNulo()
+    return MonitorMemoria(1 if medir_memoria is True else int(medir_memoria))
+
+
+def tabla_vacia():
+    return pd.DataFrame({
+        'Dia': pd.array([], dtype='int32'),
+        'Estructura': pd.Categorical([]),
+        'Bytes': pd.array([], dtype='int64'),
+    })
+
+
+def mayores_estructuras(df_memoria, n=10):
+    """Bytes de cada estructura en su última medición y crecimiento desde la primera, de mayor a menor."""
+    matriz = df_memoria.pivot_table(index='Dia', columns='Estructura', values='Bytes', observed=True)
+    resumen = pd.DataFrame({
+        'Bytes': matriz.iloc[-1],
+        'Crecimiento': matriz.iloc[-1] - matriz.iloc[0],
+    }).astype('int64')
+    resumen['MB'] = (resumen['Bytes'] / 2**20).round(2)
+    return resumen.sort_values('Bytes', ascending=False).head(n)
@@ -0,0 +1,207 @@
+"""
+Módulo de Perfilado
+Captura estadísticas de cProfile de run_simulation (todo el bucle de días o solo
+los días elegidos) como dict plano de pstats y las expone como ranking top-N
+(texto de pstats y DataFrame) y como pilas colapsadas ("a;b;c <microsegundos>") para generar flamegraphs con
+flamegraph.pl o speedscope. Desactivado por defecto.
+"""
+import cProfile
+import io
+import os
+import pstats
+
+import pandas as pd
+
+TOP_N = 30
+ORDEN = 'cumulative'          # Criterio del reporte de texto (ver pstats.SortKey)
+MAX_PROFUNDIDAD_PILA = 64
+MIN_MICROSEGUNDOS_PILA = 1    # Las pilas con menos tiempo propio se omiten
+COLUMNAS_PERFIL = ('Funcion', 'Archivo', 'Linea', 'Llamadas', 'Tiempo_Propio_s', 'Tiempo_Acumulado_s')
+
+
+def nombre_funcion(funcion):
+    """'modulo.py:linea(nombre)' a partir de la clave (archivo, línea, nombre) de pstats."""
+    archivo, linea, nombre = funcion
+    if archivo == '~':   # Funciones integradas
+        return nombre
+    return f"{os.path.basename(archivo)}:{linea}({nombre})"
+
+
+class PerfilSimulacion:
+    """
+    Perfilador de una corrida. Con `dias=None` perfila todo el bucle de días;
+    con un conjunto de días, solo esos días:
+        perfil.iniciar()
+        for dia in ...:
+            perfil.iniciar_dia(dia)
+            ...
+            perfil.cerrar_dia(dia)
+        perfil.detener()
+    """
+
+    activo = True
+
+    def __init__(self, dias=None):
+        self.dias = None if dias is None else frozenset(dias)
+        self.perfil = cProfile.Profile()
+        self._midiendo = False
+
+    def _activar(self):
+        if not self._midiendo:
+            self.perfil.enable()
+            self._midiendo = True
+
+    def _desactivar(self):
+        if self._midiendo:
+            self.perfil.disable()
+            self._midiendo = False
+
+    def iniciar(self):
+        if self.dias is None:
+            self._activar()
+
+    def iniciar_dia(self, dia):
+        if self.dias is not None and dia in self.dias:
+            self._activar()
+
+    def cerrar_dia(self, dia):
+        if self.dias is not None and dia in self.dias:
+            self._desactivar()
+
+    def detener(self):
+        self._desactivar()
+
+    def estadisticas(self):
+        """
+        Estadísticas capturadas como dict plano de pstats
+        {(archivo, línea, función): (cc, nc, tt, ct, llamadores)}; None si no se perfiló ningún día.
+        """
+        self._desactivar()
+        if not self.perfil.getstats():
+            return None
+        return pstats.Stats(self.perfil).stats
+
+
+class PerfilNulo:
+    """Perfilado desactivado: misma interfaz de ciclo de vida que PerfilSimulacion, sin costo."""
+
+    activo = False
+
+    def iniciar(self):
+        pass
+
+    def iniciar_dia(self, dia):
+        pass
+
+    def cerrar_dia(self, dia):
+        pass
+
+    def detener(self):
+        pass
+
+    def estadisticas(self):
+        return None
+
+
+def crear_perfil(perfilar=False):
+    """
+    perfilar: False/None desactiva; True perfila toda la corrida; un día (int) o
+    una colección de días (p. ej. demanda.DIAS_PICO_ESTACIONAL) perfila solo esos días.
+    """
+    if perfilar is None or perfilar is False:
+        return PerfilNulo()
+    if perfilar is True:
+        return PerfilSimulacion()
+    if isinstance(perfilar, int):
+        return PerfilSimulacion({perfilar})
+    return PerfilSimulacion(perfilar)
+
+
+def _pstats(estadisticas):
+    """pstats.Stats sobre un dict de estadísticas (para ordenar, imprimir y volcar a .prof)."""
+    stats = pstats.Stats(stream=io.StringIO())
+    stats.stats = estadisticas
+    stats.get_top_level_stats()
+    return stats
+
+
+def top(estadisticas, n=TOP_N, orden='tottime'):
+    """Las `n` funciones con más tiempo (propio por defecto) como DataFrame."""
+    if not estadisticas:
+        return tabla_vacia()
+    clave = 'Tiempo_Propio_s' if orden == 'tottime' else 'Tiempo_Acumulado_s'
+    filas = [{
+        'Funcion': f[2],
+        'Archivo': os.path.basename(f[0]),
+        'Linea': f[1],
+        'Llamadas': nc,
+        'Tiempo_Propio_s': tt,
+        'Tiempo_Acumulado_s': ct,
+    } for f, (cc, nc, tt, ct, callers) in estadisticas.items()]
+    df = pd.DataFrame(filas, columns=list(COLUMNAS_PERFIL))
+    return df.sort_values(clave, ascending=False, ignore_index=True).head(n)
+
+
+def reporte(estadisticas, n=TOP_N, orden=ORDEN):
+    """Texto de pstats ordenado por `orden` con las `n` primeras funciones."""
+    if not estadisticas:
+        return "Sin datos de perfil (ningún día perfilado).\n"
+    stats = _pstats(estadisticas)
+    stats.sort_stats(orden).print_stats(n)
+    return stats.stream.getvalue()
+
+
+def guardar(estadisticas, prefijo, n=TOP_N, orden=ORDEN):
+    """Escribe <prefijo>.prof (pstats), <prefijo>.txt (top-N) y <prefijo>.collapsed; retorna las rutas."""
+    rutas = {'prof': f"{prefijo}.prof", 'txt': f"{prefijo}.txt", 'collapsed': f"{prefijo}.collapsed"}
+    _pstats(estadisticas or {}).dump_stats(rutas['prof'])
+    with open(rutas['txt'], 'w', encoding='utf-8') as f:
+        f.write(reporte(estadisticas, n, orden))
+    with open(rutas['collapsed'], 'w', encoding='utf-8') as f:
+        f.write(pilas_colapsadas(estadisticas or {}))
+    return rutas
+
+
+def tabla_vacia():
+    return pd.DataFrame({
+        'Funcion': pd.Series([], dtype=str),
+        'Archivo': pd.Series([], dtype=str),
+        'Linea': pd.Series([], dtype='int64'),
+        'Llamadas': pd.Series([], dtype='int64'),
+        'Tiempo_Propio_s': pd.Series([], dtype='float64'),
+        'Tiempo_Acumulado_s': pd.Series([], dtype='float64'),
+    })
+
+
+def pilas_colapsadas(stats, max_profundidad=MAX_PROFUNDIDAD_PILA, min_us=MIN_MICROSEGUNDOS_PILA):
+    """
+    Reconstruye pilas desde el grafo llamador -> llamado de pstats. cProfile no
+    guarda pilas completas: el tiempo de cada arista se reparte hacia abajo en
+    proporción al tiempo acumulado que llega por esa ruta (aproximación estándar
+    de los conversores de cProfile a flamegraph). Las recursiones se cortan.
+    """
+    hijos = {}
+    for funcion, (_, _, _, _, llamadores) in stats.items():
+        for llamador, (_, _, _, ct_arista) in llamadores.items():
+            hijos.setdefault(llamador, []).append((funcion, ct_arista))
+    raices = [f for f, datos in stats.items() if not datos[4]]
+
+    acumulado = {}
+    pendientes = [((raiz,), stats[raiz][3]) for raiz in raices]
+    while pendientes:
+        pila, ct_ruta = pendientes.pop()
+        funcion = pila[-1]
+        _, _, tt, ct, _ = stats[funcion]
+        proporcion = ct_ruta / ct if ct > 0 else 0.0
+        propio_us = tt * proporcion * 1e6
+        if propio_us >= min_us:
+            clave = ';'.join(nombre_funcion(f) for f in pila)
+            acumulado[clave] = acumulado.get(clave, 0.0) + propio_us
+        if len(pila) >= max_profundidad:
+            continue
+        for hijo, ct_arista in hijos.get(funcion, ()):
+            if hijo in pila or ct_arista * proporcion * 1e6 < min_us:
+                continue
+            pendientes.append((pila + (hijo,), ct_arista * proporcion))
+
+    return ''.join(f"{pila} {int(round(us))}\n" for pila, us in sorted(acumulado.items()))
@@ -0,0 +1,242 @@
+"""
+Módulo de Políticas de Inventario
+Optimiza por SKU los parámetros (s, S) de reposición: punto de reorden `s` y
+nivel objetivo `S`. Simula en bloque muchas políticas candidatas sobre una traza
+de demanda diaria, con una recursión de inventario de un escalón vectorizada en
+NumPy (eje de políticas × eje de SKUs, bucle por día). Para cada SKU elige la
+política de menor costo (mantención + quiebre + órdenes) que cumple el fill rate
+objetivo y la escribe en el maestro de productos.
+"""
+import random
+
+import numpy as np
+import pandas as pd
+
+from .demanda import generar_demanda_diaria
+
+FILL_RATE_OBJETIVO = 0.95
+TASA_MANTENCION_ANUAL = 0.25      # Costo de mantener inventario, fracción del costo unitario por año
+COSTO_POR_ORDEN = 25.0            # Soles por orden de compra emitida
+FACTORES_SEGURIDAD = np.linspace(-0.5, 3.0, 8)         # z del punto de reorden: s = µL + z·σ√L
+DIAS_COBERTURA_LOTE = (1, 2, 3, 5, 7, 10, 14, 21, 30)  # S - s en días de demanda media
+MAX_CELDAS = 4_000_000            # Tamaño del bloque (políticas × SKUs × días de tránsito)
+COLUMNAS_POLITICAS = ('Punto_Reorden', 'Stock_Objetivo', 'Q_Lote_Optimo', 'Fill_Rate', 'Costo',
+                      'Fill_Rate_Actual', 'Costo_Actual', 'Cumple_Objetivo')
+
+
+# ============================================================================
+# TRAZAS DE DEMANDA
+# ============================================================================
+
+def traza_desde_resultados(resultados, skus=None):
+    """
+    Demanda diaria solicitada por SKU de una corrida de run_simulation.
+    Retorna un DataFrame (índice Dia 1..n_dias, una columna por SKU).
+    """
+    lineas = resultados['df_lineas_pedido']
+    fechas = resultados['df_pedidos'].set_index('ID_Pedido')['Fecha']
+    demanda = pd.DataFrame({
+        'Dia': lineas['ID_Pedido'].astype(str).map(fechas).to_numpy(),
+        'SKU': lineas['SKU'].astype(str).to_numpy(),
+        'Cantidad': lineas['Cant_Solicitada'].to_numpy(),
+    })
+    n_dias = resultados['config']['n_dias']
+    skus = list(dict.fromkeys(demanda['SKU'])) if skus is None else list(skus)
+    traza = demanda.pivot_table(index='Dia', columns='SKU', values='Cantidad', aggfunc='sum', fill_value=0)
+    return traza.reindex(index=range(1, n_dias + 1), columns=skus, fill_value=0).astype('int64')
+
+
+def generar_traza(n_dias, escenario="normal", semilla=None, skus=None, demanda_diaria=generar_demanda_diaria):
+    """
+    Traza de demanda generada con el mismo generador que la simulación (con un
+    generador propio inicializado con `semilla`, sin tocar los globales).
+    """
+    rng = random.Random(semilla)
+    filas = {}
+    for dia in range(1, n_dias + 1):
+        del_dia = filas.setdefault(dia, {})
+        for pedido in demanda_diaria(dia, escenario, rng):
+            for item in pedido['items']:
+                del_dia[item['sku']] = del_dia.get(item['sku'], 0) + item['cantidad']
+    traza = pd.DataFrame.from_dict(filas, orient='index').fillna(0)
+    traza.index.name = 'Dia'
+    if skus is not None:
+        traza = traza.reindex(columns=list(skus), fill_value=0)
+    return traza.astype('int64')
+
+
+# ============================================================================
+# SIMULACIÓN VECTORIZADA DE POLÍTICAS
+# ============================================================================
+
+def simular_politicas(demanda, lead_time, s, S, lote_minimo=0, stock_inicial=None):
+    """
+    Recursión de inventario de un escalón para P políticas × K SKUs a la vez.
+    Cada día: llegan las órdenes, se atiende la demanda con el stock físico (lo no
+    atendido es venta perdida) y, si la posición (físico + tránsito) queda bajo `s`,
+    se ordena max(lote_minimo, S - posición), que llega `lead_time` días después
+    (la misma regla que GestionInventario.verificar_reposicion).
+
+    Args:
+        demanda: (D, K) unidades por día y SKU.
+        lead_time: (K,) días de reposición (mínimo 1).
+        s, S: (P, K) punto de reorden y nivel objetivo por política y SKU.
+        lote_minimo: escalar, (K,) o (P, K).
+        stock_inicial: stock físico inicial (por defecto S).
+
+    Returns:
+        dict de arrays (P, K): 'inventario' (unidades·día al cierre), 'ventas',
+        'perdidas' y 'ordenes'.
+    """
+    demanda = np.asarray(demanda, dtype=np.int64)
+    lead_time = np.maximum(np.asarray(lead_time, dtype=np.int64), 1)
+    s = np.asarray(s, dtype=np.int64)
+    S = np.asarray(S, dtype=np.int64)
+    n_politicas, n_skus = s.shape
+    lote = np.broadcast_to(np.asarray(lote_minimo, dtype=np.int64), s.shape)
+
+    fisico = (S if stock_inicial is None else np.broadcast_to(stock_inicial, s.shape)).astype(np.int64).copy()
+    transito = np.zeros_like(fisico)
+    # Anillo de llegadas: posición (día + lead_time) % R de cada SKU
+    n_anillo = int(lead_time.max()) + 1
+    llegadas = np.zeros((n_anillo, n_politicas, n_skus), dtype=np.int64)
+    columnas = np.arange(n_skus)
+
+    inventario = np.zeros(s.shape, dtype=np.int64)
+    ventas = np.zeros(s.shape, dtype=np.int64)
+    ordenes = np.zeros(s.shape, dtype=np.int64)
+    for dia in range(len(demanda)):
+        ranura = dia % n_anillo
+        fisico += llegadas[ranura]
+        transito -= llegadas[ranura]
+        llegadas[ranura] = 0
+
+        vendido = np.minimum(fisico, demanda[dia])
+        fisico -= vendido
+        ventas += vendido
+        inventario += fisico
+
+        posicion = fisico + transito
+        pedir = np.where(posicion < s, np.maximum(lote, S - posicion), 0)
+        transito += pedir
+        ordenes += pedir > 0
+        llegadas[(dia + lead_time) % n_anillo, :, columnas] += pedir.T
+
+    return {
+        'inventario': inventario,
+        'ventas': ventas,
+        'perdidas': demanda.sum(axis=0) - ventas,
+        'ordenes': ordenes,
+    }
+
+
+def politicas_candidatas(demanda, lead_time, factores_seguridad=FACTORES_SEGURIDAD,
+                         dias_cobertura=DIAS_COBERTURA_LOTE):
+    """
+    Rejilla de candidatos (P, K) a partir de la media y desviación diaria de cada SKU:
+    s = µL + z·σ√L para cada z, S = s + µ·días de cobertura para cada cobertura.
+    """
+    demanda = np.asarray(demanda, dtype=np.float64)
+    media = demanda.mean(axis=0)
+    desviacion = demanda.std(axis=0)
+    lead_time = np.maximum(np.asarray(lead_time, dtype=np.float64), 1)
+
+    z = np.repeat(np.asarray(factores_seguridad, dtype=np.float64), len(dias_cobertura))[:, None]
+    cobertura = np.tile(np.asarray(dias_cobertura, dtype=np.float64), len(factores_seguridad))[:, None]
+    s = np.maximum(np.ceil(media * lead_time + z * desviacion * np.sqrt(lead_time)), 0)
+    S = s + np.maximum(np.ceil(media * cobertura), 1)
+    return s.astype(np.int64), S.astype(np.int64)
+
+
+def costos_politicas(resultado, costo_mantencion, costo_quiebre, costo_orden=COSTO_POR_ORDEN):
+    """Costo total (P, K): mantención por unidad·día + quiebre por unidad perdida + costo por orden."""
+    return (resultado['inventario'] * costo_mantencion
+            + resultado['perdidas'] * costo_quiebre
+            + resultado['ordenes'] * costo_orden)
+
+
+# ============================================================================
+# OPTIMIZADOR
+# ============================================================================
+
+def optimizar_politicas(df_productos, traza, fill_rate_objetivo=FILL_RATE_OBJETIVO,
+                        tasa_mantencion_anual=TASA_MANTENCION_ANUAL, costo_orden=COSTO_POR_ORDEN,
+                        costo_quiebre=None, factores_seguridad=FACTORES_SEGURIDAD,
+                        dias_cobertura=DIAS_COBERTURA_LOTE, max_celdas=MAX_CELDAS):
+    """
+    Elige por SKU el (s, S) de menor costo con fill rate >= objetivo sobre la traza
+    (si ninguno lo cumple, el de mayor fill rate). También evalúa la política
+    vigente del maestro (Punto_Reorden, Stock_Objetivo, Q_Lote_Optimo como lote mínimo).
+
+    Args:
+        df_productos: Maestro (GestionInventario.df_productos) indexado por SKU.
+        traza: DataFrame de demanda diaria (columnas SKU), ver generar_traza / traza_desde_resultados.
+        costo_quiebre: Costo por unidad perdida (por defecto el margen Precio_Venta - Costo_Unitario).
+
+    Returns:
+        DataFrame indexado por SKU con COLUMNAS_POLITICAS. Q_Lote_Optimo = S - s,
+        de modo que la regla max(Q, S - posición) de verificar_reposicion ordena hasta S.
+    """
+    productos = df_productos.reindex(traza.columns)
+    if productos['Lead_Time'].isna().any():
+        faltantes = productos.index[productos['Lead_Time'].isna()].tolist()
+        raise ValueError(f"SKUs de la traza sin maestro: {faltantes[:5]}")
+    demanda = traza.to_numpy(dtype=np.int64)
+    lead_time = productos['Lead_Time'].to_numpy(dtype=np.int64)
+    costo_mantencion = productos['Costo_Unitario'].to_numpy(dtype=np.float64) * tasa_mantencion_anual / 365
+    if costo_quiebre is None:
+        costo_quiebre = (productos['Precio_Venta'] - productos['Costo_Unitario']).clip(lower=0).to_numpy(np.float64)
+    costo_quiebre = np.broadcast_to(np.asarray(costo_quiebre, dtype=np.float64), lead_time.shape)
+    total_demanda = demanda.sum(axis=0)
+
+    s, S = politicas_candidatas(demanda, lead_time, factores_seguridad, dias_cobertura)
+    n_politicas, n_skus = s.shape
+    tamano_bloque = max(max_celdas // (n_politicas * (int(lead_time.max()) + 2)), 1)
+
+    elegidas = {col: np.zeros(n_skus) for col in ('s', 'S', 'fill', 'costo')}
+    for inicio in range(0, n_skus, tamano_bloque):
+        k = slice(inicio, inicio + tamano_bloque)
+        resultado = simular_politicas(demanda[:, k], lead_time[k], s[:, k], S[:, k])
+        costo = costos_politicas(resultado, costo_mantencion[k], costo_quiebre[k], costo_orden)
+        fill = _fill_rate(resultado['ventas'], total_demanda[k])
+        cumple = fill >= fill_rate_objetivo
+        # Entre las que cumplen, la de menor costo; si ninguna cumple, la de mayor fill rate
+        puntaje = np.where(cumple, costo, np.inf)
+        mejor = np.where(cumple.any(axis=0), puntaje.argmin(axis=0), fill.argmax(axis=0))
+        columnas = np.arange(mejor.size)
+        elegidas['s'][k] = s[:, k][mejor, columnas]
+        elegidas['S'][k] = S[:, k][mejor, columnas]
+        elegidas['fill'][k] = fill[mejor, columnas]
+        elegidas['costo'][k] = costo[mejor, columnas]
+
+    actual = simular_politicas(
+        demanda, lead_time,
+        productos['Punto_Reorden'].to_numpy(dtype=np.int64)[None, :],
+        productos['Stock_Objetivo'].to_numpy(dtype=np.int64)[None, :],
+        lote_minimo=productos['Q_Lote_Optimo'].to_numpy(dtype=np.int64))
+
+    punto_reorden = elegidas['s'].astype(np.int64)
+    stock_objetivo = elegidas['S'].astype(np.int64)
+    return pd.DataFrame({
+        'Punto_Reorden': punto_reorden,
+        'Stock_Objetivo': stock_objetivo,
+        'Q_Lote_Optimo': stock_objetivo - punto_reorden,
+        'Fill_Rate': elegidas['fill'],
+        'Costo': elegidas['costo'],
+        'Fill_Rate_Actual': _fill_rate(actual['ventas'], total_demanda)[0],
+        'Costo_Actual': costos_politicas(actual, costo_mantencion, costo_quiebre, costo_orden)[0],
+        'Cumple_Objetivo': elegidas['fill'] >= fill_rate_objetivo,
+    }, index=pd.Index(traza.columns, name='ID_Producto'))
+
+
+def _fill_rate(ventas, total_demanda):
+    """Fill rate (P, K); 1.0 para SKUs sin demanda en la traza."""
+    return np.divide(ventas, total_demanda, out=np.ones(ventas.shape), where=total_demanda > 0)
+
+
+def aplicar_politicas(df_productos, politicas):
+    """Escribe Punto_Reorden, Stock_Objetivo y Q_Lote_Optimo de `politicas` en el maestro (en el lugar)."""
+    columnas = ['Punto_Reorden', 'Stock_Objetivo', 'Q_Lote_Optimo']
+    comunes = politicas.index.intersection(df_productos.index)
+    df_productos.loc[comunes, columnas] = politicas.loc[comunes, columnas].astype(df_productos[columnas].dtypes)
+    return df_productos
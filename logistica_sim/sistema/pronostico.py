@@ -0,0 +1,228 @@
+"""
+Módulo de Pronóstico de Demanda
+Pronósticos de demanda diaria por SKU vectorizados sobre todo el catálogo:
+promedio móvil, suavizado exponencial simple, Holt (nivel + tendencia) y
+Croston (SKUs intermitentes), más un modo combinado que usa Croston o Holt
+según la intermitencia observada. Cada día se actualizan en O(n_skus) con la
+demanda del día, y alimentan puntos de reorden dinámicos:
+    ROP = demanda pronosticada en el lead time + z · σ · √lead_time
+"""
+import numpy as np
+
+Z_SERVICIO = 1.65          # Factor de seguridad (~95% de nivel de servicio por ciclo)
+ALFA_ERROR = 0.1           # Suavizado del error cuadrático (σ del pronóstico)
+MIN_OBSERVACIONES = 7      # Días de historia antes de usar puntos de reorden dinámicos
+UMBRAL_INTERMITENCIA = 1.32  # Intervalo medio entre demandas (ADI) desde el que un SKU es intermitente
+
+
+def vector_demanda(pedidos, indice):
+    """Unidades solicitadas por SKU en una lista de pedidos, como arreglo en el orden de `indice` (sku -> posición)."""
+    posiciones, cantidades = [], []
+    for pedido in pedidos:
+        for item in pedido['items']:
+            i = indice.get(item['sku'])
+            if i is not None:
+                posiciones.append(i)
+                cantidades.append(item['cantidad'])
+    return np.bincount(np.asarray(posiciones, dtype=np.int64), weights=np.asarray(cantidades, dtype=np.float64),
+                       minlength=len(indice))
+
+
+class Pronosticador:
+    """
+    Base: estado por SKU en arreglos (mismo orden que `skus`) y error del
+    pronóstico a un día suavizado exponencialmente. Las subclases implementan
+    _actualizar(demanda) y pronostico(horizonte).
+    """
+
+    metodo = None
+
+    def __init__(self, skus, alfa_error=ALFA_ERROR, min_observaciones=MIN_OBSERVACIONES):
+        self.skus = list(skus)
+        self.indice = {sku: i for i, sku in enumerate(self.skus)}
+        self.alfa_error = alfa_error
+        self.min_observaciones = min_observaciones
+        self.n_observaciones = 0
+        self.error_cuadratico = np.zeros(len(self.skus))
+
+    @property
+    def listo(self):
+        """True cuando hay historia suficiente para confiar en el pronóstico."""
+        return self.n_observaciones >= self.min_observaciones
+
+    def vector_demanda(self, pedidos):
+        """Unidades solicitadas por SKU (en el orden de `skus`) en una lista de pedidos."""
+        return vector_demanda(pedidos, self.indice)
+
+    def actualizar(self, demanda):
+        """Incorpora la demanda de un día (arreglo por SKU)."""
+        demanda = np.asarray(demanda, dtype=np.float64)
+        if self.n_observaciones:
+            error = demanda - self.pronostico()
+            self.error_cuadratico += self.alfa_error * (error * error - self.error_cuadratico)
+        self._actualizar(demanda)
+        self.n_observaciones += 1
+
+    def _actualizar(self, demanda):
+        raise NotImplementedError
+
+    def pronostico(self, horizonte=1):
+        """Demanda esperada del día t + horizonte, por SKU."""
+        raise NotImplementedError
+
+    def demanda_periodo(self, dias):
+        """Demanda esperada acumulada en los próximos `dias` (escalar o arreglo por SKU)."""
+        return self.pronostico() * np.asarray(dias, dtype=np.float64)
+
+    def desviacion(self):
+        """Desviación estándar del error del pronóstico a un día."""
+        return np.sqrt(self.error_cuadratico)
+
+    def punto_reorden(self, lead_time, z=Z_SERVICIO):
+        """Punto de reorden dinámico por SKU: demanda del lead time + z·σ·√lead_time."""
+        lead_time = np.maximum(np.asarray(lead_time, dtype=np.float64), 1)
+        return np.maximum(self.demanda_periodo(lead_time) + z * self.desviacion() * np.sqrt(lead_time), 0)
+
+
+class PromedioMovil(Pronosticador):
+    """Promedio de los últimos `ventana` días (suma móvil sobre un búfer circular)."""
+
+    metodo = 'promedio_movil'
+
+    def __init__(self, skus, ventana=7, **kwargs):
+        super().__init__(skus, **kwargs)
+        self.ventana = ventana
+        self._historia = np.zeros((ventana, len(self.skus)))
+        self._suma = np.zeros(len(self.skus))
+
+    def _actualizar(self, demanda):
+        fila = self.n_observaciones % self.ventana
+        self._suma += demanda - self._historia[fila]
+        self._historia[fila] = demanda
+
+    def pronostico(self, horizonte=1):
+        return self._suma / max(min(self.n_observaciones, self.ventana), 1)
+
+
+class SuavizadoExponencial(Pronosticador):
+    """Suavizado exponencial simple: nivel += alfa · (demanda - nivel)."""
+
+    metodo = 'ses'
+
+    def __init__(self, skus, alfa=0.3, **kwargs):
+        super().__init__(skus, **kwargs)
+        self.alfa = alfa
+        self.nivel = np.zeros(len(self.skus))
+
+    def _actualizar(self, demanda):
+        if self.n_observaciones == 0:
+            self.nivel[:] = demanda
+        else:
+            self.nivel += self.alfa * (demanda - self.nivel)
+
+    def pronostico(self, horizonte=1):
+        return self.nivel.copy()
+
+
+class Holt(Pronosticador):
+    """Suavizado exponencial doble de Holt (nivel y tendencia); pronóstico no negativo."""
+
+    metodo = 'holt'
+
+    def __init__(self, skus, alfa=0.3, beta=0.1, **kwargs):
+        super().__init__(skus, **kwargs)
+        self.alfa = alfa
+        self.beta = beta
+        self.nivel = np.zeros(len(self.skus))
+        self.tendencia = np.zeros(len(self.skus))
+
+    def _actualizar(self, demanda):
+        if self.n_observaciones == 0:
+            self.nivel[:] = demanda
+            return
+        nivel_previo = self.nivel
+        self.nivel = self.alfa * demanda + (1 - self.alfa) * (nivel_previo + self.tendencia)
+        self.tendencia = self.beta * (self.nivel - nivel_previo) + (1 - self.beta) * self.tendencia
+
+    def pronostico(self, horizonte=1):
+        return np.maximum(self.nivel + horizonte * self.tendencia, 0)
+
+    def demanda_periodo(self, dias):
+        # Suma de nivel + h·tendencia para h = 1..dias
+        dias = np.asarray(dias, dtype=np.float64)
+        return np.maximum(self.nivel * dias + self.tendencia * dias * (dias + 1) / 2, 0)
+
+
+class Croston(Pronosticador):
+    """
+    Croston para demanda intermitente: suaviza por separado el tamaño de la
+    demanda no nula y el intervalo entre demandas; pronóstico = tamaño / intervalo
+    (con la corrección de Syntetos-Boylan, SBA, si `sba`).
+    """
+
+    metodo = 'croston'
+
+    def __init__(self, skus, alfa=0.1, sba=True, **kwargs):
+        super().__init__(skus, **kwargs)
+        self.alfa = alfa
+        self.sba = sba
+        self.tamano = np.zeros(len(self.skus))
+        self.intervalo = np.ones(len(self.skus))
+        self._desde_ultima = np.zeros(len(self.skus))
+        self._n_demandas = np.zeros(len(self.skus), dtype=np.int64)
+
+    def _actualizar(self, demanda):
+        self._desde_ultima += 1
+        hay = demanda > 0
+        # Peso 1 en la primera demanda (inicializa), alfa en las siguientes, 0 sin demanda
+        peso = np.where(hay & (self._n_demandas == 0), 1.0, self.alfa * hay)
+        self.tamano += peso * (demanda - self.tamano)
+        self.intervalo += peso * (self._desde_ultima - self.intervalo)
+        self._desde_ultima *= ~hay
+        self._n_demandas += hay
+
+    def pronostico(self, horizonte=1):
+        factor = 1 - self.alfa / 2 if self.sba else 1.0
+        return factor * self.tamano / self.intervalo
+
+    def intervalo_medio(self):
+        """ADI observado: días de historia por día con demanda (inf si nunca hubo demanda)."""
+        return np.divide(self.n_observaciones, self._n_demandas, out=np.full(len(self.skus), np.inf),
+                         where=self._n_demandas > 0)
+
+
+class PronosticoCombinado(Pronosticador):
+    """
+    Croston para los SKUs intermitentes (ADI >= `umbral`) y Holt para el resto;
+    la clasificación se recalcula con cada actualización.
+    """
+
+    metodo = 'auto'
+
+    def __init__(self, skus, umbral=UMBRAL_INTERMITENCIA, alfa=0.3, beta=0.1, alfa_croston=0.1, **kwargs):
+        super().__init__(skus, **kwargs)
+        self.umbral = umbral
+        self.holt = Holt(self.skus, alfa=alfa, beta=beta)
+        self.croston = Croston(self.skus, alfa=alfa_croston)
+        self.intermitente = np.zeros(len(self.skus), dtype=bool)
+
+    def _actualizar(self, demanda):
+        self.holt.actualizar(demanda)
+        self.croston.actualizar(demanda)
+        self.intermitente = self.croston.intervalo_medio() >= self.umbral
+
+    def pronostico(self, horizonte=1):
+        return np.where(self.intermitente, self.croston.pronostico(horizonte), self.holt.pronostico(horizonte))
+
+    def demanda_periodo(self, dias):
+        return np.where(self.intermitente, self.croston.demanda_periodo(dias), self.holt.demanda_periodo(dias))
+
+
+METODOS = {clase.metodo: clase for clase in (PromedioMovil, SuavizadoExponencial, Holt, Croston, PronosticoCombinado)}
+
+
+def crear_pronosticador(metodo, skus, **parametros):
+    """Pronosticador `metodo` ('promedio_movil', 'ses', 'holt', 'croston' o 'auto') para `skus`."""
+    if metodo not in METODOS:
+        raise ValueError(f"Método de pronóstico desconocido: {metodo}. Opciones: {list(METODOS)}")
+    return METODOS[metodo](skus, **parametros)
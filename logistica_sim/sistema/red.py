@@ -0,0 +1,487 @@
+"""
+Módulo de Red de Almacenes
+Simulación multi-almacén: cada nodo (centro de distribución) tiene su propio
+GestionInventario y GestionTransporte con su flota. Un coordinador genera la
+demanda, asigna cada pedido a un almacén según reglas de abastecimiento por
+zona (con respaldo si el primario no tiene stock) y planifica transferencias
+entre nodos. Los nodos se simulan uno tras otro o, a pedido, en procesos de
+trabajo en paralelo, y solo se sincronizan al cierre de cada día (estado de
+stock y transferencias enviadas).
+"""
+import contextlib
+import functools
+import math
+import multiprocessing
+import os
+import random
+import traceback
+
+import numpy as np
+import pandas as pd
+
+from . import esquemas, indicadores
+from .catalogos import dic_almacenes, FACTOR_CIRCUITO, catalogos_simulacion, version_catalogos
+from .demanda import generar_demanda_diaria
+from .flota import duracion_viaje, TURNO_INICIO_H, TURNO_FIN_H
+from .inventario import GestionInventario
+from .transporte import GestionTransporte
+
+METODO_INICIO = 'spawn'   # Método de inicio de los procesos de trabajo (ver multiprocessing)
+TABLAS_NODO = ('df_pedidos', 'df_lineas_pedido', 'df_kardex', 'df_compras', 'df_despachos',
+               'ventas_perdidas', 'historial_backlog')
+
+
+# ============================================================================
+# CONFIGURACIÓN DE LA RED
+# ============================================================================
+
+def repartir_flota(almacenes, flota=None):
+    """
+    Flota de cada almacén ({id: formato dic_flota}). Los almacenes con 'flota'
+    usan esos IDs de `flota` (por defecto dic_flota); los vehículos no asignados
+    se reparten en ronda entre los almacenes sin 'flota'.
+    """
+    flota = catalogos_simulacion()['dic_flota'] if flota is None else flota
+    asignada = {aid: {} for aid in almacenes}
+    usados = set()
+    for aid, info in almacenes.items():
+        for vid in info.get('flota') or ():
+            if vid not in flota:
+                raise ValueError(f"Vehículo {vid} del almacén {aid} no existe en la flota")
+            asignada[aid][vid] = flota[vid]
+            usados.add(vid)
+    sin_flota = [aid for aid, info in almacenes.items() if not info.get('flota')]
+    libres = [vid for vid in flota if vid not in usados]
+    for i, vid in enumerate(libres if sin_flota else ()):
+        asignada[sin_flota[i % len(sin_flota)]][vid] = flota[vid]
+    return asignada
+
+
+def reglas_abastecimiento(almacenes, coordenadas_zonas=None, max_almacenes=None):
+    """
+    Regla por defecto: cada zona se abastece desde los almacenes ordenados por
+    distancia (el primero es el primario, los siguientes son respaldo).
+    """
+    coordenadas_zonas = catalogos_simulacion()['dic_coordenadas_zonas'] if coordenadas_zonas is None else coordenadas_zonas
+    reglas = {}
+    for zona, (x, y) in coordenadas_zonas.items():
+        orden = sorted(almacenes, key=lambda aid: math.dist((x, y), almacenes[aid]['coordenadas']))
+        reglas[zona] = orden[:max_almacenes] if max_almacenes else orden
+    return reglas
+
+
+def dias_transferencia(origen, destino):
+    """Días de tránsito entre dos almacenes (mínimo 1): duración del viaje sobre el turno operativo."""
+    distancia = math.dist(origen, destino) * FACTOR_CIRCUITO
+    return max(math.ceil(duracion_viaje(distancia, 1) / (TURNO_FIN_H - TURNO_INICIO_H)), 1)
+
+
+# ============================================================================
+# NODO (ALMACÉN)
+# ============================================================================
+
+class NodoAlmacen:
+    """
+    Un almacén de la red con su inventario, su flota y su propio generador
+    aleatorio, random.Random(f"{semilla}:{id}") (el resultado no depende de cómo
+    se repartan los nodos en procesos).
+    """
+
+    def __init__(self, id_almacen, coordenadas, flota, escenario="normal", estrategia_empaque="ffd",
+                 semilla=None, catalogos=None):
+        self.id = id_almacen
+        self.escenario = escenario
+        self.rng = random.Random(None if semilla is None else f"{semilla}:{id_almacen}")
+        self.gestion = GestionInventario(rng=self.rng, catalogos=catalogos)
+        self.transporte = GestionTransporte(estrategia_empaque, flota=flota, origen=coordenadas, catalogos=catalogos)
+        self.registros = []   # Filas de df_pedidos
+        self.lineas = {'ID_Pedido': [], 'SKU': [], 'Cant_Solicitada': [], 'Cant_Entregada': []}
+        self.zona_pedido = {}  # ID_Pedido -> Zona_ID (para transportar los pedidos de backlog)
+        self.transferencias_en_camino = []
+
+    def maestro(self):
+        """Parámetros de reposición por SKU (en el orden de df_inventario)."""
+        productos = self.gestion.df_productos.reindex(self.gestion.df_inventario.index)
+        return {
+            'skus': productos.index.tolist(),
+            'stock_seguridad': productos['Stock_Seguridad'].to_numpy(dtype=np.int64, copy=True),
+            'stock_objetivo': productos['Stock_Objetivo'].to_numpy(dtype=np.int64, copy=True),
+        }
+
+    def estado(self):
+        """Stock disponible y posición de inventario por SKU al cierre del día."""
+        inventario = self.gestion.df_inventario
+        return {
+            'disponible': inventario['Stock_Disponible'].to_numpy(dtype=np.int64, copy=True),
+            'posicion': inventario['Posicion_Inventario'].to_numpy(dtype=np.int64, copy=True),
+        }
+
+    def simular_dia(self, dia, pedidos, salidas, entradas):
+        """
+        Un día del almacén. `salidas`: transferencias a enviar hoy; `entradas`:
+        transferencias enviadas ayer por otros almacenes hacia este. Retorna el
+        estado de cierre y las salidas con la cantidad realmente enviada.
+        """
+        gestion = self.gestion
+        gestion.recibir_ordenes_compra(dia)
+
+        for transferencia in entradas:
+            gestion.registrar_transferencia_entrante(transferencia)
+            self.transferencias_en_camino.append(transferencia)
+        en_camino = []
+        for transferencia in self.transferencias_en_camino:
+            if transferencia['Fecha_Arribo'] <= dia:
+                gestion.recibir_transferencia(transferencia, dia)
+            else:
+                en_camino.append(transferencia)
+        self.transferencias_en_camino = en_camino
+
+        enviadas = [dict(t, Cantidad=gestion.enviar_transferencia(t, dia)) for t in salidas]
+
+        # Backlog primero, agrupado por pedido para transporte
+        pedidos_para_transporte = {}
+        for item in gestion.atender_backlog(dia):
+            pid = item['id_pedido']
+            if pid not in pedidos_para_transporte:
+                pedidos_para_transporte[pid] = {'id_pedido': pid, 'cliente': item['cliente'], 'items': [],
+                                                'zona': self.zona_pedido.get(pid, 'General')}
+            pedidos_para_transporte[pid]['items'].append({'sku': item['sku'], 'cantidad': item['cantidad']})
+        pedidos_para_transporte = list(pedidos_para_transporte.values())
+
+        for pedido in pedidos:
+            registro, entregado_por_sku, pedido_transporte = gestion.procesar_pedido(pedido, dia)
+            registro['Respaldo'] = pedido.get('respaldo', False)
+            self.registros.append(registro)
+            self.zona_pedido[pedido['id_pedido']] = pedido['zona_id']
+            for item in pedido['items']:
+                self.lineas['ID_Pedido'].append(pedido['id_pedido'])
+                self.lineas['SKU'].append(item['sku'])
+                self.lineas['Cant_Solicitada'].append(item['cantidad'])
+                self.lineas['Cant_Entregada'].append(entregado_por_sku.get(item['sku'], 0))
+            if pedido_transporte is not None:
+                pedidos_para_transporte.append(pedido_transporte)
+
+        self.transporte.planificar_despachos(dia, pedidos_para_transporte, gestion.df_productos)
+        gestion.verificar_reposicion(dia, self.escenario)
+        return {'enviadas': enviadas, **self.estado()}
+
+    def resultados(self):
+        """Tablas finales del almacén (mismos esquemas que run_simulation, más 'Respaldo' en df_pedidos)."""
+        tablas = self.gestion.obtener_tablas_finales()
+        return {
+            'df_pedidos': esquemas.construir_tabla('df_pedidos', self.registros),
+            'df_lineas_pedido': esquemas.construir_tabla('df_lineas_pedido', self.lineas),
+            'df_kardex': tablas['df_kardex'],
+            'df_compras': tablas['df_compras'],
+            'df_despachos': self.transporte.obtener_despachos_df(),
+            'ventas_perdidas': esquemas.construir_tabla('ventas_perdidas', self.gestion.ventas_perdidas),
+            'historial_backlog': esquemas.construir_tabla('historial_backlog', self.gestion.historial_backlog),
+            'df_estado_actual': tablas['df_estado_actual'],
+        }
+
+
+# ============================================================================
+# EJECUTORES: NODOS EN EL PROCESO ACTUAL O EN PROCESOS DE TRABAJO
+# ============================================================================
+
+class _EjecutorLocal:
+    """Todos los nodos en el proceso actual, uno tras otro."""
+
+    def __init__(self, especificaciones):
+        self.nodos = {aid: NodoAlmacen(**spec) for aid, spec in especificaciones.items()}
+
+    def llamar(self, metodo, argumentos=None):
+        """{id_nodo: nodo.metodo(*argumentos[id_nodo])} para todos los nodos."""
+        return {aid: getattr(nodo, metodo)(*(argumentos[aid] if argumentos else ()))
+                for aid, nodo in self.nodos.items()}
+
+    def cerrar(self):
+        pass
+
+
+def _trabajador(conexion, especificaciones):
+    """Proceso de trabajo: mantiene sus nodos y atiende llamadas hasta recibir None."""
+    try:
+        nodos = {aid: NodoAlmacen(**spec) for aid, spec in especificaciones.items()}
+        conexion.send(('ok', None))
+        while True:
+            mensaje = conexion.recv()
+            if mensaje is None:
+                break
+            metodo, argumentos = mensaje
+            conexion.send(('ok', {aid: getattr(nodo, metodo)(*(argumentos[aid] if argumentos else ()))
+                                  for aid, nodo in nodos.items()}))
+    except Exception:
+        conexion.send(('error', traceback.format_exc()))
+    finally:
+        conexion.close()
+
+
+class _EjecutorProcesos:
+    """
+    Nodos repartidos en `n_procesos` procesos creados con el método de inicio
+    `metodo_inicio` (por defecto 'spawn': los trabajadores no heredan estado del
+    proceso padre; los catálogos de la corrida viajan en la especificación de cada
+    nodo). Cada llamada se envía a todos los procesos antes de esperar respuestas,
+    por lo que los nodos avanzan en paralelo.
+    """
+
+    def __init__(self, especificaciones, n_procesos, metodo_inicio=METODO_INICIO):
+        contexto = multiprocessing.get_context(metodo_inicio)
+        ids = list(especificaciones)
+        self.grupos = [ids[i::n_procesos] for i in range(n_procesos)]
+        self.procesos, self.conexiones = [], []
+        for grupo in self.grupos:
+            propia, remota = contexto.Pipe()
+            proceso = contexto.Process(target=_trabajador, args=(remota, {aid: especificaciones[aid] for aid in grupo}),
+                                       daemon=True)
+            proceso.start()
+            remota.close()
+            self.procesos.append(proceso)
+            self.conexiones.append(propia)
+        for conexion in self.conexiones:
+            self._recibir(conexion)
+
+    @staticmethod
+    def _recibir(conexion):
+        estado, contenido = conexion.recv()
+        if estado == 'error':
+            raise RuntimeError(f"Error en un proceso de la red:\n{contenido}")
+        return contenido
+
+    def llamar(self, metodo, argumentos=None):
+        for grupo, conexion in zip(self.grupos, self.conexiones):
+            conexion.send((metodo, {aid: argumentos[aid] for aid in grupo} if argumentos else None))
+        respuestas = {}
+        for conexion in self.conexiones:
+            respuestas.update(self._recibir(conexion))
+        return respuestas
+
+    def cerrar(self):
+        for conexion, proceso in zip(self.conexiones, self.procesos):
+            with contextlib.suppress(OSError):
+                conexion.send(None)
+            conexion.close()
+            proceso.join(timeout=5)
+            if proceso.is_alive():
+                proceso.terminate()
+
+
+# ============================================================================
+# COORDINADOR
+# ============================================================================
+
+def asignar_pedidos(pedidos, reglas, disponible, indice_sku, ids):
+    """
+    Asigna cada pedido al primer almacén de la regla de su zona que cubre todas sus
+    líneas con el stock disponible proyectado (que se descuenta); si ninguno puede,
+    al primario. Marca pedido['respaldo'] si no se atendió desde el primario.
+    Retorna {id_almacen: [pedidos]}.
+    """
+    posicion = {aid: i for i, aid in enumerate(ids)}
+    asignados = {aid: [] for aid in ids}
+    for pedido in pedidos:
+        candidatos = [posicion[a] for a in reglas.get(pedido['zona_id'], ids) if a in posicion] or list(range(len(ids)))
+        skus = np.fromiter((indice_sku[i['sku']] for i in pedido['items']), dtype=np.int64)
+        cantidades = np.fromiter((i['cantidad'] for i in pedido['items']), dtype=np.int64)
+        elegido = next((c for c in candidatos if (disponible[c, skus] >= cantidades).all()), candidatos[0])
+        disponible[elegido, skus] = np.maximum(disponible[elegido, skus] - cantidades, 0)
+        pedido['respaldo'] = elegido != candidatos[0]
+        asignados[ids[elegido]].append(pedido)
+    return asignados
+
+
+def planificar_transferencias(estado, maestro, ids, coordenadas, dia, contador):
+    """
+    Transferencias de balanceo al cierre del día: un almacén con disponible bajo el
+    stock de seguridad recibe, desde el almacén más cercano con disponible sobre
+    el stock objetivo, lo necesario para llevar su posición al objetivo (sin dejar
+    al origen bajo su objetivo). Retorna la lista de transferencias a enviar mañana.
+    """
+    disponible = np.array([estado[aid]['disponible'] for aid in ids])
+    posicion = np.array([estado[aid]['posicion'] for aid in ids])
+    seguridad, objetivo = maestro['stock_seguridad'], maestro['stock_objetivo']
+    exceso = np.maximum(disponible - objetivo, 0)
+
+    transferencias = []
+    for n, k in zip(*np.nonzero(disponible < seguridad)):
+        necesidad = objetivo[k] - posicion[n, k]
+        donantes = [m for m in np.flatnonzero(exceso[:, k] > 0) if m != n]
+        donantes.sort(key=lambda m: math.dist(coordenadas[ids[m]], coordenadas[ids[n]]))
+        for m in donantes:
+            if necesidad <= 0:
+                break
+            cantidad = int(min(necesidad, exceso[m, k]))
+            exceso[m, k] -= cantidad
+            necesidad -= cantidad
+            posicion[n, k] += cantidad
+            transferencias.append(_transferencia(contador, dia, ids[m], ids[n], maestro['skus'][k], cantidad,
+                                                 'Balanceo', coordenadas))
+            contador += 1
+    return transferencias
+
+
+def _transferencia(numero, dia_envio, origen, destino, sku, cantidad, motivo, coordenadas):
+    return {
+        'ID_Transferencia': f"TR-{numero:05d}",
+        'Fecha_Creacion': dia_envio,
+        'Origen': origen,
+        'Destino': destino,
+        'Producto': sku,
+        'Cantidad_Solicitada': int(cantidad),
+        'Cantidad': int(cantidad),
+        'Fecha_Arribo': dia_envio + dias_transferencia(coordenadas[origen], coordenadas[destino]),
+        'Motivo': motivo,
+    }
+
+
+def simular_red(n_dias, escenario="normal", estrategia_empaque="ffd", semilla=None, almacenes=None,
+                reglas=None, transferencias=(), balancear=True, procesos=1, carga=None, catalogos=None,
+                metodo_inicio=METODO_INICIO):
+    """
+    Simula la red de almacenes día a día.
+
+    Args:
+        almacenes: {id: {'nombre', 'coordenadas', 'flota': [IDs de dic_flota] (opcional)}};
+            por defecto catalogos.dic_almacenes.
+        reglas: {zona: [almacén primario, respaldos...]}; por defecto, por distancia (reglas_abastecimiento).
+        transferencias: Transferencias manuales [{'Fecha', 'Origen', 'Destino', 'Producto', 'Cantidad'}],
+            enviadas el día 'Fecha'.
+        balancear: Planifica transferencias de balanceo al cierre de cada día.
+        procesos: 1 (por defecto) o 0 simula todos los nodos en el proceso actual; N > 1 los
+            reparte en N procesos de trabajo; None usa uno por almacén hasta os.cpu_count().
+            El resultado es el mismo.
+        metodo_inicio: Método de inicio de los procesos de trabajo ('spawn', 'forkserver' o 'fork').
+        carga: CargaSintetica (ver carga.py); sin 'flota' en los almacenes, su flota se reparte entre ellos.
+        catalogos: Catálogos de la corrida (catalogos.catalogos_simulacion); por defecto los del
+            módulo o, con `carga`, carga.catalogos(). Viajan a cada nodo en su especificación.
+
+    Returns:
+        Diccionario con las tablas de la red (con columna 'Almacen'), df_transferencias,
+        df_kpis_diarios y metricas_globales de la red, y df_kpis_almacen por nodo.
+    """
+    if catalogos is None:
+        catalogos = catalogos_simulacion() if carga is None else carga.catalogos()
+    if almacenes is None:
+        almacenes = dic_almacenes
+        if carga is not None:
+            # Los IDs de flota del catálogo no existen en la carga: se reparte su flota
+            almacenes = {aid: {k: v for k, v in info.items() if k != 'flota'} for aid, info in almacenes.items()}
+    reglas = reglas_abastecimiento(almacenes, catalogos['dic_coordenadas_zonas']) if reglas is None else reglas
+    ids = list(almacenes)
+    coordenadas = {aid: tuple(info['coordenadas']) for aid, info in almacenes.items()}
+    flotas = repartir_flota(almacenes, catalogos['dic_flota'])
+    if carga is None:
+        demanda_diaria = functools.partial(generar_demanda_diaria, catalogos=catalogos)
+    else:
+        demanda_diaria = carga.generar_demanda_diaria
+    especificaciones = {
+        aid: {'id_almacen': aid, 'coordenadas': coordenadas[aid], 'flota': flotas[aid], 'escenario': escenario,
+              'estrategia_empaque': estrategia_empaque, 'semilla': semilla, 'catalogos': catalogos}
+        for aid in ids
+    }
+    if procesos is None:
+        procesos = min(len(ids), os.cpu_count() or 1)
+    procesos = min(int(procesos), len(ids))
+    rng = random.Random(semilla)   # Demanda del coordinador
+
+    if procesos > 1:
+        ejecutor = _EjecutorProcesos(especificaciones, procesos, metodo_inicio)
+    else:
+        ejecutor = _EjecutorLocal(especificaciones)
+    try:
+        maestro = next(iter(ejecutor.llamar('maestro').values()))
+        indice_sku = {sku: k for k, sku in enumerate(maestro['skus'])}
+        estado = ejecutor.llamar('estado')
+
+        contador = 1
+        programadas = {}   # día -> transferencias a enviar ese día
+        for t in sorted(transferencias, key=lambda t: t['Fecha']):
+            if t['Origen'] not in coordenadas or t['Destino'] not in coordenadas or t['Origen'] == t['Destino']:
+                raise ValueError(f"Transferencia inválida entre '{t['Origen']}' y '{t['Destino']}'")
+            if t['Producto'] not in indice_sku:
+                raise ValueError(f"Producto desconocido en transferencia: {t['Producto']}")
+            programadas.setdefault(t['Fecha'], []).append(
+                _transferencia(contador, t['Fecha'], t['Origen'], t['Destino'], t['Producto'], t['Cantidad'],
+                               'Manual', coordenadas))
+            contador += 1
+        registro_transferencias = []
+        entradas = {aid: [] for aid in ids}
+
+        for dia in range(1, n_dias + 1):
+            pedidos = demanda_diaria(dia, escenario, rng)
+            salidas = {aid: [] for aid in ids}
+            for t in programadas.pop(dia, []):
+                salidas[t['Origen']].append(t)
+
+            # Stock proyectado del cierre anterior, sin lo que sale hoy en transferencias
+            disponible = np.array([estado[aid]['disponible'] for aid in ids])
+            for aid, lista in salidas.items():
+                for t in lista:
+                    k = indice_sku[t['Producto']]
+                    disponible[ids.index(aid), k] -= t['Cantidad_Solicitada']
+            asignados = asignar_pedidos(pedidos, reglas, disponible, indice_sku, ids)
+
+            estado = ejecutor.llamar('simular_dia', {aid: (dia, asignados[aid], salidas[aid], entradas[aid])
+                                                     for aid in ids})
+
+            # Sincronización de cierre: transferencias enviadas -> entradas de mañana en el destino
+            entradas = {aid: [] for aid in ids}
+            for aid in ids:
+                for t in estado[aid]['enviadas']:
+                    registro_transferencias.append(t)
+                    if t['Cantidad'] > 0:
+                        entradas[t['Destino']].append(t)
+            if balancear and dia < n_dias:
+                # Las enviadas hoy aún no figuran en la posición del destino
+                for aid in ids:
+                    for t in entradas[aid]:
+                        estado[aid]['posicion'][indice_sku[t['Producto']]] += t['Cantidad']
+                nuevas = planificar_transferencias(estado, maestro, ids, coordenadas, dia + 1, contador)
+                contador += len(nuevas)
+                programadas.setdefault(dia + 1, []).extend(nuevas)
+
+        por_nodo = ejecutor.llamar('resultados')
+    finally:
+        ejecutor.cerrar()
+
+    return _consolidar(por_nodo, registro_transferencias, ids, n_dias, {
+        'n_dias': n_dias, 'escenario': escenario, 'estrategia_empaque': estrategia_empaque, 'semilla': semilla,
+        'almacenes': {aid: dict(almacenes[aid], flota=list(flotas[aid])) for aid in ids},
+        'reglas': reglas, 'balancear': balancear, 'procesos': procesos,
+        'metodo_inicio': metodo_inicio if procesos > 1 else None,
+        'version_catalogos': version_catalogos(catalogos),
+        'carga': None if carga is None else carga.descripcion(),
+    })
+
+
+def _consolidar(por_nodo, registro_transferencias, ids, n_dias, config):
+    """Une las tablas de los nodos (columna 'Almacen') y calcula los KPIs de la red y por almacén."""
+    resultados = {'config': config}
+    for nombre in TABLAS_NODO:
+        partes = [por_nodo[aid][nombre].assign(Almacen=aid) for aid in ids]
+        df = esquemas.construir_tabla(nombre, pd.concat(partes, ignore_index=True))
+        df['Almacen'] = pd.Categorical(df['Almacen'] if 'Almacen' in df else [], categories=ids)
+        resultados[nombre] = df
+    resultados['df_transferencias'] = esquemas.construir_tabla('df_transferencias', registro_transferencias)
+
+    dias = range(1, n_dias + 1)
+    resultados['df_kpis_diarios'], resultados['metricas_globales'] = indicadores.calcular_kpis(
+        resultados['df_pedidos'], resultados['ventas_perdidas'], resultados['df_despachos'], dias=dias)
+
+    filas = []
+    for aid in ids:
+        tablas = por_nodo[aid]
+        _, metricas = indicadores.calcular_kpis(tablas['df_pedidos'], tablas['ventas_perdidas'],
+                                                tablas['df_despachos'], dias=dias)
+        estado = tablas['df_estado_actual']
+        filas.append({
+            'Almacen': aid,
+            **metricas,
+            'pedidos_respaldo': int(tablas['df_pedidos']['Respaldo'].sum()) if len(tablas['df_pedidos']) else 0,
+            'valor_inventario': float((estado['Stock_Fisico'] * estado['Costo_Unitario']).sum()),
+        })
+    resultados['df_kpis_almacen'] = pd.DataFrame(filas).set_index('Almacen')
+    resultados['metricas_globales']['valor_total_inventario'] = float(
+        resultados['df_kpis_almacen']['valor_inventario'].sum())
+    return resultados
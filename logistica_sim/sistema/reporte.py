@@ -2,10 +2,17 @@
 Módulo de Reporte Consolidado
 Genera reportes finales consolidados y PDFs.
 Consolida: reporte.py + generador_pdf.py
+El PDF se arma con agregados ya calculados (KPIs, cubo, eventos de alerta) y puede
+generarse en un hilo de trabajo con caché por huella del resultado.
 """
 from fpdf import FPDF
 import pandas as pd
 import tempfile
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from . import indicadores
 
 
 # ============================================================================
@@ -89,85 +96,184 @@ class PDFReport(FPDF):
         self.ln()
 
 
+COLUMNAS_RESUMEN_ALERTAS = ['Tipo', 'Nivel', 'Aperturas', 'Cierres', 'Primer_Dia', 'Ultimo_Dia', 'Entidades']
+
+# Presupuesto de la sección de alertas (filas de tabla de 7 mm en una página A4)
+PAGINAS_MAX_ALERTAS = 1
+FILAS_POR_PAGINA = 30
+
+
+def preparar_datos_reporte(resultados):
+    """
+    Reúne las entradas del reporte a partir de los agregados ya calculados por
+    run_simulation (KPIs del motor de indicadores, cubo, eventos de alerta), sin
+    volver a recorrer las tablas de pedidos.
+    """
+    metricas_globales = resultados.get('metricas_globales', {})
+    if 'df_kpis_diarios' in resultados and 'otif_global' in metricas_globales:
+        kpis_diarios, kpis_globales = resultados['df_kpis_diarios'], metricas_globales
+    else:
+        kpis_diarios, kpis_globales = indicadores.calcular_kpis_resultados(resultados)
+
+    # Días pico de demanda
+    dias_pico = (kpis_diarios.loc[kpis_diarios['total_pedidos'] > 0, 'unidades_solicitadas']
+                 .sort_values(ascending=False).head(3).index.tolist())
+
+    # Productos con mayor backlog (del cubo si está disponible)
+    if 'cubo_kpis' in resultados and resultados['cubo_kpis'].n_celdas > 0:
+        backlog_sku = resultados['cubo_kpis'].consolidar('sku')['unidades_backlog']
+        productos_backlog = backlog_sku[backlog_sku > 0].sort_values(ascending=False).head(3).index.tolist()
+    elif 'historial_backlog' in resultados and not resultados['historial_backlog'].empty:
+        productos_backlog = (resultados['historial_backlog'].groupby('Producto')['Cantidad_Pendiente'].sum()
+                             .sort_values(ascending=False).head(3).index.tolist())
+    else:
+        productos_backlog = []
+
+    # Estado final del inventario (primeros 10 SKUs)
+    estado_final = None
+    if resultados['resultados_diarios'] and 'estado_inventario' in resultados['resultados_diarios'][-1]:
+        estado_final = resultados['resultados_diarios'][-1]['estado_inventario'].join(
+            resultados['df_productos'][['Nombre_Producto', 'Stock_Seguridad']]
+        ).head(10)
+
+    return {
+        'config': resultados['config'],
+        'kpis_globales': kpis_globales,
+        'valor_total_inventario': metricas_globales.get('valor_total_inventario', 0.0),
+        'resumen_alertas': resumir_alertas(resultados),
+        'alertas_activas': resultados.get('alertas_activas', pd.DataFrame()),
+        'dias_pico': dias_pico,
+        'productos_backlog': productos_backlog,
+        'estado_final': estado_final
+    }
+
+
+def resumir_alertas(resultados):
+    """
+    Condensa las alertas por tipo: eventos, aperturas, cierres, entidades afectadas
+    y rango de días. Acepta los eventos de `df_alertas` o, si no existen, las
+    alertas guardadas en resultados_diarios.
+    """
+    df_alertas = resultados.get('df_alertas')
+    if df_alertas is None:
+        df_alertas = pd.DataFrame([
+            a if isinstance(a, dict) else {'Fecha': d['dia'], 'Tipo': 'General', 'Mensaje': str(a), 'Nivel': '-'}
+            for d in resultados['resultados_diarios'] for a in d['alertas']
+        ])
+    if df_alertas.empty:
+        return pd.DataFrame(columns=COLUMNAS_RESUMEN_ALERTAS)
+
+    df = df_alertas.copy()
+    if 'Evento' not in df.columns:
+        df['Evento'] = 'Apertura'
+    if 'Entidad' not in df.columns:
+        df['Entidad'] = '-'
+    elif 'Regla' in df.columns:
+        # Las alertas de KPI se identifican por su regla (otif_bajo, fill_rate_bajo, ...)
+        df['Entidad'] = df['Entidad'].where(df['Entidad'] != 'KPI', df['Regla'])
+    df['Es_Apertura'] = df['Evento'] == 'Apertura'
+    df['Es_Cierre'] = df['Evento'] == 'Cierre'
+
+    resumen = df.groupby('Tipo', sort=False).agg(
+        Nivel=('Nivel', 'first'),
+        Aperturas=('Es_Apertura', 'sum'),
+        Cierres=('Es_Cierre', 'sum'),
+        Primer_Dia=('Fecha', 'min'),
+        Ultimo_Dia=('Fecha', 'max'),
+        Entidades=('Entidad', lambda e: ", ".join(map(str, pd.unique(e))))
+    ).reset_index()
+    return resumen.sort_values('Aperturas', ascending=False, kind='stable')[COLUMNAS_RESUMEN_ALERTAS]
+
+
 def generar_pdf(resultados):
+    """Genera el reporte PDF (bytes) de un resultado de run_simulation."""
+    return renderizar_pdf(preparar_datos_reporte(resultados))
+
+
+def renderizar_pdf(datos):
+    """Renderiza el PDF a partir de las entradas de `preparar_datos_reporte`."""
     pdf = PDFReport()
     pdf.add_page()
+    agregar_secciones(pdf, datos)
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def agregar_secciones(pdf, datos):
+    """Escribe las secciones 1-6 del reporte de un resultado en la página actual del PDF."""
+    kpis_globales = datos['kpis_globales']
     
     # 1. Configuración
     pdf.chapter_title("1. Configuracion de la Simulacion")
     config_text = (
-        f"Escenario: {resultados['config']['escenario']}\n"
-        f"Dias Simulados: {resultados['config']['n_dias']}\n"
+        f"Escenario: {datos['config']['escenario']}\n"
+        f"Dias Simulados: {datos['config']['n_dias']}\n"
     )
     pdf.chapter_body(config_text)
     
     # 2. Métricas Globales
     pdf.chapter_title("2. Indicadores Clave de Desempeno (KPIs)")
     
-    # Calcular KPIs globales (mismo método que Tablero de Control)
-    df_pedidos = resultados['df_pedidos']
-    
-    # OTIF y Fill Rate globales
-    total_pedidos = len(df_pedidos['ID_Pedido'].unique())
-    total_unidades = df_pedidos['Cant_Solicitada'].sum()
-    fill_rate_global = (df_pedidos['Cant_Entregada'].sum() / total_unidades * 100) if total_unidades > 0 else 0
-    
-    pedidos_agrupados = df_pedidos.groupby('ID_Pedido').agg({
-        'Cant_Solicitada': 'sum',
-        'Cant_Entregada': 'sum'
-    })
-    pedidos_perfectos = pedidos_agrupados[pedidos_agrupados['Cant_Solicitada'] == pedidos_agrupados['Cant_Entregada']]
-    otif_global = (len(pedidos_perfectos) / total_pedidos * 100) if total_pedidos > 0 else 0
-    
-    # Backlog y Utilización Flota (promedios diarios están bien para estos)
-    kpis_diarios = pd.DataFrame([d['kpis'] for d in resultados['resultados_diarios']]).fillna(0)
-    
     metricas = {
-        "OTIF (Pedidos Perfectos)": f"{otif_global:.1f}%",
-        "Fill Rate (Volumen)": f"{fill_rate_global:.1f}%",
-        "Backlog Rate Promedio": f"{kpis_diarios['backlog_rate'].mean():.1f}%",
-        "Utilizacion Flota Promedio": f"{kpis_diarios['utilizacion_flota'].mean():.1f}%",
-        "Valor Inventario Final": f"S/ {resultados['metricas_globales']['valor_total_inventario']:,.2f}"
+        "OTIF (Pedidos Perfectos)": f"{kpis_globales['otif_global']:.1f}%",
+        "Fill Rate (Volumen)": f"{kpis_globales['fill_rate_global']:.1f}%",
+        "Backlog Rate Promedio": f"{kpis_globales['backlog_rate_promedio']:.1f}%",
+        "Utilizacion Flota Promedio": f"{kpis_globales['utilizacion_flota_promedio']:.1f}%",
+        "Valor Inventario Final": f"S/ {datos['valor_total_inventario']:,.2f}"
     }
     pdf.add_kpi_table(metricas)
     
-    # 3. Alertas
+    # 3. Alertas (resumen por tipo, acotado a PAGINAS_MAX_ALERTAS)
     pdf.chapter_title("3. Resumen de Alertas")
-    hay_alertas = False
-    for d in resultados['resultados_diarios']:
-        if d['alertas']:
-            hay_alertas = True
-            pdf.set_font('Arial', 'B', 10)
-            pdf.cell(0, 10, f"Dia {d['dia']}:", 0, 1)
-            pdf.set_font('Arial', '', 10)
-            for alerta in d['alertas']:
-                pdf.cell(10) # Indent
-                # Manejar alertas como dict o string
-                if isinstance(alerta, dict):
-                    mensaje = alerta.get('Mensaje', str(alerta))
-                else:
-                    mensaje = str(alerta)
-                pdf.multi_cell(0, 10, f"- {mensaje}")
+    resumen_alertas = datos['resumen_alertas']
     
-    if not hay_alertas:
+    if resumen_alertas.empty:
         pdf.chapter_body("No se registraron alertas durante la simulacion.")
+    else:
+        filas_disponibles = PAGINAS_MAX_ALERTAS * FILAS_POR_PAGINA - 1  # Menos la cabecera
+        cols = ['Tipo', 'Nivel', 'Aperturas', 'Cierres', 'Dias', 'Entidades']
+        anchos = [40, 18, 20, 18, 20, 74]
+        
+        pdf.set_font('Arial', 'B', 8)
+        for col, ancho in zip(cols, anchos):
+            pdf.cell(ancho, 7, col, 1)
+        pdf.ln()
+        
+        pdf.set_font('Arial', '', 8)
+        for row in resumen_alertas.head(filas_disponibles).itertuples(index=False):
+            pdf.cell(anchos[0], 7, str(row.Tipo)[:24], 1)
+            pdf.cell(anchos[1], 7, str(row.Nivel), 1)
+            pdf.cell(anchos[2], 7, str(int(row.Aperturas)), 1)
+            pdf.cell(anchos[3], 7, str(int(row.Cierres)), 1)
+            pdf.cell(anchos[4], 7, f"{row.Primer_Dia}-{row.Ultimo_Dia}", 1)
+            pdf.cell(anchos[5], 7, _recortar(row.Entidades, 48), 1)
+            pdf.ln()
+        filas_disponibles -= min(len(resumen_alertas), filas_disponibles)
+        
+        omitidos = len(resumen_alertas) - (PAGINAS_MAX_ALERTAS * FILAS_POR_PAGINA - 1)
+        if omitidos > 0:
+            pdf.cell(0, 7, f"... {omitidos} tipos de alerta adicionales omitidos.", 0, 1)
+        
+        # Alertas abiertas al final, con el espacio restante del presupuesto
+        alertas_activas = datos['alertas_activas']
+        if not alertas_activas.empty and filas_disponibles > 1:
+            pdf.ln(2)
+            pdf.set_font('Arial', 'B', 8)
+            pdf.cell(0, 7, f"Alertas abiertas al cierre: {len(alertas_activas)}", 0, 1)
+            pdf.set_font('Arial', '', 8)
+            for row in alertas_activas.head(filas_disponibles - 1).itertuples(index=False):
+                pdf.cell(0, 7, f"- {row.Tipo} ({row.Entidad}) desde el dia {row.Dia_Apertura}", 0, 1)
+        pdf.ln()
         
     # 4. Resumen de Operaciones
     pdf.chapter_title("4. Resumen de Operaciones")
     
     # Cálculos para el resumen
-    total_pedidos_cnt = len(df_pedidos['ID_Pedido'].unique())
-    total_solicitado = df_pedidos['Cant_Solicitada'].sum()
-    total_entregado = df_pedidos['Cant_Entregada'].sum()
-    
-    total_perdido = 0
-    if 'ventas_perdidas' in resultados and not resultados['ventas_perdidas'].empty:
-        total_perdido = resultados['ventas_perdidas']['Cantidad_Perdida'].sum()
-        
-    backlog_total_unidades = total_solicitado - total_entregado - total_perdido
-    if backlog_total_unidades < 0: backlog_total_unidades = 0
-        
-    porcentaje_backlog = (backlog_total_unidades / total_solicitado * 100) if total_solicitado > 0 else 0
+    total_pedidos_cnt = kpis_globales['total_pedidos']
+    total_solicitado = kpis_globales['total_unidades']
+    total_entregado = kpis_globales['unidades_entregadas']
+    total_perdido = kpis_globales['unidades_perdidas']
+    backlog_total_unidades = kpis_globales['backlog_unidades']
+    porcentaje_backlog = kpis_globales['backlog_rate_global']
     
     resumen_texto = (
         f"Total pedidos recibidos: {total_pedidos_cnt}\n"
@@ -197,33 +303,28 @@ def generar_pdf(resultados):
             recomendaciones.append(f"- Ventas perdidas detectadas ({tasa_perdida:.1f}%). Monitorear cobertura de inventario.")
     
     # Análisis de OTIF
-    otif_promedio = kpis_diarios['otif'].mean() if 'otif' in kpis_diarios.columns else 0
+    otif_promedio = kpis_globales['otif_promedio']
     if otif_promedio < 80:
         recomendaciones.append(f"- OTIF bajo ({otif_promedio:.1f}%). Incrementar capacidad de picking o mejorar gestion de inventario.")
     elif otif_promedio < 90:
         recomendaciones.append(f"- OTIF moderado ({otif_promedio:.1f}%). Revisar procesos de alistamiento.")
     
     # Análisis de Utilización de Flota
-    utilizacion_flota = kpis_diarios['utilizacion_flota'].mean() if 'utilizacion_flota' in kpis_diarios.columns else 0
+    utilizacion_flota = kpis_globales['utilizacion_flota_promedio']
     if utilizacion_flota < 60:
         recomendaciones.append(f"- Baja utilizacion de flota ({utilizacion_flota:.1f}%). Consolidar rutas o reasignar pedidos entre zonas.")
     elif utilizacion_flota > 90:
         recomendaciones.append(f"- Flota cerca del limite ({utilizacion_flota:.1f}%). Considerar ampliar capacidad de transporte.")
     
     # Análisis de Días Pico (Peak Days)
-    demanda_por_dia = df_pedidos.groupby('Fecha')['Cant_Solicitada'].sum().sort_values(ascending=False)
-    if len(demanda_por_dia) > 0:
-        top_3_dias = demanda_por_dia.head(3)
-        if len(top_3_dias) > 0:
-            dias_pico_str = ", ".join([f"Dia {int(dia)}" for dia in top_3_dias.index])
-            recomendaciones.append(f"- Dias de mayor demanda: {dias_pico_str}. Reforzar personal de picking en estos dias.")
+    if datos['dias_pico']:
+        dias_pico_str = ", ".join([f"Dia {int(dia)}" for dia in datos['dias_pico']])
+        recomendaciones.append(f"- Dias de mayor demanda: {dias_pico_str}. Reforzar personal de picking en estos dias.")
     
     # Análisis de Productos Críticos
-    if 'historial_backlog' in resultados and not resultados['historial_backlog'].empty:
-        productos_backlog = resultados['historial_backlog'].groupby('Producto')['Cantidad_Pendiente'].sum().sort_values(ascending=False).head(3)
-        if len(productos_backlog) > 0:
-            productos_str = ", ".join(productos_backlog.index)
-            recomendaciones.append(f"- Productos con mayor backlog: {productos_str}. Priorizar reaprovisionamiento.")
+    if datos['productos_backlog']:
+        productos_str = ", ".join(datos['productos_backlog'])
+        recomendaciones.append(f"- Productos con mayor backlog: {productos_str}. Priorizar reaprovisionamiento.")
     
     # Recomendación general sobre política FIFO
     recomendaciones.append("- Sistema utiliza politica FIFO estricta para backlog (atencion equitativa por orden de llegada).")
@@ -236,27 +337,92 @@ def generar_pdf(resultados):
     # 6. Resumen de Inventario
     pdf.chapter_title("6. Estado Final del Inventario")
     
-    if resultados['resultados_diarios']:
-        ultimo_dia = resultados['resultados_diarios'][-1]
-        if 'estado_inventario' in ultimo_dia:
-            df_final = ultimo_dia['estado_inventario'].join(
-                resultados['df_productos'][['Nombre_Producto', 'Stock_Seguridad']]
-            ).head(10)
-            
-            pdf.set_font('Arial', 'B', 8)
-            cols = ['Producto', 'Nombre', 'Stock_Fisico', 'Stock_Disponible']
-            anchos = [40, 60, 30, 30]
-            
-            for i, col in enumerate(cols):
-                pdf.cell(anchos[i], 8, col, 1)
+    df_final = datos['estado_final']
+    if df_final is not None:
+        pdf.set_font('Arial', 'B', 8)
+        cols = ['Producto', 'Nombre', 'Stock_Fisico', 'Stock_Disponible']
+        anchos = [40, 60, 30, 30]
+        
+        for i, col in enumerate(cols):
+            pdf.cell(anchos[i], 8, col, 1)
+        pdf.ln()
+        
+        pdf.set_font('Arial', '', 8)
+        for index, row in df_final.iterrows():
+            pdf.cell(anchos[0], 8, str(index)[:30], 1)
+            pdf.cell(anchos[1], 8, str(row.get('Nombre_Producto', 'N/A'))[:30], 1)
+            pdf.cell(anchos[2], 8, str(int(row['Stock_Fisico'])), 1)
+            pdf.cell(anchos[3], 8, str(int(row['Stock_Disponible'])), 1)
             pdf.ln()
-            
-            pdf.set_font('Arial', '', 8)
-            for index, row in df_final.iterrows():
-                pdf.cell(anchos[0], 8, str(index)[:30], 1)
-                pdf.cell(anchos[1], 8, str(row.get('Nombre_Producto', 'N/A'))[:30], 1)
-                pdf.cell(anchos[2], 8, str(int(row['Stock_Fisico'])), 1)
-                pdf.cell(anchos[3], 8, str(int(row['Stock_Disponible'])), 1)
-                pdf.ln()
-    
-    return pdf.output(dest='S').encode('latin-1')
+
+
+def _recortar(texto, largo):
+    texto = str(texto)
+    return texto if len(texto) <= largo else texto[:largo - 3] + "..."
+
+
+# ============================================================================
+# GENERACIÓN EN SEGUNDO PLANO Y CACHÉ
+# ============================================================================
+
+MAX_REPORTES_CACHE = 8
+
+_cache_pdf = OrderedDict()   # huella -> bytes (LRU)
+_en_curso = {}               # huella -> Future
+_bloqueo = threading.Lock()
+_ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reporte_pdf")
+
+
+def huella_resultados(resultados):
+    """
+    Hash del resultado de simulación: configuración, métricas y tablas que alimentan
+    el reporte (KPIs diarios, eventos de alerta e inventario final).
+    """
+    h = hashlib.sha1()
+    h.update(repr(sorted(resultados.get('config', {}).items())).encode())
+    h.update(repr(sorted((k, str(v)) for k, v in resultados.get('metricas_globales', {}).items())).encode())
+
+    tablas = [resultados.get('df_kpis_diarios'), resultados.get('df_alertas'), resultados.get('df_pedidos')]
+    if resultados.get('resultados_diarios'):
+        tablas.append(resultados['resultados_diarios'][-1].get('estado_inventario'))
+    for df in tablas:
+        if df is None or df.empty:
+            h.update(b"-")
+            continue
+        columnas = [c for c in df.columns if df[c].dtype != object]  # Columnas con listas/dicts no son hashables
+        h.update(pd.util.hash_pandas_object(df[columnas], index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def generar_pdf_async(resultados, huella=None):
+    """
+    Genera el PDF en un hilo de trabajo y retorna un Future con los bytes.
+    Si el mismo resultado ya se generó (o se está generando), retorna de inmediato
+    el Future correspondiente. `huella` evita recalcular `huella_resultados` cuando
+    el llamador ya la tiene guardada junto al resultado.
+    """
+    clave = huella_resultados(resultados) if huella is None else huella
+    with _bloqueo:
+        if clave in _cache_pdf:
+            _cache_pdf.move_to_end(clave)
+            futuro = Future()
+            futuro.set_result(_cache_pdf[clave])
+            return futuro
+        if clave in _en_curso:
+            return _en_curso[clave]
+        futuro = _ejecutor.submit(_generar_y_cachear, clave, resultados)
+        _en_curso[clave] = futuro
+        return futuro
+
+
+def _generar_y_cachear(clave, resultados):
+    try:
+        pdf_bytes = generar_pdf(resultados)
+        with _bloqueo:
+            _cache_pdf[clave] = pdf_bytes
+            while len(_cache_pdf) > MAX_REPORTES_CACHE:
+                _cache_pdf.popitem(last=False)
+        return pdf_bytes
+    finally:
+        with _bloqueo:
+            _en_curso.pop(clave, None)
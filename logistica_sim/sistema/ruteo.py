@@ -0,0 +1,345 @@
+"""
+Módulo de Ruteo
+Matriz de distancias entre almacén y zonas (NumPy, cacheada) y construcción de
+rutas multi-parada con la heurística de ahorros de Clarke–Wright y mejora 2-opt.
+Las rutas pueden armarse por zona o sobre las coordenadas de cada cliente.
+Todas las heurísticas respetan un presupuesto de tiempo por día.
+"""
+import time
+import numpy as np
+from .catalogos import dic_coordenadas_zonas, COORDENADAS_ALMACEN, FACTOR_CIRCUITO
+
+ID_ALMACEN = "ALM"
+
+# Por encima de este número de pedidos, los ahorros se calculan solo contra los
+# vecinos más cercanos de cada pedido, buscados en una grilla sobre las coordenadas:
+# no se arma la matriz n x n (las distancias se calculan solo para esos pares y,
+# para el 2-opt, dentro de cada ruta).
+MAX_PEDIDOS_AHORROS_COMPLETOS = 1500
+VECINOS_AHORROS = 40
+
+
+def distancias(xy, factor_circuito=FACTOR_CIRCUITO):
+    """Matriz (km) entre los puntos de `xy` (n x 2): distancia euclidiana × factor de circuito vial."""
+    xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+    diferencias = xy[:, None, :] - xy[None, :, :]
+    return np.sqrt((diferencias ** 2).sum(axis=2)) * factor_circuito
+
+
+def distancias_pares(xy_a, xy_b, factor_circuito=FACTOR_CIRCUITO):
+    """Distancia (km) entre los puntos a[k] y b[k] (arrays n x 2), sin matriz."""
+    diferencias = np.asarray(xy_a, dtype=float) - np.asarray(xy_b, dtype=float)
+    return np.sqrt((diferencias ** 2).sum(axis=1)) * factor_circuito
+
+
+def vecinos_cercanos(xy, k):
+    """
+    Los k vecinos más cercanos de cada punto (array n x k de índices), buscados en
+    una grilla con ~k puntos por celda. Para cada celda se amplía el anillo de celdas
+    vecinas hasta que el k-ésimo candidato esté más cerca que cualquier punto fuera
+    del anillo, por lo que el resultado es exacto. Memoria O(n·k).
+    """
+    xy = np.asarray(xy, dtype=float)
+    n = len(xy)
+    k = min(k, n - 1)
+    n_celdas = max(int(np.sqrt(n / max(k, 1))), 1)
+    minimo = xy.min(axis=0)
+    lado = max(float((xy.max(axis=0) - minimo).max()) / n_celdas, 1e-9)
+    celda = np.minimum(((xy - minimo) / lado).astype(np.int64), n_celdas - 1)
+
+    # Puntos ordenados por celda: los de la celda c están en orden[inicio[c]:inicio[c + 1]]
+    clave = celda[:, 0] * n_celdas + celda[:, 1]
+    orden = np.argsort(clave, kind="stable")
+    inicio = np.searchsorted(clave[orden], np.arange(n_celdas * n_celdas + 1))
+
+    vecinos = np.empty((n, k), dtype=np.int64)
+    for c in np.unique(clave):
+        propios = orden[inicio[c]:inicio[c + 1]]
+        cx, cy = divmod(int(c), n_celdas)
+        anillo = 1
+        while True:
+            x0, x1 = max(cx - anillo, 0), min(cx + anillo, n_celdas - 1)
+            y0, y1 = max(cy - anillo, 0), min(cy + anillo, n_celdas - 1)
+            candidatos = np.concatenate([orden[inicio[x * n_celdas + y0]:inicio[x * n_celdas + y1 + 1]]
+                                         for x in range(x0, x1 + 1)])
+            cubre_todo = x0 == 0 and y0 == 0 and x1 == n_celdas - 1 and y1 == n_celdas - 1
+            if len(candidatos) > k or cubre_todo:
+                d = np.sqrt(((xy[propios][:, None, :] - xy[candidatos][None, :, :]) ** 2).sum(axis=2))
+                d[propios[:, None] == candidatos[None, :]] = np.inf   # Sin el propio punto
+                mas_cercanos = np.argpartition(d, k - 1, axis=1)[:, :k]
+                # Exacto si el k-ésimo vecino está dentro de la distancia garantizada por el anillo
+                if cubre_todo or d[np.arange(len(propios))[:, None], mas_cercanos].max() <= anillo * lado:
+                    vecinos[propios] = candidatos[mas_cercanos]
+                    break
+            anillo += 1
+    return vecinos
+
+
+def matriz_desde_coordenadas(xy):
+    """Matriz con el almacén en el índice 0 seguido de los puntos `xy` (relativos al almacén)."""
+    return distancias(np.vstack((COORDENADAS_ALMACEN, np.asarray(xy, dtype=float).reshape(-1, 2))))
+
+
+class MatrizDistancias:
+    """
+    Matriz de distancias (km) entre puntos con coordenadas planas.
+    Se calcula una sola vez con NumPy (distancia euclidiana × factor de circuito vial).
+    """
+
+    def __init__(self, coordenadas, factor_circuito=FACTOR_CIRCUITO):
+        self.ids = list(coordenadas.keys())
+        self.indice = {pid: i for i, pid in enumerate(self.ids)}
+
+        self.coordenadas = np.array([coordenadas[pid] for pid in self.ids], dtype=float).reshape(-1, 2)
+        self.matriz = distancias(self.coordenadas, factor_circuito)
+
+    def indices(self, ids):
+        """Convierte IDs de puntos en índices de la matriz (IDs desconocidos -> almacén)."""
+        idx_almacen = self.indice[ID_ALMACEN]
+        return np.fromiter((self.indice.get(pid, idx_almacen) for pid in ids), dtype=np.int64, count=len(ids))
+
+    def distancia(self, origen, destino):
+        return float(self.matriz[self.indices([origen])[0], self.indices([destino])[0]])
+
+
+_cache_matrices = {}
+
+def obtener_matriz_distancias(coordenadas_zonas=None):
+    """
+    Retorna la MatrizDistancias (almacén + zonas) cacheada por conjunto de coordenadas.
+    Por defecto usa `dic_coordenadas_zonas` del catálogo.
+    """
+    if coordenadas_zonas is None:
+        coordenadas_zonas = dic_coordenadas_zonas
+
+    clave = tuple(sorted((z, tuple(c)) for z, c in coordenadas_zonas.items()))
+    if clave not in _cache_matrices:
+        coordenadas = {ID_ALMACEN: COORDENADAS_ALMACEN, **coordenadas_zonas}
+        _cache_matrices[clave] = MatrizDistancias(coordenadas)
+    return _cache_matrices[clave]
+
+
+def coordenadas_desde(origen=None, coordenadas_zonas=None):
+    """
+    Coordenadas de las zonas relativas a un almacén ubicado en `origen` (por
+    defecto, el almacén central): la matriz siempre ubica al almacén en COORDENADAS_ALMACEN.
+    """
+    if coordenadas_zonas is None:
+        coordenadas_zonas = dic_coordenadas_zonas
+    if origen is None or tuple(origen) == tuple(COORDENADAS_ALMACEN):
+        return coordenadas_zonas
+    dx, dy = origen[0] - COORDENADAS_ALMACEN[0], origen[1] - COORDENADAS_ALMACEN[1]
+    return {z: (x - dx, y - dy) for z, (x, y) in coordenadas_zonas.items()}
+
+
+def longitud_ruta(ruta, matriz):
+    """Longitud de una ruta cerrada almacén -> paradas -> almacén (ruta en índices de la matriz)."""
+    if len(ruta) == 0:
+        return 0.0
+    recorrido = np.concatenate(([0], ruta, [0]))
+    return float(matriz[recorrido[:-1], recorrido[1:]].sum())
+
+
+def dos_opt(ruta, matriz, limite=None):
+    """
+    Mejora 2-opt (mejor mejora) de una ruta cerrada en el almacén (índice 0).
+    Cada iteración evalúa todos los pares (i, j) de forma vectorizada.
+
+    Args:
+        ruta: Secuencia de índices de paradas (sin el almacén).
+        matriz: Matriz de distancias con el almacén en el índice 0.
+        limite: Instante (perf_counter) a partir del cual se detiene la mejora.
+    """
+    recorrido = np.concatenate(([0], np.asarray(ruta, dtype=np.int64), [0]))
+    n = len(recorrido)
+    if n < 5:
+        return recorrido[1:-1]
+
+    i_idx, j_idx = np.triu_indices(n - 1, 2)
+    while limite is None or time.perf_counter() < limite:
+        a, b = recorrido[i_idx], recorrido[i_idx + 1]
+        c, d = recorrido[j_idx], recorrido[j_idx + 1]
+        delta = matriz[a, c] + matriz[b, d] - matriz[a, b] - matriz[c, d]
+
+        k = delta.argmin()
+        if delta[k] >= -1e-9:
+            break
+        i, j = i_idx[k], j_idx[k]
+        recorrido[i + 1:j + 1] = recorrido[i + 1:j + 1][::-1].copy()
+
+    return recorrido[1:-1]
+
+
+def _pares_ahorro(matriz):
+    """
+    Retorna los pares (i, j) de clientes (índices desde 1) ordenados por ahorro
+    s_ij = d0i + d0j - dij descendente, solo con ahorro positivo (todos los pares).
+    """
+    n = matriz.shape[0] - 1
+    i_idx, j_idx = np.triu_indices(n, 1)
+    ahorros = matriz[0, i_idx + 1] + matriz[0, j_idx + 1] - matriz[i_idx + 1, j_idx + 1]
+    return _ordenar_ahorros(i_idx, j_idx, ahorros)
+
+
+def _pares_ahorro_vecinos(xy, k=VECINOS_AHORROS):
+    """
+    Como `_pares_ahorro`, pero solo entre cada pedido y sus k vecinos más cercanos,
+    a partir de las coordenadas `xy` (n x 2, relativas al almacén): memoria O(n·k).
+    """
+    n = len(xy)
+    vecinos = vecinos_cercanos(xy, k)
+    i_idx = np.repeat(np.arange(n), vecinos.shape[1])
+    # Eliminar duplicados (i, j) / (j, i)
+    pares = np.unique(np.sort(np.column_stack((i_idx, vecinos.ravel())), axis=1), axis=0)
+    i_idx, j_idx = pares[:, 0], pares[:, 1]
+
+    almacen = np.asarray(COORDENADAS_ALMACEN, dtype=float)
+    d0 = distancias_pares(xy, np.broadcast_to(almacen, xy.shape))
+    ahorros = d0[i_idx] + d0[j_idx] - distancias_pares(xy[i_idx], xy[j_idx])
+    return _ordenar_ahorros(i_idx, j_idx, ahorros)
+
+
+def _ordenar_ahorros(i_idx, j_idx, ahorros):
+    orden = np.argsort(-ahorros, kind="stable")
+    orden = orden[ahorros[orden] > 0]
+    return i_idx[orden] + 1, j_idx[orden] + 1
+
+
+def clarke_wright(matriz, demandas, capacidad, limite=None, pares=None):
+    """
+    Heurística de ahorros de Clarke–Wright (versión paralela).
+
+    Args:
+        matriz: Matriz de distancias con el almacén en el índice 0 y un cliente por índice 1..n
+            (puede ser None si se pasan `pares`).
+        demandas: Array (n,) con la carga de cada cliente.
+        capacidad: Capacidad máxima de una ruta.
+        limite: Instante (perf_counter) a partir del cual se dejan de fusionar rutas.
+        pares: (pares_i, pares_j) ya ordenados por ahorro (p. ej. `_pares_ahorro_vecinos`).
+
+    Returns:
+        Lista de rutas; cada ruta es una lista de índices de cliente (1..n).
+    """
+    n = len(demandas)
+    ruta_de = np.arange(n + 1)
+    rutas = {i: [i] for i in range(1, n + 1)}
+    carga = np.concatenate(([0.0], np.asarray(demandas, dtype=float)))
+
+    pares_i, pares_j = _pares_ahorro(matriz) if pares is None else pares
+    for k, (i, j) in enumerate(zip(pares_i.tolist(), pares_j.tolist())):
+        if limite is not None and k % 1024 == 0 and time.perf_counter() >= limite:
+            break
+
+        ri, rj = ruta_de[i], ruta_de[j]
+        if ri == rj or carga[ri] + carga[rj] > capacidad:
+            continue
+
+        ruta_i, ruta_j = rutas[ri], rutas[rj]
+        # i debe quedar al final de su ruta y j al inicio de la suya
+        if ruta_i[-1] != i:
+            if ruta_i[0] != i:
+                continue
+            ruta_i.reverse()
+        if ruta_j[0] != j:
+            if ruta_j[-1] != j:
+                continue
+            ruta_j.reverse()
+
+        ruta_i.extend(ruta_j)
+        ruta_de[ruta_j] = ri
+        carga[ri] += carga[rj]
+        del rutas[rj]
+
+    return list(rutas.values())
+
+
+def construir_rutas(zonas, pesos, capacidades, matriz_distancias, limite=None, coordenadas=None):
+    """
+    Construye viajes multi-parada para los pedidos de un día:
+    1. Clarke–Wright sobre los pedidos (capacidad = vehículo más grande).
+    2. Asignación de rutas a vehículos: la ruta más pesada primero, al vehículo
+       libre más pequeño donde quepa (si no quedan libres, se reutiliza la flota).
+    3. Mejora 2-opt de cada ruta.
+
+    `coordenadas` (n x 2, relativas al almacén) ubica cada pedido en su cliente;
+    sin ellas, cada pedido se ubica en el centro de su zona (`matriz_distancias`).
+
+    Returns:
+        (viajes, sin_asignar) con el mismo formato que `empaque.empacar_dia`
+        ('zonas' en orden de visita).
+    """
+    pesos = np.asarray(pesos, dtype=float)
+    capacidades = np.asarray(capacidades, dtype=float)
+    capacidad_max = capacidades.max() if len(capacidades) else 0.0
+
+    rutables = np.flatnonzero(pesos <= capacidad_max)
+    sin_asignar = np.flatnonzero(pesos > capacidad_max).tolist()
+    if len(rutables) == 0:
+        return [], sin_asignar
+
+    if coordenadas is not None:
+        xy = np.asarray(coordenadas, dtype=float)[rutables]
+    else:
+        xy = matriz_distancias.coordenadas[matriz_distancias.indices([zonas[i] for i in rutables])]
+
+    if len(rutables) <= MAX_PEDIDOS_AHORROS_COMPLETOS:
+        matriz = matriz_desde_coordenadas(xy)
+        rutas = clarke_wright(matriz, pesos[rutables], capacidad_max, limite)
+    else:
+        # Sin matriz n x n: ahorros entre vecinos y 2-opt con la matriz de cada ruta
+        matriz = None
+        rutas = clarke_wright(None, pesos[rutables], capacidad_max, limite, pares=_pares_ahorro_vecinos(xy))
+    cargas = np.array([pesos[rutables[np.array(r) - 1]].sum() for r in rutas])
+
+    # Asignar vehículos: ruta más pesada al vehículo libre más ajustado
+    orden_vehiculos = np.argsort(capacidades, kind="stable")
+    libres = np.ones(len(capacidades), dtype=bool)
+    viajes = []
+
+    for r in np.argsort(-cargas, kind="stable"):
+        candidatos = orden_vehiculos[(capacidades[orden_vehiculos] >= cargas[r]) & libres[orden_vehiculos]]
+        if len(candidatos) == 0:
+            candidatos = orden_vehiculos[capacidades[orden_vehiculos] >= cargas[r]]  # Segunda vuelta
+        vid = candidatos[0]
+        libres[vid] = False
+
+        if matriz is not None:
+            ruta = dos_opt(rutas[r], matriz, limite)
+        else:
+            ruta = np.asarray(rutas[r], dtype=np.int64)
+            ruta = ruta[dos_opt(np.arange(1, len(ruta) + 1), matriz_desde_coordenadas(xy[ruta - 1]), limite) - 1]
+        pedidos = rutables[ruta - 1]
+
+        viajes.append({
+            'vehiculo': int(vid),
+            'zonas': list(dict.fromkeys(zonas[i] for i in pedidos)),  # En orden de visita
+            'pedidos': pedidos.tolist(),
+            'carga': cargas[r]
+        })
+
+    return viajes, sin_asignar
+
+
+def secuenciar_zonas(zonas, matriz_distancias, limite=None):
+    """
+    Ordena las zonas de un viaje para minimizar el recorrido (2-opt desde el orden dado).
+    Retorna (secuencia, distancia_km).
+    """
+    zonas = list(dict.fromkeys(zonas))
+    puntos = np.concatenate(([matriz_distancias.indice[ID_ALMACEN]], matriz_distancias.indices(zonas)))
+    matriz = matriz_distancias.matriz[np.ix_(puntos, puntos)]
+
+    ruta = dos_opt(np.arange(1, len(puntos)), matriz, limite)
+    return [zonas[i - 1] for i in ruta], longitud_ruta(ruta, matriz)
+
+
+def secuenciar_paradas(paradas, coordenadas, limite=None):
+    """
+    Ordena las paradas de un viaje (p. ej. clientes) por sus coordenadas relativas
+    al almacén (2-opt desde el orden dado). Retorna (secuencia, distancia_km).
+    """
+    paradas = list(dict.fromkeys(paradas))
+    matriz = matriz_desde_coordenadas([coordenadas[p] for p in paradas])
+
+    ruta = dos_opt(np.arange(1, len(paradas) + 1), matriz, limite)
+    return [paradas[i - 1] for i in ruta], longitud_ruta(ruta, matriz)
@@ -0,0 +1,305 @@
+"""
+Módulo de Servicio de Simulación
+Capa de caché entre la interfaz y run_simulation. Los resultados se memorizan
+por (escenario, días, capacidad de picking, estrategia de empaque, versión de
+catálogos, semilla) en una caché LRU a nivel de proceso, compartida por todas
+las sesiones del navegador; las tablas derivadas para gráficos también se
+memorizan por la misma clave. Las corridas sin semilla no son reproducibles y
+no se cachean. `simular_async` ejecuta la simulación en un hilo de trabajo y
+expone el avance día a día (KPIs parciales) y la cancelación; una corrida
+compartida por varias sesiones solo se detiene cuando todas la cancelan.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import catalogos, consultas
+
+MAX_SIMULACIONES_CACHE = 4
+MAX_SIMULACIONES_CONCURRENTES = 4   # Hilos de trabajo; más allá, las corridas esperan en una cola común
+MAX_DERIVADOS_CACHE = 32
+MAX_FILAS_GRAFICO = 5000   # Presupuesto de filas (día × SKU) enviado a Altair
+
+_cache_simulaciones = OrderedDict()   # clave -> resultados (LRU)
+_en_curso = {}                        # clave -> EjecucionSimulacion (misma simulación pedida por otra sesión)
+_cache_derivados = OrderedDict()      # (clave, nombre) -> DataFrame (LRU)
+_bloqueo = threading.Lock()
+# Pool común a todas las sesiones (simulaciones síncronas y asíncronas). Cada corrida usa su
+# propio generador aleatorio, así que pueden intercalarse; comparten el GIL, por lo que varias
+# corridas simultáneas no suman CPU, pero una corrida corta no espera a que termine una larga
+_ejecutor = ThreadPoolExecutor(max_workers=MAX_SIMULACIONES_CONCURRENTES, thread_name_prefix="simulacion")
+
+
+class SimulacionCancelada(Exception):
+    """La simulación fue cancelada antes de terminar."""
+
+
+class EjecucionSimulacion:
+    """
+    Simulación en curso o terminada. `futuro` entrega los resultados completos;
+    mientras corre, `dias_completados` y `kpis_parciales()` reflejan el avance.
+    `_suscriptores` cuenta las sesiones que esperan la corrida (protegido por `_bloqueo`).
+    """
+
+    def __init__(self, clave, n_dias):
+        self.clave = clave
+        self.n_dias = n_dias
+        self.dias_completados = 0
+        self.futuro = Future()
+        self._kpis = []
+        self._cancelar = threading.Event()
+        self._suscriptores = 1
+
+    @property
+    def fraccion(self):
+        return self.dias_completados / self.n_dias if self.n_dias else 1.0
+
+    def terminada(self):
+        return self.futuro.done()
+
+    def cancelada(self):
+        return self.futuro.done() and isinstance(self.futuro.exception(), SimulacionCancelada)
+
+    def cancelar(self):
+        """
+        La sesión deja de esperar la simulación. Solo cuando la abandona el último
+        suscriptor se pide detenerla (al cerrar el día en curso); retorna True en ese caso.
+        """
+        with _bloqueo:
+            self._suscriptores = max(self._suscriptores - 1, 0)
+            if self._suscriptores:
+                return False
+            self._cancelar.set()
+            return True
+
+    def resultado(self, timeout=None):
+        return self.futuro.result(timeout)
+
+    def kpis_parciales(self):
+        """KPIs de los días ya simulados (índice 'dia')."""
+        filas = list(self._kpis)
+        if not filas:
+            return pd.DataFrame(index=pd.Index([], name='dia'))
+        return pd.DataFrame(filas).set_index('dia')
+
+    def _progreso(self, dia, n_dias, resultado_dia):
+        if self._cancelar.is_set():
+            raise SimulacionCancelada(f"Simulación cancelada en el día {dia} de {n_dias}")
+        self._kpis.append({'dia': dia, **resultado_dia['kpis']})
+        self.dias_completados = dia
+
+    def _terminar(self, resultados):
+        self._kpis = [{'dia': r['dia'], **r['kpis']} for r in resultados['resultados_diarios']]
+        self.dias_completados = self.n_dias
+        self.futuro.set_result(resultados)
+
+
+def clave_simulacion(escenario, n_dias, capacidad_picking, estrategia_empaque="ffd", semilla=None,
+                     instrumentar=False):
+    """Clave de caché de una simulación (incluye la versión actual de los catálogos)."""
+    return (escenario, int(n_dias), int(capacidad_picking), estrategia_empaque,
+            catalogos.version_catalogos(), semilla, bool(instrumentar))
+
+
+def clave_resultados(resultados):
+    """Clave de caché de un resultado ya calculado (None si no es reproducible)."""
+    config = resultados.get('config', {})
+    if config.get('semilla') is None:
+        return None
+    if config.get('carga') or config.get('politicas') or config.get('pronostico') or config.get('stock_seguridad'):
+        return None   # Parámetros fuera de la clave: no comparten caché con la corrida base
+    return (config['escenario'], int(config['n_dias']), int(config.get('capacidad_picking', 0)),
+            config.get('estrategia_empaque', 'ffd'), config.get('version_catalogos'), config['semilla'],
+            bool(config.get('instrumentar', False)))
+
+
+def simular(n_dias, capacidad_picking, escenario="normal", estrategia_empaque="ffd", semilla=None,
+            instrumentar=False):
+    """
+    Retorna el resultado de run_simulation desde la caché o lo calcula en el hilo
+    de trabajo. Si otra sesión ya está calculando la misma clave, espera ese cálculo
+    en lugar de repetirlo.
+    El diccionario retornado es compartido: no debe modificarse.
+    """
+    from main import run_simulation  # Import diferido: main depende de este paquete
+
+    parametros = dict(n_dias=n_dias, capacidad_picking=capacidad_picking, escenario=escenario,
+                      estrategia_empaque=estrategia_empaque, semilla=semilla, instrumentar=instrumentar)
+    if semilla is None:
+        return run_simulation(**parametros)
+
+    ejecucion, propia = _registrar(
+        clave_simulacion(escenario, n_dias, capacidad_picking, estrategia_empaque, semilla, instrumentar), n_dias)
+    if propia:
+        _ejecutor.submit(_ejecutar, ejecucion, parametros)
+    return ejecucion.resultado()
+
+
+def simular_async(n_dias, capacidad_picking, escenario="normal", estrategia_empaque="ffd", semilla=None,
+                  instrumentar=False):
+    """
+    Inicia la simulación en el hilo de trabajo y retorna su EjecucionSimulacion.
+    Si el resultado está en caché, la ejecución retornada ya está terminada; si la
+    misma clave se está calculando, se retorna esa ejecución.
+    """
+    parametros = dict(n_dias=n_dias, capacidad_picking=capacidad_picking, escenario=escenario,
+                      estrategia_empaque=estrategia_empaque, semilla=semilla, instrumentar=instrumentar)
+    if semilla is None:
+        ejecucion, propia = EjecucionSimulacion(None, n_dias), True
+    else:
+        ejecucion, propia = _registrar(
+            clave_simulacion(escenario, n_dias, capacidad_picking, estrategia_empaque, semilla, instrumentar), n_dias)
+    if propia:
+        _ejecutor.submit(_ejecutar, ejecucion, parametros)
+    return ejecucion
+
+
+def _registrar(clave, n_dias):
+    """
+    Retorna (ejecución, propia): desde caché, la que ya está en curso (sumando un
+    suscriptor), o una nueva a ejecutar. Una corrida ya cancelada no se reutiliza.
+    """
+    with _bloqueo:
+        if clave in _cache_simulaciones:
+            _cache_simulaciones.move_to_end(clave)
+            ejecucion = EjecucionSimulacion(clave, n_dias)
+            ejecucion._terminar(_cache_simulaciones[clave])
+            return ejecucion, False
+        en_curso = _en_curso.get(clave)
+        if en_curso is not None and not en_curso._cancelar.is_set():
+            en_curso._suscriptores += 1
+            return en_curso, False
+        ejecucion = EjecucionSimulacion(clave, n_dias)
+        _en_curso[clave] = ejecucion
+        return ejecucion, True
+
+
+def _ejecutar(ejecucion, parametros):
+    from main import run_simulation
+
+    try:
+        if ejecucion._cancelar.is_set():
+            raise SimulacionCancelada("Simulación cancelada antes de iniciar")
+        resultados = run_simulation(**parametros, progreso=ejecucion._progreso)
+        if ejecucion.clave is not None:
+            with _bloqueo:
+                _cache_simulaciones[ejecucion.clave] = resultados
+                while len(_cache_simulaciones) > MAX_SIMULACIONES_CACHE:
+                    clave_vieja, _ = _cache_simulaciones.popitem(last=False)
+                    for k in [k for k in _cache_derivados if k[0] == clave_vieja]:
+                        del _cache_derivados[k]
+        ejecucion._terminar(resultados)
+    except BaseException as e:
+        ejecucion.futuro.set_exception(e)
+    finally:
+        with _bloqueo:
+            if _en_curso.get(ejecucion.clave) is ejecucion:
+                del _en_curso[ejecucion.clave]
+
+
+def derivado(resultados, nombre, construir):
+    """
+    Tabla derivada `nombre` = construir(resultados), memorizada por la clave del
+    resultado. Sin clave (corrida sin semilla) se calcula directamente.
+    """
+    clave = clave_resultados(resultados)
+    if clave is None:
+        return construir(resultados)
+    return _memorizar((clave, nombre), lambda: construir(resultados))
+
+
+def _memorizar(clave, construir):
+    with _bloqueo:
+        if clave in _cache_derivados:
+            _cache_derivados.move_to_end(clave)
+            return _cache_derivados[clave]
+
+    df = construir()
+    with _bloqueo:
+        _cache_derivados[clave] = df
+        while len(_cache_derivados) > MAX_DERIVADOS_CACHE:
+            _cache_derivados.popitem(last=False)
+    return df
+
+
+def limpiar_cache():
+    """Vacía las cachés de simulaciones y tablas derivadas."""
+    with _bloqueo:
+        _cache_simulaciones.clear()
+        _cache_derivados.clear()
+
+
+def evolucion_stock(resultados, max_filas=MAX_FILAS_GRAFICO):
+    """Saldo de cada SKU al cierre de cada día (Dia, Producto, Stock) para el gráfico de stock."""
+    return derivado(
+        resultados, ('evolucion_stock', max_filas),
+        lambda res: datos_evolucion_stock(res['df_kardex'], res['df_productos'], res['config']['n_dias'], max_filas)
+    )
+
+
+def tabla_indexada(resultados, nombre):
+    """TablaIndexada (ver consultas.py) de una tabla de resultados, construida una vez por resultado."""
+    return derivado(resultados, ('indice', nombre), lambda res: consultas.indexar(res, nombre))
+
+
+def tabla_clientes():
+    """Maestro de clientes como DataFrame, memorizado por versión de catálogos."""
+    return _memorizar(('catalogos', catalogos.version_catalogos(), 'tabla_clientes'), _construir_tabla_clientes)
+
+
+def _construir_tabla_clientes():
+    data_cli = []
+    for k, v in catalogos.dic_clientes.items():
+        r = v.copy()
+        r['ID_Cliente'] = k
+        data_cli.append(r)
+    df_clientes = pd.DataFrame(data_cli)
+    cols_order = ['ID_Cliente', 'nombre', 'tipo', 'frecuencia_compra', 'credito_limite', 'probabilidad_espera']
+    return df_clientes[[c for c in cols_order if c in df_clientes.columns]]
+
+
+def datos_evolucion_stock(df_kardex, df_productos, n_dias, max_filas=None):
+    """
+    Saldo al cierre de cada día por SKU, en formato largo (Dia, Producto, Stock).
+    Toma el último Saldo_Final de cada (día, SKU) del kardex, lo pivota a una
+    matriz día × SKU, la completa hacia adelante desde el stock inicial
+    (Q_Lote_Optimo * 2, igual que la inicialización del inventario) y la vuelve a
+    formato largo. Con `max_filas` se submuestrean días para que el resultado no
+    supere ese número de filas; siempre se incluyen el primero y el último día, aunque
+    con muchos SKUs esos 2 puntos excedan el presupuesto.
+    """
+    skus = df_productos.index.unique()
+    dias = pd.RangeIndex(1, n_dias + 1, name='Dia')
+
+    if df_kardex.empty:
+        matriz = pd.DataFrame(index=dias, columns=skus, dtype=float)
+    else:
+        # Último movimiento de cada (día, SKU): el kardex se registra en orden cronológico
+        ultimos = df_kardex.drop_duplicates(['Fecha', 'Producto'], keep='last')
+        matriz = ultimos.pivot(index='Fecha', columns='Producto', values='Saldo_Final')
+        matriz.columns = matriz.columns.astype(skus.dtype)
+        matriz = matriz.reindex(columns=skus)
+        # Movimientos previos al día 1 cuentan para el saldo inicial del día 1
+        matriz = matriz.reindex(matriz.index.union(dias)).ffill().reindex(dias)
+
+    stock_inicial = df_productos['Q_Lote_Optimo'].groupby(level=0).first().reindex(skus).to_numpy(dtype=float) * 2
+    valores = matriz.to_numpy(dtype=float)
+    valores = np.where(np.isnan(valores), stock_inicial, valores).astype(np.int64)
+
+    if max_filas and len(dias) * max(len(skus), 1) > max_filas:
+        # Días equiespaciados que entran en el presupuesto; siempre el primero y el último
+        # (al menos 2 puntos aunque los SKUs superen max_filas)
+        n_dias_grafico = max(max_filas // max(len(skus), 1), min(len(dias), 2))
+        seleccion = np.linspace(0, len(dias) - 1, n_dias_grafico).round().astype(int)
+        seleccion = np.unique(np.append(seleccion, len(dias) - 1))
+        dias, valores = dias[seleccion], valores[seleccion]
+
+    # Formato largo (melt): todos los días de un SKU, luego el siguiente
+    return pd.DataFrame({
+        'Dia': np.tile(np.asarray(dias), len(skus)),
+        'Producto': np.repeat(np.asarray(skus), len(dias)),
+        'Stock': valores.T.ravel()
+    })
@@ -0,0 +1,189 @@
+"""
+Módulo de Stock de Seguridad
+Stock de seguridad y punto de reorden dinámicos por SKU. Mantiene media y
+varianza de la demanda diaria en una ventana móvil y del lead time de las
+órdenes de compra recibidas (Welford vectorizado: O(1) por SKU y día), y
+recalcula para un nivel de servicio:
+    SS  = z · √(L̄ · σ²_d + d̄² · σ²_L)
+    ROP = d̄ · L̄ + SS
+Los valores se escriben en el maestro (Stock_Seguridad, Punto_Reorden y
+Stock_Objetivo), de donde los leen la reposición y las alertas.
+"""
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .pronostico import vector_demanda
+
+NIVEL_SERVICIO = 0.95
+VENTANA_DIAS = 28          # Días de demanda en la ventana móvil (None: toda la historia)
+MIN_OBSERVACIONES = 7      # Días de demanda antes de reemplazar los valores del maestro
+COLUMNAS_STOCK_SEGURIDAD = ('Demanda_Media', 'Demanda_Desv', 'Lead_Time_Medio', 'Lead_Time_Desv',
+                            'Recepciones', 'Stock_Seguridad', 'Punto_Reorden', 'Stock_Objetivo')
+
+
+class Welford:
+    """
+    Media y varianza incrementales de n series a la vez (una por SKU). `agregar`
+    y `quitar` aceptan una máscara para actualizar solo algunas series.
+    """
+
+    def __init__(self, n):
+        self.n = np.zeros(n, dtype=np.int64)
+        self.media = np.zeros(n)
+        self._m2 = np.zeros(n)
+
+    def agregar(self, valores, mascara=None):
+        valores = np.asarray(valores, dtype=np.float64)
+        paso = np.ones(len(self.n), dtype=bool) if mascara is None else mascara
+        self.n += paso
+        delta = valores - self.media
+        self.media += np.divide(delta, self.n, out=np.zeros_like(delta), where=paso)
+        self._m2 += np.where(paso, delta * (valores - self.media), 0.0)
+
+    def quitar(self, valores, mascara=None):
+        valores = np.asarray(valores, dtype=np.float64)
+        paso = np.ones(len(self.n), dtype=bool) if mascara is None else mascara & (self.n > 0)
+        self.n -= paso
+        delta = valores - self.media
+        self.media -= np.divide(delta, self.n, out=np.zeros_like(delta), where=paso & (self.n > 0))
+        self._m2 -= np.where(paso, delta * (valores - self.media), 0.0)
+        vacias = self.n == 0
+        self.media[vacias] = 0.0
+        self._m2[vacias] = 0.0
+
+    def varianza(self):
+        """Varianza muestral (0 con menos de dos observaciones)."""
+        return np.maximum(np.divide(self._m2, self.n - 1, out=np.zeros_like(self._m2), where=self.n > 1), 0.0)
+
+
+class MotorStockSeguridad:
+    """
+    Estadísticas de demanda y lead time por SKU del maestro `df_productos`:
+        motor.actualizar_demanda(motor.vector_demanda(pedidos_dia))
+        motor.registrar_recepciones(recepciones, dia)
+        motor.aplicar(df_productos)
+    Mientras un SKU no tiene recepciones se usa el Lead_Time del maestro (sin variabilidad).
+    """
+
+    def __init__(self, df_productos, nivel_servicio=NIVEL_SERVICIO, ventana=VENTANA_DIAS,
+                 min_observaciones=MIN_OBSERVACIONES):
+        if not 0 < nivel_servicio < 1:
+            raise ValueError(f"Nivel de servicio fuera de (0, 1): {nivel_servicio}")
+        self.skus = df_productos.index
+        self.indice = {sku: i for i, sku in enumerate(self.skus)}
+        self.nivel_servicio = nivel_servicio
+        self.z = NormalDist().inv_cdf(nivel_servicio)
+        self.ventana = ventana
+        self.min_observaciones = min_observaciones
+        self.demanda = Welford(len(self.skus))
+        self.lead_time = Welford(len(self.skus))
+        self._historia = None if ventana is None else np.zeros((ventana, len(self.skus)))
+        self._dias = 0
+        # Parámetros del maestro al iniciar: respaldo y brecha S - s a conservar
+        self.lead_time_maestro = df_productos['Lead_Time'].to_numpy(dtype=np.float64)
+        self.seguridad_maestro = df_productos['Stock_Seguridad'].to_numpy(dtype=np.float64)
+        self.reorden_maestro = df_productos['Punto_Reorden'].to_numpy(dtype=np.float64)
+        self.brecha_objetivo = df_productos['Stock_Objetivo'].to_numpy(dtype=np.float64) - self.reorden_maestro
+
+    @property
+    def listo(self):
+        return self._dias >= self.min_observaciones
+
+    def vector_demanda(self, pedidos):
+        return vector_demanda(pedidos, self.indice)
+
+    def actualizar_demanda(self, demanda):
+        """Incorpora la demanda del día (arreglo por SKU); con ventana, sale la del día más antiguo."""
+        demanda = np.asarray(demanda, dtype=np.float64)
+        if self._historia is not None:
+            fila = self._dias % self.ventana
+            if self._dias >= self.ventana:
+                self.demanda.quitar(self._historia[fila])
+            self._historia[fila] = demanda
+        self.demanda.agregar(demanda)
+        self._dias += 1
+
+    def registrar_recepciones(self, recepciones, dia):
+        """Lead time real (día de recepción - Fecha_Creacion) de cada orden de compra recibida."""
+        observaciones = [(self.indice[o['Producto']], dia - o['Fecha_Creacion'])
+                         for o in recepciones if o['Producto'] in self.indice]
+        # Varias recepciones del mismo SKU en un día se incorporan en rondas sucesivas
+        while observaciones:
+            valores = np.zeros(len(self.skus))
+            mascara = np.zeros(len(self.skus), dtype=bool)
+            pendientes = []
+            for i, lead_time in observaciones:
+                if mascara[i]:
+                    pendientes.append((i, lead_time))
+                else:
+                    mascara[i] = True
+                    valores[i] = lead_time
+            self.lead_time.agregar(valores, mascara)
+            observaciones = pendientes
+
+    def calcular(self):
+        """
+        Arreglos por SKU: stock de seguridad y punto de reorden del nivel de servicio,
+        y las estadísticas que los producen.
+        """
+        media_demanda = self.demanda.media
+        var_demanda = self.demanda.varianza()
+        con_recepciones = self.lead_time.n > 0
+        media_lead = np.where(con_recepciones, self.lead_time.media, self.lead_time_maestro)
+        var_lead = np.where(con_recepciones, self.lead_time.varianza(), 0.0)
+        seguridad = self.z * np.sqrt(media_lead * var_demanda + media_demanda ** 2 * var_lead)
+        return {
+            'Demanda_Media': media_demanda,
+            'Demanda_Desv': np.sqrt(var_demanda),
+            'Lead_Time_Medio': media_lead,
+            'Lead_Time_Desv': np.sqrt(var_lead),
+            'Recepciones': self.lead_time.n.copy(),
+            'Stock_Seguridad': np.ceil(seguridad),
+            'Punto_Reorden': np.ceil(media_demanda * media_lead + seguridad),
+        }
+
+    def aplicar(self, df_productos):
+        """
+        Escribe Stock_Seguridad, Punto_Reorden y Stock_Objetivo (Punto_Reorden + brecha
+        original S - s) en el maestro, en el lugar. Sin historia suficiente restaura los del maestro.
+        """
+        if self.listo:
+            valores = self.calcular()
+            seguridad, reorden = valores['Stock_Seguridad'], valores['Punto_Reorden']
+        else:
+            seguridad, reorden = self.seguridad_maestro, self.reorden_maestro
+        nuevos = {
+            'Stock_Seguridad': seguridad,
+            'Punto_Reorden': reorden,
+            'Stock_Objetivo': reorden + self.brecha_objetivo,
+        }
+        if df_productos.index.equals(self.skus):
+            # Asignación directa de columnas (evita alinear índices en cada día)
+            for columna, arreglo in nuevos.items():
+                df_productos[columna] = arreglo.astype(df_productos[columna].dtype)
+        else:
+            columnas = list(nuevos)
+            df_productos.loc[self.skus, columnas] = pd.DataFrame(nuevos, index=self.skus).astype(
+                df_productos[columnas].dtypes)
+        return df_productos
+
+    def tabla(self):
+        """df_stock_seguridad: estadísticas y parámetros vigentes por SKU."""
+        valores = self.calcular()
+        valores['Stock_Objetivo'] = valores['Punto_Reorden'] + self.brecha_objetivo
+        df = pd.DataFrame(valores, index=self.skus, columns=list(COLUMNAS_STOCK_SEGURIDAD))
+        return df.astype({'Recepciones': 'int64', 'Stock_Seguridad': 'int64', 'Punto_Reorden': 'int64',
+                          'Stock_Objetivo': 'int64'})
+
+
+def crear_motor(stock_seguridad, df_productos):
+    """
+    stock_seguridad: False/None desactiva (retorna None); True usa NIVEL_SERVICIO;
+    un número en (0, 1) es el nivel de servicio.
+    """
+    if stock_seguridad is None or stock_seguridad is False:
+        return None
+    nivel = NIVEL_SERVICIO if stock_seguridad is True else float(stock_seguridad)
+    return MotorStockSeguridad(df_productos, nivel)
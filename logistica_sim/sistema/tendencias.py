@@ -0,0 +1,120 @@
+"""
+Módulo de Tendencias de KPIs
+Estadísticas en línea de los KPIs diarios: ventanas móviles (7/30 días) y media
+exponencial (EWMA). Cada actualización es O(1) y la memoria está acotada por el
+tamaño de la ventana más grande, por lo que corridas de varios años pueden
+reportar tendencias sin conservar todos los registros diarios.
+"""
+import math
+from collections import deque
+
+# KPIs diarios monitoreados (claves del diccionario de KPIs del día)
+KPIS_MONITOREADOS = ("otif", "fill_rate", "backlog_rate", "unidades_perdidas", "utilizacion_flota")
+VENTANAS_DIAS = (7, 30)
+ALFA_EWMA = 0.3
+
+
+class VentanaMovil:
+    """
+    Media y desviación estándar de los últimos `tamano` valores.
+    Mantiene sumas acumuladas (valor y cuadrado) que se corrigen al salir el más antiguo;
+    cada `tamano` actualizaciones se recalculan para no acumular error de redondeo
+    (O(1) amortizado).
+    """
+
+    def __init__(self, tamano):
+        self.tamano = tamano
+        self.valores = deque(maxlen=tamano)
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+        self._desde_recalculo = 0
+
+    def actualizar(self, valor):
+        if len(self.valores) == self.tamano:
+            antiguo = self.valores[0]
+            self.suma -= antiguo
+            self.suma_cuadrados -= antiguo * antiguo
+        self.valores.append(valor)
+        self.suma += valor
+        self.suma_cuadrados += valor * valor
+
+        self._desde_recalculo += 1
+        if self._desde_recalculo >= self.tamano:
+            self.suma = math.fsum(self.valores)
+            self.suma_cuadrados = math.fsum(x * x for x in self.valores)
+            self._desde_recalculo = 0
+
+    @property
+    def n(self):
+        return len(self.valores)
+
+    @property
+    def media(self):
+        return self.suma / self.n if self.n else 0.0
+
+    @property
+    def desviacion(self):
+        if self.n < 2:
+            return 0.0
+        varianza = (self.suma_cuadrados - self.suma * self.suma / self.n) / (self.n - 1)
+        return math.sqrt(max(varianza, 0.0))  # Evita negativos por redondeo
+
+
+class MediaExponencial:
+    """EWMA: s_t = alfa * x_t + (1 - alfa) * s_{t-1}, iniciada con la primera observación."""
+
+    def __init__(self, alfa=ALFA_EWMA):
+        if not 0 < alfa <= 1:
+            raise ValueError("alfa debe estar en (0, 1].")
+        self.alfa = alfa
+        self.valor = None
+
+    def actualizar(self, x):
+        self.valor = x if self.valor is None else self.alfa * x + (1 - self.alfa) * self.valor
+        return self.valor
+
+
+class MonitorKPIs:
+    """
+    Mantiene, por cada KPI monitoreado, el último valor, las ventanas móviles y la EWMA.
+    Se alimenta con el diccionario de KPIs de cada día al cerrarlo.
+    """
+
+    def __init__(self, kpis=KPIS_MONITOREADOS, ventanas=VENTANAS_DIAS, alfa=ALFA_EWMA):
+        self.kpis = tuple(kpis)
+        self.ventanas = tuple(ventanas)
+        self.dia = None
+        self.ultimo = {k: 0.0 for k in self.kpis}
+        self.moviles = {k: {v: VentanaMovil(v) for v in self.ventanas} for k in self.kpis}
+        self.ewma = {k: MediaExponencial(alfa) for k in self.kpis}
+
+    def actualizar(self, dia, kpis_dia):
+        """Incorpora los KPIs del día (las claves ausentes cuentan como 0)."""
+        self.dia = dia
+        for k in self.kpis:
+            valor = float(kpis_dia.get(k, 0.0))
+            self.ultimo[k] = valor
+            for ventana in self.moviles[k].values():
+                ventana.actualizar(valor)
+            self.ewma[k].actualizar(valor)
+
+    def resumen(self):
+        """
+        Estado actual en formato plano: {kpi}_media_{v}d, {kpi}_desv_{v}d y {kpi}_ewma.
+        """
+        resumen = {}
+        for k in self.kpis:
+            for v, ventana in self.moviles[k].items():
+                resumen[f"{k}_media_{v}d"] = round(ventana.media, 2)
+                resumen[f"{k}_desv_{v}d"] = round(ventana.desviacion, 2)
+            ewma = self.ewma[k].valor
+            resumen[f"{k}_ewma"] = round(ewma, 2) if ewma is not None else 0.0
+        return resumen
+
+    def tendencia(self, kpi, ventana_corta=None, ventana_larga=None):
+        """
+        Diferencia entre la media corta y la larga (positivo = el KPI mejora/sube).
+        """
+        corta = ventana_corta or self.ventanas[0]
+        larga = ventana_larga or self.ventanas[-1]
+        return round(self.moviles[kpi][corta].media - self.moviles[kpi][larga].media, 2)
@@ -3,9 +3,23 @@ Módulo de Transporte Consolidado
 Administra la flota de vehículos, asignación de despachos y cálculo de ocupación por peso.
 Consolida: transporte.py + gestion_transporte.py
 """
+import time
+from array import array
 import pandas as pd
 import numpy as np
-from .catalogos import dic_zonas
+from .catalogos import dic_zonas, dic_vehiculos, catalogos_simulacion, costo_km_tipo, COORDENADAS_ALMACEN
+from . import empaque, ruteo, esquemas
+from .flota import CalendarioFlota, duracion_viaje, formatear_hora, TURNO_INICIO_H, TURNO_FIN_H
+
+# Estrategias de GestionTransporte: las del motor de empaque + ruteo Clarke–Wright
+ESTRATEGIAS_TRANSPORTE = empaque.ESTRATEGIAS_EMPAQUE + ("ruteo",)
+
+# Columnas de la cabecera de despachos (tabla columnar; los pedidos van en las líneas)
+COLUMNAS_DESPACHO = [
+    'ID_Despacho', 'Fecha_Salida', 'Hora_Salida', 'Hora_Retorno', 'Destino',
+    'ID_Vehiculo', 'Tipo_Vehiculo', 'Peso_Total_Carga_kg', 'Volumen_Total_m3',
+    'Capacidad_Max_kg', 'Porcentaje_Ocupacion', 'Distancia_km', 'Costo_Viaje', 'Cant_Pedidos'
+]
 
 
 # ============================================================================
@@ -36,6 +50,7 @@ def planificar_rutas(dia, pedidos_preparados, vehiculos):
     
     vehiculos_disponibles = list(vehiculos.keys())
     idx_vehiculo = 0
+    matriz_distancias = ruteo.obtener_matriz_distancias()
     
     for zona_id, cantidad_total in pedidos_por_zona.items():
         nombre_zona = dic_zonas[zona_id]
@@ -53,15 +68,16 @@ def planificar_rutas(dia, pedidos_preparados, vehiculos):
         
         utilizacion = min(cantidad_total, capacidad) / capacidad * 100
         
-        # Costo estimado (asumimos distancia fija promedio por zona para el ejemplo, ej. 50km)
-        distancia_promedio = 50 
-        costo_viaje = distancia_promedio * costo_km
+        # Costo según distancia real ida y vuelta (matriz de distancias del catálogo)
+        distancia = 2 * matriz_distancias.distancia(ruteo.ID_ALMACEN, zona_id)
+        costo_viaje = distancia * costo_km
         
         rutas.append({
             "vehiculo": vehiculo_id,
             "zona": nombre_zona,
             "cantidad": cantidad_total,
             "utilizacion": utilizacion,
+            "distancia_km": round(distancia, 2),
             "costo": costo_viaje
         })
         
@@ -71,164 +87,352 @@ def planificar_rutas(dia, pedidos_preparados, vehiculos):
     return rutas, costo_total
 
 
+# ============================================================================
+# MODELO DE CARGA (PESOS Y VOLÚMENES POR SKU)
+# ============================================================================
+
+class ModeloCarga:
+    """
+    Pesos y volúmenes unitarios del maestro de productos como arrays densos
+    indexados por código entero de SKU. Se construye una sola vez y permite
+    calcular el peso/volumen de todos los pedidos de un día sin consultas
+    escalares a pandas.
+    """
+
+    def __init__(self, df_productos):
+        self.df_productos = df_productos
+        self.codigos = {sku: i for i, sku in enumerate(df_productos.index)}
+        self.peso_kg = df_productos['Peso_Unitario_kg'].to_numpy(dtype=float)
+
+        if 'Volumen_Unitario_m3' in df_productos.columns:
+            self.volumen_m3 = df_productos['Volumen_Unitario_m3'].to_numpy(dtype=float)
+        else:
+            self.volumen_m3 = np.zeros(len(df_productos), dtype=float)
+
+    def codificar(self, skus):
+        """Convierte una secuencia de SKUs en un array de códigos enteros."""
+        return np.fromiter((self.codigos[sku] for sku in skus), dtype=np.int64, count=len(skus))
+
+    def calcular_pedidos(self, pedidos):
+        """
+        Calcula peso (kg) y volumen (m³) total por pedido.
+        Aplana todas las líneas del día, hace un gather de los arrays unitarios
+        y una suma por segmento (bincount) por pedido.
+
+        Returns:
+            (pesos, volumenes): arrays de longitud len(pedidos).
+        """
+        n_lineas = np.fromiter((len(p['items']) for p in pedidos), dtype=np.int64, count=len(pedidos))
+        lineas = [item for p in pedidos for item in p['items']]
+
+        codigos = self.codificar([item['sku'] for item in lineas])
+        cantidades = np.fromiter((item['cantidad'] for item in lineas), dtype=float, count=len(lineas))
+        segmento = np.repeat(np.arange(len(pedidos)), n_lineas)
+
+        pesos = np.bincount(segmento, weights=cantidades * self.peso_kg[codigos], minlength=len(pedidos))
+        volumenes = np.bincount(segmento, weights=cantidades * self.volumen_m3[codigos], minlength=len(pedidos))
+        return pesos, volumenes
+
+
 # ============================================================================
 # CLASE DE GESTIÓN DE TRANSPORTE (de gestion_transporte.py)
 # ============================================================================
 
 class GestionTransporte:
-    def __init__(self):
-        """Inicializa la gestión de transporte."""
+    def __init__(self, estrategia_empaque="ffd", presupuesto_ruteo_s=1.0, flota=None, origen=None, catalogos=None):
+        """
+        Inicializa la gestión de transporte.
+
+        Args:
+            estrategia_empaque: 'ffd', 'bfd', 'consolidado' (motor de empaque) o 'ruteo' (Clarke–Wright).
+            presupuesto_ruteo_s: Tiempo máximo (s) por día para las heurísticas de ruteo.
+            flota: Vehículos propios con el formato de dic_flota (por defecto, dic_flota de `catalogos`).
+            origen: Coordenadas (km) del almacén de salida (por defecto, COORDENADAS_ALMACEN).
+            catalogos: Catálogos de la corrida (zonas, coordenadas y flota; ver
+                catalogos.catalogos_simulacion); por defecto los del módulo catalogos.
+        """
+        if estrategia_empaque not in ESTRATEGIAS_TRANSPORTE:
+            raise ValueError(f"Estrategia de empaque desconocida: {estrategia_empaque}. Opciones: {ESTRATEGIAS_TRANSPORTE}")
+
         self.flota = []
-        self.despachos = []
+        self.despachos = {col: [] for col in COLUMNAS_DESPACHO}  # Cabecera (columnar)
+        # Líneas despacho-pedido con claves enteras: Num_Despacho = fila de cabecera + 1
+        self.lineas_despacho = {'Num_Despacho': array('i'), 'Num_Pedido': array('i'), 'Peso_kg': array('d')}
+        self.codigos_pedido = {}  # ID_Pedido -> Num_Pedido
+        self.ids_pedido = []      # Num_Pedido -> ID_Pedido
+        self.utilizacion_diaria = []  # Resumen de utilización por día
+        self.modelo_carga = None      # ModeloCarga construido desde el maestro de productos
         self.contador_despachos = 1
+        self.estrategia_empaque = estrategia_empaque
+        self.presupuesto_ruteo_s = presupuesto_ruteo_s
+        catalogos = catalogos_simulacion() if catalogos is None else catalogos
+        self.dic_zonas = catalogos['dic_zonas']
+        self.coordenadas_zonas = ruteo.coordenadas_desde(origen, catalogos['dic_coordenadas_zonas'])
+        self.matriz_distancias = ruteo.obtener_matriz_distancias(self.coordenadas_zonas)
+        # Coordenadas de clientes relativas al almacén: paradas de la estrategia 'ruteo'
+        self.coordenadas_clientes = ruteo.coordenadas_desde(origen, catalogos['dic_coordenadas_clientes'])
+        self.pendientes_transporte = []       # Pedidos arrastrados al plan del día siguiente
+        self.pedidos_no_transportables = []   # Pedidos que exceden la capacidad de cualquier vehículo
         
-        self._inicializar_flota()
+        self._inicializar_flota(catalogos['dic_flota'] if flota is None else flota)
+        self.calendario = CalendarioFlota([v['ID_Vehiculo'] for v in self.flota])
+        self._vehiculo = {v['ID_Vehiculo']: v for v in self.flota}
+        self._no_disponibles = set()   # Vehículos en ruta o en mantenimiento (los únicos a restablecer)
         
-    def _inicializar_flota(self):
+    def _inicializar_flota(self, flota):
         """
         Crea la flota inicial de vehículos.
         """
-        # Definición de flota estándar
+        # Flota del catálogo (costo por km según su tipo, ver catalogos.dic_tipos_vehiculo)
         self.flota = [
-            {'ID_Vehiculo': 'V-001', 'Tipo': 'Camión 5Ton', 'Capacidad_Max_kg': 5000, 'Costo_Por_Viaje': 150, 'Estado': 'Disponible'},
-            {'ID_Vehiculo': 'V-002', 'Tipo': 'Camión 5Ton', 'Capacidad_Max_kg': 5000, 'Costo_Por_Viaje': 150, 'Estado': 'Disponible'},
-            {'ID_Vehiculo': 'V-003', 'Tipo': 'Camión 10Ton', 'Capacidad_Max_kg': 10000, 'Costo_Por_Viaje': 280, 'Estado': 'Disponible'},
-            {'ID_Vehiculo': 'V-004', 'Tipo': 'Furgoneta 1Ton', 'Capacidad_Max_kg': 1000, 'Costo_Por_Viaje': 80, 'Estado': 'Disponible'},
-            {'ID_Vehiculo': 'V-005', 'Tipo': 'Camión 5Ton', 'Capacidad_Max_kg': 5000, 'Costo_Por_Viaje': 150, 'Estado': 'Disponible'}
+            {'ID_Vehiculo': vid, 'Tipo': v['tipo'], 'Capacidad_Max_kg': v['capacidad_kg'], 'Estado': 'Disponible'}
+            for vid, v in flota.items()
         ]
+        for vehiculo in self.flota:
+            vehiculo['Costo_Km'] = costo_km_tipo(vehiculo['Tipo'])
         
     def obtener_flota_df(self):
         return pd.DataFrame(self.flota)
     
     def obtener_despachos_df(self):
-        return pd.DataFrame(self.despachos)
+        """Cabecera de despachos (una fila por viaje)."""
+        return esquemas.construir_tabla('df_despachos', pd.DataFrame(self.despachos, columns=COLUMNAS_DESPACHO))
+
+    def obtener_lineas_despacho_df(self):
+        """
+        Líneas despacho-pedido (una fila por pedido transportado).
+        Los IDs se reconstruyen desde las claves enteras con gathers vectorizados.
+        """
+        filas = np.frombuffer(self.lineas_despacho['Num_Despacho'], dtype=np.int32) - 1
+        num_pedido = np.frombuffer(self.lineas_despacho['Num_Pedido'], dtype=np.int32)
+
+        return esquemas.construir_tabla('df_lineas_despacho', {
+            'ID_Despacho': pd.Categorical.from_codes(filas, categories=pd.Index(self.despachos['ID_Despacho'])),
+            'ID_Pedido': pd.Categorical.from_codes(num_pedido, categories=pd.Index(self.ids_pedido)),
+            'Peso_kg': np.frombuffer(self.lineas_despacho['Peso_kg'], dtype=float).round(2)
+        })
+
+    def obtener_entregas_pedido_df(self):
+        """
+        Vehículo y horario en que viajó cada pedido (join líneas-cabecera por clave entera, O(n)).
+        Un pedido puede aparecer varias veces si se despachó en partes (p. ej. backlog).
+        """
+        filas = np.frombuffer(self.lineas_despacho['Num_Despacho'], dtype=np.int32) - 1
+        df_cabecera = self.obtener_despachos_df()[['Fecha_Salida', 'Hora_Retorno', 'ID_Vehiculo', 'Destino']]
+
+        df_entregas = self.obtener_lineas_despacho_df()
+        return pd.concat([df_entregas, df_cabecera.iloc[filas].reset_index(drop=True)], axis=1)
+
+    def obtener_utilizacion_df(self):
+        """Retorna el resumen diario de utilización de flota del motor de empaque."""
+        return esquemas.construir_tabla('df_utilizacion', self.utilizacion_diaria)
+        
+    def programar_mantenimiento(self, id_vehiculo, dia, hora_inicio=TURNO_INICIO_H, duracion_h=TURNO_FIN_H - TURNO_INICIO_H):
+        """Bloquea un vehículo por mantenimiento (por defecto, el turno completo del día)."""
+        self.calendario.programar_mantenimiento(id_vehiculo, dia, hora_inicio, duracion_h)
+
+    def _registrar_lineas(self, num_despacho, ids_pedidos, pesos_pedidos):
+        """Agrega las líneas despacho-pedido con claves enteras."""
+        for id_pedido in ids_pedidos:
+            if id_pedido not in self.codigos_pedido:
+                self.codigos_pedido[id_pedido] = len(self.ids_pedido)
+                self.ids_pedido.append(id_pedido)
+
+        self.lineas_despacho['Num_Despacho'].extend([num_despacho] * len(ids_pedidos))
+        self.lineas_despacho['Num_Pedido'].extend(self.codigos_pedido[p] for p in ids_pedidos)
+        self.lineas_despacho['Peso_kg'].extend(float(p) for p in pesos_pedidos)
+
+    def _paradas(self, pedidos, zonas):
+        """
+        Parada de cada pedido: su cliente si tiene coordenadas, si no su zona (o el
+        almacén para zonas sin coordenadas). Retorna (paradas, {parada: (x, y)}).
+        """
+        paradas = [p.get('cliente') if p.get('cliente') in self.coordenadas_clientes else z
+                   for p, z in zip(pedidos, zonas)]
+        coordenadas = {}
+        for parada in paradas:
+            if parada not in coordenadas:
+                coordenadas[parada] = self.coordenadas_clientes.get(
+                    parada, self.coordenadas_zonas.get(parada, COORDENADAS_ALMACEN))
+        return paradas, coordenadas
+
+    def _actualizar_estados(self, dia_actual):
+        """
+        Actualiza el Estado de la flota para el día según el calendario. Solo toca
+        los vehículos que salieron a ruta o estuvieron en mantenimiento el día
+        anterior y los que tienen mantenimiento hoy.
+        """
+        self.calendario.depurar(dia_actual)
+        en_mantenimiento = self.calendario.en_mantenimiento_dia(dia_actual)
+        for vid in self._no_disponibles - en_mantenimiento:
+            self._vehiculo[vid]['Estado'] = 'Disponible'
+        for vid in en_mantenimiento:
+            self._vehiculo[vid]['Estado'] = 'Mantenimiento'
+        self._no_disponibles = en_mantenimiento
         
     def planificar_despachos(self, dia_actual, pedidos_para_despacho, df_productos):
         """
         Asigna pedidos a vehículos basándose en el peso y la ZONA (Destino).
         Se intenta usar vehículos distintos para zonas distintas.
+        El empaque lo resuelve el módulo `empaque` según `self.estrategia_empaque`
+        y cada viaje se programa en el calendario de flota: un vehículo puede hacer
+        varios viajes por día dentro del turno. Los pedidos que no caben en la primera
+        vuelta se reempacan en vueltas sucesivas mientras la flota tenga turno; solo
+        los que no alcanzan horario se arrastran al plan del día siguiente (con prioridad).
         
         Args:
             dia_actual: Día de la simulación.
             pedidos_para_despacho: Lista de pedidos listos (con items despachados).
-            df_productos: DataFrame de productos para consultar pesos.
+            df_productos: DataFrame de productos (fuente del ModeloCarga de pesos/volúmenes).
+
+        Returns:
+            (despachos_dia, pedidos_sin_asignar): pedidos_sin_asignar incluye los arrastrados.
         """
-        from .catalogos import dic_zonas
+        self._actualizar_estados(dia_actual)
+
+        # Pedidos arrastrados del día anterior primero
+        pedidos_para_despacho = self.pendientes_transporte + list(pedidos_para_despacho)
+        self.pendientes_transporte = []
 
         if not pedidos_para_despacho:
             return [], []  # despachos_dia, pedidos_sin_asignar
             
-        # 1. Calcular peso total por pedido y agrupar por ZONA
-        pedidos_con_peso = []
-        for pedido in pedidos_para_despacho:
-            peso_total = 0
-            items_validos = []
-            
-            for item in pedido['items']:
-                sku = item['sku']
-                cantidad = item['cantidad']
-                peso_unitario = df_productos.loc[sku, 'Peso_Unitario_kg']
-                peso_total += cantidad * peso_unitario
-                items_validos.append(item)
-            
-            if peso_total > 0:
-                pedidos_con_peso.append({
-                    'id_pedido': pedido['id_pedido'],
-                    'peso_kg': peso_total,
-                    'cliente': pedido.get('cliente', 'Desconocido'),
-                    'zona': pedido.get('zona', 'General')
-                })
-        
-        # Agrupar pedidos por Zona
-        pedidos_por_zona = {}
-        for p in pedidos_con_peso:
-            z = p['zona']
-            if z not in pedidos_por_zona:
-                pedidos_por_zona[z] = []
-            pedidos_por_zona[z].append(p)
-
-        # 2. Asignar a vehículos (Algoritmo Greedy por Zona)
-        # Reiniciar estado de flota para el día
+        # 1. Calcular peso y volumen por pedido (gather + suma por segmento vectorizados)
+        if self.modelo_carga is None or self.modelo_carga.df_productos is not df_productos:
+            self.modelo_carga = ModeloCarga(df_productos)
+        pesos, volumenes = self.modelo_carga.calcular_pedidos(pedidos_para_despacho)
+
+        validos = np.flatnonzero(pesos > 0)
+        pedidos_validos = [pedidos_para_despacho[i] for i in validos]
+        pesos = pesos[validos]
+        volumenes = volumenes[validos]
+        ids_pedido = [p['id_pedido'] for p in pedidos_validos]
+
+        # 2. Empacar pedidos en vehículos (motor de empaque por zona o consolidado)
         vehiculos_disponibles = [v for v in self.flota if v['Estado'] == 'Disponible']
-        # Ordenar vehículos por capacidad (usar los grandes primero)
-        vehiculos_disponibles.sort(key=lambda x: x['Capacidad_Max_kg'], reverse=True)
-        
-        # Control de uso de vehículos en el día (para no reutilizar el mismo camión en zonas lejanas el mismo día)
-        vehiculos_usados_hoy = set()
-        
+        capacidades = np.array([v['Capacidad_Max_kg'] for v in vehiculos_disponibles], dtype=float)
+        posicion_vehiculo = {v['ID_Vehiculo']: k for k, v in enumerate(vehiculos_disponibles)}
+
+        zonas = [p.get('zona', 'General') for p in pedidos_validos]
+        limite = time.perf_counter() + self.presupuesto_ruteo_s
+        paradas = None
+        if self.estrategia_empaque == "ruteo" and self.coordenadas_clientes:
+            paradas, coordenadas_paradas = self._paradas(pedidos_validos, zonas)
+
+        def empacar(idx):
+            """Viajes para los pedidos `idx` (índices de pedidos_validos) y los que no cupieron."""
+            if self.estrategia_empaque == "ruteo":
+                viajes, sin_asignar = ruteo.construir_rutas(
+                    [zonas[i] for i in idx], pesos[idx], capacidades, self.matriz_distancias, limite,
+                    coordenadas=None if paradas is None else [coordenadas_paradas[paradas[i]] for i in idx]
+                )
+            else:
+                viajes, sin_asignar = empaque.empacar_dia(
+                    pesos[idx], [zonas[i] for i in idx], capacidades, self.estrategia_empaque
+                )
+            for viaje in viajes:
+                viaje['pedidos'] = [idx[j] for j in viaje['pedidos']]
+            return viajes, [idx[j] for j in sin_asignar]
+
+        if not vehiculos_disponibles:
+            viajes, idx_arrastrar = [], list(range(len(pesos)))  # Toda la flota en mantenimiento
+        else:
+            viajes, idx_arrastrar = empacar(list(range(len(pesos))))
+
         despachos_dia = []
+        viajes_realizados = []
+
+        def programar(viaje):
+            """Programa el viaje en el calendario y registra su despacho; False si no hay horario."""
+            vehiculo = vehiculos_disponibles[viaje['vehiculo']]
+            carga = viaje['carga']
+            if paradas is None:
+                secuencia, distancia = ruteo.secuenciar_zonas(viaje['zonas'], self.matriz_distancias, limite)
+                destinos = secuencia
+            else:
+                # Recorrido cliente a cliente; el destino lista las zonas en orden de visita
+                secuencia, distancia = ruteo.secuenciar_paradas(
+                    [paradas[i] for i in viaje['pedidos']], coordenadas_paradas, limite)
+                zona_parada = {paradas[i]: zonas[i] for i in viaje['pedidos']}
+                destinos = list(dict.fromkeys(zona_parada[p] for p in secuencia))
+            duracion = duracion_viaje(distancia, len(secuencia))
+
+            reserva = self.calendario.reservar(vehiculo['ID_Vehiculo'], dia_actual, duracion)
+            if reserva is None:
+                # Vehículo sin horario: probar el que quede libre antes con capacidad suficiente
+                def admisible(vid, carga=carga):
+                    return vid in posicion_vehiculo and self._vehiculo[vid]['Capacidad_Max_kg'] >= carga
+                reserva_alt = self.calendario.reservar_primero_disponible(admisible, dia_actual, duracion)
+                if reserva_alt is None:
+                    return False
+                id_vehiculo, hora_salida, hora_retorno = reserva_alt
+                vehiculo = vehiculos_disponibles[posicion_vehiculo[id_vehiculo]]
+            else:
+                hora_salida, hora_retorno = reserva
+
+            ocupacion = (carga / vehiculo['Capacidad_Max_kg']) * 100
+            vehiculo['Estado'] = 'En Ruta'
+            self._no_disponibles.add(vehiculo['ID_Vehiculo'])
+
+            despacho = {
+                'ID_Despacho': f"D-{self.contador_despachos:04d}",
+                'Fecha_Salida': dia_actual,
+                'Hora_Salida': formatear_hora(hora_salida),
+                'Hora_Retorno': formatear_hora(hora_retorno),
+                'Destino': ", ".join(self.dic_zonas.get(z, z) for z in destinos),
+                'ID_Vehiculo': vehiculo['ID_Vehiculo'],
+                'Tipo_Vehiculo': vehiculo['Tipo'],
+                'Peso_Total_Carga_kg': round(carga, 2),
+                'Volumen_Total_m3': round(float(volumenes[viaje['pedidos']].sum()), 3),
+                'Capacidad_Max_kg': vehiculo['Capacidad_Max_kg'],
+                'Porcentaje_Ocupacion': round(ocupacion, 1),
+                'Distancia_km': round(distancia, 2),
+                'Costo_Viaje': round(distancia * vehiculo['Costo_Km'], 2),
+                'Cant_Pedidos': len(viaje['pedidos'])
+            }
+
+            for col in COLUMNAS_DESPACHO:
+                self.despachos[col].append(despacho[col])
+            self._registrar_lineas(self.contador_despachos, [ids_pedido[i] for i in viaje['pedidos']], pesos[viaje['pedidos']])
+            despachos_dia.append(despacho)
+            viajes_realizados.append({**viaje, 'vehiculo': posicion_vehiculo[vehiculo['ID_Vehiculo']]})
+            self.contador_despachos += 1
+            return True
+
+        capacidad_disponible = capacidades.max() if len(capacidades) else 0.0
+
+        # 3. Programar y generar despachos (secuencia 2-opt, costo por km, horario en calendario).
+        # Lo que no cupo en una vuelta se reempaca en otra mientras quede turno en la flota
+        while viajes:
+            despachados = len(despachos_dia)
+            for viaje in viajes:
+                if not programar(viaje):
+                    idx_arrastrar.extend(viaje['pedidos'])
+            restantes = [i for i in idx_arrastrar if pesos[i] <= capacidad_disponible]
+            if len(despachos_dia) == despachados or not restantes:
+                break   # Turno completo (ningún viaje encontró horario) o nada más que despachar
+            idx_arrastrar = [i for i in idx_arrastrar if pesos[i] > capacidad_disponible]
+            viajes, sin_asignar = empacar(restantes)
+            idx_arrastrar.extend(sin_asignar)
+
+        # 4. Arrastrar al día siguiente lo que no salió (si alguna vez puede caber en un vehículo)
+        capacidad_max = max((v['Capacidad_Max_kg'] for v in self.flota), default=0)
         pedidos_sin_asignar = []
+        for i in sorted(idx_arrastrar):
+            pedidos_sin_asignar.append(ids_pedido[i])
+            if pesos[i] <= capacidad_max:
+                self.pendientes_transporte.append(pedidos_validos[i])
+            else:
+                self.pedidos_no_transportables.append(ids_pedido[i])
 
-        # Procesar cada zona
-        for zona_id, pedidos_zona in pedidos_por_zona.items():
-            nombre_zona = dic_zonas.get(zona_id, zona_id)
-            
-            # Ordenar pedidos de la zona por peso descendente
-            pedidos_zona.sort(key=lambda x: x['peso_kg'], reverse=True)
-            
-            # Filtrar vehículos que NO han sido usados hoy todavía
-            # (Si se acaban los libres, podríamos reusar, pero la regla pide "más de una flota")
-            vehiculos_libres = [v for v in vehiculos_disponibles if v['ID_Vehiculo'] not in vehiculos_usados_hoy]
-            
-            # Si no hay libres, ¿reusamos? 
-            # Para cumplir "si son destinos distintos deberían ir más de una flota", intentamos forzar distintos.
-            # Si no hay suficientes camiones, quedarán pendientes o se reusan.
-            # Vamos a intentar usar libres primero. Si no hay, usamos los ya usados (segunda vuelta).
-            if not vehiculos_libres and vehiculos_disponibles:
-                 vehiculos_libres = vehiculos_disponibles # Fallback: reusar si es absolutamente necesario
-            
-            # Ordenar libres por capacidad
-            vehiculos_libres.sort(key=lambda x: x['Capacidad_Max_kg'], reverse=True)
-            
-            carga_vehiculos_zona = {v['ID_Vehiculo']: 0 for v in vehiculos_libres}
-            pedidos_vehiculos_zona = {v['ID_Vehiculo']: [] for v in vehiculos_libres}
-            
-            pedidos_no_asignados_zona = []
-
-            for pedido in pedidos_zona:
-                asignado = False
-                for vehiculo in vehiculos_libres:
-                    vid = vehiculo['ID_Vehiculo']
-                    capacidad = vehiculo['Capacidad_Max_kg']
-                    carga_actual = carga_vehiculos_zona[vid]
-                    
-                    if carga_actual + pedido['peso_kg'] <= capacidad:
-                        # Asignar
-                        carga_vehiculos_zona[vid] += pedido['peso_kg']
-                        pedidos_vehiculos_zona[vid].append(pedido['id_pedido'])
-                        asignado = True
-                        vehiculos_usados_hoy.add(vid) # Marcar como usado
-                        break
-                
-                if not asignado:
-                    pedidos_no_asignados_zona.append(pedido['id_pedido'])
-            
-            pedidos_sin_asignar.extend(pedidos_no_asignados_zona)
-
-            # Generar despachos para esta zona
-            for vehiculo in vehiculos_libres:
-                vid = vehiculo['ID_Vehiculo']
-                carga = carga_vehiculos_zona[vid]
-                
-                if carga > 0:
-                    ocupacion = (carga / vehiculo['Capacidad_Max_kg']) * 100
-                    
-                    despacho = {
-                        'ID_Despacho': f"D-{self.contador_despachos:04d}",
-                        'Fecha_Salida': dia_actual,
-                        'Destino': nombre_zona, # Nuevo campo solicitado
-                        'ID_Vehiculo': vid,
-                        'Tipo_Vehiculo': vehiculo['Tipo'],
-                        'Peso_Total_Carga_kg': round(carga, 2),
-                        'Capacidad_Max_kg': vehiculo['Capacidad_Max_kg'],
-                        'Porcentaje_Ocupacion': round(ocupacion, 1),
-                        'Costo_Viaje': vehiculo['Costo_Por_Viaje'],
-                        'Pedidos_Asociados': ", ".join(pedidos_vehiculos_zona[vid]),
-                        'Cant_Pedidos': len(pedidos_vehiculos_zona[vid])
-                    }
-                    
-                    self.despachos.append(despacho)
-                    despachos_dia.append(despacho)
-                    self.contador_despachos += 1
+        # 5. Resumen de utilización del día
+        resumen = empaque.resumen_utilizacion(viajes_realizados, capacidades)
+        self.utilizacion_diaria.append({
+            'Fecha': dia_actual,
+            'Estrategia': self.estrategia_empaque,
+            **resumen,
+            'Pedidos_Sin_Asignar': len(pedidos_sin_asignar),
+            'Pedidos_Arrastrados': len(self.pendientes_transporte)
+        })
 
         return despachos_dia, pedidos_sin_asignar
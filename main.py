@@ -2,216 +2,317 @@
 Sistema de Simulación Logística - LIA S.A.C.
 Script principal de ejecución con Gestión de Inventario Profesional (DataFrame).
 """
+import argparse
+import functools
+import random
 import pandas as pd
-import numpy as np
-from logistica_sim.sistema.demanda import generar_demanda_diaria
+from logistica_sim.sistema.demanda import generar_demanda_diaria, DIAS_PICO_ESTACIONAL
 from logistica_sim.sistema.inventario import GestionInventario
 from logistica_sim.sistema.transporte import GestionTransporte
-from logistica_sim.sistema import indicadores, alertas
-from logistica_sim.sistema.catalogos import dic_zonas
+from logistica_sim.sistema.pronostico import crear_pronosticador
+from logistica_sim.sistema.stock_seguridad import crear_motor as crear_motor_seguridad, COLUMNAS_STOCK_SEGURIDAD
+from logistica_sim.sistema.catalogos import catalogos_simulacion, version_catalogos
+from logistica_sim.sistema import indicadores, alertas, tendencias, esquemas, instrumentacion, memoria, perfilado
+from logistica_sim.sistema.cubo import CuboKPIs
 
-def run_simulation(n_dias, capacidad_picking, escenario="normal"):
+def run_simulation(n_dias, capacidad_picking, escenario="normal", estrategia_empaque="ffd", semilla=None,
+                   progreso=None, instrumentar=False, medir_memoria=False, perfilar=False,
+                   carga=None, politicas=None, pronostico=None, stock_seguridad=None, catalogos=None):
     """
     Ejecuta la simulación completa día a día.
+    estrategia_empaque: 'ffd', 'bfd', 'consolidado' (ver sistema/empaque.py) o 'ruteo' (ver sistema/ruteo.py).
+    semilla: si se indica, inicializa el generador aleatorio propio de la corrida
+    (resultado reproducible). No usa ni altera los generadores globales de random y
+    numpy, por lo que varias corridas pueden ejecutarse a la vez en hilos distintos.
+    progreso: callback opcional progreso(dia, n_dias, resultado_dia) llamado al cerrar cada día
+    con el registro de resultados_diarios; si lanza una excepción la simulación se detiene.
+    instrumentar: si es True, mide tiempo y llamadas de cada fase por día (df_timings);
+    desactivado no agrega costo apreciable (ver sistema/instrumentacion.py).
+    medir_memoria: True (cada día) o N (cada N días) estima los bytes de cada estructura
+    y la memoria trazada por tracemalloc (df_memoria, df_memoria_resumen, pico_memoria;
+    ver sistema/memoria.py). Ralentiza la simulación mientras está activo.
+    perfilar: True perfila con cProfile todo el bucle de días; un día o colección de días
+    perfila solo esos días (df_perfil con las funciones de más tiempo propio y
+    'estadisticas_perfil', dict de pstats para perfilado.reporte, guardar y
+    pilas_colapsadas; ver sistema/perfilado.py).
+    carga: CargaSintetica (ver sistema/carga.py); la corrida usa sus catálogos, flota y
+    demanda en lugar de los del módulo catalogos.
+    catalogos: catálogos de la corrida ({'dic_sku', 'dic_clientes', 'dic_zonas',
+    'dic_coordenadas_zonas', 'dic_coordenadas_clientes', 'dic_flota'}, ver
+    catalogos.catalogos_simulacion); por defecto los del módulo o, con `carga`,
+    carga.catalogos(). Se pasan explícitamente a
+    la demanda y a los gestores: los catálogos globales nunca se modifican.
+    politicas: DataFrame de parámetros (s, S) por SKU de politicas.optimizar_politicas;
+    reemplaza Punto_Reorden, Stock_Objetivo y Q_Lote_Optimo del maestro antes del día 1.
+    pronostico: método de pronóstico ('promedio_movil', 'ses', 'holt', 'croston', 'auto')
+    o un Pronosticador (ver sistema/pronostico.py); se actualiza con la demanda de cada
+    día y la reposición usa puntos de reorden dinámicos. Se retorna en 'pronostico'.
+    stock_seguridad: True (nivel de servicio 95%) o un nivel en (0, 1) recalcula cada día
+    Stock_Seguridad, Punto_Reorden y Stock_Objetivo del maestro desde la variabilidad de la
+    demanda y del lead time observado; reposición y alertas usan esos umbrales
+    (df_stock_seguridad; ver sistema/stock_seguridad.py).
     """
+    if catalogos is None:
+        catalogos = catalogos_simulacion() if carga is None else carga.catalogos()
+    if carga is None:
+        demanda_diaria = functools.partial(generar_demanda_diaria, catalogos=catalogos)
+    else:
+        demanda_diaria = carga.generar_demanda_diaria
+    # Generador de la corrida: demanda y decisiones de los clientes (espera o venta perdida)
+    rng = random.Random(semilla)
+
     # Inicializar módulos
-    gestion = GestionInventario()
-    transporte = GestionTransporte()
+    gestion = GestionInventario(rng=rng, catalogos=catalogos)
+    if politicas is not None:
+        gestion.aplicar_politicas(politicas)
+    pronosticador = pronostico
+    if isinstance(pronostico, str):
+        pronosticador = crear_pronosticador(pronostico, gestion.df_productos.index)
+    motor_seguridad = crear_motor_seguridad(stock_seguridad, gestion.df_productos)
+    transporte = GestionTransporte(estrategia_empaque, catalogos=catalogos)
+    monitor_kpis = tendencias.MonitorKPIs()
+    motor_alertas = alertas.MotorAlertas()
+    crono = instrumentacion.crear_cronometro(instrumentar)
+    monitor_memoria = memoria.crear_monitor(medir_memoria)
+    perfil = perfilado.crear_perfil(perfilar)
     
     resultados_diarios = []
     lista_pedidos_db = [] # Para construir df_pedidos
+    lineas_pedido = {'ID_Pedido': [], 'SKU': [], 'Cant_Solicitada': [], 'Cant_Entregada': []}
+    monitor_memoria.iniciar()
+    perfil.iniciar()
     
     # Loop de Simulación
-    for dia in range(1, n_dias + 1):
-        # 1. Generar Demanda (Pedidos)
-        pedidos_dia = generar_demanda_diaria(dia, escenario)
+    try:
+        for dia in range(1, n_dias + 1):
+            inicio_pedidos_dia = len(lista_pedidos_db)
+            inicio_ventas_perdidas = len(gestion.ventas_perdidas)
+            crono.iniciar_dia(dia)
+            perfil.iniciar_dia(dia)
         
-        # 2. Recepción de Compras (Entradas de Stock)
-        recepciones = gestion.recibir_ordenes_compra(dia)
+            # 1. Generar Demanda (Pedidos)
+            with crono.fase('demanda'):
+                pedidos_dia = demanda_diaria(dia, escenario, rng)
         
-        # 2.1. Atender Backlog (Prioridad antes de nuevos pedidos)
-        items_backlog_despachados = gestion.atender_backlog(dia)
+            # 2. Recepción de Compras (Entradas de Stock)
+            with crono.fase('recepciones'):
+                recepciones = gestion.recibir_ordenes_compra(dia)
         
-        # 3. Procesamiento de Pedidos (Compromiso y Despacho)
-        pedidos_procesados_dia = []
-        pedidos_para_transporte = []
+            pedidos_procesados_dia = []
+            pedidos_para_transporte = []
         
-        # Agregar items de backlog a transporte
-        # Agrupar por pedido para reconstruir estructura de transporte
-        backlog_por_pedido = {}
-        for item in items_backlog_despachados:
-            pid = item['id_pedido']
-            if pid not in backlog_por_pedido:
-                backlog_por_pedido[pid] = {'id_pedido': pid, 'cliente': item['cliente'], 'items': [], 'zona': 'General'}
-            
-            backlog_por_pedido[pid]['items'].append({'sku': item['sku'], 'cantidad': item['cantidad']})
-            
-        # Añadir backlog procesado a la lista de transporte
-        for pid, p_data in backlog_por_pedido.items():
-            # Buscar zona en lista_pedidos_db (histórico)
-            # Esto es un poco ineficiente pero funcional para simulación pequeña
-            zona_id_found = 'General'
-            for p_hist in lista_pedidos_db:
-                if p_hist['ID_Pedido'] == pid:
-                    zona_id_found = p_hist['Zona_ID']  # Usar ID, no nombre
-                    break
-            p_data['zona'] = zona_id_found
-            pedidos_para_transporte.append(p_data)
-
-        for pedido in pedidos_dia:
-            # Intentar comprometer stock
-            exito, comprometidos, faltantes = gestion.comprometer_stock(pedido)
+            # 2.1. Atender Backlog (Prioridad antes de nuevos pedidos)
+            with crono.fase('backlog'):
+                items_backlog_despachados = gestion.atender_backlog(dia)
             
-            # Despachar (Mueve de Físico a Cliente y registra Kardex)
-            items_despachados = gestion.despachar_pedido(pedido, dia)
-            
-            # Calcular estado del pedido
-            cant_solicitada = sum(i['cantidad'] for i in pedido['items'])
-            cant_entregada = sum(i['cantidad'] for i in items_despachados)
-            
-
-            
-            estado_pedido = 'Pendiente'
-            if cant_entregada == cant_solicitada:
-                estado_pedido = 'Entregado Total'
-            elif cant_entregada > 0:
-                estado_pedido = 'Entregado Parcial'
-            else:
-                estado_pedido = 'Pendiente' 
-            
-            # Determinar el día de entrega efectiva (hoy si se entregó algo, sino se marca como pendiente)
-            dia_entrega = dia if cant_entregada > 0 else None
+                # Agregar items de backlog a transporte
+                # Agrupar por pedido para reconstruir estructura de transporte
+                backlog_por_pedido = {}
+                for item in items_backlog_despachados:
+                    pid = item['id_pedido']
+                    if pid not in backlog_por_pedido:
+                        backlog_por_pedido[pid] = {'id_pedido': pid, 'cliente': item['cliente'], 'items': [], 'zona': 'General'}
+                
+                    backlog_por_pedido[pid]['items'].append({'sku': item['sku'], 'cantidad': item['cantidad']})
+                
+                # Añadir backlog procesado a la lista de transporte
+                for pid, p_data in backlog_por_pedido.items():
+                    # Buscar zona en lista_pedidos_db (histórico)
+                    # Esto es un poco ineficiente pero funcional para simulación pequeña
+                    zona_id_found = 'General'
+                    for p_hist in lista_pedidos_db:
+                        if p_hist['ID_Pedido'] == pid:
+                            zona_id_found = p_hist['Zona_ID']  # Usar ID, no nombre
+                            break
+                    p_data['zona'] = zona_id_found
+                    pedidos_para_transporte.append(p_data)
+        
+            # 3. Procesamiento de Pedidos (Compromiso y Despacho)
+            for pedido in pedidos_dia:
+                with crono.fase('pedidos'):
+                    registro, entregado_por_sku, pedido_transporte = gestion.procesar_pedido(pedido, dia)
             
-            # Crear detalle de items con cantidades
-            items_detalle = []
-            for item in pedido['items']:
-                items_detalle.append({
-                    'SKU': item['sku'],
-                    'Cant_Solicitada': item['cantidad'],
-                    'Cant_Entregada': sum(d['cantidad'] for d in items_despachados if d['sku'] == item['sku'])
-                })
+                    # Líneas del pedido (tabla hija df_lineas_pedido)
+                    for item in pedido['items']:
+                        lineas_pedido['ID_Pedido'].append(pedido['id_pedido'])
+                        lineas_pedido['SKU'].append(item['sku'])
+                        lineas_pedido['Cant_Solicitada'].append(item['cantidad'])
+                        lineas_pedido['Cant_Entregada'].append(entregado_por_sku.get(item['sku'], 0))
             
-            # Guardar registro para df_pedidos
-            lista_pedidos_db.append({
-                'ID_Pedido': pedido['id_pedido'],
-                'Fecha': dia,
-                'Fecha_Entrega': dia_entrega,
-                'Cliente': pedido['cliente_id'],
-                'Zona_ID': pedido['zona_id'],  # ID para lógica interna
-                'Zona': dic_zonas.get(pedido['zona_id'], pedido['zona_id']),  # Nombre para display
-                'Producto': str([i['sku'] for i in pedido['items']]), # Simplificado para vista general
-                'Items_Detalle': items_detalle,  # Detalle completo de productos
-                'Cant_Solicitada': cant_solicitada,
-                'Cant_Entregada': cant_entregada,
-                'Estado': estado_pedido
-            })
+                    # Guardar registro para df_pedidos
+                    lista_pedidos_db.append(registro)
             
-            # Preparar para transporte (solo lo que se despachó efectivamente)
-            if cant_entregada > 0:
-                # Reconstruir estructura para transporte con items despachados
-                pedido_transporte = {
-                    'id_pedido': pedido['id_pedido'],
-                    'cliente': pedido['cliente_id'],
-                    'zona': pedido['zona_id'],
-                    'items': items_despachados # Solo lo que se mueve
-                }
-                pedidos_para_transporte.append(pedido_transporte)
+                    # Preparar para transporte (solo lo que se despachó efectivamente)
+                    if pedido_transporte is not None:
+                        pedidos_para_transporte.append(pedido_transporte)
         
-        # 4. Planificación de Transporte
-        despachos_dia, no_asignados = transporte.planificar_despachos(dia, pedidos_para_transporte, gestion.df_productos)
+            # 4. Planificación de Transporte
+            with crono.fase('transporte'):
+                despachos_dia, no_asignados = transporte.planificar_despachos(dia, pedidos_para_transporte, gestion.df_productos)
         
-        # 5. Reposición (Compras a Proveedores)
-        ordenes_generadas = gestion.verificar_reposicion(dia, escenario)
+            # 5. Reposición (Compras a Proveedores)
+            with crono.fase('reposicion'):
+                if pronosticador is not None:
+                    pronosticador.actualizar(pronosticador.vector_demanda(pedidos_dia))
+                if motor_seguridad is not None:
+                    motor_seguridad.actualizar_demanda(motor_seguridad.vector_demanda(pedidos_dia))
+                    motor_seguridad.registrar_recepciones(recepciones, dia)
+                    motor_seguridad.aplicar(gestion.df_productos)
+                ordenes_generadas = gestion.verificar_reposicion(dia, escenario, pronosticador)
         
-        # 6. Cálculo de KPIs y Alertas del Día
-        # Primero calcular los KPIs base
-        pedidos_dia_completos = [p for p in lista_pedidos_db if p['Fecha'] == dia]
+            # 6. Cálculo de KPIs y Alertas del Día (sumas simples sobre los registros del día)
+            with crono.fase('kpis'):
+                pedidos_dia_completos = lista_pedidos_db[inicio_pedidos_dia:]
+                ventas_perdidas_dia = [vp for vp in gestion.ventas_perdidas[inicio_ventas_perdidas:] if vp.get('Fecha') == dia]
         
-        kpis_dia = indicadores.calcular_kpis_diarios(
-            pedidos_dia, 
-            pedidos_procesados_dia, 
-            capacidad_picking,
-            pedidos_dia_completos  # Pasar registros completos para cálculo correcto de OTIF
-        )
+                kpis_dia = indicadores.calcular_kpis_diarios(
+                    pedidos_dia, 
+                    pedidos_procesados_dia, 
+                    capacidad_picking,
+                    pedidos_dia_completos,
+                    ventas_perdidas_dia,
+                    despachos_dia
+                )
         
-        # Recalcular KPIs precisos basados en lo procesado hoy
-        total_solicitado_dia = sum(p['Cant_Solicitada'] for p in lista_pedidos_db if p['Fecha'] == dia)
-        total_entregado_dia = sum(p['Cant_Entregada'] for p in lista_pedidos_db if p['Fecha'] == dia)
-        fill_rate_dia = (total_entregado_dia / total_solicitado_dia * 100) if total_solicitado_dia > 0 else 100
-        kpis_dia['fill_rate'] = round(fill_rate_dia, 2)
+                monitor_kpis.actualizar(dia, kpis_dia)
         
-        # OTIF: Pedidos completos entregados EL MISMO DÍA
-        pedidos_otif = [
-            p for p in pedidos_dia_completos 
-            if p['Cant_Solicitada'] == p['Cant_Entregada']  # Completo
-            and p['Fecha_Entrega'] == dia  # Entregado el mismo día
-        ]
-        otif_dia = (len(pedidos_otif) / len(pedidos_dia_completos) * 100) if len(pedidos_dia_completos) > 0 else 0
-        kpis_dia['otif'] = round(otif_dia, 2)
-
-        # Calcular Backlog Rate correcto (Unidades pendientes, NO perdidas)
-        # Backlog = Total No Entregado - Ventas Perdidas
-        unidades_no_entregadas = total_solicitado_dia - total_entregado_dia
-        unidades_perdidas_dia = sum(vp.get('Cantidad_Perdida', 0) for vp in gestion.ventas_perdidas if vp.get('Fecha') == dia)
-        unidades_backlog_dia = unidades_no_entregadas - unidades_perdidas_dia
-        if unidades_backlog_dia < 0: unidades_backlog_dia = 0  # Failsafe
+            # Eventos de alerta del día (apertura/cierre, sin repetir condiciones ya abiertas)
+            with crono.fase('alertas'):
+                alertas_dia = motor_alertas.evaluar(
+                    dia,
+                    gestion.df_inventario, 
+                    gestion.df_productos,
+                    kpis_dia
+                )
         
-        backlog_rate_dia = (unidades_backlog_dia / total_solicitado_dia * 100) if total_solicitado_dia > 0 else 0
-        kpis_dia['backlog_rate'] = round(backlog_rate_dia, 2)
+            # Guardar estado diario
+            resultados_diarios.append({
+                "dia": dia,
+                "kpis": kpis_dia,
+                "tendencias": monitor_kpis.resumen(),
+                "alertas": alertas_dia,
+                "estado_inventario": gestion.df_inventario.copy() # Snapshot
+            })
         
-        # Calcular Utilización de Flota (Ocupación promedio de vehículos usados)
-        if despachos_dia:
-            ocupacion_promedio = sum(d['Porcentaje_Ocupacion'] for d in despachos_dia) / len(despachos_dia)
-            kpis_dia['utilizacion_flota'] = round(ocupacion_promedio, 2)
-        else:
-            kpis_dia['utilizacion_flota'] = 0.0
+            perfil.cerrar_dia(dia)
         
-        alertas_dia = alertas.generar_alertas(
-            gestion.df_inventario, 
-            gestion.df_productos,
-            kpis_dia, 
-            dia
-        )
+            if monitor_memoria.toca(dia, n_dias):
+                # Los snapshots se miden aparte de resultados_diarios (que los referencia)
+                monitor_memoria.medir(dia, memoria.estructuras_simulacion(
+                    gestion, transporte,
+                    snapshots_inventario=[r['estado_inventario'] for r in resultados_diarios],
+                    resultados_diarios=resultados_diarios,
+                    lista_pedidos_db=lista_pedidos_db,
+                    lineas_pedido=lineas_pedido,
+                    monitor_kpis=monitor_kpis,
+                    motor_alertas=motor_alertas,
+                ))
         
-        # Guardar estado diario
-        resultados_diarios.append({
-            "dia": dia,
-            "kpis": kpis_dia,
-            "alertas": alertas_dia,
-            "estado_inventario": gestion.df_inventario.copy() # Snapshot
-        })
+            if progreso is not None:
+                progreso(dia, n_dias, resultados_diarios[-1])
+    finally:
+        # También ante excepciones en una fase o cancelación desde `progreso`
+        monitor_memoria.detener()
+        perfil.detener()
+    estadisticas_perfil = perfil.estadisticas()
 
     # --- Generación de Resultados Finales ---
     tablas_inventario = gestion.obtener_tablas_finales()
-    df_pedidos = pd.DataFrame(lista_pedidos_db)
-    
-    # Métricas Globales
-    metricas_globales = indicadores.calcular_metricas_globales(resultados_diarios)
-    metricas_globales['valor_total_inventario'] = (
-        tablas_inventario['df_estado_actual']['Stock_Fisico'] * 
-        tablas_inventario['df_estado_actual']['Costo_Unitario']
-    ).sum()
+    df_pedidos = esquemas.construir_tabla('df_pedidos', lista_pedidos_db)
+    df_lineas_pedido = esquemas.construir_tabla('df_lineas_pedido', lineas_pedido)
+    df_ventas_perdidas = esquemas.construir_tabla('ventas_perdidas', gestion.ventas_perdidas)
+    df_historial_backlog = esquemas.construir_tabla('historial_backlog', gestion.historial_backlog)
     
     # Tablas de Transporte
     df_flota = transporte.obtener_flota_df()
     df_despachos = transporte.obtener_despachos_df()
+    df_lineas_despacho = transporte.obtener_lineas_despacho_df()
+    df_utilizacion = transporte.obtener_utilizacion_df()
+    
+    # KPIs diarios y Métricas Globales (una pasada del motor de indicadores)
+    df_kpis_diarios, metricas_globales = indicadores.calcular_kpis(
+        df_pedidos, df_ventas_perdidas, df_despachos, dias=range(1, n_dias + 1)
+    )
+    metricas_globales['valor_total_inventario'] = float((
+        tablas_inventario['df_estado_actual']['Stock_Fisico'] * 
+        tablas_inventario['df_estado_actual']['Costo_Unitario']
+    ).sum())
     
     return {
-        'config': {'n_dias': n_dias, 'escenario': escenario},
+        'config': {'n_dias': n_dias, 'escenario': escenario, 'estrategia_empaque': estrategia_empaque,
+                   'capacidad_picking': capacidad_picking, 'semilla': semilla,
+                   'version_catalogos': version_catalogos(catalogos), 'instrumentar': instrumentar,
+                   'medir_memoria': medir_memoria, 'perfilar': perfilar,
+                   'carga': None if carga is None else carga.descripcion(),
+                   'politicas': politicas is not None,
+                   'pronostico': None if pronosticador is None else pronosticador.metodo,
+                   'stock_seguridad': None if motor_seguridad is None else motor_seguridad.nivel_servicio},
         'resultados_diarios': resultados_diarios,
         'metricas_globales': metricas_globales,
+        'df_kpis_diarios': df_kpis_diarios,
+        'cubo_kpis': CuboKPIs.construir(df_pedidos, df_lineas_pedido, df_ventas_perdidas, df_historial_backlog),
+        'df_tendencias': pd.DataFrame(
+            [{'Dia': r['dia'], **r['tendencias']} for r in resultados_diarios]
+        ),
         'df_productos': tablas_inventario['df_productos'],
         'df_pedidos': df_pedidos,
+        'df_lineas_pedido': df_lineas_pedido,
         'df_compras': tablas_inventario['df_compras'],
         'df_kardex': tablas_inventario['df_kardex'],
         'df_flota': df_flota,
         'df_despachos': df_despachos,
-        'ventas_perdidas': pd.DataFrame(gestion.ventas_perdidas),
-        'historial_backlog': pd.DataFrame(gestion.historial_backlog)
+        'df_lineas_despacho': df_lineas_despacho,
+        'df_utilizacion': df_utilizacion,
+        'df_alertas': pd.DataFrame([a for r in resultados_diarios for a in r['alertas']]),
+        'alertas_activas': pd.DataFrame(motor_alertas.alertas_activas()),
+        'ventas_perdidas': df_ventas_perdidas,
+        'historial_backlog': df_historial_backlog,
+        'df_timings': crono.tabla(),
+        'df_memoria': monitor_memoria.tabla(),
+        'df_memoria_resumen': monitor_memoria.resumen(),
+        'pico_memoria': monitor_memoria.pico(),
+        'df_perfil': perfilado.top(estadisticas_perfil),
+        'estadisticas_perfil': estadisticas_perfil,
+        'pronostico': pronosticador,
+        'df_stock_seguridad': (pd.DataFrame(columns=list(COLUMNAS_STOCK_SEGURIDAD)) if motor_seguridad is None
+                               else motor_seguridad.tabla())
     }
 
-if __name__ == "__main__":
-    # Test rápido
-    res = run_simulation(7, 1500)
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta la simulación logística")
+    parser.add_argument('--dias', type=int, default=7)
+    parser.add_argument('--picking', type=int, default=1500, help="Capacidad de picking diaria")
+    parser.add_argument('--escenario', default="normal")
+    parser.add_argument('--empaque', default="ffd", help="Estrategia de empaque/transporte")
+    parser.add_argument('--semilla', type=int, default=None)
+    parser.add_argument('--perfilar', action='store_true', help="Perfila la corrida con cProfile")
+    parser.add_argument('--dia-perfil', default=None,
+                        help="Perfila solo estos días: '17', '15,16' o 'pico' (días pico de demanda_estacional)")
+    parser.add_argument('--top', type=int, default=perfilado.TOP_N, help="Funciones en el reporte del perfil")
+    parser.add_argument('--orden', default=perfilado.ORDEN, help="Orden del reporte (cumulative, tottime, ...)")
+    parser.add_argument('--salida-perfil', default=None,
+                        help="Prefijo de archivos del perfil (.prof, .txt, .collapsed)")
+    args = parser.parse_args(argv)
+
+    perfilar = args.perfilar
+    if args.dia_perfil == 'pico':
+        perfilar = DIAS_PICO_ESTACIONAL
+    elif args.dia_perfil:
+        perfilar = [int(d) for d in args.dia_perfil.split(',')]
+
+    res = run_simulation(args.dias, args.picking, args.escenario, args.empaque, semilla=args.semilla,
+                         perfilar=perfilar)
     print(f"Simulación completada. Pedidos: {len(res['df_pedidos'])}")
-    print(f"Tablas generadas: {res.keys()}")
+
+    if not perfilar:
+        print(f"Tablas generadas: {res.keys()}")
+        return 0
+    print(perfilado.reporte(res['estadisticas_perfil'], args.top, args.orden))
+    if args.salida_perfil:
+        rutas = perfilado.guardar(res['estadisticas_perfil'], args.salida_perfil, args.top, args.orden)
+        print("Perfil guardado: " + ", ".join(rutas.values()))
+    return 0
+
+if __name__ == "__main__":
+    # Test rápido: python main.py  |  Perfil: python main.py --dias 30 --perfilar --salida-perfil perfil
+    raise SystemExit(main_cli())
@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from logistica_sim.sistema.alertas import MotorAlertas, ReglaAlerta, generar_alertas
+
+def test_motor_alertas():
+    print("Iniciando prueba del motor de alertas (apertura/cierre con histéresis)...")
+    df_productos = pd.DataFrame({'Stock_Seguridad': [100, 50]}, index=pd.Index(['P001', 'P002'], name='ID_Producto'))
+
+    def inventario(p001, p002):
+        return pd.DataFrame({'Stock_Fisico': [p001, p002]}, index=df_productos.index)
+
+    motor = MotorAlertas()
+    kpis_ok = {'otif': 100.0, 'fill_rate': 100.0}
+
+    # Caso 1: Una condición persistente emite una sola apertura
+    print("\n--- Caso 1: Deduplicación ---")
+    dia1 = motor.evaluar(1, inventario(80, 500), df_productos, kpis_ok)
+    dia2 = motor.evaluar(2, inventario(70, 500), df_productos, kpis_ok)
+    print(f"Día 1: {[a['Mensaje'] for a in dia1]}")
+    assert [(a['Evento'], a['Entidad']) for a in dia1] == [('Apertura', 'P001')]
+    assert dia2 == []
+
+    # Caso 2: Se cierra al recuperarse y queda registro del día de apertura
+    print("\n--- Caso 2: Cierre ---")
+    dia3 = motor.evaluar(3, inventario(300, 500), df_productos, kpis_ok)
+    print(f"Día 3: {[a['Mensaje'] for a in dia3]}")
+    assert dia3[0]['Evento'] == 'Cierre' and dia3[0]['Dia_Apertura'] == 1
+    assert motor.alertas_activas() == []
+
+    # Caso 3: Histéresis del KPI (abre < 90, cierra solo al superar 92)
+    print("\n--- Caso 3: Histéresis ---")
+    motor = MotorAlertas([ReglaAlerta('otif_bajo', 'KPI Bajo', 'otif', '<', 90, 'Medio', alcance='kpi', histeresis=2.0)])
+    eventos = [motor.evaluar(d, inventario(0, 0), df_productos, {'otif': v})
+               for d, v in enumerate([85, 91, 89, 93], start=1)]
+    print(f"Eventos por día: {[[e['Evento'] for e in ev] for ev in eventos]}")
+    assert [[e['Evento'] for e in ev] for ev in eventos] == [['Apertura'], [], [], ['Cierre']]
+
+    # Caso 4: Evaluación sin estado (compatibilidad) lista todas las condiciones vigentes
+    alertas = generar_alertas(inventario(10, 10), df_productos, {'otif': 50.0, 'fill_rate': 60.0}, 1)
+    print(f"Sin estado: {len(alertas)} alertas")
+    assert len(alertas) == 4
+
+    print("\n[EXITO] PRUEBA EXITOSA: Las alertas se abren y cierran sin repetirse cada día.")
+
+if __name__ == "__main__":
+    test_motor_alertas()
@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import copy
+import benchmark_simulacion as bench
+from logistica_sim.sistema import catalogos, demanda
+
+def test_benchmark_simulacion():
+    print("Iniciando prueba del benchmark de simulación...")
+    sku_original = copy.deepcopy(catalogos.dic_sku)
+
+    # Caso 1: Un caso pequeño mide total, etapas y PDF sin tocar el catálogo global
+    print("\n--- Caso 1: Medición ---")
+    documento = bench.ejecutar([{'dias': 5, 'pedidos_por_dia': 12, 'n_skus': 8}], repeticiones=1)
+    tiempos = documento['casos']['d5_p12_s8']['tiempos_s']
+    assert set(bench.ETAPAS) <= set(tiempos) and 'generar_pdf' in tiempos
+    assert sum(tiempos[e] for e in bench.ETAPAS) <= tiempos['total']
+    assert catalogos.dic_sku == sku_original and demanda.PEDIDOS_POR_DIA == (10, 15)
+    assert len(bench.catalogo_sintetico(8)['dic_sku']) == 8
+
+    # Caso 2: Regresiones según tolerancia y diferencia mínima
+    print("\n--- Caso 2: Comparación contra base ---")
+    base = {'casos': {'c': {'tiempos_s': {'total': 1.0, 'demanda': 0.001, 'alertas': 0.2}}}}
+    actual = {'casos': {'c': {'tiempos_s': {'total': 1.1, 'demanda': 0.003, 'alertas': 0.5, 'nueva': 9.0}},
+                        'otro': {'tiempos_s': {'total': 5.0}}}}
+    regresiones = bench.comparar(actual, base, tolerancia=0.25)
+    print(regresiones)
+    assert [r['metrica'] for r in regresiones] == ['alertas']
+    assert bench.comparar(actual, base, tolerancia=2.0) == []
+
+    # Caso 3: Barrido de un eje a la vez sin casos repetidos
+    casos = bench.casos_barrido()
+    assert len(casos) == len({bench.nombre_caso(c) for c in casos}) == 7
+
+    print("\n[EXITO] PRUEBA EXITOSA: El benchmark mide etapas con catálogos propios y detecta regresiones.")
+
+if __name__ == "__main__":
+    test_benchmark_simulacion()
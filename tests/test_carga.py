@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import time
+import numpy as np
+from main import run_simulation
+from logistica_sim.sistema import carga, catalogos, demanda
+
+def test_carga_sintetica():
+    print("Iniciando prueba del generador de carga sintética...")
+    c = carga.CargaSintetica(lineas_por_dia=2000, n_skus=300, n_clientes=80, n_zonas=12, semilla=4)
+
+    # Caso 1: Maestros coherentes y reproducibles
+    print("\n--- Caso 1: Maestros ---")
+    assert len(c.dic_sku) == 300 and len(c.dic_clientes) == 80 and len(c.dic_zonas) == 12
+    assert set(c.dic_coordenadas_zonas) == set(c.dic_zonas)
+    assert all(v['precio_venta'] > v['costo_unitario'] and v['stock_objetivo'] > v['stock_minimo']
+               for v in c.dic_sku.values())
+    assert {v['frecuencia_compra'] for v in c.dic_clientes.values()} <= set(catalogos.FRECUENCIA_PESOS)
+    assert c.dic_flota and {v['tipo'] for v in c.dic_flota.values()} <= set(catalogos.dic_tipos_vehiculo)
+    # Cada cliente tiene coordenadas cerca del centro de su zona
+    assert set(c.dic_coordenadas_clientes) == set(c.dic_clientes)
+    for cliente, (x, y) in c.dic_coordenadas_clientes.items():
+        zx, zy = c.dic_coordenadas_zonas[c.dic_clientes[cliente]['zona_id']]
+        assert ((x - zx) ** 2 + (y - zy) ** 2) ** 0.5 <= carga.RADIO_CLIENTES_KM + 0.1
+    otra = carga.CargaSintetica(lineas_por_dia=2000, n_skus=300, n_clientes=80, n_zonas=12, semilla=4)
+    assert otra.dic_sku == c.dic_sku and otra.generar_demanda_diaria(3) == c.generar_demanda_diaria(3)
+
+    # Caso 2: Demanda con el volumen, el sesgo Zipf y la estacionalidad pedidos
+    print("\n--- Caso 2: Demanda ---")
+    pedidos = c.generar_demanda_diaria(7)
+    lineas = [i for p in pedidos for i in p['items']]
+    print(f"Pedidos: {len(pedidos)}, Líneas: {len(lineas)}")
+    assert len(lineas) == round(2000 * c.factor_estacional(7))
+    assert all(len({i['sku'] for i in p['items']}) == len(p['items']) for p in pedidos)
+    assert all(p['zona_id'] == c.dic_clientes[p['cliente_id']]['zona_id'] for p in pedidos)
+    conteo = {}
+    for i in lineas:
+        conteo[i['sku']] = conteo.get(i['sku'], 0) + 1
+    assert conteo['P00001'] > conteo.get('P00050', 0) * 5
+    pico = c.generar_demanda_diaria(demanda.DIAS_PICO_ESTACIONAL[0], "demanda_estacional")
+    normal = c.generar_demanda_diaria(demanda.DIAS_PICO_ESTACIONAL[0])
+    assert sum(len(p['items']) for p in pico) > 1.9 * sum(len(p['items']) for p in normal)
+
+    # Caso 3: Escala de 100k líneas por día
+    print("\n--- Caso 3: Escala 100k ---")
+    t0 = time.perf_counter()
+    grande = carga.CargaSintetica.escala('100k')
+    n = sum(len(p['items']) for p in grande.generar_demanda_diaria(1))
+    print(f"100k: {n} líneas en {time.perf_counter() - t0:.2f}s, flota de {len(grande.dic_flota)} vehículos")
+    assert abs(n - 100_000 * grande.factor_estacional(1)) <= 1
+
+    print("\n[EXITO] PRUEBA EXITOSA: La carga sintética genera maestros y demanda coherentes y sembrados.")
+
+def test_carga_en_simulacion():
+    print("Iniciando prueba de la carga sintética dentro de run_simulation...")
+    originales = copy.deepcopy((catalogos.dic_sku, catalogos.dic_clientes, catalogos.dic_zonas,
+                                catalogos.dic_coordenadas_zonas, catalogos.dic_flota))
+    c = carga.CargaSintetica(lineas_por_dia=200, n_skus=60, n_clientes=30, n_zonas=8, semilla=1)
+    catalogos_carga = copy.deepcopy(c.catalogos())
+
+    def verificar_globales(dia, n_dias, resultado_dia):
+        # Durante la corrida los catálogos globales siguen intactos
+        assert catalogos.dic_sku == originales[0] and catalogos.dic_flota == originales[4]
+
+    res = run_simulation(4, 1500, "normal", semilla=2, carga=c, progreso=verificar_globales)
+    print(res['metricas_globales'])
+    assert len(res['df_productos']) == 60
+    assert set(res['df_flota']['ID_Vehiculo']) == set(c.dic_flota)
+    assert set(res['df_pedidos']['Zona_ID']) <= set(c.dic_zonas)
+    total_lineas = sum(round(200 * c.factor_estacional(d)) for d in range(1, 5))
+    assert len(res['df_lineas_pedido']) == total_lineas
+    assert res['config']['carga']['n_skus'] == 60 and c.catalogos() == catalogos_carga
+    assert res['config']['version_catalogos'] == catalogos.version_catalogos(c.catalogos())
+
+    # Los catálogos reales no se modifican
+    assert (catalogos.dic_sku, catalogos.dic_clientes, catalogos.dic_zonas,
+            catalogos.dic_coordenadas_zonas, catalogos.dic_flota) == originales
+    assert np.isclose(res['metricas_globales']['total_unidades'],
+                      res['df_lineas_pedido']['Cant_Solicitada'].sum())
+
+    print("\n[EXITO] PRUEBA EXITOSA: run_simulation corre con catálogos, flota y demanda sintéticos.")
+
+if __name__ == "__main__":
+    test_carga_sintetica()
+    test_carga_en_simulacion()
@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+from logistica_sim.sistema import comparativo
+
+def test_reporte_comparativo():
+    print("Iniciando prueba del reporte comparativo de escenarios...")
+    escenarios = ("normal", "demanda_estacional")
+
+    # Caso 1: Procesos paralelos y ejecución local dan los mismos resúmenes (misma semilla)
+    print("\n--- Caso 1: Paralelo vs secuencial ---")
+    paralelo = comparativo.simular_escenarios(escenarios, n_dias=10, semilla=7, procesos=2)
+    secuencial = comparativo.simular_escenarios(escenarios, n_dias=10, semilla=7, procesos=1)
+    df = comparativo.tabla_comparativa(paralelo)
+    print(df[['OTIF (%)', 'Fill Rate (%)', 'Delta Fill Rate (%)']])
+    assert df.equals(comparativo.tabla_comparativa(secuencial))
+    assert (df.loc['normal'].filter(like='Delta') == 0).all()
+
+    # Caso 2: Los resúmenes son compactos (sin tablas de pedidos ni kardex)
+    assert 'df_pedidos' not in paralelo[0] and 'df_kardex' not in paralelo[0]
+
+    # Caso 3: PDF con página comparativa + una sección por escenario
+    print("\n--- Caso 3: PDF ---")
+    pdf_bytes = comparativo.generar_pdf_comparativo(paralelo)
+    paginas = int(re.search(rb"/Count (\d+)", pdf_bytes).group(1))
+    print(f"Páginas: {paginas}")
+    assert paginas >= 1 + len(escenarios)
+
+    print("\n[EXITO] PRUEBA EXITOSA: El comparativo resume escenarios en paralelo y calcula deltas.")
+
+if __name__ == "__main__":
+    test_reporte_comparativo()
@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import numpy as np
+import pandas as pd
+from logistica_sim.sistema.consultas import TablaIndexada, n_paginas, pedidos_con_sku
+
+def test_consultas_paginadas():
+    print("Iniciando prueba de filtros indexados y paginación...")
+    rng = np.random.default_rng(1)
+    n = 500_000
+    df_kardex = pd.DataFrame({
+        'Fecha': np.sort(rng.integers(1, 366, n)).astype(np.int32),
+        'Producto': pd.Categorical(rng.choice([f"P{i:03d}" for i in range(1, 201)], n)),
+        'Tipo_Movimiento': pd.Categorical(rng.choice(['SALDO_INICIAL', 'COMPRA_RECEPCION', 'VENTA_DESPACHO'], n)),
+        'Cantidad': rng.integers(1, 100, n),
+    })
+    t0 = time.perf_counter()
+    tabla = TablaIndexada(df_kardex, ('Fecha', 'Producto', 'Tipo_Movimiento'))
+    print(f"Índices de {n:,} filas en {time.perf_counter() - t0:.3f}s")
+
+    # Caso 1: Filtros combinados = máscara booleana equivalente (mismo orden)
+    print("\n--- Caso 1: Filtros ---")
+    t0 = time.perf_counter()
+    filas = tabla.filtrar(Fecha=range(10, 20), Producto=['P001', 'P050'], Tipo_Movimiento='VENTA_DESPACHO')
+    t_indice = time.perf_counter() - t0
+    mascara = (df_kardex['Fecha'].between(10, 19) & df_kardex['Producto'].isin(['P001', 'P050'])
+               & (df_kardex['Tipo_Movimiento'] == 'VENTA_DESPACHO'))
+    print(f"{len(filas)} filas en {t_indice * 1000:.2f}ms")
+    assert np.array_equal(filas, np.flatnonzero(mascara.to_numpy()))
+    assert len(tabla.filtrar()) == n and len(tabla.filtrar(Producto='X')) == 0
+
+    # Caso 2: Páginas por desplazamiento
+    print("\n--- Caso 2: Paginación ---")
+    pagina_2 = tabla.pagina(filas, 2, 25)
+    assert pagina_2.equals(df_kardex[mascara].iloc[25:50])
+    assert n_paginas(len(filas), 25) == -(-len(filas) // 25) and n_paginas(0) == 1
+
+    # Caso 3: Búsqueda de IDs por prefijo y pedidos que contienen un SKU
+    print("\n--- Caso 3: Búsqueda ---")
+    df_pedidos = pd.DataFrame({'ID_Pedido': ['P01-001', 'P01-002', 'P02-001', 'P10-001'], 'Fecha': [1, 1, 2, 10]})
+    df_lineas = pd.DataFrame({'ID_Pedido': ['P01-001', 'P02-001', 'P02-001'], 'SKU': ['P003', 'P003', 'P004']})
+    pedidos = TablaIndexada(df_pedidos, ('ID_Pedido', 'Fecha'))
+    lineas = TablaIndexada(df_lineas, ('ID_Pedido', 'SKU'))
+    print(pedidos.buscar_ids('ID_Pedido', 'p01'))
+    assert pedidos.buscar_ids('ID_Pedido', 'p01') == ['P01-001', 'P01-002']
+    assert pedidos.buscar_ids('ID_Pedido', 'P0', limite=3) == ['P01-001', 'P01-002', 'P02-001']
+    ids = pedidos_con_sku(lineas, 'P003')
+    assert pedidos.filtrar(ID_Pedido=ids, Fecha=2).tolist() == [2]
+
+    print("\n[EXITO] PRUEBA EXITOSA: Las tablas se filtran por índice, se paginan y permiten búsqueda por prefijo.")
+
+if __name__ == "__main__":
+    test_consultas_paginadas()
@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from logistica_sim.sistema.cubo import CuboKPIs
+
+def test_cubo_kpis():
+    print("Iniciando prueba del cubo de KPIs...")
+    df_pedidos = pd.DataFrame([
+        {'ID_Pedido': 'A', 'Fecha': 1, 'Cliente': 'C01', 'Zona_ID': 'Z01'},
+        {'ID_Pedido': 'B', 'Fecha': 1, 'Cliente': 'C02', 'Zona_ID': 'Z02'},
+        {'ID_Pedido': 'C', 'Fecha': 2, 'Cliente': 'C01', 'Zona_ID': 'Z01'},
+    ])
+    df_lineas = pd.DataFrame([
+        {'ID_Pedido': 'A', 'SKU': 'P001', 'Cant_Solicitada': 10, 'Cant_Entregada': 10},
+        {'ID_Pedido': 'A', 'SKU': 'P002', 'Cant_Solicitada': 5, 'Cant_Entregada': 0},
+        {'ID_Pedido': 'B', 'SKU': 'P001', 'Cant_Solicitada': 4, 'Cant_Entregada': 4},
+        {'ID_Pedido': 'C', 'SKU': 'P002', 'Cant_Solicitada': 8, 'Cant_Entregada': 2},
+    ])
+    df_perdidas = pd.DataFrame([{'Fecha': 2, 'Pedido_ID': 'C', 'Producto': 'P002', 'Cantidad_Perdida': 6}])
+    df_backlog = pd.DataFrame([{'Fecha_Ingreso': 1, 'ID_Pedido': 'A', 'Producto': 'P002',
+                                'Cantidad_Pendiente': 5, 'Estado': 'Ingresado a Backlog'}])
+
+    cubo = CuboKPIs.construir(df_pedidos, df_lineas, df_perdidas, df_backlog)
+
+    # Caso 1: Consolidación por día (pedidos exactos sin la dimensión SKU)
+    print("\n--- Caso 1: Por día ---")
+    por_dia = cubo.consolidar('dia')
+    print(por_dia)
+    assert por_dia.loc[1, 'pedidos'] == 2 and por_dia.loc[1, 'lineas'] == 3
+    assert por_dia.loc[1, 'unidades_backlog'] == 5 and por_dia.loc[2, 'unidades_perdidas'] == 6
+
+    # Caso 2: Corte por cliente y zona, agrupado por SKU
+    print("\n--- Caso 2: Corte cliente C01 por SKU ---")
+    por_sku = cubo.consolidar('sku', cliente='C01', zona='Z01')
+    print(por_sku)
+    assert por_sku.loc['P002', 'unidades_solicitadas'] == 13
+    assert por_sku.loc['P002', 'pedidos'] == 2  # Pedidos que contienen el SKU
+    assert por_sku.loc['P001', 'fill_rate'] == 100.0
+
+    # Caso 3: Total y sub-cubo
+    total = cubo.consolidar(())
+    assert total['unidades_solicitadas'].iloc[0] == 27 and total['pedidos'].iloc[0] == 3
+    assert cubo.cortar(dia=2).consolidar(())['unidades_entregadas'].iloc[0] == 2
+
+    print("\n[EXITO] PRUEBA EXITOSA: El cubo consolida y corta por día, SKU, cliente y zona.")
+
+if __name__ == "__main__":
+    test_cubo_kpis()
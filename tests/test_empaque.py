@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from logistica_sim.sistema import empaque
+from logistica_sim.sistema.transporte import GestionTransporte
+from logistica_sim.sistema.inventario import GestionInventario
+
+def test_empaque():
+    print("Iniciando prueba del motor de empaque...")
+    capacidades = np.array([1000, 5000, 10000], dtype=float)
+
+    # Caso 1: Ninguna estrategia excede la capacidad de los vehículos
+    print("\n--- Caso 1: Capacidad respetada ---")
+    rng = np.random.default_rng(0)
+    pesos = rng.uniform(50, 1500, 200)
+    zonas = rng.choice(['Z01', 'Z02', 'Z03'], 200).tolist()
+
+    for estrategia in empaque.ESTRATEGIAS_EMPAQUE:
+        viajes, sin_asignar = empaque.empacar_dia(pesos, zonas, capacidades, estrategia)
+        for v in viajes:
+            assert v['carga'] <= capacidades[v['vehiculo']] + 1e-6
+            assert abs(pesos[v['pedidos']].sum() - v['carga']) < 1e-6
+        asignados = sum(len(v['pedidos']) for v in viajes)
+        assert asignados + len(sin_asignar) == len(pesos)
+        print(f"{estrategia}: {len(viajes)} viajes, {len(sin_asignar)} sin asignar")
+
+    # Caso 2: Best-Fit elige el vehículo más ajustado
+    print("\n--- Caso 2: Best-Fit Decreasing ---")
+    asignacion, cargas = empaque.empacar([900], capacidades, "bfd")
+    print(f"Pedido de 900 kg asignado al vehículo de {capacidades[asignacion[0]]:.0f} kg (esperado 1000)")
+    assert capacidades[asignacion[0]] == 1000
+
+    # Caso 3: Modo consolidado mezcla zonas en un mismo viaje
+    print("\n--- Caso 3: Consolidación multi-zona ---")
+    viajes, _ = empaque.empacar_dia([300, 300], ['Z01', 'Z02'], capacidades, "consolidado")
+    print(f"Viajes: {len(viajes)} (esperado 1), Zonas: {viajes[0]['zonas']}")
+    assert len(viajes) == 1 and viajes[0]['zonas'] == ['Z01', 'Z02']
+
+    # Caso 4: Integración con GestionTransporte y resumen de utilización
+    print("\n--- Caso 4: Integración con GestionTransporte ---")
+    gestion = GestionInventario()
+    sku = gestion.df_inventario.index[0]
+    pedidos = [
+        {'id_pedido': f'P{i}', 'cliente': 'C01', 'zona': z, 'items': [{'sku': sku, 'cantidad': 100}]}
+        for i, z in enumerate(['Z01', 'Z02', 'Z01'])
+    ]
+    transporte = GestionTransporte(estrategia_empaque="bfd")
+    despachos, no_asignados = transporte.planificar_despachos(1, pedidos, gestion.df_productos)
+    df_util = transporte.obtener_utilizacion_df()
+    print(df_util)
+    assert len(despachos) == 2 and not no_asignados
+    assert df_util.loc[0, 'Viajes'] == 2
+
+    print("\n[EXITO] PRUEBA EXITOSA: El motor de empaque respeta capacidades y estrategias.")
+
+if __name__ == "__main__":
+    test_empaque()
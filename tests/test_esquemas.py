@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from main import run_simulation
+from logistica_sim.sistema import esquemas
+
+def test_esquemas_tablas():
+    print("Iniciando prueba de esquemas compactos de tablas de resultados...")
+    res = run_simulation(20, 1500, "normal")
+
+    # Caso 1: Cada tabla respeta su esquema
+    print("\n--- Caso 1: Tipos por tabla ---")
+    tablas = {'df_pedidos': res['df_pedidos'], 'df_lineas_pedido': res['df_lineas_pedido'],
+              'df_kardex': res['df_kardex'], 'df_despachos': res['df_despachos']}
+    for nombre, df in tablas.items():
+        for col, tipo in esquemas.ESQUEMAS[nombre].items():
+            if col in df.columns:
+                assert df[col].dtype.name == pd.Series(dtype=tipo).dtype.name, f"{nombre}.{col}: {df[col].dtype}"
+        print(f"{nombre}: {len(df)} filas OK")
+    assert 'Items_Detalle' not in res['df_pedidos'].columns
+
+    # Caso 2: La tabla hija de líneas cuadra con la cabecera
+    print("\n--- Caso 2: Líneas vs cabecera ---")
+    pedidos = res['df_pedidos'].set_index('ID_Pedido')
+    por_pedido = res['df_lineas_pedido'].groupby('ID_Pedido')[['Cant_Solicitada', 'Cant_Entregada']].sum()
+    por_pedido = por_pedido.reindex(pedidos.index.astype(str))
+    assert (por_pedido['Cant_Solicitada'].to_numpy() == pedidos['Cant_Solicitada'].to_numpy()).all()
+    assert (por_pedido['Cant_Entregada'].to_numpy() == pedidos['Cant_Entregada'].to_numpy()).all()
+    assert res['df_lineas_pedido'].groupby('ID_Pedido').size().sum() == pedidos['N_Lineas'].sum()
+
+    # Caso 3: Tabla vacía con todas las columnas y tipos
+    vacia = esquemas.construir_tabla('df_despachos', [])
+    assert list(vacia.columns) == list(esquemas.ESQUEMAS['df_despachos']) and vacia.empty
+
+    # Caso 4: Los tipos compactos usan menos memoria que los inferidos
+    print("\n--- Caso 4: Memoria ---")
+    compacto = esquemas.memoria_tablas(res)
+    inferido = {n: int(res[n].astype({c: object for c in res[n].select_dtypes('category').columns})
+                       .astype({c: 'int64' for c in res[n].select_dtypes('int32').columns})
+                       .memory_usage(deep=True).sum()) for n in compacto}
+    print(f"Compacto: {sum(compacto.values()):,} B, Inferido: {sum(inferido.values()):,} B")
+    assert sum(compacto.values()) < sum(inferido.values()) / 2
+
+    print("\n[EXITO] PRUEBA EXITOSA: Las tablas de resultados usan tipos compactos y tablas hijas.")
+
+if __name__ == "__main__":
+    test_esquemas_tablas()
@@ -0,0 +1,95 @@
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logistica_sim.sistema.flota import CalendarioFlota, TURNO_INICIO_H, TURNO_FIN_H
+from logistica_sim.sistema.transporte import GestionTransporte
+from logistica_sim.sistema.inventario import GestionInventario
+
+def test_calendario_flota():
+    print("Iniciando prueba del calendario de flota...")
+    calendario = CalendarioFlota(['V-001', 'V-002'])
+    horas_turno = TURNO_FIN_H - TURNO_INICIO_H
+
+    # Caso 1: Varios viajes por día, uno después del retorno del anterior
+    print("\n--- Caso 1: Viajes múltiples ---")
+    primero = calendario.reservar('V-001', 1, 4.0)
+    segundo = calendario.reservar('V-001', 1, 4.0)
+    print(f"Viaje 1: {primero}, Viaje 2: {segundo}")
+    assert segundo[0] == primero[1]
+
+    # Caso 2: Un viaje que excede el turno no se programa
+    print("\n--- Caso 2: Fuera de turno ---")
+    assert calendario.reservar('V-001', 1, horas_turno) is None
+
+    # Caso 3: Mantenimiento bloquea el día y se elige otro vehículo
+    print("\n--- Caso 3: Mantenimiento ---")
+    calendario.programar_mantenimiento('V-002', 2, TURNO_INICIO_H, horas_turno)
+    assert calendario.en_mantenimiento('V-002', 2)
+    vid, inicio, fin = calendario.reservar_primero_disponible(['V-002', 'V-001'], 2, 3.0)
+    print(f"Vehículo asignado el día 2: {vid} (esperado V-001)")
+    assert vid == 'V-001'
+
+    # Caso 3b: El heap por (libre_desde, posición) elige lo mismo que recorrer todos los candidatos
+    print("\n--- Caso 3b: Heap vs recorrido completo ---")
+    rng = random.Random(3)
+    ids = [f"V-{i:03d}" for i in range(1, 31)]
+    rapido, lento = CalendarioFlota(ids), CalendarioFlota(ids)
+    for dia in range(1, 6):
+        for vid in rng.sample(ids, 3):
+            hora = TURNO_INICIO_H + rng.randint(0, 8)
+            for cal in (rapido, lento):
+                cal.programar_mantenimiento(vid, dia, hora, 2.0)
+        for _ in range(60):
+            candidatos = rng.sample(ids, rng.randint(1, len(ids)))
+            duracion = rng.choice([1.5, 3.0, 5.0])
+            huecos = [(lento.primer_hueco(v, dia, duracion), ids.index(v), v) for v in candidatos]
+            huecos = [h for h in huecos if h[0] is not None]
+            esperado = None
+            if huecos:
+                inicio, _, v = min(huecos)
+                lento.reservar(v, dia, duracion)
+                esperado = (v, inicio, inicio + duracion)
+            assert rapido.reservar_primero_disponible(candidatos, dia, duracion) == esperado
+        rapido.depurar(dia + 1)
+
+    # Caso 4: Integración - pedidos sin vehículo se arrastran al día siguiente
+    print("\n--- Caso 4: Arrastre de pedidos ---")
+    gestion = GestionInventario()
+    transporte = GestionTransporte()
+    for v in transporte.flota:
+        transporte.programar_mantenimiento(v['ID_Vehiculo'], 1)
+
+    pedidos = [{'id_pedido': 'P1', 'cliente': 'C01', 'zona': 'Z01', 'items': [{'sku': 'P001', 'cantidad': 10}]}]
+    despachos_1, sin_asignar_1 = transporte.planificar_despachos(1, pedidos, gestion.df_productos)
+    despachos_2, sin_asignar_2 = transporte.planificar_despachos(2, [], gestion.df_productos)
+    print(f"Día 1: {len(despachos_1)} despachos, sin asignar {sin_asignar_1}")
+    df_lineas = transporte.obtener_lineas_despacho_df()
+    print(f"Día 2: {len(despachos_2)} despachos ({df_lineas['ID_Pedido'].tolist()})")
+    assert not despachos_1 and sin_asignar_1 == ['P1']
+    assert len(despachos_2) == 1 and df_lineas['ID_Pedido'].tolist() == ['P1']
+    estados = {v['ID_Vehiculo']: v['Estado'] for v in transporte.flota}
+    assert list(estados.values()).count('En Ruta') == 1
+    assert set(estados.values()) == {'En Ruta', 'Disponible'}
+
+    # Caso 5: Una zona que excede la flota sale en vueltas sucesivas el mismo día; se arrastra al llenarse el turno
+    print("\n--- Caso 5: Vueltas en el día ---")
+    cantidad = int(2000 // gestion.df_productos.loc['P001', 'Peso_Unitario_kg'])   # ~2000 kg por pedido
+    flota = {'V-001': {'tipo': 'Camión 5Ton', 'capacidad_kg': 5000}}
+    for n_pedidos in (4, 20):
+        transporte = GestionTransporte(flota=flota)
+        pedidos = [{'id_pedido': f'P{i}', 'cliente': 'C01', 'zona': 'Z01', 'items': [{'sku': 'P001', 'cantidad': cantidad}]}
+                   for i in range(n_pedidos)]
+        despachos, sin_asignar = transporte.planificar_despachos(1, pedidos, gestion.df_productos)
+        print(f"{n_pedidos} pedidos: {[(d['Hora_Salida'], d['Hora_Retorno']) for d in despachos]}, arrastrados {len(sin_asignar)}")
+        assert all(d['Hora_Salida'] == a['Hora_Retorno'] for a, d in zip(despachos, despachos[1:]))
+        assert sum(d['Cant_Pedidos'] for d in despachos) + len(sin_asignar) == n_pedidos
+        if n_pedidos == 4:
+            assert len(despachos) == 2 and not sin_asignar   # Segunda vuelta, nada al día siguiente
+    assert len(despachos) > 2 and sin_asignar and len(transporte.pendientes_transporte) == len(sin_asignar)
+
+    print("\n[EXITO] PRUEBA EXITOSA: El calendario programa viajes, vueltas en el día, mantenimientos y arrastres.")
+
+if __name__ == "__main__":
+    test_calendario_flota()
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import numpy as np
+import pandas as pd
+from logistica_sim.sistema import indicadores
+
+def test_motor_kpis():
+    print("Iniciando prueba del motor de KPIs vectorizado...")
+
+    # Caso 1: Coincide con el cálculo escalar por día
+    print("\n--- Caso 1: Referencia escalar ---")
+    pedidos = [
+        {'Fecha': 1, 'Fecha_Entrega': 1, 'Cant_Solicitada': 10, 'Cant_Entregada': 10},
+        {'Fecha': 1, 'Fecha_Entrega': 1, 'Cant_Solicitada': 20, 'Cant_Entregada': 5},
+        {'Fecha': 1, 'Fecha_Entrega': None, 'Cant_Solicitada': 10, 'Cant_Entregada': 0},
+        {'Fecha': 3, 'Fecha_Entrega': 3, 'Cant_Solicitada': 8, 'Cant_Entregada': 8},
+    ]
+    ventas_perdidas = [{'Fecha': 1, 'Cantidad_Perdida': 5}]
+    despachos = [{'Fecha_Salida': 1, 'Porcentaje_Ocupacion': 40.0}, {'Fecha_Salida': 1, 'Porcentaje_Ocupacion': 60.0}]
+
+    df_dia, globales = indicadores.calcular_kpis(pedidos, ventas_perdidas, despachos, dias=range(1, 4))
+    print(df_dia[['total_pedidos', 'otif', 'fill_rate', 'backlog_rate', 'utilizacion_flota']])
+
+    assert df_dia.loc[1, 'otif'] == round(1 / 3 * 100, 2)
+    assert df_dia.loc[1, 'fill_rate'] == round(15 / 40 * 100, 2)
+    assert df_dia.loc[1, 'backlog_rate'] == round(20 / 40 * 100, 2)  # 40 - 15 entregadas - 5 perdidas
+    assert df_dia.loc[1, 'utilizacion_flota'] == 50.0
+    assert df_dia.loc[2, 'fill_rate'] == 100.0 and df_dia.loc[2, 'total_pedidos'] == 0  # Día sin pedidos
+    assert globales['total_pedidos'] == 4 and globales['otif_global'] == 50.0
+    assert globales['backlog_unidades'] == 20
+
+    # KPIs de un día dentro del bucle: sumas simples, mismos valores que el motor
+    pedidos_1 = [p for p in pedidos if p['Fecha'] == 1]
+    kpis_1 = indicadores.calcular_kpis_diarios(pedidos_1, [], 1500, pedidos_1, ventas_perdidas, despachos)
+    for clave in ('otif', 'fill_rate', 'backlog_rate', 'utilizacion_flota', 'unidades_perdidas'):
+        assert kpis_1[clave] == df_dia.loc[1, clave], clave
+
+    # Caso 2: Un millón de líneas en una sola pasada
+    print("\n--- Caso 2: Escala ---")
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    fechas = rng.integers(1, 366, n)
+    solicitado = rng.integers(1, 50, n)
+    entregado = np.minimum(solicitado, rng.integers(0, 60, n))
+    df_grande = pd.DataFrame({
+        'Fecha': fechas,
+        'Fecha_Entrega': np.where(entregado > 0, fechas, np.nan),
+        'Cant_Solicitada': solicitado,
+        'Cant_Entregada': entregado
+    })
+    inicio = time.perf_counter()
+    df_dia, globales = indicadores.calcular_kpis(df_grande)
+    segundos = time.perf_counter() - inicio
+    print(f"{n:,} líneas -> {len(df_dia)} días en {segundos:.3f} s")
+    assert globales['total_pedidos'] == n
+    assert globales['unidades_entregadas'] == int(entregado.sum())
+
+    print("\n[EXITO] PRUEBA EXITOSA: El motor de KPIs coincide con el cálculo por día y escala a 1M de líneas.")
+
+if __name__ == "__main__":
+    test_motor_kpis()
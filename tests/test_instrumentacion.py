@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from main import run_simulation
+from logistica_sim.sistema import instrumentacion
+
+def test_instrumentacion_fases():
+    print("Iniciando prueba de instrumentación por fase...")
+
+    # Caso 1: Tiempos y llamadas por día y fase
+    print("\n--- Caso 1: df_timings ---")
+    res = run_simulation(10, 1500, "normal", semilla=3, instrumentar=True)
+    df_timings = res['df_timings']
+    print(instrumentacion.resumen_fases(df_timings))
+    assert len(df_timings) == 10 * len(instrumentacion.FASES)
+    assert set(df_timings['Fase']) == set(instrumentacion.FASES)
+    assert (df_timings['Tiempo_ms'] > 0).all()
+    pedidos_por_dia = res['df_pedidos'].groupby('Fecha').size()
+    llamadas = df_timings[df_timings['Fase'] == 'pedidos'].set_index('Dia')['Llamadas']
+    assert (llamadas.reindex(pedidos_por_dia.index) == pedidos_por_dia).all()
+
+    # Caso 2: Desactivada por defecto, sin cambiar resultados
+    print("\n--- Caso 2: Desactivada ---")
+    res_sin = run_simulation(10, 1500, "normal", semilla=3)
+    assert res_sin['df_timings'].empty and list(res_sin['df_timings'].columns) == list(instrumentacion.COLUMNAS_TIEMPOS)
+    assert res_sin['metricas_globales'] == res['metricas_globales']
+
+    # Caso 3: El cronómetro nulo no agrega costo apreciable
+    nulo = instrumentacion.crear_cronometro(False)
+    t0 = time.perf_counter()
+    for _ in range(100_000):
+        with nulo.fase('pedidos'):
+            pass
+    costo_us = (time.perf_counter() - t0) / 100_000 * 1e6
+    print(f"Costo por fase desactivada: {costo_us:.3f} µs")
+    assert costo_us < 5
+
+    print("\n[EXITO] PRUEBA EXITOSA: Las fases se miden por día solo cuando se activa la instrumentación.")
+
+if __name__ == "__main__":
+    test_instrumentacion_fases()
@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tracemalloc
+import pandas as pd
+from main import run_simulation
+from logistica_sim.sistema import memoria, pronostico
+
+def test_tamano_profundo():
+    print("Iniciando prueba de estimación de tamaño de estructuras...")
+
+    # Caso 1: Contenedores pequeños se miden completos; objetos compartidos se cuentan una vez
+    print("\n--- Caso 1: Medición exacta y objetos compartidos ---")
+    fila = {'Fecha': 1, 'Producto': 'P001', 'Saldo_Final': 10}
+    lista = [fila, fila]
+    exacto = sys.getsizeof(lista) + memoria.tamano_profundo(fila)
+    assert memoria.tamano_profundo(lista) == exacto
+    vistos = set()
+    memoria.tamano_profundo(fila, vistos)
+    assert memoria.tamano_profundo(lista, vistos) == sys.getsizeof(lista)
+
+    # Caso 2: Contenedores grandes se extrapolan desde una muestra
+    print("\n--- Caso 2: Extrapolación ---")
+    kardex = [{'Fecha': i, 'Producto': f"P{i % 7:03d}", 'Saldo_Final': i * 3} for i in range(20_000)]
+    completo = memoria.tamano_profundo(kardex, muestra=len(kardex))
+    estimado = memoria.tamano_profundo(kardex)
+    print(f"Completo: {completo} B, Estimado: {estimado} B")
+    assert abs(estimado - completo) / completo < 0.10
+
+    # Caso 3: DataFrames por memory_usage(deep=True)
+    df = pd.DataFrame({'a': range(1000), 'b': ['x'] * 1000})
+    assert memoria.tamano_profundo(df) == df.memory_usage(deep=True).sum()
+
+    print("\n[EXITO] PRUEBA EXITOSA: El tamaño de las estructuras se estima sin contar dos veces objetos compartidos.")
+
+def test_memoria_simulacion():
+    print("Iniciando prueba de contabilidad de memoria de la simulación...")
+
+    # Caso 1: Mediciones cada N días (y el último) por estructura
+    print("\n--- Caso 1: df_memoria cada 4 días ---")
+    res = run_simulation(10, 1500, "normal", semilla=5, medir_memoria=4)
+    df_memoria = res['df_memoria']
+    print(memoria.mayores_estructuras(df_memoria, 8))
+    assert sorted(df_memoria['Dia'].unique()) == [4, 8, 10]
+    estructuras = set(df_memoria['Estructura'])
+    assert {'inventario.kardex', 'inventario.historial_backlog', 'transporte.despachos',
+            'principal.snapshots_inventario', 'principal.lista_pedidos_db'} <= estructuras
+    kardex = df_memoria[df_memoria['Estructura'] == 'inventario.kardex']['Bytes']
+    assert kardex.is_monotonic_increasing and (df_memoria['Bytes'] >= 0).all()
+
+    # Caso 2: Pico de tracemalloc atribuido a una estructura
+    print("\n--- Caso 2: Pico ---")
+    pico = res['pico_memoria']
+    print(pico)
+    assert pico['Traced_Pico'] == res['df_memoria_resumen']['Traced_Pico'].max() > 0
+    assert pico['Estructura_Crecimiento'] in estructuras
+    assert not tracemalloc.is_tracing()
+
+    # Caso 3: Desactivado por defecto, sin cambiar resultados
+    print("\n--- Caso 3: Desactivado ---")
+    res_sin = run_simulation(10, 1500, "normal", semilla=5)
+    assert res_sin['df_memoria'].empty and res_sin['pico_memoria'] is None
+    assert list(res_sin['df_memoria'].columns) == list(memoria.COLUMNAS_MEMORIA)
+    assert res_sin['metricas_globales'] == res['metricas_globales']
+
+    # Caso 4: Una excepción en una fase del día no deja tracemalloc activo
+    print("\n--- Caso 4: Excepción en la simulación ---")
+    class PronosticoFallido(pronostico.SuavizadoExponencial):
+        def _actualizar(self, demanda):
+            raise RuntimeError("falla en la fase de reposición")
+
+    fallido = PronosticoFallido(res['df_productos'].index)
+    try:
+        run_simulation(3, 1500, "normal", semilla=5, medir_memoria=True, pronostico=fallido)
+        assert False, "Debió propagar la excepción de la fase"
+    except RuntimeError:
+        pass
+    assert not tracemalloc.is_tracing()
+
+    print("\n[EXITO] PRUEBA EXITOSA: La memoria por estructura y el pico se registran solo cuando se activa.")
+
+if __name__ == "__main__":
+    test_tamano_profundo()
+    test_memoria_simulacion()
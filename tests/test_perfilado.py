@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import main
+from main import run_simulation
+from logistica_sim.sistema import perfilado, demanda
+
+def cancelar(dia, n_dias, resultado_dia):
+    if dia == 2:
+        raise KeyboardInterrupt
+
+def test_perfil_simulacion():
+    print("Iniciando prueba del modo de perfilado con cProfile...")
+
+    # Caso 1: Corrida completa -> top-N adjunto, reporte y pilas colapsadas
+    print("\n--- Caso 1: Corrida completa ---")
+    res = run_simulation(5, 1500, "normal", semilla=2, perfilar=True)
+    df_perfil = res['df_perfil']
+    print(df_perfil.head(10))
+    assert len(df_perfil) == perfilado.TOP_N
+    assert df_perfil['Tiempo_Propio_s'].is_monotonic_decreasing
+    assert isinstance(res['estadisticas_perfil'], dict)
+    reporte = perfilado.reporte(res['estadisticas_perfil'], 10)
+    assert 'Ordered by: cumulative time' in reporte
+    pilas = perfilado.pilas_colapsadas(res['estadisticas_perfil']).splitlines()
+    assert pilas and all(linea.rsplit(' ', 1)[1].isdigit() for linea in pilas)
+    assert any('calcular_kpis_diarios' in linea for linea in pilas)
+
+    # Caso 2: Solo los días pico del escenario estacional
+    print("\n--- Caso 2: Días pico ---")
+    res_pico = run_simulation(20, 1500, "demanda_estacional", semilla=2, perfilar=demanda.DIAS_PICO_ESTACIONAL)
+    stats = res_pico['estadisticas_perfil']
+    llamadas_demanda = sum(v[1] for f, v in stats.items() if f[2] == 'generar_demanda_diaria')
+    print(f"Llamadas a generar_demanda_diaria perfiladas: {llamadas_demanda}")
+    assert llamadas_demanda == len(demanda.DIAS_PICO_ESTACIONAL)
+    assert not any(f[2] == 'construir_tabla' for f in stats)   # Tablas finales fuera del perfil
+
+    # Caso 3: Desactivado por defecto, sin cambiar resultados
+    print("\n--- Caso 3: Desactivado ---")
+    res_sin = run_simulation(5, 1500, "normal", semilla=2)
+    assert res_sin['estadisticas_perfil'] is None and res_sin['df_perfil'].empty
+    assert res_sin['metricas_globales'] == res['metricas_globales']
+
+    # Caso 4: Cancelación a mitad de corrida -> el perfilador queda detenido
+    print("\n--- Caso 4: Cancelación ---")
+    try:
+        run_simulation(5, 1500, "normal", semilla=2, perfilar=True, progreso=cancelar)
+        assert False, "Debió propagar la cancelación"
+    except KeyboardInterrupt:
+        pass
+    assert sys.getprofile() is None
+
+    print("\n[EXITO] PRUEBA EXITOSA: El perfil de cProfile se captura por corrida o por día elegido.")
+
+def test_perfil_cli():
+    print("Iniciando prueba del perfil desde la línea de comandos...")
+    with tempfile.TemporaryDirectory() as directorio:
+        prefijo = os.path.join(directorio, "perfil")
+        assert main.main_cli(['--dias', '3', '--semilla', '1', '--dia-perfil', '2', '--top', '5',
+                              '--salida-perfil', prefijo]) == 0
+        for extension in ('prof', 'txt', 'collapsed'):
+            assert os.path.getsize(f"{prefijo}.{extension}") > 0
+
+    print("\n[EXITO] PRUEBA EXITOSA: El CLI escribe el perfil (.prof, .txt y pilas colapsadas).")
+
+if __name__ == "__main__":
+    test_perfil_simulacion()
+    test_perfil_cli()
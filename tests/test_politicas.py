@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from main import run_simulation
+from logistica_sim.sistema import politicas
+from logistica_sim.sistema.inventario import GestionInventario
+
+def test_recursion_politicas():
+    print("Iniciando prueba de la recursión (s, S) vectorizada...")
+
+    # Caso 1: Un SKU, demanda constante, verificado a mano
+    print("\n--- Caso 1: Recursión determinista ---")
+    demanda = np.full((6, 1), 4)
+    res = politicas.simular_politicas(demanda, [2], s=[[5]], S=[[10]])
+    # Día 0: 10-4=6; día 1: 2 (<5, pide 8, llega el día 3); día 2: vende 2 y pierde 2;
+    # día 3: llega 8 -> 4 (<5, pide 6, llega el día 5); día 4: 0; día 5: llega 6 -> 2 (pide 8)
+    assert res['ventas'][0, 0] == 4 + 4 + 2 + 4 + 4 + 4
+    assert res['perdidas'][0, 0] == 2
+    assert res['inventario'][0, 0] == 6 + 2 + 0 + 4 + 0 + 2
+    assert res['ordenes'][0, 0] == 3
+
+    # Caso 2: Las políticas son independientes entre sí (mismo resultado en bloque que una a una)
+    print("\n--- Caso 2: Bloque vs individual ---")
+    rng = np.random.default_rng(3)
+    demanda = rng.poisson(20, size=(40, 3))
+    s, S = politicas.politicas_candidatas(demanda, [2, 3, 5])
+    bloque = politicas.simular_politicas(demanda, [2, 3, 5], s, S)
+    for p in (0, 17, len(s) - 1):
+        sola = politicas.simular_politicas(demanda, [2, 3, 5], s[p:p + 1], S[p:p + 1])
+        for clave in bloque:
+            assert (sola[clave][0] == bloque[clave][p]).all()
+
+    print("\n[EXITO] PRUEBA EXITOSA: Recursión (s, S) correcta e independiente por política.")
+
+def test_optimizar_politicas():
+    print("Iniciando prueba del optimizador de políticas...")
+    gestion = GestionInventario()
+    traza = politicas.generar_traza(90, semilla=21, skus=gestion.df_productos.index)
+    assert traza.shape == (90, len(gestion.df_productos))
+
+    opt = politicas.optimizar_politicas(gestion.df_productos, traza, max_celdas=1000)  # Bloques de pocos SKUs
+    print(opt.round(2))
+    assert opt['Cumple_Objetivo'].all() and (opt['Fill_Rate'] >= politicas.FILL_RATE_OBJETIVO).all()
+    assert (opt['Stock_Objetivo'] > opt['Punto_Reorden']).all()
+    assert (opt['Q_Lote_Optimo'] == opt['Stock_Objetivo'] - opt['Punto_Reorden']).all()
+    # Ninguna política elegida es más cara que la vigente cuando esta cumple el objetivo
+    vigente_cumple = opt['Fill_Rate_Actual'] >= politicas.FILL_RATE_OBJETIVO
+    assert (opt.loc[vigente_cumple, 'Costo'] <= opt.loc[vigente_cumple, 'Costo_Actual'] + 1e-6).all()
+
+    # Escritura en el maestro y uso en la simulación completa (otra semilla: fuera de muestra)
+    gestion.aplicar_politicas(opt)
+    assert (gestion.df_productos['Punto_Reorden'] == opt['Punto_Reorden']).all()
+    base = run_simulation(30, 1500, semilla=8)
+    optimizada = run_simulation(30, 1500, semilla=8, politicas=opt)
+    print(f"Fill rate: {base['metricas_globales']['fill_rate_global']} -> "
+          f"{optimizada['metricas_globales']['fill_rate_global']}")
+    assert optimizada['config']['politicas'] and not base['config']['politicas']
+    assert optimizada['metricas_globales']['fill_rate_global'] > base['metricas_globales']['fill_rate_global']
+
+    print("\n[EXITO] PRUEBA EXITOSA: Políticas (s, S) optimizadas y aplicadas al maestro.")
+
+if __name__ == "__main__":
+    test_recursion_politicas()
+    test_optimizar_politicas()
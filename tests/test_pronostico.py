@@ -0,0 +1,104 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import numpy as np
+from main import run_simulation
+from logistica_sim.sistema import pronostico
+from logistica_sim.sistema.inventario import GestionInventario, EstadoInventario
+
+def test_metodos_pronostico():
+    print("Iniciando prueba de los métodos de pronóstico...")
+    skus = ['A', 'B', 'C']
+
+    # Caso 1: Valores calculados a mano
+    print("\n--- Caso 1: Fórmulas ---")
+    historia = [[10, 0, 4], [20, 0, 0], [30, 6, 0], [40, 0, 8]]
+    pm = pronostico.crear_pronosticador('promedio_movil', skus, ventana=3)
+    ses = pronostico.crear_pronosticador('ses', skus, alfa=0.5)
+    holt = pronostico.crear_pronosticador('holt', skus, alfa=0.5, beta=0.5)
+    croston = pronostico.crear_pronosticador('croston', skus, alfa=0.5, sba=False)
+    for dia in historia:
+        for p in (pm, ses, holt, croston):
+            p.actualizar(dia)
+    assert np.allclose(pm.pronostico(), [30, 2, 8 / 3])
+    assert np.isclose(ses.pronostico()[0], 31.25)              # 10 -> 15 -> 22.5 -> 31.25
+    assert holt.pronostico(2)[0] > holt.pronostico(1)[0] > 30   # Tendencia creciente
+    assert np.isclose(holt.demanda_periodo(2)[0], holt.pronostico(1)[0] + holt.pronostico(2)[0])
+    # C: demanda 4 tras 1 día, luego 8 tras 3 días -> tamaño 6, intervalo 2
+    assert np.isclose(croston.pronostico()[2], 6 / 2)
+    assert croston.pronostico()[1] == 6 / 3 and np.isinf(croston.intervalo_medio()).sum() == 0
+
+    # Caso 2: El modo combinado usa Croston en los SKUs intermitentes
+    print("\n--- Caso 2: Combinado ---")
+    auto = pronostico.crear_pronosticador('auto', skus)
+    for dia in historia:
+        auto.actualizar(dia)
+    assert auto.intermitente.tolist() == [False, True, True]
+    assert np.allclose(auto.pronostico(), np.where(auto.intermitente, auto.croston.pronostico(),
+                                                   auto.holt.pronostico()))
+
+    # Caso 3: Punto de reorden dinámico (demanda constante: sin error -> sin stock de seguridad)
+    print("\n--- Caso 3: Punto de reorden ---")
+    constante = pronostico.crear_pronosticador('ses', skus)
+    for _ in range(10):
+        constante.actualizar([5, 5, 5])
+    assert constante.listo and np.allclose(constante.punto_reorden([1, 2, 3]), [5, 10, 15])
+    try:
+        pronostico.crear_pronosticador('arima', skus)
+        assert False, "Debió fallar con un método desconocido"
+    except ValueError:
+        pass
+
+    # Caso 4: Actualización de 100k SKUs en milisegundos
+    print("\n--- Caso 4: Escala ---")
+    grande = pronostico.crear_pronosticador('auto', range(100_000))
+    demanda = np.random.default_rng(1).poisson(0.5, size=(10, 100_000))
+    t0 = time.perf_counter()
+    for dia in demanda:
+        grande.actualizar(dia)
+    ms_dia = (time.perf_counter() - t0) / len(demanda) * 1000
+    print(f"Actualización 'auto' para 100k SKUs: {ms_dia:.2f} ms/día")
+    assert ms_dia < 100
+
+    print("\n[EXITO] PRUEBA EXITOSA: Pronósticos vectorizados e incrementales.")
+
+def test_reposicion_con_pronostico():
+    print("Iniciando prueba de reposición con puntos de reorden dinámicos...")
+    gestion = GestionInventario()
+    p = pronostico.crear_pronosticador('ses', gestion.df_productos.index)
+
+    # Sin historia suficiente se usan los puntos del maestro
+    puntos, objetivos = gestion.puntos_reorden(p)
+    assert (puntos == gestion.df_productos['Punto_Reorden']).all()
+    for _ in range(pronostico.MIN_OBSERVACIONES):
+        p.actualizar(np.full(len(p.skus), 500))
+    puntos, objetivos = gestion.puntos_reorden(p)
+    esperado = 500 * gestion.df_productos['Lead_Time']
+    assert (puntos == esperado).all()
+    assert ((objetivos - puntos) == gestion.df_productos['Stock_Objetivo'] - gestion.df_productos['Punto_Reorden']).all()
+
+    # EstadoInventario: el mínimo dinámico (sobre el estático) dispara la reposición
+    estado = EstadoInventario()
+    sku = p.skus[0]
+    estado.stock = {s: 10**6 for s in estado.stock}
+    estado.stock[sku] = int(esperado[sku]) - 1
+    assert estado.verificar_reposicion(1, {}) == []
+    ordenes = estado.verificar_reposicion(1, {}, pronostico=p)
+    assert [o['sku'] for o in ordenes] == [sku]
+
+    # Simulación completa
+    base = run_simulation(30, 1500, semilla=4)
+    res = run_simulation(30, 1500, semilla=4, pronostico='auto')
+    assert res['config']['pronostico'] == 'auto' and res['pronostico'].n_observaciones == 30
+    assert base['pronostico'] is None
+    print(f"Fill rate: {base['metricas_globales']['fill_rate_global']} -> "
+          f"{res['metricas_globales']['fill_rate_global']}")
+    assert res['metricas_globales']['fill_rate_global'] > base['metricas_globales']['fill_rate_global']
+
+    print("\n[EXITO] PRUEBA EXITOSA: La reposición usa puntos de reorden basados en el pronóstico.")
+
+if __name__ == "__main__":
+    test_metodos_pronostico()
+    test_reposicion_con_pronostico()
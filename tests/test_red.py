@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import numpy as np
+import pandas as pd
+from logistica_sim.sistema import red, catalogos, carga
+
+def test_red_almacenes():
+    print("Iniciando prueba de la red multi-almacén...")
+
+    # Caso 1: Reglas de abastecimiento y reparto de flota
+    print("\n--- Caso 1: Configuración de la red ---")
+    reglas = red.reglas_abastecimiento(catalogos.dic_almacenes)
+    assert set(reglas) == set(catalogos.dic_coordenadas_zonas)
+    assert all(sorted(r) == sorted(catalogos.dic_almacenes) for r in reglas.values())
+    flotas = red.repartir_flota(catalogos.dic_almacenes)
+    assert set(flotas['A01']) == {'V-001', 'V-003', 'V-004'} and set(flotas['A02']) == {'V-002', 'V-005'}
+    sin_flota = red.repartir_flota({'X': {'coordenadas': (0, 0)}, 'Y': {'coordenadas': (5, 5)}})
+    assert len(sin_flota['X']) + len(sin_flota['Y']) == len(catalogos.dic_flota) and sin_flota['Y']
+
+    # Caso 2: Asignación con respaldo cuando el primario no cubre el pedido
+    print("\n--- Caso 2: Respaldo ---")
+    ids = ['A01', 'A02']
+    indice = {'P001': 0, 'P002': 1}
+    disponible = np.array([[5, 100], [50, 100]])
+    pedidos = [
+        {'id_pedido': 'X1', 'zona_id': 'Z', 'items': [{'sku': 'P001', 'cantidad': 3}]},
+        {'id_pedido': 'X2', 'zona_id': 'Z', 'items': [{'sku': 'P001', 'cantidad': 3}, {'sku': 'P002', 'cantidad': 1}]},
+        {'id_pedido': 'X3', 'zona_id': 'Z', 'items': [{'sku': 'P001', 'cantidad': 90}]},
+    ]
+    asignados = red.asignar_pedidos(pedidos, {'Z': ['A01', 'A02']}, disponible, indice, ids)
+    assert [p['id_pedido'] for p in asignados['A01']] == ['X1', 'X3']
+    assert [p['id_pedido'] for p in asignados['A02']] == ['X2'] and pedidos[1]['respaldo']
+    assert not pedidos[0]['respaldo'] and not pedidos[2]['respaldo']  # Nadie cubre X3: queda en el primario
+
+    # Caso 3: Secuencial y en procesos dan el mismo resultado
+    print("\n--- Caso 3: Secuencial vs procesos ---")
+    manual = [{'Fecha': 3, 'Origen': 'A01', 'Destino': 'A02', 'Producto': 'P001', 'Cantidad': 7}]
+    estado_global = random.getstate()
+    sec = red.simular_red(15, semilla=11, transferencias=manual)
+    par = red.simular_red(15, semilla=11, procesos=2, transferencias=manual)
+    assert sec['config']['procesos'] == 1 and par['config']['metodo_inicio'] == red.METODO_INICIO
+    for nombre in ('df_pedidos', 'df_kardex', 'df_despachos', 'df_transferencias', 'df_kpis_almacen'):
+        pd.testing.assert_frame_equal(sec[nombre], par[nombre])
+    assert sec['metricas_globales'] == par['metricas_globales']
+    assert random.getstate() == estado_global   # Generadores propios del coordinador y de cada nodo
+
+    # Con una carga sintética, sus catálogos llegan a los procesos 'spawn' como argumentos
+    c = carga.CargaSintetica(lineas_por_dia=120, n_skus=40, n_clientes=20, n_zonas=6, semilla=3)
+    sec_carga = red.simular_red(4, semilla=5, carga=c)
+    par_carga = red.simular_red(4, semilla=5, carga=c, procesos=2)
+    pd.testing.assert_frame_equal(sec_carga['df_pedidos'], par_carga['df_pedidos'])
+    assert set(par_carga['df_pedidos']['Zona_ID']) <= set(c.dic_zonas)
+    print(sec['df_kpis_almacen'][['total_pedidos', 'otif_global', 'pedidos_respaldo']])
+
+    # Caso 4: Transferencias en tablas y kardex de origen y destino
+    print("\n--- Caso 4: Transferencias ---")
+    trans = sec['df_transferencias']
+    print(trans)
+    primera = trans.iloc[0]
+    assert primera['Motivo'] == 'Manual' and primera['Fecha_Creacion'] == 3 and primera['Cantidad'] == 7
+    assert primera['Fecha_Arribo'] > primera['Fecha_Creacion']
+    kardex = sec['df_kardex']
+    salidas = kardex[kardex['Tipo_Movimiento'] == 'TRANSFERENCIA_SALIDA']
+    entradas = kardex[kardex['Tipo_Movimiento'] == 'TRANSFERENCIA_ENTRADA']
+    enviadas = trans[trans['Cantidad'] > 0]
+    assert -salidas['Cantidad'].sum() == enviadas['Cantidad'].sum()
+    llegadas = enviadas[enviadas['Fecha_Arribo'] <= 15]
+    assert entradas['Cantidad'].sum() == llegadas['Cantidad'].sum()
+    assert set(salidas['Almacen']) <= set(enviadas['Origen']) and set(entradas['Almacen']) <= set(llegadas['Destino'])
+
+    # Los pedidos de la red son los mismos que genera la demanda (cada uno en un solo almacén)
+    assert sec['df_pedidos']['ID_Pedido'].is_unique
+    assert sec['metricas_globales']['total_pedidos'] == sec['df_kpis_almacen']['total_pedidos'].sum()
+
+    print("\n[EXITO] PRUEBA EXITOSA: Red de almacenes con respaldo, transferencias y nodos en paralelo.")
+
+if __name__ == "__main__":
+    test_red_almacenes()
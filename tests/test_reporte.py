@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import pandas as pd
+from main import run_simulation
+from logistica_sim.sistema import reporte
+
+def test_reporte_pdf():
+    print("Iniciando prueba del reporte PDF (resumen de alertas, caché y segundo plano)...")
+    res = run_simulation(20, 1500, "demanda_estacional")
+
+    # Caso 1: Las alertas se condensan por tipo
+    print("\n--- Caso 1: Resumen de alertas ---")
+    resumen = reporte.resumir_alertas(res)
+    print(resumen[['Tipo', 'Aperturas', 'Cierres', 'Entidades']])
+    assert resumen['Aperturas'].sum() == (res['df_alertas']['Evento'] == 'Apertura').sum()
+
+    # Caso 2: Miles de alertas no crecen el PDF más allá del presupuesto de páginas
+    print("\n--- Caso 2: Presupuesto de páginas ---")
+    res_ruidoso = dict(res)
+    res_ruidoso['df_alertas'] = pd.DataFrame([
+        {'Fecha': d, 'Tipo': f'Tipo {t}', 'Mensaje': 'x', 'Nivel': 'Alto', 'Evento': 'Apertura', 'Entidad': f'SKU{t}'}
+        for d in range(1, 201) for t in range(50)
+    ])
+    pdf_bytes = reporte.generar_pdf(res_ruidoso)
+    paginas = int(re.search(rb"/Count (\d+)", pdf_bytes).group(1))
+    print(f"Alertas: {len(res_ruidoso['df_alertas'])}, Páginas: {paginas}")
+    assert paginas <= 4
+
+    # Caso 3: Generación en segundo plano con caché por huella del resultado
+    print("\n--- Caso 3: Caché ---")
+    primero = reporte.generar_pdf_async(res).result(timeout=60)
+    segundo = reporte.generar_pdf_async(res)
+    assert segundo.done() and segundo.result() == primero
+    tercero = reporte.generar_pdf_async(res, huella=reporte.huella_resultados(res))  # Huella ya guardada
+    assert tercero.done() and tercero.result() == primero
+    assert reporte.huella_resultados(res) != reporte.huella_resultados(res_ruidoso)
+
+    print("\n[EXITO] PRUEBA EXITOSA: El reporte resume alertas, respeta el presupuesto y se sirve desde caché.")
+
+if __name__ == "__main__":
+    test_reporte_pdf()
@@ -0,0 +1,182 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import threading
+import time
+import numpy as np
+import pandas as pd
+from logistica_sim.sistema import servicio, catalogos
+
+def test_servicio_cache():
+    print("Iniciando prueba del servicio de simulación con caché...")
+    servicio.limpiar_cache()
+
+    # Caso 1: Misma configuración y semilla -> mismo resultado desde caché
+    print("\n--- Caso 1: Acierto de caché ---")
+    t0 = time.perf_counter()
+    res1 = servicio.simular(10, 1500, "normal", semilla=7)
+    t_calculo = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    res2 = servicio.simular(10, 1500, "normal", semilla=7)
+    t_cache = time.perf_counter() - t0
+    print(f"Cálculo: {t_calculo:.3f}s, Caché: {t_cache * 1000:.3f}ms")
+    assert res2 is res1 and t_cache < t_calculo
+
+    # Caso 2: La semilla hace reproducible la simulación
+    servicio.limpiar_cache()
+    res3 = servicio.simular(10, 1500, "normal", semilla=7)
+    assert res3 is not res1
+    assert res3['metricas_globales'] == res1['metricas_globales']
+    assert servicio.clave_resultados(res3) == servicio.clave_simulacion("normal", 10, 1500, "ffd", 7)
+
+    # Caso 3: Tablas derivadas memorizadas con el resultado
+    print("\n--- Caso 3: Derivados ---")
+    graf = servicio.evolucion_stock(res3)
+    assert servicio.evolucion_stock(res3) is graf
+    assert len(graf) == 10 * len(res3['df_productos'])
+    assert servicio.tabla_clientes() is servicio.tabla_clientes()
+
+    # Caso 4: Cambiar el catálogo cambia la clave; el LRU respeta su tamaño
+    print("\n--- Caso 4: Versión de catálogos y LRU ---")
+    version = catalogos.version_catalogos()
+    original = catalogos.dic_sku['P001']['lead_time_dias']
+    catalogos.dic_sku['P001']['lead_time_dias'] = original + 1
+    try:
+        assert catalogos.version_catalogos() != version
+        assert servicio.simular(10, 1500, "normal", semilla=7) is not res3
+    finally:
+        catalogos.dic_sku['P001']['lead_time_dias'] = original
+
+    for semilla in range(servicio.MAX_SIMULACIONES_CACHE + 2):
+        servicio.simular(7, 1500, "normal", semilla=semilla)
+    assert len(servicio._cache_simulaciones) == servicio.MAX_SIMULACIONES_CACHE
+    assert all(k[0][5] != 7 for k in servicio._cache_derivados if k[0] != 'catalogos')
+    servicio.limpiar_cache()
+
+    print("\n[EXITO] PRUEBA EXITOSA: Las simulaciones y sus tablas derivadas se sirven desde caché por configuración y semilla.")
+
+def test_datos_evolucion_stock():
+    print("Iniciando prueba de datos del gráfico de evolución de stock...")
+    df_productos = pd.DataFrame({'Q_Lote_Optimo': [50, 30]}, index=pd.Index(['P001', 'P002'], name='ID_Producto'))
+    df_kardex = pd.DataFrame([
+        {'Fecha': 2, 'Producto': 'P001', 'Saldo_Final': 90},
+        {'Fecha': 2, 'Producto': 'P001', 'Saldo_Final': 70},   # Último del día 2
+        {'Fecha': 4, 'Producto': 'P002', 'Saldo_Final': 10},
+    ])
+
+    # Caso 1: Último saldo del día, arrastre hacia adelante y stock inicial
+    print("\n--- Caso 1: Pivot + ffill ---")
+    df = servicio.datos_evolucion_stock(df_kardex, df_productos, 5)
+    matriz = df.pivot(index='Dia', columns='Producto', values='Stock')
+    print(matriz)
+    assert matriz['P001'].tolist() == [100, 70, 70, 70, 70]
+    assert matriz['P002'].tolist() == [60, 60, 60, 10, 10]
+
+    # Caso 2: Horizonte largo dentro del presupuesto de filas
+    print("\n--- Caso 2: 200 SKUs x 365 días ---")
+    rng = np.random.default_rng(0)
+    skus = [f"S{i:03d}" for i in range(200)]
+    df_productos = pd.DataFrame({'Q_Lote_Optimo': rng.integers(10, 100, 200)}, index=skus)
+    n = 200_000
+    df_kardex = pd.DataFrame({
+        'Fecha': np.sort(rng.integers(1, 366, n)),
+        'Producto': pd.Categorical(rng.choice(skus, n)),
+        'Saldo_Final': rng.integers(0, 500, n),
+    })
+    t0 = time.perf_counter()
+    completo = servicio.datos_evolucion_stock(df_kardex, df_productos, 365)
+    t_completo = time.perf_counter() - t0
+    reducido = servicio.datos_evolucion_stock(df_kardex, df_productos, 365, max_filas=5000)
+    print(f"Completo: {len(completo)} filas en {t_completo:.3f}s, Reducido: {len(reducido)} filas")
+    assert len(completo) == 365 * 200 and len(reducido) <= 5000
+    assert {1, 365} <= set(reducido['Dia'])
+    # Más SKUs que filas: igual se grafican el primer y el último día
+    minimo = servicio.datos_evolucion_stock(df_kardex, df_productos, 365, max_filas=100)
+    assert set(minimo['Dia']) == {1, 365} and len(minimo) == 2 * 200
+
+    print("\n[EXITO] PRUEBA EXITOSA: Los datos del gráfico de stock se arman vectorizados y respetan el presupuesto.")
+
+def test_simulacion_async():
+    print("Iniciando prueba de simulación en segundo plano con avance y cancelación...")
+    servicio.limpiar_cache()
+
+    # Caso 1: Avance parcial y cancelación
+    print("\n--- Caso 1: Cancelación ---")
+    ejecucion = servicio.simular_async(365, 1500, "normal", semilla=11)
+    while ejecucion.dias_completados < 3 and not ejecucion.terminada():
+        time.sleep(0.01)
+    parcial = ejecucion.kpis_parciales()
+    print(parcial[['total_pedidos', 'fill_rate', 'otif']].head())
+    assert len(parcial) >= 3 and 'fill_rate' in parcial.columns
+    ejecucion.cancelar()
+    try:
+        ejecucion.resultado(timeout=60)
+        assert False, "La simulación debió cancelarse"
+    except servicio.SimulacionCancelada as e:
+        print(f"Cancelada: {e} ({ejecucion.dias_completados} días)")
+    assert ejecucion.cancelada() and ejecucion.dias_completados < 365
+    assert not servicio._cache_simulaciones and not servicio._en_curso
+
+    # Caso 2: Ejecución completa; queda en caché para la versión síncrona
+    print("\n--- Caso 2: Ejecución completa ---")
+    ejecucion = servicio.simular_async(15, 1500, "normal", semilla=11)
+    res = ejecucion.resultado(timeout=60)
+    assert ejecucion.fraccion == 1.0 and len(ejecucion.kpis_parciales()) == 15
+    assert servicio.simular(15, 1500, "normal", semilla=11) is res
+    assert servicio.simular_async(15, 1500, "normal", semilla=11).terminada()
+    servicio.limpiar_cache()
+
+    # Caso 3: Corridas concurrentes en hilos no comparten estado aleatorio
+    print("\n--- Caso 3: Corridas concurrentes ---")
+    from main import run_simulation
+    secuenciales = {s: run_simulation(10, 1500, "normal", semilla=s)['metricas_globales'] for s in (3, 4)}
+    estado_global = random.getstate()
+    turno = threading.Barrier(2)
+    concurrentes = {}
+
+    def correr(semilla):
+        # La barrera intercala los días de ambas corridas
+        concurrentes[semilla] = run_simulation(10, 1500, "normal", semilla=semilla,
+                                               progreso=lambda *_: turno.wait())['metricas_globales']
+
+    hilos = [threading.Thread(target=correr, args=(s,)) for s in (3, 4)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert concurrentes == secuenciales and random.getstate() == estado_global
+
+    # Caso 4: Corrida compartida entre sesiones; solo se detiene cuando la cancela la última
+    print("\n--- Caso 4: Suscriptores ---")
+    servicio.limpiar_cache()
+    sesion_a = servicio.simular_async(365, 1500, "normal", semilla=12)
+    sesion_b = servicio.simular_async(365, 1500, "normal", semilla=12)
+    assert sesion_b is sesion_a
+    assert not sesion_a.cancelar()   # Sigue para la sesión B
+    # Mientras tanto, otra configuración no espera a que termine la corrida larga
+    corta = servicio.simular_async(7, 1500, "normal", semilla=13).resultado(timeout=120)
+    assert not sesion_b.terminada() and len(corta['resultados_diarios']) == 7
+    assert sesion_b.cancelar()
+    # Una corrida ya cancelada no se entrega a una sesión nueva
+    nueva = servicio.simular_async(365, 1500, "normal", semilla=12)
+    assert nueva is not sesion_a and nueva.cancelar()
+    try:
+        sesion_b.resultado(timeout=60)
+        assert False, "La simulación debió cancelarse"
+    except servicio.SimulacionCancelada:
+        pass
+    try:
+        nueva.resultado(timeout=60)
+        assert False, "La simulación debió cancelarse"
+    except servicio.SimulacionCancelada:
+        pass
+    servicio.limpiar_cache()
+
+    print("\n[EXITO] PRUEBA EXITOSA: La simulación corre en segundo plano, informa su avance y se puede cancelar.")
+
+if __name__ == "__main__":
+    test_servicio_cache()
+    test_datos_evolucion_stock()
+    test_simulacion_async()
@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from statistics import NormalDist
+import numpy as np
+from main import run_simulation
+from logistica_sim.sistema import stock_seguridad
+from logistica_sim.sistema.inventario import GestionInventario
+
+def test_welford_y_formulas():
+    print("Iniciando prueba del motor de stock de seguridad...")
+
+    # Caso 1: Welford con ventana móvil coincide con media/varianza de los últimos días
+    print("\n--- Caso 1: Welford ---")
+    rng = np.random.default_rng(7)
+    demanda = rng.poisson(12, size=(50, 4)).astype(float)
+    w = stock_seguridad.Welford(4)
+    for i, fila in enumerate(demanda):
+        if i >= 10:
+            w.quitar(demanda[i - 10])
+        w.agregar(fila)
+    assert np.allclose(w.media, demanda[-10:].mean(axis=0))
+    assert np.allclose(w.varianza(), demanda[-10:].var(axis=0, ddof=1))
+    parcial = stock_seguridad.Welford(3)
+    parcial.agregar([4, 0, 0], np.array([True, False, False]))
+    parcial.agregar([6, 0, 0], np.array([True, False, False]))
+    assert parcial.n.tolist() == [2, 0, 0] and parcial.media[0] == 5 and parcial.varianza()[0] == 2
+
+    # Caso 2: Fórmula SS = z·√(L·σd² + d²·σL²) con lead times observados en recepciones
+    print("\n--- Caso 2: Stock de seguridad y punto de reorden ---")
+    gestion = GestionInventario()
+    productos = gestion.df_productos
+    motor = stock_seguridad.MotorStockSeguridad(productos, nivel_servicio=0.9, ventana=None)
+    sku = productos.index[0]
+    for dia in range(1, 11):
+        motor.actualizar_demanda(np.where(productos.index == sku, 10 + (dia % 2) * 10, 0))
+    motor.registrar_recepciones([{'Producto': sku, 'Fecha_Creacion': 1},
+                                 {'Producto': sku, 'Fecha_Creacion': 3}], dia=6)  # Lead times 5 y 3
+    valores = motor.calcular()
+    d, var_d = 15.0, np.var([20, 10] * 5, ddof=1)
+    l, var_l = 4.0, 2.0
+    z = NormalDist().inv_cdf(0.9)
+    assert valores['Recepciones'][0] == 2 and valores['Lead_Time_Medio'][0] == l
+    assert valores['Stock_Seguridad'][0] == np.ceil(z * np.sqrt(l * var_d + d ** 2 * var_l))
+    assert valores['Punto_Reorden'][0] == np.ceil(d * l + z * np.sqrt(l * var_d + d ** 2 * var_l))
+    # Sin recepciones: lead time del maestro y sin demanda -> stock de seguridad 0
+    assert valores['Lead_Time_Medio'][1] == productos['Lead_Time'].iloc[1] and valores['Stock_Seguridad'][1] == 0
+
+    # Caso 3: Escritura en el maestro conservando la brecha S - s
+    print("\n--- Caso 3: Maestro ---")
+    brecha = productos['Stock_Objetivo'] - productos['Punto_Reorden']
+    motor.aplicar(productos)
+    assert productos.loc[sku, 'Punto_Reorden'] == valores['Punto_Reorden'][0]
+    assert productos.loc[sku, 'Stock_Seguridad'] == valores['Stock_Seguridad'][0]
+    assert ((productos['Stock_Objetivo'] - productos['Punto_Reorden']) == brecha).all()
+    try:
+        stock_seguridad.MotorStockSeguridad(productos, nivel_servicio=1.2)
+        assert False, "Debió fallar con un nivel de servicio inválido"
+    except ValueError:
+        pass
+
+    print("\n[EXITO] PRUEBA EXITOSA: Welford vectorizado y fórmulas de stock de seguridad.")
+
+def test_stock_seguridad_en_simulacion():
+    print("Iniciando prueba de stock de seguridad dinámico en la simulación...")
+    base = run_simulation(30, 1500, semilla=6)
+    res = run_simulation(30, 1500, semilla=6, stock_seguridad=0.95)
+    tabla = res['df_stock_seguridad']
+    print(tabla)
+    assert res['config']['stock_seguridad'] == 0.95 and base['df_stock_seguridad'].empty
+    assert (tabla['Recepciones'] > 0).any() and (tabla['Stock_Seguridad'] > 0).all()
+
+    # Reposición y alertas usan los umbrales dinámicos del maestro
+    assert (res['df_productos']['Stock_Seguridad'] == tabla['Stock_Seguridad']).all()
+    assert (res['df_productos']['Punto_Reorden'] == tabla['Punto_Reorden']).all()
+    criticas = res['df_alertas'][res['df_alertas']['Regla'] == 'inventario_critico']
+    umbrales = criticas['Mensaje'].str.extract(r'< (\d+)\)')[0].dropna().astype(int)
+    assert not set(umbrales) <= set(base['df_productos']['Stock_Seguridad'])
+    print(f"Fill rate: {base['metricas_globales']['fill_rate_global']} -> "
+          f"{res['metricas_globales']['fill_rate_global']}")
+    assert res['metricas_globales']['fill_rate_global'] > base['metricas_globales']['fill_rate_global']
+
+    print("\n[EXITO] PRUEBA EXITOSA: Umbrales de reposición y alertas se adaptan durante la corrida.")
+
+if __name__ == "__main__":
+    test_welford_y_formulas()
+    test_stock_seguridad_en_simulacion()
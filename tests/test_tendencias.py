@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from logistica_sim.sistema.tendencias import MonitorKPIs, VentanaMovil
+
+def test_tendencias_kpis():
+    print("Iniciando prueba de tendencias en línea (ventanas móviles y EWMA)...")
+    rng = np.random.default_rng(3)
+    serie = pd.Series(rng.uniform(40, 100, 400))
+
+    # Caso 1: Coincide con pandas rolling / ewm sin guardar el histórico
+    print("\n--- Caso 1: Referencia pandas ---")
+    monitor = MonitorKPIs(kpis=("fill_rate",), alfa=0.3)
+    for dia, valor in enumerate(serie, start=1):
+        monitor.actualizar(dia, {"fill_rate": valor})
+
+    resumen = monitor.resumen()
+    esperado_7 = serie.rolling(7).mean().iloc[-1]
+    esperado_30_desv = serie.rolling(30).std().iloc[-1]
+    esperado_ewma = serie.ewm(alpha=0.3, adjust=False).mean().iloc[-1]
+    print(f"Media 7d: {resumen['fill_rate_media_7d']} (pandas {esperado_7:.2f})")
+    print(f"EWMA: {resumen['fill_rate_ewma']} (pandas {esperado_ewma:.2f})")
+    assert abs(resumen['fill_rate_media_7d'] - esperado_7) < 0.01
+    assert abs(resumen['fill_rate_desv_30d'] - esperado_30_desv) < 0.01
+    assert abs(resumen['fill_rate_ewma'] - esperado_ewma) < 0.01
+
+    # Caso 2: Memoria acotada por la ventana
+    print("\n--- Caso 2: Memoria acotada ---")
+    ventana = VentanaMovil(30)
+    for valor in serie:
+        ventana.actualizar(valor)
+    assert ventana.n == 30
+
+    # Caso 3: Tendencia corta vs larga
+    monitor = MonitorKPIs(kpis=("otif",))
+    for dia in range(1, 31):
+        monitor.actualizar(dia, {"otif": 60.0 if dia <= 23 else 90.0})
+    print(f"Tendencia OTIF 7d-30d: {monitor.tendencia('otif')}")
+    assert monitor.tendencia('otif') > 0
+
+    print("\n[EXITO] PRUEBA EXITOSA: Las tendencias en línea coinciden con pandas.")
+
+if __name__ == "__main__":
+    test_tendencias_kpis()
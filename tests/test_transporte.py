@@ -0,0 +1,120 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from logistica_sim.sistema.transporte import ModeloCarga
+from logistica_sim.sistema.inventario import GestionInventario
+from logistica_sim.sistema import catalogos
+
+def test_modelo_carga():
+    print("Iniciando prueba del modelo de carga (pesos/volúmenes por SKU)...")
+    gestion = GestionInventario()
+    df_productos = gestion.df_productos
+    modelo = ModeloCarga(df_productos)
+
+    pedidos = [
+        {'id_pedido': 'P1', 'items': [{'sku': 'P001', 'cantidad': 10}, {'sku': 'P005', 'cantidad': 2}]},
+        {'id_pedido': 'P2', 'items': [{'sku': 'P002', 'cantidad': 3}]},
+        {'id_pedido': 'P3', 'items': []},
+    ]
+    pesos, volumenes = modelo.calcular_pedidos(pedidos)
+
+    # Referencia: consulta escalar al maestro de productos
+    esperado = [
+        sum(i['cantidad'] * df_productos.loc[i['sku'], 'Peso_Unitario_kg'] for i in p['items'])
+        for p in pedidos
+    ]
+    print(f"Pesos calculados: {pesos.tolist()} (esperado {esperado})")
+    print(f"Volúmenes calculados (m³): {volumenes.round(3).tolist()}")
+
+    assert np.allclose(pesos, esperado)
+    assert volumenes[0] > 0 and volumenes[2] == 0
+    print("\n[EXITO] PRUEBA EXITOSA: El modelo de carga coincide con el maestro de productos.")
+
+def test_ruteo():
+    print("Iniciando prueba de ruteo (Clarke-Wright + 2-opt)...")
+    from logistica_sim.sistema import ruteo
+    from logistica_sim.sistema.transporte import GestionTransporte
+
+    rng = np.random.default_rng(1)
+    coordenadas = {f"Z{i:02d}": tuple(rng.uniform(-40, 40, 2)) for i in range(60)}
+    matriz_distancias = ruteo.obtener_matriz_distancias(coordenadas)
+    assert ruteo.obtener_matriz_distancias(coordenadas) is matriz_distancias  # Cacheada
+
+    # Caso 1: Clarke-Wright respeta la capacidad y asigna todos los pedidos
+    zonas = rng.choice(list(coordenadas), 150).tolist()
+    pesos = rng.uniform(50, 900, 150)
+    capacidades = np.array([1000, 5000, 5000, 10000], dtype=float)
+    viajes, sin_asignar = ruteo.construir_rutas(zonas, pesos, capacidades, matriz_distancias)
+    print(f"Viajes: {len(viajes)}, Pedidos sin asignar: {len(sin_asignar)}")
+    assert not sin_asignar
+    assert sum(len(v['pedidos']) for v in viajes) == len(pesos)
+    assert all(v['carga'] <= capacidades[v['vehiculo']] + 1e-6 for v in viajes)
+
+    # Caso 2: 2-opt nunca empeora la ruta
+    ruta = np.arange(1, 40)
+    antes = ruteo.longitud_ruta(ruta, matriz_distancias.matriz)
+    despues = ruteo.longitud_ruta(ruteo.dos_opt(ruta, matriz_distancias.matriz), matriz_distancias.matriz)
+    print(f"Longitud ruta: {antes:.1f} km -> {despues:.1f} km tras 2-opt")
+    assert despues <= antes
+
+    # Caso 2b: Más de MAX_PEDIDOS_AHORROS_COMPLETOS pedidos -> vecinos por grilla, sin matriz n x n
+    xy = rng.uniform(-40, 40, (2000, 2))
+    vecinos = ruteo.vecinos_cercanos(xy, 10)
+    d = np.sqrt(((xy[:, None, :] - xy[None, :, :]) ** 2).sum(axis=2))
+    np.fill_diagonal(d, np.inf)
+    assert np.allclose(np.sort(d[np.arange(len(xy))[:, None], vecinos], axis=1), np.sort(d, axis=1)[:, :10])
+    pesos = rng.uniform(50, 900, len(xy))
+    viajes, sin_asignar = ruteo.construir_rutas([None] * len(xy), pesos, capacidades, None, coordenadas=xy)
+    assert not sin_asignar and sorted(p for v in viajes for p in v['pedidos']) == list(range(len(xy)))
+    assert all(v['carga'] <= capacidades[v['vehiculo']] + 1e-6 for v in viajes)
+
+    # Caso 3: El costo del despacho refleja la distancia recorrida y el costo por km
+    gestion = GestionInventario()
+    pedidos = [{'id_pedido': 'P1', 'cliente': 'C01', 'zona': 'Z01', 'items': [{'sku': 'P001', 'cantidad': 10}]}]
+    transporte = GestionTransporte(estrategia_empaque="ruteo")
+    despachos, _ = transporte.planificar_despachos(1, pedidos, gestion.df_productos)
+    vehiculo = next(v for v in transporte.flota if v['ID_Vehiculo'] == despachos[0]['ID_Vehiculo'])
+    print(f"Distancia: {despachos[0]['Distancia_km']} km, Costo: S/ {despachos[0]['Costo_Viaje']}")
+    assert abs(despachos[0]['Costo_Viaje'] - despachos[0]['Distancia_km'] * vehiculo['Costo_Km']) < 0.05
+    assert vehiculo['Costo_Km'] == catalogos.costo_km_tipo(vehiculo['Tipo'])
+
+    # Caso 4: Con 'ruteo' cada pedido se visita en su cliente (ida y vuelta almacén -> C03 -> almacén)
+    pedidos = [{'id_pedido': 'P2', 'cliente': 'C03', 'zona': 'Z01', 'items': [{'sku': 'P001', 'cantidad': 10}]}]
+    despachos, _ = GestionTransporte(estrategia_empaque="ruteo").planificar_despachos(1, pedidos, gestion.df_productos)
+    x, y = catalogos.dic_coordenadas_clientes['C03']
+    esperado = 2 * (x ** 2 + y ** 2) ** 0.5 * catalogos.FACTOR_CIRCUITO
+    print(f"Distancia al cliente C03: {despachos[0]['Distancia_km']} km (esperado {esperado:.2f})")
+    assert abs(despachos[0]['Distancia_km'] - esperado) < 0.01 and despachos[0]['Destino'] == 'Zona Norte'
+    print("\n[EXITO] PRUEBA EXITOSA: Las rutas respetan capacidad y costos por km.")
+
+def test_lineas_despacho():
+    print("Iniciando prueba de la relación despacho-pedido...")
+    from logistica_sim.sistema.transporte import GestionTransporte
+
+    gestion = GestionInventario()
+    pedidos = [
+        {'id_pedido': f'P{i}', 'cliente': 'C01', 'zona': z, 'items': [{'sku': 'P002', 'cantidad': 20}]}
+        for i, z in enumerate(['Z01', 'Z02', 'Z01', 'Z03'])
+    ]
+    transporte = GestionTransporte()
+    transporte.planificar_despachos(1, pedidos, gestion.df_productos)
+
+    df_despachos = transporte.obtener_despachos_df()
+    df_lineas = transporte.obtener_lineas_despacho_df()
+    df_entregas = transporte.obtener_entregas_pedido_df()
+    print(df_lineas)
+
+    # Cada pedido aparece una vez y los pesos cuadran con la cabecera
+    assert sorted(df_lineas['ID_Pedido'].astype(str)) == ['P0', 'P1', 'P2', 'P3']
+    peso_lineas = df_lineas.groupby('ID_Despacho')['Peso_kg'].sum()
+    peso_cabecera = df_despachos.set_index('ID_Despacho')['Peso_Total_Carga_kg']
+    assert np.allclose(peso_lineas.loc[peso_cabecera.index], peso_cabecera)
+    assert df_entregas['ID_Vehiculo'].notna().all()
+    print("\n[EXITO] PRUEBA EXITOSA: Las líneas de despacho relacionan cada pedido con su viaje.")
+
+if __name__ == "__main__":
+    test_modelo_carga()
+    test_ruteo()
+    test_lineas_despacho()